@@ -8,6 +8,8 @@
  * - 시퀀스 번호 기반 데이터 무결성
  * - 명령 수신 및 ACK/NACK 응답
  * - 다양한 시나리오 테스트 지원
+ * - 바이너리 측정 프레임 (set_format 명령으로 전환, 24바이트 + CRC16)
+ * - 버스트 모드 (set_burst 명령, 20Hz~10kHz 샘플을 K개씩 묶어 바이너리 전송)
  */
 
 #include <ArduinoJson.h>
@@ -28,6 +30,54 @@ unsigned long measurementInterval = 1000; // 1초 기본값
 unsigned long lastMeasurement = 0;
 unsigned long sequenceNumber = 0;
 bool sensorStatus = true;
+bool binaryFormat = false; // true: 측정 데이터를 바이너리 프레임으로 전송
+unsigned long burstRateHz = 0;   // 0: 버스트 모드 꺼짐
+uint8_t burstSamples = 100;      // 버스트 프레임당 샘플 수
+
+// 바이너리 측정 프레임 (little-endian, Python binary_protocol.py와 동일)
+const uint8_t FRAME_SYNC_0 = 0xA5;
+const uint8_t FRAME_SYNC_1 = 0x5A;
+const uint8_t FRAME_TYPE_MEASUREMENT = 0x01;
+
+struct __attribute__((packed)) MeasurementFrame {
+  uint8_t sync[2];
+  uint8_t type;
+  uint32_t seq;
+  uint32_t ts;         // millis()
+  uint16_t voltageMv;  // mV
+  int32_t currentUa;   // µA
+  int32_t powerUw;     // µW
+  uint8_t flags;       // bit0: sensor ok, bit1-3: simulation mode
+  uint16_t crc;        // CRC-16/CCITT-FALSE (type ~ flags)
+};
+
+// 버스트 프레임: 헤더 + 샘플 K개 + CRC16
+const uint8_t FRAME_TYPE_BURST = 0x02;
+const uint8_t BURST_MAX_SAMPLES = 200;
+const unsigned long BURST_MIN_RATE_HZ = 20;     // dt가 uint16 µs에 들어가는 범위
+const unsigned long BURST_MAX_RATE_HZ = 10000;
+
+struct __attribute__((packed)) BurstHeader {
+  uint8_t sync[2];
+  uint8_t type;
+  uint32_t seq;        // 첫 샘플 seq
+  uint32_t ts;         // 첫 샘플 micros()
+  uint8_t count;       // 샘플 수 K
+  uint8_t flags;
+};
+
+struct __attribute__((packed)) BurstSample {
+  uint16_t dtUs;       // 이전 샘플 대비 µs
+  uint16_t voltageMv;
+  int32_t currentUa;
+  int32_t powerUw;
+};
+
+BurstHeader burstHeader;
+BurstSample burstBuffer[BURST_MAX_SAMPLES];
+uint8_t burstCount = 0;
+unsigned long nextSampleUs = 0;
+unsigned long lastSampleUs = 0;
 
 // 시뮬레이션 파라미터
 struct SimulationParams {
@@ -61,6 +111,14 @@ void setup() {
 void loop() {
   unsigned long currentTime = millis();
   
+  if (burstRateHz > 0) {
+    // 버스트 모드: micros() 기준 샘플링, delay 없이 루프
+    sampleBurst();
+    handleSerialCommands();
+    updateSimulationMode(currentTime);
+    return;
+  }
+  
   // 측정 간격 확인
   if (currentTime - lastMeasurement >= measurementInterval) {
     sendMeasurementData();
@@ -85,6 +143,11 @@ void sendMeasurementData() {
   float current = generateCurrent();
   float power = voltage * current;
   
+  if (binaryFormat) {
+    sendBinaryMeasurement(voltage, current, power);
+    return;
+  }
+  
   // JSON 데이터 구성
   doc["v"] = round(voltage * 1000) / 1000.0;  // 소수점 3자리
   doc["a"] = round(current * 1000) / 1000.0;  // 소수점 3자리
@@ -102,6 +165,96 @@ void sendMeasurementData() {
   Serial.println(jsonString);
 }
 
+uint16_t crc16(const uint8_t* data, size_t length) {
+  // CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF)
+  return crc16Update(0xFFFF, data, length);
+}
+
+uint16_t crc16Update(uint16_t crc, const uint8_t* data, size_t length) {
+  for (size_t i = 0; i < length; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void sendBinaryMeasurement(float voltage, float current, float power) {
+  MeasurementFrame frame;
+  frame.sync[0] = FRAME_SYNC_0;
+  frame.sync[1] = FRAME_SYNC_1;
+  frame.type = FRAME_TYPE_MEASUREMENT;
+  frame.seq = ++sequenceNumber;
+  frame.ts = millis();
+  frame.voltageMv = (uint16_t)lround(voltage * 1000.0);
+  frame.currentUa = (int32_t)lround(current * 1000000.0);
+  frame.powerUw = (int32_t)lround(power * 1000000.0);
+  frame.flags = (sensorStatus ? 0x01 : 0x00) | ((uint8_t)currentMode << 1);
+  
+  // sync와 CRC 필드를 제외한 구간의 CRC
+  const uint8_t* bytes = (const uint8_t*)&frame;
+  frame.crc = crc16(bytes + 2, sizeof(MeasurementFrame) - 4);
+  
+  Serial.write(bytes, sizeof(MeasurementFrame));
+}
+
+void sampleBurst() {
+  unsigned long now = micros();
+  if ((long)(now - nextSampleUs) < 0) {
+    return;
+  }
+  
+  float voltage = generateVoltage();
+  float current = generateCurrent();
+  float power = voltage * current;
+  
+  if (burstCount == 0) {
+    burstHeader.seq = sequenceNumber + 1;
+    burstHeader.ts = now;
+  }
+  
+  BurstSample& sample = burstBuffer[burstCount];
+  sample.dtUs = burstCount == 0 ? 0 : (uint16_t)min(now - lastSampleUs, 65535UL);
+  sample.voltageMv = (uint16_t)lround(voltage * 1000.0);
+  sample.currentUa = (int32_t)lround(current * 1000000.0);
+  sample.powerUw = (int32_t)lround(power * 1000000.0);
+  
+  sequenceNumber++;
+  burstCount++;
+  lastSampleUs = now;
+  nextSampleUs += 1000000UL / burstRateHz;
+  if ((long)(now - nextSampleUs) > 1000000L) {
+    // 1초 이상 밀리면 따라잡지 않고 현재 시각부터 다시 시작
+    nextSampleUs = now;
+  }
+  
+  if (burstCount >= burstSamples) {
+    sendBurstFrame();
+  }
+}
+
+void sendBurstFrame() {
+  burstHeader.sync[0] = FRAME_SYNC_0;
+  burstHeader.sync[1] = FRAME_SYNC_1;
+  burstHeader.type = FRAME_TYPE_BURST;
+  burstHeader.count = burstCount;
+  burstHeader.flags = (sensorStatus ? 0x01 : 0x00) | ((uint8_t)currentMode << 1);
+  
+  // CRC는 type ~ 마지막 샘플 구간 (헤더와 샘플 버퍼가 떨어져 있으므로 이어서 계산)
+  const uint8_t* header = (const uint8_t*)&burstHeader;
+  const uint8_t* samples = (const uint8_t*)burstBuffer;
+  size_t samplesLength = sizeof(BurstSample) * burstCount;
+  uint16_t crc = crc16(header + 2, sizeof(BurstHeader) - 2);
+  crc = crc16Update(crc, samples, samplesLength);
+  
+  Serial.write(header, sizeof(BurstHeader));
+  Serial.write(samples, samplesLength);
+  Serial.write((const uint8_t*)&crc, sizeof(crc));
+  
+  burstCount = 0;
+}
+
 float generateVoltage() {
   float voltage = simParams.baseVoltage;
   
@@ -194,7 +347,7 @@ void handleJsonCommand(const StaticJsonDocument<200>& doc) {
   String cmd = doc["cmd"];
   unsigned long seq = doc["seq"];
   
-  StaticJsonDocument<100> response;
+  StaticJsonDocument<256> response; // get_status 필드 9개 수용
   response["ack"] = seq;
   
   if (cmd == "set_interval") {
@@ -218,10 +371,49 @@ void handleJsonCommand(const StaticJsonDocument<200>& doc) {
       response["message"] = "Invalid mode";
     }
   }
+  else if (cmd == "set_format") {
+    String format = doc["value"];
+    if (format == "json" || format == "binary") {
+      // 응답은 항상 JSON으로 보낸 뒤 측정 데이터 포맷 전환
+      response["result"] = "ok";
+      response["message"] = "Format changed to " + format;
+      String responseStr;
+      serializeJson(response, responseStr);
+      Serial.println(responseStr);
+      binaryFormat = (format == "binary");
+      return;
+    }
+    response["result"] = "error";
+    response["message"] = "Invalid format (json, binary)";
+  }
+  else if (cmd == "set_burst") {
+    unsigned long rateHz = doc["rate_hz"] | 0UL;
+    unsigned int samples = doc["samples"] | (unsigned int)burstSamples;
+    if (rateHz == 0) {
+      burstRateHz = 0;
+      burstCount = 0;
+      response["result"] = "ok";
+      response["message"] = "Burst mode disabled";
+    } else if (rateHz >= BURST_MIN_RATE_HZ && rateHz <= BURST_MAX_RATE_HZ &&
+               samples >= 1 && samples <= BURST_MAX_SAMPLES) {
+      burstSamples = samples;
+      burstCount = 0;
+      nextSampleUs = micros();
+      burstRateHz = rateHz;
+      response["result"] = "ok";
+      response["message"] = "Burst mode " + String(rateHz) + "Hz x " + String(samples) + " samples";
+    } else {
+      response["result"] = "error";
+      response["message"] = "Invalid burst settings (rate_hz 20-10000, samples 1-200)";
+    }
+  }
   else if (cmd == "get_status") {
     response["result"] = "ok";
     response["uptime"] = millis();
     response["interval"] = measurementInterval;
+    response["format"] = binaryFormat ? "binary" : "json";
+    response["burst_rate_hz"] = burstRateHz;
+    response["burst_samples"] = burstSamples;
     response["mode"] = getModeString();
     response["sequence"] = sequenceNumber;
   }
@@ -232,6 +424,8 @@ void handleJsonCommand(const StaticJsonDocument<200>& doc) {
     serializeJson(response, responseStr);
     Serial.println(responseStr);
     delay(1000);
+    burstRateHz = 0;
+    burstCount = 0;
     setup(); // 소프트 리셋
     return;
   }
@@ -256,6 +450,8 @@ void handleTextCommand(const String& command) {
     sendStatusMessage("  {\"cmd\":\"set_mode\",\"value\":\"NORMAL\",\"seq\":2}");
     sendStatusMessage("  {\"cmd\":\"get_status\",\"seq\":3}");
     sendStatusMessage("  {\"cmd\":\"reset\",\"seq\":4}");
+    sendStatusMessage("  {\"cmd\":\"set_format\",\"value\":\"binary\",\"seq\":5}");
+    sendStatusMessage("  {\"cmd\":\"set_burst\",\"rate_hz\":1000,\"samples\":100,\"seq\":6}");
     sendStatusMessage("Text Commands: HELP, STATUS, MODES");
     sendStatusMessage("========================");
   }
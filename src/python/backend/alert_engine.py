@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - Alert Engine
+임계값 알림 상태 머신 (히스테리시스 + 디바운스 + 전이 시에만 기록)
+
+기능:
+- 규칙 컴파일: 메트릭별 진입/해제 임계값을 시작 시 한 번만 계산
+- 메트릭별 상태 (normal / warning / danger), 샘플당 O(1) 평가
+- 히스테리시스: 해제 임계값은 진입 임계값보다 hysteresis만큼 안쪽
+- 디바운스: 새 레벨이 최소 지속 시간 이상 유지되어야 전이
+- 열린 알림의 샘플 수/피크값은 메모리에서 갱신하고 주기적으로 flush
+- 수명주기: open → (escalate) → close, 해제 시 resolved_at 기록
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+LEVEL_NORMAL = 0
+LEVEL_WARNING = 1
+LEVEL_DANGER = 2
+
+LEVEL_SEVERITY = {LEVEL_WARNING: "warning", LEVEL_DANGER: "danger"}
+LEVEL_ALERT_TYPE = {
+    LEVEL_WARNING: "threshold_warning",
+    LEVEL_DANGER: "threshold_violation",
+}
+
+ALERT_METRICS = ("voltage", "current", "power")
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """메트릭 임계값 규칙 (None인 한계는 검사하지 않음)"""
+
+    metric: str
+    unit: str
+    danger_low: Optional[float] = None
+    danger_high: Optional[float] = None
+    warning_range: float = 0.0
+    hysteresis: float = 0.0
+    open_seconds: float = 1.0  # 레벨 상승 디바운스
+    close_seconds: float = 5.0  # 레벨 하강 디바운스
+
+
+DEFAULT_ALERT_RULES = (
+    AlertRule(
+        "voltage",
+        "V",
+        danger_low=4.5,
+        danger_high=5.5,
+        warning_range=0.2,
+        hysteresis=0.05,
+    ),
+    AlertRule("current", "A", danger_high=0.5, warning_range=0.1, hysteresis=0.02),
+    AlertRule("power", "W", danger_high=2.0, warning_range=0.3, hysteresis=0.05),
+)
+
+
+@dataclass
+class AlertTransition:
+    """DB에 기록할 알림 상태 전이 (open / escalate / close)"""
+
+    kind: str
+    metric: str
+    level: int
+    value: float
+    threshold: float
+    peak_value: float
+    sample_count: int
+    timestamp: datetime
+    message: str
+    event_id: Optional[int] = None
+
+    @property
+    def severity(self) -> str:
+        return LEVEL_SEVERITY[self.level]
+
+    @property
+    def alert_type(self) -> str:
+        return LEVEL_ALERT_TYPE[self.level]
+
+
+class _MetricState:
+    """메트릭별 알림 상태 (규칙과 컴파일된 임계값 포함)"""
+
+    __slots__ = (
+        "rule",
+        "index",
+        "enter",
+        "exit",
+        "limits",
+        "level",
+        "pending_level",
+        "pending_since",
+        "event_id",
+        "event_level",
+        "threshold",
+        "opened_at",
+        "peak_value",
+        "peak_excess",
+        "sample_count",
+        "dirty",
+    )
+
+    def __init__(self, rule: AlertRule):
+        low = -math.inf if rule.danger_low is None else rule.danger_low
+        high = math.inf if rule.danger_high is None else rule.danger_high
+        warn_low = low + rule.warning_range
+        warn_high = high - rule.warning_range
+        h = rule.hysteresis
+
+        self.rule = rule
+        self.index = ALERT_METRICS.index(rule.metric)
+        # (danger_low, warning_low, warning_high, danger_high)
+        self.enter = (low, warn_low, warn_high, high)
+        self.exit = (low + h, warn_low + h, warn_high - h, high - h)
+
+        if rule.danger_low is not None and rule.danger_high is not None:
+            self.limits = f"safe: {low}{rule.unit}-{high}{rule.unit}"
+        elif rule.danger_high is not None:
+            self.limits = f"max: {high}{rule.unit}"
+        else:
+            self.limits = f"min: {low}{rule.unit}"
+
+        self.level = LEVEL_NORMAL
+        self.pending_level: Optional[int] = None
+        self.pending_since = 0.0
+        self._reset_event()
+
+    def _reset_event(self):
+        self.event_id: Optional[int] = None
+        self.event_level = LEVEL_NORMAL
+        self.threshold = 0.0
+        self.opened_at: Optional[datetime] = None
+        self.peak_value = 0.0
+        self.peak_excess = -math.inf
+        self.sample_count = 0
+        self.dirty = False
+
+
+def _level(value: float, thresholds: tuple[float, float, float, float]) -> int:
+    danger_low, warning_low, warning_high, danger_high = thresholds
+    if value > danger_high or value < danger_low:
+        return LEVEL_DANGER
+    if value > warning_high or value < warning_low:
+        return LEVEL_WARNING
+    return LEVEL_NORMAL
+
+
+class AlertEngine:
+    """컴파일된 규칙 기반 알림 엔진 (DB 접근 없음, 전이 목록만 반환)"""
+
+    def __init__(
+        self,
+        rules: tuple[AlertRule, ...] = DEFAULT_ALERT_RULES,
+        flush_interval: float = 10.0,
+    ):
+        self.states = [_MetricState(rule) for rule in rules]
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+
+        self.metrics = {
+            "samples": 0,
+            "transitions": 0,
+            "opened": 0,
+            "closed": 0,
+            "counter_flushes": 0,
+        }
+
+    def evaluate(
+        self, voltage: float, current: float, power: float, now: float
+    ) -> list[AlertTransition]:
+        """샘플 1개 평가 (now: time.monotonic 초) - 전이가 없으면 빈 리스트"""
+        self.metrics["samples"] += 1
+        values = (voltage, current, power)
+        transitions = []
+
+        for state in self.states:
+            transition = self._evaluate_metric(state, values[state.index], now)
+            if transition is not None:
+                transitions.append(transition)
+
+        return transitions
+
+    def _evaluate_metric(
+        self, state: _MetricState, value: float, now: float
+    ) -> Optional[AlertTransition]:
+        current_level = state.level
+        level = _level(value, state.enter)
+        if level < current_level:
+            # 히스테리시스: 해제 임계값 기준으로도 벗어나야 레벨 하강
+            level = max(level, min(current_level, _level(value, state.exit)))
+
+        if current_level:
+            # 열린 알림: 메모리 카운터/피크 갱신 (flush 시 기록)
+            state.sample_count += 1
+            excess = max(value - state.enter[2], state.enter[1] - value)
+            if excess > state.peak_excess:
+                state.peak_excess = excess
+                state.peak_value = value
+            state.dirty = True
+
+        if level == current_level:
+            state.pending_level = None
+            return None
+
+        # 디바운스: 같은 방향의 변화가 지속된 시간 기준
+        rising = level > current_level
+        same_direction = (
+            state.pending_level is not None
+            and (state.pending_level > current_level) == rising
+        )
+        if not same_direction:
+            state.pending_since = now
+        state.pending_level = level
+
+        delay = state.rule.open_seconds if rising else state.rule.close_seconds
+        if now - state.pending_since < delay:
+            return None
+
+        state.level = level
+        state.pending_level = None
+        return self._transition(state, current_level, level, value)
+
+    def _transition(
+        self, state: _MetricState, previous: int, level: int, value: float
+    ) -> Optional[AlertTransition]:
+        rule = state.rule
+
+        if previous == LEVEL_NORMAL:
+            state.opened_at = datetime.now()
+            state.sample_count = 1
+            state.peak_value = value
+            state.peak_excess = max(value - state.enter[2], state.enter[1] - value)
+            kind = "open"
+            self.metrics["opened"] += 1
+        elif level == LEVEL_NORMAL:
+            kind = "close"
+            self.metrics["closed"] += 1
+        elif level > state.event_level:
+            kind = "escalate"
+        else:
+            # 위험 → 경고 하강은 이벤트 최고 심각도를 유지하므로 기록 없음
+            return None
+
+        if kind != "close":
+            state.event_level = level
+            high_side = value > state.enter[2]
+            if level == LEVEL_DANGER:
+                state.threshold = state.enter[3] if high_side else state.enter[0]
+            else:
+                state.threshold = state.enter[2] if high_side else state.enter[1]
+
+        label = rule.metric.capitalize()
+        if state.event_level == LEVEL_DANGER:
+            message = f"{label} out of range: {state.peak_value:.3f}{rule.unit}"
+        else:
+            message = f"{label} near limit: {state.peak_value:.3f}{rule.unit}"
+
+        transition = AlertTransition(
+            kind=kind,
+            metric=rule.metric,
+            level=state.event_level,
+            value=value,
+            threshold=state.threshold,
+            peak_value=state.peak_value,
+            sample_count=state.sample_count,
+            timestamp=datetime.now(),
+            message=f"{message} ({state.limits})",
+            event_id=state.event_id,
+        )
+
+        self.metrics["transitions"] += 1
+        state.dirty = False
+        if kind == "close":
+            state._reset_event()
+        return transition
+
+    def close_all(self) -> list[AlertTransition]:
+        """열린 알림 모두 해제 (수집 중지 시 - 이후 샘플이 없으므로 닫을 기회가 없음)"""
+        transitions = []
+        for state in self.states:
+            if state.level:
+                previous = state.level
+                state.level = LEVEL_NORMAL
+                state.pending_level = None
+                transition = self._transition(
+                    state, previous, LEVEL_NORMAL, state.peak_value
+                )
+                transitions.append(transition)
+        return transitions
+
+    def set_event_id(self, metric: str, event_id: Optional[int]):
+        """open 전이로 생성된 DB 행 id 연결"""
+        for state in self.states:
+            if state.rule.metric == metric and state.level:
+                state.event_id = event_id
+
+    def pop_counter_updates(
+        self, now: float, force: bool = False
+    ) -> list[tuple[float, int, int]]:
+        """flush 주기가 지났으면 열린 알림의 (peak, sample_count, id) 목록 반환"""
+        if not force and now - self._last_flush < self.flush_interval:
+            return []
+
+        self._last_flush = now
+        updates = []
+        for state in self.states:
+            if state.dirty and state.event_id is not None:
+                updates.append((state.peak_value, state.sample_count, state.event_id))
+                state.dirty = False
+
+        if updates:
+            self.metrics["counter_flushes"] += 1
+        return updates
+
+    def get_active(self) -> list[dict[str, Any]]:
+        """현재 열린 알림 상태"""
+        return [
+            {
+                "metric": state.rule.metric,
+                "severity": LEVEL_SEVERITY[state.event_level],
+                "level": LEVEL_SEVERITY[state.level],
+                "peak_value": state.peak_value,
+                "sample_count": state.sample_count,
+                "opened_at": state.opened_at.isoformat(),
+                "event_id": state.event_id,
+            }
+            for state in self.states
+            if state.level
+        ]
+
+    def get_metrics(self) -> dict[str, Any]:
+        """엔진 메트릭 반환"""
+        return {**self.metrics, "active": self.get_active()}
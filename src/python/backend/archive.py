@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - Cold Archive
+보관 기간이 지난 원본 측정 데이터를 압축 블록으로 보존하는 콜드 아카이브
+
+기능:
+- 만료된 1시간 파티션의 장치 1개 = 압축 블록 1개, 하루 단위 파일(YYYYMMDD.pma)에 추가
+- 컬럼별 인코딩 (NumPy 벡터화, 무손실)
+  - timestamp: delta-of-delta (고정 주기 샘플은 거의 0)
+  - voltage/current/power: 소수 자릿수 정수화 후 delta
+    (무손실이 아니면 Gorilla식 XOR + 바이트 셔플)
+  - sequence_number: delta
+  - sensor_status/simulation_mode: 사전(dictionary) 코드
+  - 정수 배열은 값 범위에 맞는 가장 작은 dtype으로 저장
+- 블록 페이로드 압축: zstandard 설치 시 zstd, 없으면 zlib
+- 범위 조회: 블록 헤더만 훑어 겹치는 (장치의) 블록을 골라 NumPy 배열로 바로 복원
+
+파일 형식: [블록 헤더 | 압축 페이로드]의 반복 (덧붙이기 전용)
+PMA1 블록(장치 구분 이전)은 sensor_id 없는 헤더이며 기본 장치 데이터로 읽는다.
+쓰기 도중 중단된 마지막 블록은 읽을 때 무시하고 다음 쓰기 전에 잘라낸다.
+같은 시각 + 장치의 블록이 여러 개면 (재시도 시 대체) 파일의 마지막 블록만 읽는다.
+"""
+
+import logging
+import os
+import struct
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_MAGIC = b"PMA2"
+ARCHIVE_MAGIC_V1 = b"PMA1"
+ARCHIVE_SUFFIX = ".pma"
+ARCHIVE_DAY_FORMAT = "%Y%m%d"
+
+# PMA1 블록을 읽을 때의 장치
+ARCHIVE_DEFAULT_SENSOR = 1
+
+# 블록 헤더: magic, 압축 코덱, 파티션 시각(0-23), 행 수, 첫/마지막 timestamp(ms),
+# 압축 페이로드 길이, sensor_id (PMA1 헤더에는 sensor_id 없음)
+BLOCK_HEADER = struct.Struct("<4sBBIqqII")
+BLOCK_HEADER_V1 = struct.Struct("<4sBBIqqI")
+BLOCK_HEADERS = {ARCHIVE_MAGIC: BLOCK_HEADER, ARCHIVE_MAGIC_V1: BLOCK_HEADER_V1}
+
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+
+# 컬럼 섹션 헤더: 인코딩, dtype 코드, 소수 자릿수, 바이트 수
+SECTION_HEADER = struct.Struct("<BBbI")
+
+ENCODING_DOD = 0  # delta-of-delta 정수
+ENCODING_DELTA = 1  # delta 정수
+ENCODING_SCALED = 2  # 10^digits 배 정수화 + delta
+ENCODING_XOR = 3  # 직전 값과 XOR한 비트열 + 바이트 셔플
+ENCODING_DICT = 4  # 사전 코드 (사전은 NUL 구분 UTF-8)
+
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+# 무손실로 정수화를 시도할 소수 자릿수 (INA219 해상도 기준)
+SCALE_DIGITS = (3, 4, 5, 6)
+
+# MEASUREMENT_COLUMNS 순서의 컬럼 이름과 인코딩 종류
+ARCHIVE_COLUMNS = (
+    ("timestamp", "time"),
+    ("voltage", "float"),
+    ("current", "float"),
+    ("power", "float"),
+    ("sequence_number", "int"),
+    ("sensor_status", "text"),
+    ("simulation_mode", "text"),
+)
+
+
+def _smallest_int(values: np.ndarray) -> np.ndarray:
+    """값 범위에 맞는 가장 작은 부호 있는 정수 dtype으로 변환"""
+    if not len(values):
+        return values.astype(np.int8)
+    low, high = int(values.min()), int(values.max())
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def _section(encoding: int, data: np.ndarray, digits: int = 0) -> bytes:
+    if data.dtype.kind == "i":
+        dtype_code = INT_DTYPES.index(data.dtype.type)
+    else:
+        dtype_code = 255
+    raw = data.tobytes()
+    return SECTION_HEADER.pack(encoding, dtype_code, digits, len(raw)) + raw
+
+
+def _encode_float(values: np.ndarray) -> bytes:
+    """실수 컬럼: 소수 자릿수 정수화가 무손실이면 delta, 아니면 XOR + 바이트 셔플"""
+    for digits in SCALE_DIGITS:
+        scaled = np.round(values * 10**digits)
+        if np.array_equal(scaled / 10**digits, values) and np.all(
+            np.abs(scaled) < 2**52
+        ):
+            delta = np.diff(scaled.astype(np.int64), prepend=0)
+            return _section(ENCODING_SCALED, _smallest_int(delta), digits)
+
+    bits = values.view(np.uint64)
+    xor = bits ^ np.concatenate(([np.uint64(0)], bits[:-1]))
+    # 바이트 셔플: 값별 8바이트를 바이트 위치별로 모아 상위 0 바이트를 연속으로
+    shuffled = xor.view(np.uint8).reshape(-1, 8).T.copy()
+    return _section(ENCODING_XOR, shuffled)
+
+
+def _encode_text(values: list[str]) -> bytes:
+    labels, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    table = "\0".join(labels.tolist()).encode()
+    header = struct.pack("<I", len(table))
+    return header + table + _section(ENCODING_DICT, _smallest_int(codes))
+
+
+def encode_block(rows: list[tuple]) -> tuple[bytes, int, int]:
+    """측정 행 튜플(MEASUREMENT_COLUMNS 순서) → (비압축 페이로드, 첫 ts, 마지막 ts)
+
+    rows는 (timestamp, sequence_number) 오름차순이어야 한다.
+    """
+    columns = list(zip(*rows))
+    timestamps = np.asarray(columns[0], dtype=np.int64)
+    parts = []
+    for (_name, kind), values in zip(ARCHIVE_COLUMNS, columns):
+        if kind == "time":
+            delta = np.diff(timestamps, prepend=timestamps[0])
+            dod = np.diff(delta, prepend=0)
+            parts.append(_section(ENCODING_DOD, _smallest_int(dod)))
+        elif kind == "float":
+            parts.append(_encode_float(np.asarray(values, dtype=np.float64)))
+        elif kind == "int":
+            delta = np.diff(np.asarray(values, dtype=np.int64), prepend=0)
+            parts.append(_section(ENCODING_DELTA, _smallest_int(delta)))
+        else:
+            parts.append(_encode_text(values))
+    return b"".join(parts), int(timestamps[0]), int(timestamps[-1])
+
+
+def _read_section(payload: memoryview, offset: int) -> tuple[int, np.ndarray, int, int]:
+    encoding, dtype_code, digits, size = SECTION_HEADER.unpack_from(payload, offset)
+    offset += SECTION_HEADER.size
+    dtype = np.uint8 if dtype_code == 255 else INT_DTYPES[dtype_code]
+    data = np.frombuffer(payload[offset : offset + size], dtype=dtype)
+    return encoding, data, digits, offset + size
+
+
+def decode_block(payload: bytes, first_ms: int, rows: int) -> dict[str, np.ndarray]:
+    """비압축 페이로드 → 컬럼 이름별 NumPy 배열"""
+    view = memoryview(payload)
+    offset = 0
+    result = {}
+    for name, kind in ARCHIVE_COLUMNS:
+        labels = None
+        if kind == "text":
+            (table_size,) = struct.unpack_from("<I", view, offset)
+            offset += 4
+            labels = np.array(
+                bytes(view[offset : offset + table_size]).decode().split("\0")
+            )
+            offset += table_size
+
+        encoding, data, digits, offset = _read_section(view, offset)
+        if encoding == ENCODING_DOD:
+            delta = np.cumsum(data, dtype=np.int64)
+            values = first_ms + np.cumsum(delta, dtype=np.int64)
+        elif encoding == ENCODING_DELTA:
+            values = np.cumsum(data, dtype=np.int64)
+        elif encoding == ENCODING_SCALED:
+            values = np.cumsum(data, dtype=np.int64) / 10**digits
+        elif encoding == ENCODING_XOR:
+            xor = data.reshape(8, rows).T.copy().view(np.uint64).ravel()
+            values = np.bitwise_xor.accumulate(xor).view(np.float64)
+        else:
+            values = labels[data]
+        result[name] = values
+    return result
+
+
+def _empty_columns() -> dict[str, np.ndarray]:
+    dtypes = {"time": np.int64, "float": np.float64, "int": np.int64, "text": str}
+    columns = {name: np.array([], dtype=dtypes[kind]) for name, kind in ARCHIVE_COLUMNS}
+    columns["sensor_id"] = np.array([], dtype=np.int64)
+    return columns
+
+
+def _latest_blocks(blocks: list[tuple]) -> list[tuple]:
+    """같은 (시각, 장치) 블록 중 파일의 마지막 블록만 (대체된 블록 제외)"""
+    return list({(block[1], block[6]): block for block in blocks}.values())
+
+
+def _compress(payload: bytes) -> tuple[int, bytes]:
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=9).compress(payload)
+    return CODEC_ZLIB, zlib.compress(payload, 9)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd archive blocks")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class MeasurementArchive:
+    """하루 단위 압축 블록 파일로 된 원본 측정 데이터 콜드 아카이브"""
+
+    def __init__(self, directory: str, retention_days: int = 365):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.logger = logging.getLogger(__name__)
+
+    def _day_path(self, day: str) -> str:
+        return os.path.join(self.directory, day + ARCHIVE_SUFFIX)
+
+    def _scan(self, path: str) -> tuple[list[tuple], int]:
+        """블록 목록과 마지막 완전한 블록 끝 위치
+
+        블록: (codec, hour, rows, first_ms, last_ms, size, sensor_id, 페이로드 오프셋)
+        """
+        blocks = []
+        end = 0
+        try:
+            size = os.path.getsize(path)
+            with open(path, "rb") as f:
+                while end + BLOCK_HEADER_V1.size <= size:
+                    f.seek(end)
+                    header_struct = BLOCK_HEADERS.get(f.read(4))
+                    if header_struct is None or end + header_struct.size > size:
+                        break
+                    f.seek(end)
+                    header = header_struct.unpack(f.read(header_struct.size))
+                    payload_offset = end + header_struct.size
+                    block_end = payload_offset + header[6]
+                    if block_end > size:
+                        break
+                    if header_struct is BLOCK_HEADER_V1:
+                        header = (*header, ARCHIVE_DEFAULT_SENSOR)
+                    blocks.append((*header[1:], payload_offset))
+                    end = block_end
+        except FileNotFoundError:
+            pass
+        return blocks, end
+
+    def append_partition(self, day: str, hour: int, rows: list[tuple]) -> int:
+        """파티션 1개를 day 파일에 장치별 블록으로 추가 (쓴 바이트 수 반환)
+
+        rows: MEASUREMENT_COLUMNS 순서 + sensor_id 튜플, (sensor_id, timestamp,
+              sequence_number) 오름차순 (sensor_id가 없으면 기본 장치)
+        같은 시각 + 장치의 블록이 이미 있으면 (정리 도중 중단 후 재시도) 행 수가 같을
+        때만 건너뛰고, 다르면 (아카이브 후 늦게 들어온 행) 새 블록으로 대체한다.
+        """
+        if not rows:
+            return 0
+
+        path = self._day_path(day)
+        blocks, valid_end = self._scan(path)
+        archived = {(block[1], block[6]): block[2] for block in blocks}
+
+        by_sensor: dict[int, list[tuple]] = {}
+        for row in rows:
+            sensor_id = row[7] if len(row) > 7 else ARCHIVE_DEFAULT_SENSOR
+            by_sensor.setdefault(sensor_id, []).append(row[:7])
+
+        data = []
+        for sensor_id, sensor_rows in by_sensor.items():
+            if archived.get((hour, sensor_id)) == len(sensor_rows):
+                continue
+            payload, first_ms, last_ms = encode_block(sensor_rows)
+            codec, compressed = _compress(payload)
+            header = BLOCK_HEADER.pack(
+                ARCHIVE_MAGIC,
+                codec,
+                hour,
+                len(sensor_rows),
+                first_ms,
+                last_ms,
+                len(compressed),
+                sensor_id,
+            )
+            data.append(header + compressed)
+        if not data:
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "ab") as f:
+            # 중단된 쓰기의 잘린 블록 제거 후 추가
+            if f.tell() != valid_end:
+                f.truncate(valid_end)
+            f.write(b"".join(data))
+            f.flush()
+            os.fsync(f.fileno())
+        return sum(len(block) for block in data)
+
+    def days(self) -> list[str]:
+        """아카이브된 날짜 목록 (YYYYMMDD, 오름차순)"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            name[: -len(ARCHIVE_SUFFIX)]
+            for name in names
+            if name.endswith(ARCHIVE_SUFFIX)
+        )
+
+    def read(
+        self, start: datetime, end: datetime, sensor_id: Optional[int] = None
+    ) -> dict[str, np.ndarray]:
+        """start <= t < end 구간 원본 측정 데이터를 컬럼별 NumPy 배열로 복원
+
+        timestamp는 epoch 밀리초(int64), 시간 오름차순. sensor_id 컬럼 포함.
+        sensor_id가 None이면 모든 장치.
+        """
+        start_ms = int(start.timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000)
+        # 파일 이름은 로컬 날짜 기준이므로 하루 여유를 두고 선택
+        first_day = (start - timedelta(days=1)).strftime(ARCHIVE_DAY_FORMAT)
+        last_day = (end + timedelta(days=1)).strftime(ARCHIVE_DAY_FORMAT)
+
+        chunks = []
+        for day in self.days():
+            if not first_day <= day <= last_day:
+                continue
+            path = self._day_path(day)
+            blocks, _ = self._scan(path)
+            selected = [
+                block
+                for block in _latest_blocks(blocks)
+                if block[3] < end_ms
+                and block[4] >= start_ms
+                and (sensor_id is None or block[6] == sensor_id)
+            ]
+            if not selected:
+                continue
+
+            with open(path, "rb") as f:
+                for codec, _hour, rows, first_ms, _last, size, sensor, offset in sorted(
+                    selected, key=lambda block: block[3]
+                ):
+                    f.seek(offset)
+                    payload = _decompress(codec, f.read(size))
+                    columns = decode_block(payload, first_ms, rows)
+                    timestamps = columns["timestamp"]
+                    mask = (timestamps >= start_ms) & (timestamps < end_ms)
+                    chunk = {name: values[mask] for name, values in columns.items()}
+                    chunk["sensor_id"] = np.full(len(timestamps), sensor)[mask]
+                    chunks.append(chunk)
+
+        if not chunks:
+            chunks.append(_empty_columns())
+        result = {
+            name: np.concatenate([chunk[name] for chunk in chunks])
+            for name in chunks[0]
+        }
+        if len(np.unique(result["sensor_id"])) > 1:
+            # 여러 장치 블록은 시간 구간이 겹치므로 전체를 시간 순으로 재정렬
+            order = np.argsort(result["timestamp"], kind="stable")
+            result = {name: values[order] for name, values in result.items()}
+        return result
+
+    def cleanup(self, now: Optional[datetime] = None) -> int:
+        """아카이브 보관 기간이 지난 날짜 파일 삭제 (삭제한 파일 수 반환)"""
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=self.retention_days)).strftime(
+            ARCHIVE_DAY_FORMAT
+        )
+        removed = 0
+        for day in self.days():
+            if day < cutoff:
+                os.remove(self._day_path(day))
+                removed += 1
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """아카이브 파일/블록/행 수, 크기, 샘플당 바이트"""
+        days = self.days()
+        rows = 0
+        blocks = 0
+        size = 0
+        for day in days:
+            path = self._day_path(day)
+            day_blocks = _latest_blocks(self._scan(path)[0])
+            blocks += len(day_blocks)
+            rows += sum(block[2] for block in day_blocks)
+            size += os.path.getsize(path)
+        return {
+            "directory": self.directory,
+            "days": len(days),
+            "first_day": days[0] if days else None,
+            "last_day": days[-1] if days else None,
+            "blocks": blocks,
+            "rows": rows,
+            "size_bytes": size,
+            "bytes_per_sample": round(size / rows, 2) if rows else None,
+            "retention_days": self.retention_days,
+            "compression": "zstd" if zstandard is not None else "zlib",
+        }
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+JSON 코덱 마이크로 벤치마크
+실제 메시지 형태(측정 라인, WebSocket 메시지, /api/measurements 응답) 기준
+백엔드별 인코딩/디코딩 처리량 비교
+
+사용법:
+python benchmark_codec.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+import codec
+from fastapi.encoders import jsonable_encoder
+
+
+def make_measurement_line(seq: int) -> str:
+    """시뮬레이터 JSON 측정 라인 (디코딩 대상)"""
+    voltage = 5.0 + random.gauss(0, 0.02)
+    current = 0.25 + 0.1 * math.sin(seq / 50) + random.gauss(0, 0.01)
+    return json.dumps(
+        {
+            "v": round(voltage, 3),
+            "a": round(current, 3),
+            "w": round(voltage * current, 3),
+            "ts": 1000 * seq,
+            "seq": seq,
+            "status": "ok",
+            "mode": "NORMAL",
+        }
+    )
+
+
+def make_websocket_message(seq: int) -> dict:
+    """샘플당 브로드캐스트되는 측정 + 분석 메시지"""
+    data = json.loads(make_measurement_line(seq))
+    return {
+        "type": "measurement",
+        "data": data,
+        "analysis": {
+            "has_outlier": True,
+            "outlier_count": 1,
+            "confidence": 0.93,
+            "moving_averages": {
+                metric: {"1m": 5.01, "5m": 5.004, "15m": 4.998}
+                for metric in ("voltage", "current", "power")
+            },
+            "outliers": {
+                "current": {
+                    "is_outlier": True,
+                    "score": 3.42,
+                    "severity": "medium",
+                    "method": "zscore",
+                }
+            },
+        },
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def make_measurements_response(rows: int) -> dict:
+    """/api/measurements 응답 (DB 행 dict 목록)"""
+    start = datetime.now() - timedelta(hours=1)
+    data = []
+    for i in range(rows):
+        voltage = 5.0 + random.gauss(0, 0.02)
+        current = 0.25 + random.gauss(0, 0.01)
+        data.append(
+            {
+                "timestamp": (start + timedelta(seconds=i)).isoformat(sep=" "),
+                "voltage": voltage,
+                "current": current,
+                "power": voltage * current,
+                "sequence_number": i,
+                "sensor_status": "ok",
+                "simulation_mode": "NORMAL",
+            }
+        )
+    return {
+        "data": data,
+        "count": rows,
+        "hours": 1,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def measure(func, items: list, repeat: int = 1) -> float:
+    """항목당 평균 처리 시간 (µs)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            func(item)
+    elapsed = time.perf_counter() - start
+    return elapsed / (len(items) * repeat) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON codec micro-benchmark")
+    parser.add_argument(
+        "--iterations", type=int, default=20000, help="메시지 수 (기본 20000)"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=1000, help="/api/measurements 행 수 (기본 1000)"
+    )
+    args = parser.parse_args()
+
+    random.seed(42)
+    lines = [make_measurement_line(i) for i in range(args.iterations)]
+    messages = [make_websocket_message(i) for i in range(args.iterations)]
+    response = make_measurements_response(args.rows)
+    response_repeat = max(1, args.iterations // 200)
+
+    print("=" * 60)
+    print("📦 JSON codec micro-benchmark")
+    print(f"   available backends: {', '.join(codec.BACKENDS)}")
+    print(f"   selected backend  : {codec.JSON_BACKEND}")
+    print("=" * 60)
+
+    results = {}
+    for name, (dumps_bytes, loads) in codec.BACKENDS.items():
+        results[name] = {
+            "decode line": measure(loads, lines),
+            "encode ws message": measure(dumps_bytes, messages),
+            f"encode {args.rows}-row response": measure(
+                dumps_bytes, [response], response_repeat
+            ),
+        }
+
+    baseline = results["json"]
+    for case in baseline:
+        print(f"  {case}")
+        for name, timings in results.items():
+            speedup = baseline[case] / timings[case]
+            print(f"    {name:8s}: {timings[case]:10.2f} µs ({speedup:5.1f}x)")
+
+    print("=" * 60)
+    print("🧾 Typed measurement decode (decode_measurement_line)")
+    print("=" * 60)
+    typed_us = measure(codec.decode_measurement_line, lines)
+    kind = "msgspec Struct" if codec.msgspec is not None else "loads + key check"
+    print(f"  {kind:24s}: {typed_us:10.2f} µs/line")
+
+    print("=" * 60)
+    print("🌐 FastAPI response path (/api/measurements)")
+    print("=" * 60)
+    default_us = measure(
+        lambda content: json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode(),
+        [response],
+        response_repeat,
+    )
+    direct_us = measure(
+        lambda content: codec.FastJSONResponse(content).body, [response], 10
+    )
+    print(f"  jsonable_encoder + json.dumps   : {default_us:10.2f} µs/response")
+    print(f"  FastJSONResponse (direct)       : {direct_us:10.2f} µs/response")
+    print(f"  Speedup: {default_us / direct_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
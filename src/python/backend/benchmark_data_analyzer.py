@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+데이터 분석기 마이크로 벤치마크
+1 kHz 샘플링 기준 샘플당 처리 비용 측정
+
+사용법:
+python benchmark_data_analyzer.py [--samples 60000]
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+from collections import deque
+
+import numpy as np
+from data_analyzer import DataAnalyzer, MovingAverageCalculator, OutlierDetector
+
+WINDOW_SIZES = {"1m": 60, "5m": 300, "15m": 900}
+SAMPLE_RATE_HZ = 1000
+
+
+class LegacyMovingAverageCalculator:
+    """기존 구현 (deque + statistics.mean) - 비교 기준"""
+
+    def __init__(self, window_sizes: dict[str, int]):
+        self.data_buffers = {
+            metric: {key: deque(maxlen=size) for key, size in window_sizes.items()}
+            for metric in ("voltage", "current", "power")
+        }
+
+    def add_data(self, voltage: float, current: float, power: float):
+        for metric in ["voltage", "current", "power"]:
+            value = locals()[metric]
+            for window in self.data_buffers[metric]:
+                self.data_buffers[metric][window].append(value)
+
+    def get_all_moving_averages(self) -> dict[str, dict[str, float]]:
+        return {
+            metric: {
+                window: statistics.mean(buffer) if buffer else 0.0
+                for window, buffer in buffers.items()
+            }
+            for metric, buffers in self.data_buffers.items()
+        }
+
+
+class LegacyOutlierDetector(OutlierDetector):
+    """기존 구현 (리스트 복사 + statistics.mean/stdev + 전체 정렬) - 비교 기준"""
+
+    def __init__(self):
+        super().__init__()
+        self.data_history = {
+            metric: deque(maxlen=1000) for metric in ("voltage", "current", "power")
+        }
+
+    def add_data(self, voltage: float, current: float, power: float):
+        super().add_data(voltage, current, power)
+        self.data_history["voltage"].append(voltage)
+        self.data_history["current"].append(current)
+        self.data_history["power"].append(power)
+
+    def detect_outliers_zscore(self, metric: str, value: float) -> tuple[bool, float]:
+        data = list(self.data_history[metric])
+        if len(data) < self.min_samples:
+            return False, 0.0
+        stdev = statistics.stdev(data)
+        if stdev == 0:
+            return False, 0.0
+        z_score = abs((value - statistics.mean(data)) / stdev)
+        return z_score > self.z_threshold, z_score
+
+    def detect_outliers_iqr(self, metric: str, value: float) -> tuple[bool, float]:
+        data = list(self.data_history[metric])
+        if len(data) < self.min_samples:
+            return False, 0.0
+        data_sorted = sorted(data)
+        n = len(data_sorted)
+        q1, q3 = data_sorted[n // 4], data_sorted[3 * n // 4]
+        iqr = q3 - q1
+        if iqr == 0:
+            return False, 0.0
+        lower_bound = q1 - self.iqr_multiplier * iqr
+        upper_bound = q3 + self.iqr_multiplier * iqr
+        if value < lower_bound:
+            return True, (lower_bound - value) / iqr
+        if value > upper_bound:
+            return True, (value - upper_bound) / iqr
+        return False, 0.0
+
+
+def generate_samples(count: int) -> list[tuple[float, float, float]]:
+    """INA219 형태의 테스트 샘플 생성"""
+    random.seed(42)
+    samples = []
+    for i in range(count):
+        voltage = 5.0 + random.gauss(0, 0.02)
+        current = 0.25 + 0.1 * math.sin(i / 500) + random.gauss(0, 0.01)
+        samples.append((voltage, current, voltage * current))
+    return samples
+
+
+def run_calculator(calculator, samples: list[tuple[float, float, float]]) -> float:
+    """샘플당 평균 처리 시간 (µs) - 추가 + 전체 윈도우 조회"""
+    start = time.perf_counter()
+    for voltage, current, power in samples:
+        calculator.add_data(voltage, current, power)
+        calculator.get_all_moving_averages()
+    elapsed = time.perf_counter() - start
+    return elapsed / len(samples) * 1e6
+
+
+def run_detector(detector, samples: list[tuple[float, float, float]]) -> float:
+    """샘플당 평균 처리 시간 (µs) - 추가 + 3개 메트릭 이상치 탐지"""
+    start = time.perf_counter()
+    for voltage, current, power in samples:
+        detector.add_data(voltage, current, power)
+        detector.detect_outlier("voltage", voltage)
+        detector.detect_outlier("current", current)
+        detector.detect_outlier("power", power)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(samples) * 1e6
+
+
+def run_batch(samples: list[tuple[float, float, float]]) -> tuple[float, float]:
+    """(analyze_data_point 루프, analyze_batch) 샘플당 평균 처리 시간 (µs)"""
+    loop_analyzer = DataAnalyzer(":memory:")
+    start = time.perf_counter()
+    for voltage, current, power in samples:
+        loop_analyzer.analyze_data_point(voltage, current, power)
+    loop_us = (time.perf_counter() - start) / len(samples) * 1e6
+
+    columns = np.asarray(samples, dtype=np.float64)
+    start = time.perf_counter()
+    DataAnalyzer(":memory:").analyze_batch(columns[:, 0], columns[:, 1], columns[:, 2])
+    batch_us = (time.perf_counter() - start) / len(samples) * 1e6
+
+    return loop_us, batch_us
+
+
+def check_accuracy(samples: list[tuple[float, float, float]]) -> float:
+    """running sum 결과와 math.fsum 기준값의 최대 오차"""
+    calculator = MovingAverageCalculator(WINDOW_SIZES)
+    voltages = []
+    max_error = 0.0
+
+    for voltage, current, power in samples:
+        calculator.add_data(voltage, current, power)
+        voltages.append(voltage)
+
+    averages = calculator.get_moving_averages("voltage")
+    for window, size in WINDOW_SIZES.items():
+        tail = voltages[-size:]
+        expected = math.fsum(tail) / len(tail)
+        max_error = max(max_error, abs(averages[window] - expected))
+
+    return max_error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Data analyzer micro-benchmark")
+    parser.add_argument(
+        "--samples", type=int, default=60000, help="샘플 수 (기본 60초 @ 1kHz)"
+    )
+    args = parser.parse_args()
+
+    samples = generate_samples(args.samples)
+    budget_us = 1e6 / SAMPLE_RATE_HZ
+
+    print("=" * 60)
+    print("📊 MovingAverageCalculator micro-benchmark")
+    print(
+        f"   samples: {args.samples:,} ({SAMPLE_RATE_HZ} Hz budget: {budget_us:.0f} µs)"
+    )
+    print("=" * 60)
+
+    legacy_us = run_calculator(LegacyMovingAverageCalculator(WINDOW_SIZES), samples)
+    running_us = run_calculator(MovingAverageCalculator(WINDOW_SIZES), samples)
+
+    print(
+        f"  Legacy (deque + statistics.mean): {legacy_us:10.2f} µs/sample "
+        f"({legacy_us / budget_us * 100:6.1f}% of budget)"
+    )
+    print(
+        f"  Running sum (O(1))              : {running_us:10.2f} µs/sample "
+        f"({running_us / budget_us * 100:6.1f}% of budget)"
+    )
+    print(f"  Speedup: {legacy_us / running_us:.1f}x")
+    print(f"  Max abs error vs math.fsum: {check_accuracy(samples):.3e}")
+
+    print("=" * 60)
+    print("🚨 OutlierDetector micro-benchmark")
+    print("=" * 60)
+
+    # 기존 구현은 샘플당 수 ms가 걸리므로 일부 샘플만 측정
+    legacy_samples = samples[: min(len(samples), 2000)]
+    legacy_us = run_detector(LegacyOutlierDetector(), legacy_samples)
+    streaming_us = run_detector(OutlierDetector(), samples)
+
+    print(
+        f"  Legacy (copy + stdev + sort)    : {legacy_us:10.2f} µs/sample "
+        f"({legacy_us / budget_us * 100:6.1f}% of budget)"
+    )
+    print(
+        f"  Streaming (Welford + bisect)    : {streaming_us:10.2f} µs/sample "
+        f"({streaming_us / budget_us * 100:6.1f}% of budget)"
+    )
+    print(f"  Speedup: {legacy_us / streaming_us:.1f}x")
+
+    print("=" * 60)
+    print("🧮 DataAnalyzer.analyze_batch (backfill re-analysis)")
+    print("=" * 60)
+
+    loop_us, batch_us = run_batch(samples)
+    print(f"  analyze_data_point loop         : {loop_us:10.2f} µs/sample")
+    print(f"  analyze_batch (NumPy)           : {batch_us:10.2f} µs/sample")
+    print(f"  Speedup: {loop_us / batch_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
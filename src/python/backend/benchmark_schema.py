@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+측정 데이터 저장 스키마 벤치마크
+같은 데이터를 기존 스키마(v1)와 현재 스키마로 저장해 파일 크기와 조회 지연 비교
+
+- v1: 단일 rowid 테이블, DATETIME 텍스트 timestamp, id AUTOINCREMENT, created_at,
+      timestamp / created_at 보조 인덱스
+- 현재: 1시간 파티션 WITHOUT ROWID 테이블, epoch 밀리초 정수 timestamp,
+        (sensor_id, timestamp, sequence_number) 클러스터드 키
+
+사용법:
+python benchmark_schema.py [--hours 24] [--rate 10]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database import (
+    DEFAULT_SENSOR_ID,
+    MEASUREMENT_COLUMNS,
+    _measurement_partition_ddl,
+    _measurement_view_ddl,
+    measurement_partition,
+    to_epoch_ms,
+)
+
+V1_DDL = (
+    """
+    CREATE TABLE power_measurements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME NOT NULL,
+        voltage REAL NOT NULL,
+        current REAL NOT NULL,
+        power REAL NOT NULL,
+        sequence_number INTEGER,
+        sensor_status TEXT,
+        simulation_mode TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX idx_power_timestamp ON power_measurements(timestamp)",
+    "CREATE INDEX idx_power_created_at ON power_measurements(created_at)",
+)
+
+BATCH_ROWS = 10000
+
+
+def generate_rows(hours: int, rate: int) -> list[tuple]:
+    """(datetime, V, A, W, seq, status, mode) 측정 행 (now 기준 hours시간, rate Hz)"""
+    count = hours * 3600 * rate
+    start = datetime.now().replace(microsecond=0) - timedelta(hours=hours)
+    step = timedelta(seconds=1 / rate)
+    rows = []
+    for i in range(count):
+        voltage = 5.0 + random.gauss(0, 0.02)
+        current = 0.25 + random.gauss(0, 0.01)
+        rows.append(
+            (start + step * i, voltage, current, voltage * current, i, "ok", "NORMAL")
+        )
+    return rows
+
+
+def build_v1(path: str, rows: list[tuple]) -> float:
+    """v1 스키마 DB 생성 (삽입 시간 초 반환)"""
+    with sqlite3.connect(path) as conn:
+        for sql in V1_DDL:
+            conn.execute(sql)
+        started = time.perf_counter()
+        for i in range(0, len(rows), BATCH_ROWS):
+            conn.executemany(
+                f"INSERT INTO power_measurements ({MEASUREMENT_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (row[0].isoformat(sep=" "), *row[1:])
+                    for row in rows[i : i + BATCH_ROWS]
+                ],
+            )
+            conn.commit()
+        return time.perf_counter() - started
+
+
+def build_partitioned(path: str, rows: list[tuple]) -> tuple[float, list[str]]:
+    """현재 스키마 DB 생성 (삽입 시간 초, 파티션 이름 목록 반환)"""
+    partitions: list[str] = []
+    with sqlite3.connect(path) as conn:
+        started = time.perf_counter()
+        for i in range(0, len(rows), BATCH_ROWS):
+            groups: dict[str, list[tuple]] = {}
+            for row in rows[i : i + BATCH_ROWS]:
+                groups.setdefault(measurement_partition(row[0]), []).append(
+                    (to_epoch_ms(row[0]), *row[1:], DEFAULT_SENSOR_ID)
+                )
+            for name, partition_rows in groups.items():
+                if name not in partitions:
+                    for sql in _measurement_partition_ddl(name):
+                        conn.execute(sql)
+                    partitions.append(name)
+                    for sql in _measurement_view_ddl(partitions):
+                        conn.execute(sql)
+                conn.executemany(
+                    f"INSERT INTO {name} ({MEASUREMENT_COLUMNS}, sensor_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    partition_rows,
+                )
+            conn.commit()
+        return time.perf_counter() - started, partitions
+
+
+def partition_query(partitions: list[str], since: datetime, select: str) -> tuple:
+    """since 이후 파티션만 묶은 장치별 UNION ALL (첫 파티션에만 시간 조건)"""
+    first = measurement_partition(since)
+    selected = [name for name in partitions if name >= first]
+    parts, params = [], []
+    for i, name in enumerate(selected):
+        condition = "sensor_id = ?" + (" AND timestamp >= ?" if i == 0 else "")
+        parts.append(f"SELECT {select} FROM {name} WHERE {condition}")
+        params += [DEFAULT_SENSOR_ID] + ([to_epoch_ms(since)] if i == 0 else [])
+    return " UNION ALL ".join(parts), params
+
+
+def measure(path: str, sql: str, params: list, repeat: int) -> float:
+    """쿼리 지연 중앙값 (ms, 결과 전체 fetch 포함)"""
+    timings = []
+    with sqlite3.connect(path) as conn:
+        conn.execute(sql, params).fetchall()  # 페이지 캐시 워밍업
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measurement schema benchmark")
+    parser.add_argument("--hours", type=int, default=24, help="데이터 기간 (시간)")
+    parser.add_argument("--rate", type=int, default=10, help="샘플링 속도 (Hz)")
+    parser.add_argument("--repeat", type=int, default=20, help="쿼리 반복 횟수")
+    args = parser.parse_args()
+
+    rows = generate_rows(args.hours, args.rate)
+    now = rows[-1][0]
+    columns = "timestamp, voltage, current, power"
+
+    with tempfile.TemporaryDirectory() as directory:
+        v1_path = os.path.join(directory, "v1.db")
+        v2_path = os.path.join(directory, "partitioned.db")
+        v1_insert = build_v1(v1_path, rows)
+        v2_insert, partitions = build_partitioned(v2_path, rows)
+
+        print("=" * 72)
+        print("🗄️ Measurement schema benchmark")
+        print(
+            f"   rows: {len(rows):,} ({args.hours}h @ {args.rate} Hz), "
+            f"partitions: {len(partitions)}"
+        )
+        print("=" * 72)
+
+        v1_size = os.path.getsize(v1_path)
+        v2_size = os.path.getsize(v2_path)
+        print(f"  {'':34}{'v1':>12}{'partitioned':>14}{'ratio':>10}")
+        print(
+            f"  {'file size (MB)':34}{v1_size / 2**20:12.1f}"
+            f"{v2_size / 2**20:14.1f}{v1_size / v2_size:9.2f}x"
+        )
+        print(
+            f"  {'bytes / row':34}{v1_size / len(rows):12.1f}"
+            f"{v2_size / len(rows):14.1f}"
+        )
+        print(
+            f"  {'insert (µs / row)':34}{v1_insert / len(rows) * 1e6:12.2f}"
+            f"{v2_insert / len(rows) * 1e6:14.2f}{v1_insert / v2_insert:9.2f}x"
+        )
+
+        def v1_since(hours: int) -> str:
+            return (now - timedelta(hours=hours)).isoformat(sep=" ")
+
+        since_1h = now - timedelta(hours=1)
+        recent_sql, recent_params = partition_query(partitions, since_1h, columns)
+        aggregate = "COUNT(*), AVG(power), MIN(voltage), MAX(voltage)"
+        cases = [
+            (
+                "latest 1000 rows (1h window)",
+                f"SELECT {columns} FROM power_measurements WHERE timestamp >= ? "
+                "ORDER BY timestamp DESC LIMIT 1000",
+                [v1_since(1)],
+                f"SELECT {columns} FROM {partitions[-1]} WHERE sensor_id = ? "
+                "AND timestamp >= ? ORDER BY timestamp DESC LIMIT 1000",
+                [DEFAULT_SENSOR_ID, to_epoch_ms(since_1h)],
+            ),
+            (
+                "1h range read (all rows)",
+                f"SELECT {columns} FROM power_measurements WHERE timestamp >= ? "
+                "ORDER BY timestamp",
+                [v1_since(1)],
+                recent_sql,
+                recent_params,
+            ),
+        ]
+        for hours in (1, args.hours):
+            since = now - timedelta(hours=hours)
+            union_sql, union_params = partition_query(
+                partitions, since, "voltage, power"
+            )
+            cases.append(
+                (
+                    f"{hours}h aggregate",
+                    f"SELECT {aggregate} FROM power_measurements WHERE timestamp >= ?",
+                    [v1_since(hours)],
+                    f"SELECT {aggregate} FROM ({union_sql})",
+                    union_params,
+                )
+            )
+
+        print(f"  {'query latency (ms, median)':34}")
+        for label, v1_sql, v1_params, v2_sql, v2_params in cases:
+            v1_ms = measure(v1_path, v1_sql, v1_params, args.repeat)
+            v2_ms = measure(v2_path, v2_sql, v2_params, args.repeat)
+            print(f"    {label:32}{v1_ms:12.2f}{v2_ms:14.2f}{v1_ms / v2_ms:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - JSON Codec
+수집/REST API/WebSocket 공용 JSON 인코더/디코더
+
+기능:
+- 빠른 백엔드 자동 선택 (orjson → msgspec → 표준 json 폴백)
+- numpy 스칼라/배열, datetime 직렬화 (백엔드와 무관하게 같은 결과)
+- 측정 프레임 라인 디코딩 (FrameReader JSON 라인 파싱,
+  msgspec 설치 시 Struct 타입 검증 디코딩)
+- FastJSONResponse: ORJSONResponse 형태의 FastAPI 기본 응답 클래스
+
+JSON_BACKEND 환경변수(json | orjson | msgspec)로 백엔드를 강제할 수 있다.
+"""
+
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+MEASUREMENT_KEYS = ("v", "a", "w")
+MEASUREMENT_DEFAULTS = {"ts": 0, "seq": 0, "status": "ok", "mode": "NORMAL"}
+
+
+def _default(obj: Any) -> Any:
+    """백엔드가 기본 지원하지 않는 타입 변환 (numpy, datetime)"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+# 백엔드 이름 → (dumps_bytes, loads)
+BACKENDS: dict[str, tuple[Callable[[Any], bytes], Callable[[Any], Any]]] = {
+    "json": (_stdlib_dumps, json.loads),
+}
+DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError, TypeError)
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def _orjson_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    BACKENDS["orjson"] = (_orjson_dumps, orjson.loads)
+
+if msgspec is not None:
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=_default)
+    _msgspec_decoder = msgspec.json.Decoder()
+    BACKENDS["msgspec"] = (_msgspec_encoder.encode, _msgspec_decoder.decode)
+    DECODE_ERRORS += (msgspec.DecodeError,)
+
+    class MeasurementFrame(msgspec.Struct):
+        """측정 프레임 (JSON 라인, 바이너리 프레임 디코딩 결과와 같은 키)"""
+
+        v: float
+        a: float
+        w: float
+        ts: int = 0
+        seq: int = 0
+        status: str = "ok"
+        mode: str = "NORMAL"
+
+    _measurement_decoder = msgspec.json.Decoder(MeasurementFrame)
+
+
+def _select_backend() -> str:
+    requested = os.environ.get("JSON_BACKEND", "auto")
+    if requested in BACKENDS:
+        return requested
+
+    for name in ("orjson", "msgspec", "json"):
+        if name in BACKENDS:
+            return name
+    return "json"
+
+
+JSON_BACKEND = _select_backend()
+dumps_bytes, loads = BACKENDS[JSON_BACKEND]
+
+
+def dumps(obj: Any) -> str:
+    """JSON 문자열로 직렬화 (WebSocket send_text용)"""
+    return dumps_bytes(obj).decode()
+
+
+def decode_measurement_line(data: Union[str, bytes]) -> Optional[dict[str, Any]]:
+    """측정 프레임 라인 디코딩 (측정이 아니거나 필드 타입이 틀리면 None)
+
+    msgspec이 있으면 MeasurementFrame으로 파싱과 타입 검증을 한 번에 수행한다.
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.structs.asdict(_measurement_decoder.decode(data))
+        except msgspec.DecodeError:
+            return None
+
+    try:
+        frame = loads(data)
+    except DECODE_ERRORS:
+        return None
+
+    if not isinstance(frame, dict) or not all(
+        isinstance(frame.get(key), (int, float)) for key in MEASUREMENT_KEYS
+    ):
+        return None
+
+    return {
+        **{key: float(frame[key]) for key in MEASUREMENT_KEYS},
+        **{key: frame.get(key, value) for key, value in MEASUREMENT_DEFAULTS.items()},
+    }
+
+
+class FastJSONResponse(JSONResponse):
+    """codec 백엔드로 렌더링하는 JSON 응답 (FastAPI ORJSONResponse 대체)
+
+    엔드포인트에서 직접 반환하면 FastAPI의 jsonable_encoder 단계도 생략된다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
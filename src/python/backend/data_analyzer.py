@@ -4,12 +4,15 @@ INA219 Power Monitoring System - Data Analyzer
 Phase 4.1: 이동평균 + 이상치 탐지 시스템
 
 기능:
-- 이동평균 계산 (1분, 5분, 15분)
-- 이상치 탐지 (Z-score, IQR 방법)
+- 이동평균 계산 (1분, 5분, 15분, O(1) running sum)
+- 이상치 탐지 (스트리밍 Z-score, IQR 방법)
 - 실시간 통계 분석
 - 데이터 품질 평가
+- 벡터화 배치 분석 (NumPy)
 """
 
+import bisect
+import math
 import sqlite3
 import statistics
 from collections import deque
@@ -46,8 +49,97 @@ class OutlierStats:
     severity_distribution: dict[str, int]  # mild, moderate, severe
 
 
+class RunningWindowSum:
+    """링 버퍼 기반 다중 윈도우 running sum
+
+    하나의 링 버퍼(최대 윈도우 크기)를 모든 윈도우가 공유하고, 윈도우마다
+    Kahan 보정 running sum을 유지하므로 추가/조회 모두 O(윈도우 개수)이다.
+    부동소수점 누적 오차는 resync_interval 샘플마다 math.fsum 재계산으로 제한한다.
+    """
+
+    def __init__(self, window_sizes: dict[str, int], resync_interval: int = None):
+        self.window_sizes = dict(window_sizes)
+        self.capacity = max(window_sizes.values())
+        self.resync_interval = resync_interval or self.capacity
+
+        self._keys = list(window_sizes.keys())
+        self._sizes = [window_sizes[key] for key in self._keys]
+        self._sums = [0.0] * len(self._keys)
+        self._comps = [0.0] * len(self._keys)  # Kahan 보정값
+
+        self._ring = [0.0] * self.capacity
+        self._head = 0  # 다음 기록 위치
+        self._count = 0  # 저장된 샘플 수 (<= capacity)
+        self._since_resync = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float):
+        """새 값 추가 (윈도우 밖으로 밀려나는 값은 합계에서 제거)"""
+        ring = self._ring
+        capacity = self.capacity
+        head = self._head
+        count = self._count
+        sums = self._sums
+        comps = self._comps
+
+        for i, size in enumerate(self._sizes):
+            if count >= size:
+                delta = value - ring[(head - size) % capacity]
+            else:
+                delta = value
+
+            # Kahan 보정 합산
+            y = delta - comps[i]
+            t = sums[i] + y
+            comps[i] = (t - sums[i]) - y
+            sums[i] = t
+
+        ring[head] = value
+        self._head = (head + 1) % capacity
+        if count < capacity:
+            self._count = count + 1
+
+        self._since_resync += 1
+        if self._since_resync >= self.resync_interval:
+            self.resync()
+
+    def resync(self):
+        """윈도우 합계를 정확히 재계산하여 누적 오차 제거"""
+        for i, size in enumerate(self._sizes):
+            self._sums[i] = math.fsum(self.tail(min(size, self._count)))
+            self._comps[i] = 0.0
+        self._since_resync = 0
+
+    def tail(self, n: int) -> list[float]:
+        """가장 최근 n개 값"""
+        if n <= 0:
+            return []
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._ring[start : start + n]
+        return self._ring[start:] + self._ring[: (start + n) - self.capacity]
+
+    def mean(self, key: str) -> float:
+        """지정된 윈도우의 평균 (데이터가 없으면 0.0)"""
+        i = self._keys.index(key)
+        n = min(self._sizes[i], self._count)
+        return self._sums[i] / n if n else 0.0
+
+    def means(self) -> dict[str, float]:
+        """모든 윈도우의 평균"""
+        count = self._count
+        return {
+            key: (total / min(size, count) if count else 0.0)
+            for key, size, total in zip(self._keys, self._sizes, self._sums)
+        }
+
+
 class MovingAverageCalculator:
-    """이동평균 계산기"""
+    """이동평균 계산기 (O(1) running sum)"""
+
+    METRICS = ("voltage", "current", "power")
 
     def __init__(self, window_sizes: dict[str, int] = None):
         if window_sizes is None:
@@ -58,131 +150,186 @@ class MovingAverageCalculator:
             }
 
         self.window_sizes = window_sizes
-        self.data_buffers = {
-            "voltage": {key: deque(maxlen=size) for key, size in window_sizes.items()},
-            "current": {key: deque(maxlen=size) for key, size in window_sizes.items()},
-            "power": {key: deque(maxlen=size) for key, size in window_sizes.items()},
+        self.running_sums = {
+            metric: RunningWindowSum(window_sizes) for metric in self.METRICS
         }
 
     def add_data(self, voltage: float, current: float, power: float):
         """새 데이터 추가"""
-        for metric in ["voltage", "current", "power"]:
-            value = locals()[metric]
-            for window in self.data_buffers[metric]:
-                self.data_buffers[metric][window].append(value)
+        self.running_sums["voltage"].append(voltage)
+        self.running_sums["current"].append(current)
+        self.running_sums["power"].append(power)
 
     def get_moving_averages(self, metric: str) -> dict[str, float]:
         """지정된 메트릭의 이동평균 계산"""
-        if metric not in self.data_buffers:
+        if metric not in self.running_sums:
             return {}
 
-        averages = {}
-        for window, buffer in self.data_buffers[metric].items():
-            if len(buffer) > 0:
-                averages[window] = statistics.mean(buffer)
-            else:
-                averages[window] = 0.0
-
-        return averages
+        return self.running_sums[metric].means()
 
     def get_all_moving_averages(self) -> dict[str, dict[str, float]]:
         """모든 메트릭의 이동평균 계산"""
         return {
-            metric: self.get_moving_averages(metric)
-            for metric in self.data_buffers.keys()
+            metric: running_sum.means()
+            for metric, running_sum in self.running_sums.items()
         }
 
 
+class StreamingWindowStats:
+    """슬라이딩 윈도우 스트리밍 통계
+
+    - 평균/분산: 슬라이딩 윈도우 Welford 갱신 (O(1))
+    - 사분위수: bisect로 유지하는 정렬 윈도우 (탐색 O(log n), 조회 O(1))
+    누적 오차는 window_size 샘플마다 전체 재계산으로 제거한다.
+    """
+
+    def __init__(self, window_size: int = 1000):
+        self.window_size = window_size
+        self._window: deque = deque()
+        self._sorted: list[float] = []
+        self._mean = 0.0
+        self._m2 = 0.0  # 편차 제곱합
+        self._since_resync = 0
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def add(self, value: float):
+        """새 값 추가 (윈도우가 가득 차면 가장 오래된 값 제거)"""
+        window = self._window
+
+        if len(window) >= self.window_size:
+            removed = window.popleft()
+            window.append(value)
+
+            # 크기 n이 고정된 상태에서 removed → value 치환
+            n = len(window)
+            old_mean = self._mean
+            self._mean = old_mean + (value - removed) / n
+            self._m2 += (value - removed) * (value - self._mean + removed - old_mean)
+
+            del self._sorted[bisect.bisect_left(self._sorted, removed)]
+        else:
+            window.append(value)
+
+            # 표준 Welford 추가
+            delta = value - self._mean
+            self._mean += delta / len(window)
+            self._m2 += delta * (value - self._mean)
+
+        bisect.insort(self._sorted, value)
+
+        self._since_resync += 1
+        if self._since_resync >= self.window_size:
+            self.resync()
+
+    def resync(self):
+        """평균/편차 제곱합 정확히 재계산"""
+        n = len(self._window)
+        if n:
+            self._mean = math.fsum(self._window) / n
+            self._m2 = math.fsum((x - self._mean) ** 2 for x in self._window)
+        else:
+            self._mean = 0.0
+            self._m2 = 0.0
+        self._since_resync = 0
+
+    def values(self) -> list[float]:
+        """윈도우의 값 (오래된 순)"""
+        return list(self._window)
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def stdev(self) -> float:
+        """표본 표준편차 (statistics.stdev와 동일한 n-1 기준)"""
+        n = len(self._window)
+        if n < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (n - 1))
+
+    def quartiles(self) -> tuple[float, float]:
+        """(Q1, Q3) - 정렬 윈도우의 n//4, 3n//4 위치 값"""
+        n = len(self._sorted)
+        return self._sorted[n // 4], self._sorted[3 * n // 4]
+
+
 class OutlierDetector:
-    """이상치 탐지기"""
+    """이상치 탐지기 (스트리밍 Welford z-score + 정렬 윈도우 IQR)"""
 
     def __init__(
         self,
         z_threshold: float = 2.5,
         iqr_multiplier: float = 1.5,
         min_samples: int = 30,
+        history_size: int = 1000,
     ):
         self.z_threshold = z_threshold
         self.iqr_multiplier = iqr_multiplier
         self.min_samples = min_samples
 
-        # 데이터 버퍼 (최근 1000개 데이터 유지)
-        self.data_history = {
-            "voltage": deque(maxlen=1000),
-            "current": deque(maxlen=1000),
-            "power": deque(maxlen=1000),
+        # 메트릭별 스트리밍 통계 (최근 history_size개 데이터 유지)
+        self.window_stats = {
+            "voltage": StreamingWindowStats(history_size),
+            "current": StreamingWindowStats(history_size),
+            "power": StreamingWindowStats(history_size),
         }
 
     def add_data(self, voltage: float, current: float, power: float):
         """새 데이터 추가"""
-        self.data_history["voltage"].append(voltage)
-        self.data_history["current"].append(current)
-        self.data_history["power"].append(power)
+        self.window_stats["voltage"].add(voltage)
+        self.window_stats["current"].add(current)
+        self.window_stats["power"].add(power)
 
     def detect_outliers_zscore(self, metric: str, value: float) -> tuple[bool, float]:
         """Z-score 방법으로 이상치 탐지"""
-        if metric not in self.data_history:
+        if metric not in self.window_stats:
             return False, 0.0
 
-        data = list(self.data_history[metric])
-        if len(data) < self.min_samples:
+        stats = self.window_stats[metric]
+        if len(stats) < self.min_samples:
             return False, 0.0
 
-        try:
-            mean = statistics.mean(data)
-            stdev = statistics.stdev(data)
-
-            if stdev == 0:
-                return False, 0.0
-
-            z_score = abs((value - mean) / stdev)
-            is_outlier = z_score > self.z_threshold
+        stdev = stats.stdev
+        if stdev == 0:
+            return False, 0.0
 
-            return is_outlier, z_score
+        z_score = abs((value - stats.mean) / stdev)
+        is_outlier = z_score > self.z_threshold
 
-        except Exception:
-            return False, 0.0
+        return is_outlier, z_score
 
     def detect_outliers_iqr(self, metric: str, value: float) -> tuple[bool, float]:
         """IQR 방법으로 이상치 탐지"""
-        if metric not in self.data_history:
+        if metric not in self.window_stats:
             return False, 0.0
 
-        data = list(self.data_history[metric])
-        if len(data) < self.min_samples:
+        stats = self.window_stats[metric]
+        if len(stats) < self.min_samples:
             return False, 0.0
 
-        try:
-            data_sorted = sorted(data)
-            n = len(data_sorted)
-
-            q1_idx = n // 4
-            q3_idx = 3 * n // 4
-
-            q1 = data_sorted[q1_idx]
-            q3 = data_sorted[q3_idx]
-            iqr = q3 - q1
+        q1, q3 = stats.quartiles()
+        iqr = q3 - q1
 
-            if iqr == 0:
-                return False, 0.0
-
-            lower_bound = q1 - self.iqr_multiplier * iqr
-            upper_bound = q3 + self.iqr_multiplier * iqr
+        if iqr == 0:
+            return False, 0.0
 
-            is_outlier = value < lower_bound or value > upper_bound
+        lower_bound = q1 - self.iqr_multiplier * iqr
+        upper_bound = q3 + self.iqr_multiplier * iqr
 
-            # IQR 점수 계산 (경계로부터의 거리)
-            if value < lower_bound:
-                iqr_score = (lower_bound - value) / iqr
-            elif value > upper_bound:
-                iqr_score = (value - upper_bound) / iqr
-            else:
-                iqr_score = 0.0
+        is_outlier = value < lower_bound or value > upper_bound
 
-            return is_outlier, iqr_score
+        # IQR 점수 계산 (경계로부터의 거리)
+        if value < lower_bound:
+            iqr_score = (lower_bound - value) / iqr
+        elif value > upper_bound:
+            iqr_score = (value - upper_bound) / iqr
+        else:
+            iqr_score = 0.0
 
-        except Exception:
-            return False, 0.0
+        return is_outlier, iqr_score
 
     def detect_outlier(self, metric: str, value: float) -> dict[str, Any]:
         """종합 이상치 탐지"""
@@ -204,7 +351,7 @@ class OutlierDetector:
             primary_score = iqr_score
 
         # 신뢰도 계산 (데이터 샘플 수 기반)
-        sample_count = len(self.data_history[metric])
+        sample_count = len(self.window_stats[metric])
         confidence = min(sample_count / 100.0, 1.0)  # 100개 샘플에서 100% 신뢰도
 
         # 심각도 분류
@@ -330,6 +477,151 @@ class DataAnalyzer:
 
         return overall_result
 
+    def analyze_batch(
+        self,
+        voltage,
+        current=None,
+        power=None,
+        update_state: bool = False,
+    ) -> dict[str, Any]:
+        """N개 샘플 벡터화 분석 (컬럼 형식 결과)
+
+        voltage/current/power NumPy 배열 3개, 또는 v/a/w (voltage/current/power)
+        필드를 가진 구조화 배열 1개를 받는다. 이동평균, rolling z-score,
+        rolling IQR 판정을 analyze_data_point와 같은 규칙으로 계산한다.
+
+        update_state=True이면 현재 스트리밍 윈도우를 앞쪽 문맥으로 사용해
+        결과가 실시간 분석과 이어지고, 분석 후 샘플을 스트리밍 상태에 반영한다.
+        False이면 배치만으로 분석한다 (백필 재분석용).
+        """
+        columns = _batch_columns(voltage, current, power)
+        count = len(columns["voltage"])
+        detector = self.outlier_detector
+        window_sizes = self.moving_avg_calc.window_sizes
+
+        metrics = {}
+        for metric, values in columns.items():
+            if update_state:
+                avg_context = np.asarray(
+                    self.moving_avg_calc.running_sums[metric].tail(
+                        len(self.moving_avg_calc.running_sums[metric])
+                    ),
+                    dtype=np.float64,
+                )
+                stats_context = np.asarray(
+                    detector.window_stats[metric].values(), dtype=np.float64
+                )
+            else:
+                avg_context = stats_context = np.empty(0, dtype=np.float64)
+
+            moving_avg = {
+                window: _rolling_mean(values, avg_context, size)
+                for window, size in window_sizes.items()
+            }
+
+            history_size = detector.window_stats[metric].window_size
+            z_score, sample_count = _rolling_zscore(
+                values, stats_context, history_size, detector.min_samples
+            )
+            iqr_score, iqr_outlier = _rolling_iqr_score(
+                values,
+                stats_context,
+                history_size,
+                detector.min_samples,
+                detector.iqr_multiplier,
+            )
+
+            z_outlier = z_score > detector.z_threshold
+            use_z = z_score > iqr_score
+            score = np.where(use_z, z_score, iqr_score)
+
+            metrics[metric] = {
+                "value": values,
+                "moving_avg": moving_avg,
+                "z_score": z_score,
+                "iqr_score": iqr_score,
+                "score": score,
+                "method": np.where(use_z, "z-score", "iqr"),
+                "is_outlier": z_outlier | iqr_outlier,
+                "severity": np.select(
+                    [score > 4.0, score > 2.5], ["severe", "moderate"], "mild"
+                ),
+                "confidence": np.minimum(sample_count / 100.0, 1.0),
+                "sample_count": sample_count,
+            }
+
+        outlier_matrix = np.vstack([m["is_outlier"] for m in metrics.values()])
+        result = {
+            "count": count,
+            "metrics": metrics,
+            "has_any_outlier": outlier_matrix.any(axis=0),
+            "outlier_count": outlier_matrix.sum(axis=0),
+            "confidence": np.mean([m["confidence"] for m in metrics.values()], axis=0),
+        }
+
+        if update_state:
+            self._apply_batch_to_state(columns, result)
+
+        return result
+
+    def _apply_batch_to_state(
+        self, columns: dict[str, np.ndarray], result: dict[str, Any]
+    ):
+        """배치 분석 결과를 스트리밍 상태/이상치 통계에 반영"""
+        timestamp = datetime.now()
+
+        for voltage, current, power in zip(
+            columns["voltage"].tolist(),
+            columns["current"].tolist(),
+            columns["power"].tolist(),
+        ):
+            self.moving_avg_calc.add_data(voltage, current, power)
+            self.outlier_detector.add_data(voltage, current, power)
+
+        for metric, data in result["metrics"].items():
+            stats = self.outlier_stats[metric]
+            outliers = data["is_outlier"]
+            stats.total_samples += result["count"]
+            outlier_count = int(outliers.sum())
+
+            if outlier_count:
+                stats.outlier_count += outlier_count
+                stats.last_outlier_time = timestamp
+                severities, counts = np.unique(
+                    data["severity"][outliers], return_counts=True
+                )
+                for severity, severity_count in zip(severities, counts):
+                    stats.severity_distribution[str(severity)] += int(severity_count)
+
+            stats.outlier_rate = (
+                stats.outlier_count / stats.total_samples
+                if stats.total_samples > 0
+                else 0.0
+            )
+
+        # 이상치가 있는 샘플만 최근 결과에 추가 (get_recent_outliers 용)
+        for index in np.flatnonzero(result["has_any_outlier"]).tolist():
+            self.recent_results.append(
+                {
+                    "timestamp": timestamp.isoformat(),
+                    "metrics": {
+                        metric: {
+                            "value": float(data["value"][index]),
+                            "outlier": {
+                                "is_outlier": bool(data["is_outlier"][index]),
+                                "score": float(data["score"][index]),
+                                "severity": str(data["severity"][index]),
+                                "method": str(data["method"][index]),
+                            },
+                        }
+                        for metric, data in result["metrics"].items()
+                    },
+                    "has_any_outlier": True,
+                    "outlier_count": int(result["outlier_count"][index]),
+                    "confidence": float(result["confidence"][index]),
+                }
+            )
+
     def get_outlier_summary(self) -> dict[str, Any]:
         """이상치 요약 통계"""
         summary = {}
@@ -402,41 +694,21 @@ class DataAnalyzer:
         return outliers
 
     def save_analysis_to_db(self, analysis_result: dict[str, Any]):
-        """분석 결과를 데이터베이스에 저장"""
+        """분석 결과를 데이터베이스에 동기 저장 (단독 실행용)
+
+        서버는 database.AnalysisBatchWriter로 비동기 배치 저장한다.
+        analysis_results 테이블은 PowerDatabase._init_database에서 생성된다.
+        """
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # 분석 결과 테이블 생성 (없으면)
-            cursor.execute(
+            conn.executemany(
                 """
-                CREATE TABLE IF NOT EXISTS analysis_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    metric TEXT NOT NULL,
-                    value REAL NOT NULL,
-                    moving_avg_1m REAL,
-                    moving_avg_5m REAL,
-                    moving_avg_15m REAL,
-                    is_outlier BOOLEAN NOT NULL,
-                    outlier_score REAL,
-                    outlier_method TEXT,
-                    severity TEXT,
-                    confidence REAL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-            )
-
-            # 각 메트릭별 결과 저장
-            for metric, data in analysis_result["metrics"].items():
-                cursor.execute(
-                    """
-                    INSERT INTO analysis_results
-                    (timestamp, metric, value, moving_avg_1m, moving_avg_5m, moving_avg_15m,
-                     is_outlier, outlier_score, outlier_method, severity, confidence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                INSERT INTO analysis_results
+                (timestamp, metric, value, moving_avg_1m, moving_avg_5m, moving_avg_15m,
+                 is_outlier, outlier_score, outlier_method, severity, confidence)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
                     (
                         analysis_result["timestamp"],
                         metric,
@@ -449,9 +721,10 @@ class DataAnalyzer:
                         data["outlier"]["method"],
                         data["outlier"]["severity"],
                         data["outlier"]["confidence"],
-                    ),
-                )
-
+                    )
+                    for metric, data in analysis_result["metrics"].items()
+                ],
+            )
             conn.commit()
             conn.close()
 
@@ -459,6 +732,180 @@ class DataAnalyzer:
             print(f"Error saving analysis to database: {e}")
 
 
+def _batch_columns(voltage, current=None, power=None) -> dict[str, np.ndarray]:
+    """analyze_batch 입력을 voltage/current/power float64 배열로 변환"""
+    if current is None and power is None:
+        names = getattr(np.asarray(voltage).dtype, "names", None) or ()
+        records = np.asarray(voltage)
+        if {"v", "a", "w"} <= set(names):
+            voltage, current, power = records["v"], records["a"], records["w"]
+        elif {"voltage", "current", "power"} <= set(names):
+            voltage, current, power = (
+                records["voltage"],
+                records["current"],
+                records["power"],
+            )
+        else:
+            raise ValueError(
+                "Structured array must have v/a/w or voltage/current/power fields"
+            )
+
+    columns = {
+        "voltage": np.asarray(voltage, dtype=np.float64).ravel(),
+        "current": np.asarray(current, dtype=np.float64).ravel(),
+        "power": np.asarray(power, dtype=np.float64).ravel(),
+    }
+
+    if len({len(values) for values in columns.values()}) != 1:
+        raise ValueError("voltage, current and power must have the same length")
+
+    return columns
+
+
+def _window_counts(total: int, context_len: int, window: int) -> np.ndarray:
+    """배치 각 위치의 윈도우 샘플 수 (문맥 포함, 최대 window)"""
+    positions = np.arange(context_len, total, dtype=np.int64)
+    return np.minimum(positions + 1, window)
+
+
+def _rolling_mean(values: np.ndarray, context: np.ndarray, window: int) -> np.ndarray:
+    """cumsum 기반 이동평균 (시작 부분은 확장 윈도우)"""
+    full = np.concatenate([context, values])
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    # 기준값을 빼서 누적합의 크기와 반올림 오차를 줄인다
+    ref = full.mean()
+    cumsum = np.concatenate([[0.0], np.cumsum(full - ref)])
+    counts = _window_counts(len(full), len(context), window)
+    ends = np.arange(len(context), len(full)) + 1
+    return (cumsum[ends] - cumsum[ends - counts]) / counts + ref
+
+
+def _rolling_zscore(
+    values: np.ndarray, context: np.ndarray, window: int, min_samples: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """cumsum 기반 rolling z-score (표본 표준편차, 현재 값 포함)"""
+    full = np.concatenate([context, values])
+    counts = _window_counts(len(full), len(context), window)
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64), counts
+
+    ref = full.mean()
+    shifted = full - ref
+    cumsum = np.concatenate([[0.0], np.cumsum(shifted)])
+    cumsum_sq = np.concatenate([[0.0], np.cumsum(shifted * shifted)])
+    ends = np.arange(len(context), len(full)) + 1
+    starts = ends - counts
+
+    sums = cumsum[ends] - cumsum[starts]
+    sums_sq = cumsum_sq[ends] - cumsum_sq[starts]
+    means = sums / counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (sums_sq - sums * means) / (counts - 1)
+        stdev = np.sqrt(np.maximum(variance, 0.0))
+        z_score = np.abs((values - ref - means) / stdev)
+
+    valid = (counts >= min_samples) & (stdev > 0)
+    return np.where(valid, z_score, 0.0), counts
+
+
+def _sliding_order_stats(
+    full: np.ndarray, window: int, ranks: tuple[int, ...], block: int = 64
+) -> np.ndarray:
+    """크기 window인 모든 슬라이딩 윈도우의 rank번째 정렬 값
+
+    연속한 block개 윈도우는 full[k+block-1 : k+window] 구간을 공유하므로
+    공통 구간을 한 번만 정렬하고, 윈도우별 나머지 block-1개 값만 정렬해
+    searchsorted로 병합 위치를 구한다. 결과 shape: (len(ranks), 윈도우 수)
+    """
+    ranks = np.asarray(ranks)
+    total = len(full) - window + 1
+    out = np.empty((len(ranks), max(total, 0)), dtype=np.float64)
+
+    for start in range(0, total, block):
+        size = min(block, total - start)
+        core = np.sort(full[start + size - 1 : start + window])
+        if size == 1:
+            out[:, start] = core[ranks]
+            continue
+
+        # 윈도우 j의 추가 값 = extras_seq[j : j + size - 1]
+        extras_seq = np.concatenate(
+            [
+                full[start : start + size - 1],
+                full[start + window : start + window + size - 1],
+            ]
+        )
+        extras = np.sort(
+            np.lib.stride_tricks.sliding_window_view(extras_seq, size - 1), axis=1
+        )
+        # 병합 후 각 추가 값의 위치
+        positions = np.searchsorted(core, extras.ravel()).reshape(
+            size, size - 1
+        ) + np.arange(size - 1)
+
+        rows = np.arange(size)
+        for i, rank in enumerate(ranks):
+            hit = positions == rank
+            before = (positions < rank).sum(axis=1)
+            core_values = core[np.minimum(rank - before, len(core) - 1)]
+            extra_values = extras[rows, hit.argmax(axis=1)]
+            out[i, start : start + size] = np.where(
+                hit.any(axis=1), extra_values, core_values
+            )
+
+    return out
+
+
+def _rolling_iqr_score(
+    values: np.ndarray,
+    context: np.ndarray,
+    window: int,
+    min_samples: int,
+    multiplier: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """rolling IQR 점수/판정 (Q1=정렬[n//4], Q3=정렬[3n//4])"""
+    full = np.concatenate([context, values])
+    offset = len(context)
+    q1 = np.zeros(len(values), dtype=np.float64)
+    q3 = np.zeros(len(values), dtype=np.float64)
+    counts = _window_counts(len(full), offset, window)
+
+    # 윈도우가 아직 가득 차지 않은 앞부분: 위치별 partition
+    partial = int(np.count_nonzero(counts < window))
+    for i in range(partial):
+        n = int(counts[i])
+        if n < min_samples:
+            continue
+        end = offset + i + 1
+        ordered = np.partition(full[end - n : end], (n // 4, 3 * n // 4))
+        q1[i] = ordered[n // 4]
+        q3[i] = ordered[3 * n // 4]
+
+    # 가득 찬 윈도우: 블록 단위 정렬 병합
+    if partial < len(values) and window >= min_samples:
+        first = offset + partial - window + 1
+        q1[partial:], q3[partial:] = _sliding_order_stats(
+            full[first:], window, (window // 4, 3 * window // 4)
+        )
+
+    iqr = q3 - q1
+    valid = (counts >= min_samples) & (iqr != 0)
+    lower = q1 - multiplier * iqr
+    upper = q3 + multiplier * iqr
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.where(
+            values < lower,
+            (lower - values) / iqr,
+            np.where(values > upper, (values - upper) / iqr, 0.0),
+        )
+
+    is_outlier = valid & ((values < lower) | (values > upper))
+    return np.where(valid, score, 0.0), is_outlier
+
+
 # 테스트 및 데모 함수
 def demo_data_analyzer():
     """데이터 분석기 데모"""
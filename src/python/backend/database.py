@@ -9,80 +9,557 @@ Phase 3.1: SQLite Database Integration
 - 히스토리 데이터 조회 API
 - 데이터 백업 및 복구
 - 성능 최적화된 인덱스
+- Write-behind 배치 저장 (executemany 단일 트랜잭션)
+- 영속 커넥션 풀 (writer 1개 + reader N개, WAL 모드)
+- 다중 해상도 롤업 (1초 / 1분 / 1시간 min/max/avg/count, 수집 시 증분 갱신)
+- 측정 데이터 1시간 파티션 테이블 (조회 시 파티션 프루닝, 보관 기간 정리는 DROP TABLE)
+- 측정 스키마 v2: epoch 밀리초 정수 타임스탬프, WITHOUT ROWID 클러스터드 키
+- 테이블 행 수 카운터 (저장/정리 시 증분 갱신, 시작 시 보정 → 통계 조회 O(1))
+- 에너지/효율 집계: SQL 사다리꼴 적분 + 지난 파티션 요약 캐시
+- auto_vacuum=INCREMENTAL + 유휴 시 페이지 단위 점진 회수 (전체 VACUUM 잠금 없음)
+- 콜드 아카이브: 보관 기간이 지난 파티션은 DROP 전에 하루 단위 압축 블록 파일로 보존
+- 원본 샘플 로그 (선택): 고정 길이 레코드 memmap 사본으로 원본 구간 조회 처리
 """
 
 import asyncio
+import bisect
+import functools
 import json
 import logging
 import os
 import sqlite3
+import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
 
 import aiosqlite
+from archive import MeasurementArchive
+from rawlog import RawSampleLog
+
+# 롤업 tier 정의 (세밀한 순서)
+# retention_hours가 None이면 원본 데이터 보관 기간(48시간)을 따름
+ROLLUP_TIERS: dict[str, dict[str, Any]] = {
+    "1s": {
+        "table": "second_statistics",
+        "column": "second_timestamp",
+        "seconds": 1,
+        "retention_hours": None,
+    },
+    "1m": {
+        "table": "minute_statistics",
+        "column": "minute_timestamp",
+        "seconds": 60,
+        "retention_hours": None,
+    },
+    "1h": {
+        "table": "hour_statistics",
+        "column": "hour_timestamp",
+        "seconds": 3600,
+        "retention_hours": 24 * 30,
+    },
+}
+
+ROLLUP_METRICS = ("voltage", "current", "power")
+
+# 에너지 적분: 이보다 긴 샘플 간격(수집 중단)은 적분하지 않음
+ENERGY_MAX_GAP_SECONDS = 10.0
+# 마지막 수정 후 이 시간이 지난 파티션만 요약 캐시 (늦게 도착한 배치 대비)
+SUMMARY_SETTLE_SECONDS = 60.0
+
+# 트리거로 행 수를 유지하는 테이블 (측정 파티션은 저장/DROP 시 직접 갱신)
+COUNTED_TABLES = (
+    "second_statistics",
+    "minute_statistics",
+    "hour_statistics",
+    "alert_events",
+    "system_logs",
+)
+
+# PRAGMA auto_vacuum 값 (0=NONE, 1=FULL, 2=INCREMENTAL)
+AUTO_VACUUM_INCREMENTAL = 2
+
+# 측정 데이터 스키마 버전 (PRAGMA user_version)
+# 1: DATETIME 텍스트 타임스탬프 + id/created_at, 2: epoch 밀리초 정수 + WITHOUT ROWID
+# 3: sensor_id 차원 (측정/롤업/알림/분석 결과, 기존 데이터는 기본 장치)
+MEASUREMENT_SCHEMA_VERSION = 3
+
+# 장치 레지스트리 기본 장치 (sensor_id 도입 전 데이터와 sensor_id 미지정 요청)
+DEFAULT_SENSOR_ID = 1
+DEFAULT_SENSOR_NAME = "ina219-default"
+
+# 측정 데이터 시간 파티션 (1시간 단위 테이블, power_measurements는 UNION ALL 뷰)
+MEASUREMENT_VIEW = "power_measurements"
+MEASUREMENT_PARTITION_PREFIX = "power_measurements_"
+MEASUREMENT_PARTITION_FORMAT = "%Y%m%d%H"
+MEASUREMENT_COLUMNS = (
+    "timestamp, voltage, current, power, sequence_number, sensor_status, "
+    "simulation_mode"
+)
+MEASUREMENT_FIELDS = tuple(column.strip() for column in MEASUREMENT_COLUMNS.split(","))
+
+# 분석 결과 내보내기 컬럼 (timestamp는 ISO 문자열)
+ANALYSIS_COLUMNS = (
+    "id, timestamp, metric, value, moving_avg_1m, moving_avg_5m, moving_avg_15m, "
+    "is_outlier, outlier_score, outlier_method, severity, confidence, sensor_id"
+)
+
+
+def to_epoch_ms(timestamp: datetime) -> int:
+    """로컬 naive datetime → epoch 밀리초 (측정 테이블 저장 형식)"""
+    return round(timestamp.timestamp() * 1_000_000) // 1000
+
+
+@functools.lru_cache(maxsize=4096)
+def _second_text(epoch_seconds: int) -> str:
+    return datetime.fromtimestamp(epoch_seconds).isoformat(sep=" ")
+
+
+def from_epoch_ms(epoch_ms: int) -> str:
+    """epoch 밀리초 → API 응답용 로컬 시각 문자열 (기존 DATETIME 텍스트와 같은 형식)
+
+    초 단위 문자열을 캐시하므로 연속 행 변환 비용이 datetime 생성보다 작다.
+    """
+    seconds, millis = divmod(epoch_ms, 1000)
+    return f"{_second_text(seconds)}.{millis:03d}000"
+
+
+def _text_to_epoch_ms(text: Optional[str]) -> Optional[int]:
+    """v1 DATETIME 텍스트 → epoch 밀리초 (마이그레이션용 SQL 함수)"""
+    if text is None:
+        return None
+    return to_epoch_ms(datetime.fromisoformat(text))
+
+
+def measurement_rows(columns: dict[str, Any]) -> list[dict]:
+    """컬럼 배열(timestamp는 epoch 밀리초) → 측정 행 dict 목록 (API 응답 형식)"""
+    values = [[from_epoch_ms(ms) for ms in columns["timestamp"].tolist()]]
+    values += [columns[name].tolist() for name in MEASUREMENT_FIELDS[1:]]
+    return [dict(zip(MEASUREMENT_FIELDS, row)) for row in zip(*values)]
+
+
+def _measurement_dict(row) -> dict:
+    """측정 행 → dict (timestamp를 문자열로 변환)"""
+    measurement = dict(row)
+    measurement["timestamp"] = from_epoch_ms(measurement["timestamp"])
+    return measurement
+
+
+def measurement_partition(timestamp: datetime) -> str:
+    """타임스탬프가 속한 1시간 파티션 테이블 이름"""
+    return MEASUREMENT_PARTITION_PREFIX + timestamp.strftime(
+        MEASUREMENT_PARTITION_FORMAT
+    )
+
+
+def _measurement_partition_ddl(name: str) -> list[str]:
+    """파티션 테이블 생성 SQL
+
+    (sensor_id, timestamp, sequence_number) 클러스터드 키에 V/A/W가 함께 저장되므로
+    장치별 시간 범위 조회가 별도 인덱스 없이 커버링 스캔이 된다.
+    """
+    return [
+        f"""
+        CREATE TABLE IF NOT EXISTS {name} (
+            sensor_id INTEGER NOT NULL DEFAULT {DEFAULT_SENSOR_ID},
+            timestamp INTEGER NOT NULL,
+            sequence_number INTEGER NOT NULL,
+            voltage REAL NOT NULL,
+            current REAL NOT NULL,
+            power REAL NOT NULL,
+            sensor_status TEXT,
+            simulation_mode TEXT,
+            PRIMARY KEY (sensor_id, timestamp, sequence_number)
+        ) WITHOUT ROWID
+        """
+    ]
+
+
+def _measurement_view_ddl(partitions: list[str]) -> list[str]:
+    """전체 파티션을 묶는 power_measurements 뷰 재생성 SQL (파티션 1개 이상)"""
+    selects = " UNION ALL ".join(
+        f"SELECT sensor_id, {MEASUREMENT_COLUMNS} FROM {name}" for name in partitions
+    )
+    return [
+        f"DROP VIEW IF EXISTS {MEASUREMENT_VIEW}",
+        f"CREATE VIEW {MEASUREMENT_VIEW} AS {selects}",
+    ]
+
+
+def _combine_summaries(summaries: list[dict], max_gap_ms: float) -> dict:
+    """구간 요약들을 시간 순으로 합침 (구간 경계 사이 간격도 사다리꼴로 적분)"""
+    total = {
+        "count": 0,
+        "sum_v": 0.0,
+        "sum_a": 0.0,
+        "sum_w": 0.0,
+        "sum_w2": 0.0,
+        "energy_wms": 0.0,
+        "covered_ms": 0,
+    }
+    previous = None
+    for summary in summaries:
+        for key in total:
+            total[key] += summary[key]
+        if previous is not None:
+            gap = summary["first_ts"] - previous["last_ts"]
+            if gap <= max_gap_ms:
+                total["energy_wms"] += (
+                    (summary["first_w"] + previous["last_w"]) * gap / 2
+                )
+                total["covered_ms"] += gap
+        previous = summary
+    return total
+
+
+def _bucket_start(timestamp: datetime, seconds: int) -> datetime:
+    """타임스탬프를 tier 버킷 시작 시각으로 내림 (seconds는 86400의 약수)"""
+    elapsed = timestamp.hour * 3600 + timestamp.minute * 60 + timestamp.second
+    return timestamp.replace(microsecond=0) - timedelta(seconds=elapsed % seconds)
+
+
+def aggregate_rollup(rows: list[tuple], seconds: int) -> list[tuple]:
+    """측정 행을 버킷별 min/max/avg/count로 집계
+
+    rows: (timestamp, voltage, current, power, ..., [sensor_id]) 튜플 목록
+          (8번째 sensor_id가 없으면 기본 장치)
+    반환: (sensor_id, bucket, v_min, v_max, v_avg, a_min, a_max, a_avg,
+           w_min, w_max, w_avg, count) 튜플 목록
+    """
+    buckets: dict[tuple[int, datetime], list] = {}
+
+    for row in rows:
+        sensor_id = row[7] if len(row) > 7 else DEFAULT_SENSOR_ID
+        key = (sensor_id, _bucket_start(row[0], seconds))
+        acc = buckets.get(key)
+        if acc is None:
+            # 메트릭별 [min, max, sum] + 샘플 수
+            acc = buckets[key] = [[value, value, 0.0] for value in row[1:4]]
+            acc.append(0)
+
+        for stats, value in zip(acc, row[1:4]):
+            if value < stats[0]:
+                stats[0] = value
+            if value > stats[1]:
+                stats[1] = value
+            stats[2] += value
+        acc[3] += 1
+
+    result = []
+    for (sensor_id, bucket), acc in buckets.items():
+        count = acc[3]
+        values = [sensor_id, bucket]
+        for value_min, value_max, total in acc[:3]:
+            values.extend((value_min, value_max, total / count))
+        values.append(count)
+        result.append(tuple(values))
+
+    return result
+
+
+class SQLiteConnectionPool:
+    """aiosqlite 영속 커넥션 풀
+
+    쓰기 전용 커넥션 1개(asyncio.Lock으로 직렬화)와 읽기 전용 커넥션 N개를 유지한다.
+    WAL 모드에서는 reader가 writer를 막지 않으므로 /api/* 조회가 수집 저장을
+    지연시키지 않는다.
+    커넥션은 실행 중인 이벤트 루프에서 처음 사용될 때 열린다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        reader_count: int = 4,
+        mmap_size: int = 256 * 1024 * 1024,
+        cache_size_kb: int = 16 * 1024,
+        busy_timeout_ms: int = 5000,
+    ):
+        self.db_path = db_path
+        # 인메모리 DB는 커넥션마다 별도 DB가 되므로 writer 커넥션 하나만 사용
+        self.reader_count = 0 if db_path == ":memory:" else reader_count
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.busy_timeout_ms = busy_timeout_ms
+        self.logger = logging.getLogger(__name__)
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.last_write_time = 0.0  # 마지막 쓰기 종료 시각 (time.monotonic)
+
+        self.metrics = {
+            "write_acquires": 0,
+            "read_acquires": 0,
+            "write_wait_ms_max": 0.0,
+            "read_wait_ms_max": 0.0,
+        }
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def is_writing(self) -> bool:
+        """writer 사용 중 또는 대기 중 (유지보수 작업 양보 판단용)"""
+        return self._write_lock is not None and self._write_lock.locked()
+
+    def _pragmas(self, read_only: bool) -> list[str]:
+        pragmas = [
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA cache_size=-{self.cache_size_kb}",
+            f"PRAGMA busy_timeout={self.busy_timeout_ms}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+        if read_only:
+            pragmas.append("PRAGMA query_only=ON")
+        return pragmas
+
+    async def _open_connection(self, read_only: bool) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        for pragma in self._pragmas(read_only):
+            await conn.execute(pragma)
+        return conn
+
+    async def _ensure_open(self):
+        """현재 이벤트 루프에서 커넥션 풀 열기"""
+        loop = asyncio.get_running_loop()
+        if self._writer is not None and self._loop is loop:
+            return
+
+        if self._open_lock is None or self._loop is not loop:
+            # asyncio 동기화 객체는 생성된 루프에 묶이므로 루프가 바뀌면 새로 만든다
+            await self.close()
+            self._open_lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+
+            self._write_lock = asyncio.Lock()
+            self._idle_readers = asyncio.Queue()
+            self._writer = await self._open_connection(read_only=False)
+            self._readers = [
+                await self._open_connection(read_only=True)
+                for _ in range(self.reader_count)
+            ]
+            for reader in self._readers:
+                self._idle_readers.put_nowait(reader)
+
+            self.logger.info(
+                f"Connection pool opened: 1 writer + {len(self._readers)} readers (WAL)"
+            )
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """쓰기 커넥션 획득 (예외 발생 시 롤백)"""
+        await self._ensure_open()
+        start = time.perf_counter()
+        async with self._write_lock:
+            self._record_wait("write", start)
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.rollback()
+                raise
+            finally:
+                self.last_write_time = time.monotonic()
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """읽기 커넥션 획득 (reader가 없으면 writer 공유)"""
+        await self._ensure_open()
+        if not self._readers:
+            async with self.writer() as conn:
+                yield conn
+            return
+
+        start = time.perf_counter()
+        conn = await self._idle_readers.get()
+        self._record_wait("read", start)
+        try:
+            yield conn
+        finally:
+            self._idle_readers.put_nowait(conn)
+
+    def _record_wait(self, kind: str, start: float):
+        wait_ms = (time.perf_counter() - start) * 1000
+        self.metrics[f"{kind}_acquires"] += 1
+        self.metrics[f"{kind}_wait_ms_max"] = round(
+            max(self.metrics[f"{kind}_wait_ms_max"], wait_ms), 3
+        )
+
+    async def close(self):
+        """모든 커넥션 닫기"""
+        connections = list(self._readers)
+        if self._writer is not None:
+            connections.append(self._writer)
+
+        self._writer = None
+        self._readers = []
+        self._loop = None
+        self._open_lock = None
+
+        for conn in connections:
+            try:
+                await conn.close()
+            except Exception as e:
+                self.logger.error(f"Failed to close pooled connection: {e}")
+
+    def get_metrics(self) -> dict[str, Any]:
+        """커넥션 풀 메트릭 반환"""
+        return {
+            "open": self.is_open,
+            "readers": len(self._readers),
+            "idle_readers": self._idle_readers.qsize() if self._idle_readers else 0,
+            **self.metrics,
+        }
 
 
 class PowerDatabase:
     """전력 모니터링 데이터베이스 관리자"""
 
-    def __init__(self, db_path: str = "power_monitoring.db"):
+    def __init__(
+        self,
+        db_path: str = "power_monitoring.db",
+        reader_count: int = 4,
+        archive_dir: Optional[str] = None,
+        raw_log_dir: Optional[str] = None,
+    ):
         self.db_path = db_path
         self.data_retention_hours = 48  # 48시간 데이터 보관
         self.logger = logging.getLogger(__name__)
 
+        # 보관 기간이 지난 원본 측정 데이터 콜드 아카이브 (기본: <db 이름>_archive/)
+        self.archive = MeasurementArchive(
+            archive_dir or os.path.splitext(db_path)[0] + "_archive"
+        )
+
+        # 원본 샘플 로그 (RAW_LOG_DIR 또는 raw_log_dir 지정 시에만 사용)
+        raw_log_dir = raw_log_dir or os.environ.get("RAW_LOG_DIR")
+        self.raw_log = RawSampleLog(raw_log_dir) if raw_log_dir else None
+
+        # 측정 데이터 파티션 테이블 이름 (시간 순, 이름 정렬 = 시간 정렬)
+        self.partitions: list[str] = []
+
+        # 증분 vacuum 누적 통계
+        self.vacuum_stats = {"runs": 0, "pages_reclaimed": 0}
+
+        # 지난 파티션별 에너지/합계 요약 캐시 (효율 계산 시 재스캔 방지)
+        self._partition_summaries: dict[tuple[str, int], dict] = {}
+
+        # 측정 데이터 범위 (epoch 밀리초, 저장/정리 시 갱신 → 통계 조회에 쿼리 불필요)
+        self.oldest_ms: Optional[int] = None
+        self.newest_ms: Optional[int] = None
+
         # 데이터베이스 초기화
         self._init_database()
 
+        # 영속 커넥션 풀 (writer 1 + reader N)
+        self.pool = SQLiteConnectionPool(db_path, reader_count=reader_count)
+
+    async def close(self):
+        """커넥션 풀 닫기"""
+        await self.pool.close()
+
     def _init_database(self):
         """데이터베이스 테이블 초기화"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
 
-            # 전력 측정 데이터 테이블
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS power_measurements (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME NOT NULL,
-                    voltage REAL NOT NULL,
-                    current REAL NOT NULL,
-                    power REAL NOT NULL,
-                    sequence_number INTEGER,
-                    sensor_status TEXT,
-                    simulation_mode TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-            )
+            # 증분 auto_vacuum: 빈 페이지를 incremental_vacuum으로 조금씩 회수
+            # (새 DB는 테이블 생성 전에 설정, 기존 DB는 1회 VACUUM으로 전환)
+            cursor.execute("PRAGMA auto_vacuum")
+            if cursor.fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                cursor.execute("SELECT COUNT(*) FROM sqlite_master")
+                if cursor.fetchone()[0]:
+                    self.logger.info("Converting database to incremental auto_vacuum")
+                    cursor.execute("VACUUM")
+
+            # WAL 모드는 DB 파일에 영구 저장됨 (reader가 writer를 막지 않음)
+            cursor.execute("PRAGMA journal_mode=WAL")
+
+            # 전력 측정 데이터: 1시간 파티션 테이블 + power_measurements 뷰
+            # 이전 스키마(v1 파티션, 단일 테이블)는 v2로 1회 마이그레이션
+            conn.create_function("epoch_ms", 1, _text_to_epoch_ms, deterministic=True)
+            cursor.execute("PRAGMA user_version")
+            schema_version = cursor.fetchone()[0]
+
+            self.partitions = self._load_partitions(cursor)
+            if schema_version < MEASUREMENT_SCHEMA_VERSION and self.partitions:
+                self._migrate_partitions(cursor, schema_version)
 
-            # 인덱스 생성
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_power_timestamp ON power_measurements(timestamp)"
+                "SELECT type FROM sqlite_master WHERE name = ?", (MEASUREMENT_VIEW,)
             )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_power_created_at ON power_measurements(created_at)"
-            )
-
-            # 1분 통계 데이터 테이블
-            cursor.execute(
+            existing = cursor.fetchone()
+            if existing and existing[0] == "table":
+                self._migrate_measurement_table(cursor)
+                self.partitions = self._load_partitions(cursor)
+
+            cursor.execute(f"PRAGMA user_version = {MEASUREMENT_SCHEMA_VERSION}")
+
+            current = measurement_partition(datetime.now())
+            if current not in self.partitions:
+                for sql in _measurement_partition_ddl(current):
+                    cursor.execute(sql)
+                bisect.insort(self.partitions, current)
+
+            for sql in _measurement_view_ddl(self.partitions):
+                cursor.execute(sql)
+
+            # 롤업 통계 테이블 (1초 / 1분 / 1시간)
+            # 장치별 버킷 시각 UNIQUE → UPSERT 병합
+            for tier in ROLLUP_TIERS.values():
+                cursor.execute(f"PRAGMA table_info({tier['table']})")
+                rollup_columns = {row[1] for row in cursor.fetchall()}
+                legacy = None
+                if rollup_columns and "sensor_id" not in rollup_columns:
+                    # v2 롤업 (버킷 시각만 UNIQUE): 새 키로 재생성 후 복사
+                    legacy = f"{tier['table']}_v2"
+                    cursor.execute(f"ALTER TABLE {tier['table']} RENAME TO {legacy}")
+
+                cursor.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {tier["table"]} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        sensor_id INTEGER NOT NULL DEFAULT {DEFAULT_SENSOR_ID},
+                        {tier["column"]} DATETIME NOT NULL,
+                        voltage_min REAL NOT NULL,
+                        voltage_max REAL NOT NULL,
+                        voltage_avg REAL NOT NULL,
+                        current_min REAL NOT NULL,
+                        current_max REAL NOT NULL,
+                        current_avg REAL NOT NULL,
+                        power_min REAL NOT NULL,
+                        power_max REAL NOT NULL,
+                        power_avg REAL NOT NULL,
+                        sample_count INTEGER NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(sensor_id, {tier["column"]})
+                    )
                 """
-                CREATE TABLE IF NOT EXISTS minute_statistics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    minute_timestamp DATETIME NOT NULL,
-                    voltage_min REAL NOT NULL,
-                    voltage_max REAL NOT NULL,
-                    voltage_avg REAL NOT NULL,
-                    current_min REAL NOT NULL,
-                    current_max REAL NOT NULL,
-                    current_avg REAL NOT NULL,
-                    power_min REAL NOT NULL,
-                    power_max REAL NOT NULL,
-                    power_avg REAL NOT NULL,
-                    sample_count INTEGER NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(minute_timestamp)
                 )
-            """
-            )
+
+                if legacy:
+                    copied = ", ".join(
+                        column
+                        for column in rollup_columns
+                        if column not in ("id", "sensor_id")
+                    )
+                    cursor.execute(
+                        f"INSERT INTO {tier['table']} ({copied}) "
+                        f"SELECT {copied} FROM {legacy}"
+                    )
+                    cursor.execute(f"DROP TABLE {legacy}")
 
             # 인덱스 생성
             cursor.execute(
@@ -102,11 +579,35 @@ class PowerDatabase:
                     severity TEXT NOT NULL,
                     message TEXT,
                     resolved_at DATETIME,
+                    peak_value REAL,
+                    sample_count INTEGER NOT NULL DEFAULT 1,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """
             )
 
+            # 기존 DB 마이그레이션: 알림 상태 머신 카운터 컬럼
+            cursor.execute("PRAGMA table_info(alert_events)")
+            alert_columns = {row[1] for row in cursor.fetchall()}
+            if "peak_value" not in alert_columns:
+                cursor.execute("ALTER TABLE alert_events ADD COLUMN peak_value REAL")
+                # 수명주기 이전 행은 해제되지 않는 단발성 기록: 발생 시각에 해제 처리
+                # (그대로 두면 서버 시작 전 조회에서 활성 알림으로 보임)
+                cursor.execute(
+                    "UPDATE alert_events SET peak_value = metric_value, "
+                    "resolved_at = COALESCE(resolved_at, timestamp)"
+                )
+            if "sample_count" not in alert_columns:
+                cursor.execute(
+                    "ALTER TABLE alert_events "
+                    "ADD COLUMN sample_count INTEGER NOT NULL DEFAULT 1"
+                )
+            if "sensor_id" not in alert_columns:
+                cursor.execute(
+                    "ALTER TABLE alert_events "
+                    f"ADD COLUMN sensor_id INTEGER NOT NULL DEFAULT {DEFAULT_SENSOR_ID}"
+                )
+
             # 인덱스 생성
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_alert_timestamp ON alert_events(timestamp)"
@@ -117,6 +618,85 @@ class PowerDatabase:
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_alert_severity ON alert_events(severity)"
             )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_alert_sensor "
+                "ON alert_events(sensor_id, timestamp)"
+            )
+            # 알림 수명주기: 활성(미해결) / 이력(해결) 조회용 부분 인덱스
+            # 활성 인덱스는 get_active_alerts 정렬 순서(장치, 메트릭, 시각)와 일치
+            cursor.execute("PRAGMA index_info(idx_alert_active)")
+            if [row[2] for row in cursor.fetchall()] == ["metric_name", "timestamp"]:
+                # 장치 구분 이전 인덱스: 장치별 정렬에 쓰이지 않으므로 재생성
+                cursor.execute("DROP INDEX idx_alert_active")
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_alert_active
+                ON alert_events(sensor_id, metric_name, timestamp)
+                WHERE resolved_at IS NULL
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_alert_resolved
+                ON alert_events(resolved_at) WHERE resolved_at IS NOT NULL
+            """
+            )
+
+            # 데이터 분석 결과 테이블
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    moving_avg_1m REAL,
+                    moving_avg_5m REAL,
+                    moving_avg_15m REAL,
+                    is_outlier BOOLEAN NOT NULL,
+                    outlier_score REAL,
+                    outlier_method TEXT,
+                    severity TEXT,
+                    confidence REAL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+
+            cursor.execute("PRAGMA table_info(analysis_results)")
+            if "sensor_id" not in {row[1] for row in cursor.fetchall()}:
+                cursor.execute(
+                    "ALTER TABLE analysis_results "
+                    f"ADD COLUMN sensor_id INTEGER NOT NULL DEFAULT {DEFAULT_SENSOR_ID}"
+                )
+
+            # 인덱스 생성
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analysis_timestamp "
+                "ON analysis_results(timestamp)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analysis_sensor "
+                "ON analysis_results(sensor_id, timestamp)"
+            )
+
+            # 장치 레지스트리 (sensor_id → 이름/연결 포트, 기본 장치는 항상 존재)
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS devices (
+                    sensor_id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    port TEXT NOT NULL DEFAULT 'MOCK',
+                    description TEXT,
+                    enabled INTEGER NOT NULL DEFAULT 1,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+            cursor.execute(
+                "INSERT OR IGNORE INTO devices (sensor_id, name) VALUES (?, ?)",
+                (DEFAULT_SENSOR_ID, DEFAULT_SENSOR_NAME),
+            )
 
             # 시스템 상태 로그 테이블
             cursor.execute(
@@ -144,9 +724,302 @@ class PowerDatabase:
                 "CREATE INDEX IF NOT EXISTS idx_log_component ON system_logs(component)"
             )
 
+            # 테이블 행 수 카운터 (통계 조회용, 시작 시 실제 COUNT로 보정)
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS table_counters (
+                    name TEXT PRIMARY KEY,
+                    row_count INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """
+            )
+            for table in COUNTED_TABLES:
+                for event, delta in (("INSERT", "+ 1"), ("DELETE", "- 1")):
+                    cursor.execute(
+                        f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_count
+                        AFTER {event} ON {table}
+                        BEGIN
+                            UPDATE table_counters SET row_count = row_count {delta}
+                            WHERE name = '{table}';
+                        END
+                    """
+                    )
+            self._reconcile_counters(cursor)
+            self._reconcile_raw_log(cursor)
+
             conn.commit()
             self.logger.info("Database tables initialized successfully")
 
+    def _reconcile_counters(self, cursor: sqlite3.Cursor):
+        """카운터와 측정 데이터 범위를 실제 값으로 재설정 (시작 시 1회)"""
+        cursor.execute("DELETE FROM table_counters")
+        for table in COUNTED_TABLES + tuple(self.partitions):
+            cursor.execute(
+                f"INSERT INTO table_counters SELECT ?, COUNT(*) FROM {table}", (table,)
+            )
+
+        self.oldest_ms = self.newest_ms = None
+        for name in self.partitions:
+            cursor.execute(f"SELECT MIN(timestamp) FROM {name}")
+            self.oldest_ms = cursor.fetchone()[0]
+            if self.oldest_ms is not None:
+                break
+        for name in reversed(self.partitions):
+            cursor.execute(f"SELECT MAX(timestamp) FROM {name}")
+            self.newest_ms = cursor.fetchone()[0]
+            if self.newest_ms is not None:
+                break
+
+    def _reconcile_raw_log(self, cursor: sqlite3.Cursor):
+        """원본 로그가 놓친 최근 측정 구간 표시 (시작 시 1회)
+
+        로그 기록 전 종료나 로그를 끈 채 수집한 기간이 있으면 장치의 SQLite 최신
+        timestamp가 로그의 마지막 레코드보다 뒤이므로, 그 이후부터만 커버한다.
+        """
+        if self.raw_log is None:
+            return
+
+        gaps = {}
+        for sensor_id in list(self.raw_log.coverage):
+            newest = None
+            for name in reversed(self.partitions):
+                cursor.execute(
+                    f"SELECT MAX(timestamp) FROM {name} WHERE sensor_id = ?",
+                    (sensor_id,),
+                )
+                newest = cursor.fetchone()[0]
+                if newest is not None:
+                    break
+            last_ms = self.raw_log.last_ms(sensor_id)
+            if newest is not None and (last_ms is None or newest > last_ms):
+                gaps[sensor_id] = newest
+        if gaps:
+            self.logger.warning(f"Raw sample log missed recent rows: {gaps}")
+            self.raw_log.mark_gap(gaps)
+
+    def _load_partitions(self, cursor: sqlite3.Cursor) -> list[str]:
+        """DB에 있는 측정 파티션 테이블 이름 (시간 순)"""
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+            (MEASUREMENT_PARTITION_PREFIX + "%",),
+        )
+        prefix_length = len(MEASUREMENT_PARTITION_PREFIX)
+        return sorted(
+            name for (name,) in cursor.fetchall() if name[prefix_length:].isdigit()
+        )
+
+    def _copy_v1_rows(
+        self,
+        cursor: sqlite3.Cursor,
+        target: str,
+        source: str,
+        where: str = "",
+        params: tuple = (),
+    ):
+        """v1 행(텍스트 타임스탬프)을 v2 파티션으로 변환 복사"""
+        cursor.execute(
+            f"""
+            INSERT OR IGNORE INTO {target} ({MEASUREMENT_COLUMNS})
+            SELECT epoch_ms(timestamp), voltage, current, power,
+                   COALESCE(sequence_number, 0), sensor_status, simulation_mode
+            FROM {source} {where}
+            """,
+            params,
+        )
+
+    def _migrate_partitions(self, cursor: sqlite3.Cursor, schema_version: int):
+        """이전 스키마 파티션을 현재 스키마로 재작성 (1회)
+
+        v1(텍스트 타임스탬프 + id/created_at)은 변환 복사, v2는 그대로 복사하며
+        sensor_id는 기본 장치가 된다.
+        """
+        cursor.execute(f"DROP VIEW IF EXISTS {MEASUREMENT_VIEW}")
+
+        for name in self.partitions:
+            legacy = f"{name}_v{max(schema_version, 1)}"
+            cursor.execute(f"DROP INDEX IF EXISTS idx_{name}_timestamp")
+            cursor.execute(f"ALTER TABLE {name} RENAME TO {legacy}")
+            for sql in _measurement_partition_ddl(name):
+                cursor.execute(sql)
+            if schema_version < 2:
+                self._copy_v1_rows(cursor, name, legacy)
+            else:
+                cursor.execute(
+                    f"""
+                    INSERT INTO {name} ({MEASUREMENT_COLUMNS})
+                    SELECT {MEASUREMENT_COLUMNS} FROM {legacy}
+                    """
+                )
+            cursor.execute(f"DROP TABLE {legacy}")
+
+        self.logger.info(
+            f"Migrated {len(self.partitions)} measurement partitions to schema "
+            f"v{MEASUREMENT_SCHEMA_VERSION}"
+        )
+
+    def _migrate_measurement_table(self, cursor: sqlite3.Cursor):
+        """기존 단일 power_measurements 테이블을 1시간 파티션으로 분할 (1회)"""
+        cursor.execute(
+            f"SELECT DISTINCT substr(timestamp, 1, 13) FROM {MEASUREMENT_VIEW}"
+        )
+        hours = [row[0] for row in cursor.fetchall() if row[0]]
+
+        for hour in hours:
+            start = datetime.strptime(hour, "%Y-%m-%d %H")
+            name = measurement_partition(start)
+            for sql in _measurement_partition_ddl(name):
+                cursor.execute(sql)
+            self._copy_v1_rows(
+                cursor,
+                name,
+                MEASUREMENT_VIEW,
+                "WHERE timestamp >= ? AND timestamp < ?",
+                (start, start + timedelta(hours=1)),
+            )
+
+        cursor.execute(f"DROP TABLE {MEASUREMENT_VIEW}")
+        self.logger.info(f"Migrated power_measurements into {len(hours)} partitions")
+
+    async def _ensure_partitions(self, db: aiosqlite.Connection, names: set[str]):
+        """없는 파티션 테이블을 생성하고 뷰 갱신 (DDL만 담은 별도 트랜잭션으로 커밋)
+
+        측정 배치 트랜잭션을 시작하기 전에 호출해야 배치가 중간에 커밋되지 않는다.
+        """
+        missing = names.difference(self.partitions)
+        if not missing:
+            return
+
+        for name in sorted(missing):
+            for sql in _measurement_partition_ddl(name):
+                await db.execute(sql)
+        partitions = sorted(self.partitions + list(missing))
+        for sql in _measurement_view_ddl(partitions):
+            await db.execute(sql)
+        await db.commit()
+        self.partitions = partitions
+
+    def _partitions_since(self, cutoff: datetime) -> list[str]:
+        """cutoff 이후 데이터를 가질 수 있는 파티션 (파티션 프루닝, 시간 순)"""
+        first = measurement_partition(cutoff)
+        return self.partitions[bisect.bisect_left(self.partitions, first) :]
+
+    def _measurement_union(
+        self,
+        cutoff: datetime,
+        columns: str = MEASUREMENT_COLUMNS,
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> tuple[str, list]:
+        """cutoff 이후 파티션만 묶은 장치별 UNION ALL 쿼리와 파라미터
+
+        이후 파티션은 모두 cutoff 다음 시간대이므로 시간 조건은 첫 파티션에만 적용한다.
+        sensor_id 조건은 (sensor_id, timestamp) 기본 키의 앞부분이라 범위 스캔이 된다.
+        """
+        selects = []
+        params = []
+        for name in self._partitions_since(cutoff):
+            if selects:
+                selects.append(f"SELECT {columns} FROM {name} WHERE sensor_id = ?")
+                params.append(sensor_id)
+            else:
+                selects.append(
+                    f"SELECT {columns} FROM {name} "
+                    "WHERE sensor_id = ? AND timestamp >= ?"
+                )
+                params.extend((sensor_id, to_epoch_ms(cutoff)))
+
+        if not selects:
+            selects.append(f"SELECT {columns} FROM {MEASUREMENT_VIEW} WHERE 0")
+        return " UNION ALL ".join(selects), params
+
+    async def _insert_measurements(
+        self, db: aiosqlite.Connection, rows: list[tuple]
+    ) -> tuple[dict[str, list[tuple]], set[str]]:
+        """측정 행을 시간 파티션별로 나눠 저장 (호출자 트랜잭션 안에서 실행)
+
+        파티션 테이블은 호출자가 트랜잭션 시작 전에 _ensure_partitions로 만들어 둔다.
+        같은 장치 + 같은 밀리초 + 같은 시퀀스 번호의 행은 재전송 중복으로 보고 무시한다.
+        커밋 후 원본 로그 기록용 (파티션별 변환된 행, 중복이 무시된 파티션)을 반환한다.
+        """
+        if not rows:
+            return {}, set()
+
+        groups: dict[str, list[tuple]] = {}
+        for row in rows:
+            timestamp, voltage, current, power, seq, status, mode = row[:7]
+            groups.setdefault(measurement_partition(timestamp), []).append(
+                (
+                    to_epoch_ms(timestamp),
+                    voltage,
+                    current,
+                    power,
+                    0 if seq is None else seq,
+                    status,
+                    mode,
+                    row[7] if len(row) > 7 else DEFAULT_SENSOR_ID,
+                )
+            )
+
+        partial = set()
+        for name, partition_rows in groups.items():
+            for sensor_id in {row[7] for row in partition_rows}:
+                self._partition_summaries.pop((name, sensor_id), None)
+            cursor = await db.executemany(
+                f"""
+                INSERT OR IGNORE INTO {name} ({MEASUREMENT_COLUMNS}, sensor_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                partition_rows,
+            )
+            # 실제 저장된 행 수 (중복으로 무시된 행 제외)
+            await db.execute(
+                """
+                INSERT INTO table_counters (name, row_count) VALUES (?, ?)
+                ON CONFLICT(name) DO UPDATE
+                SET row_count = row_count + excluded.row_count
+            """,
+                (name, cursor.rowcount),
+            )
+            if cursor.rowcount < len(partition_rows):
+                partial.add(name)
+
+        first_ms = min(row[0] for batch in groups.values() for row in batch)
+        last_ms = max(row[0] for batch in groups.values() for row in batch)
+        if self.oldest_ms is None or first_ms < self.oldest_ms:
+            self.oldest_ms = first_ms
+        if self.newest_ms is None or last_ms > self.newest_ms:
+            self.newest_ms = last_ms
+        return groups, partial
+
+    async def _append_raw_log(self, groups: dict[str, list[tuple]], partial: set[str]):
+        """커밋된 측정 행을 원본 샘플 로그에 기록 (writer 잠금 안에서 호출, 순서 유지)
+
+        기록에 실패하면 장치별로 실패한 구간 이후부터만 로그가 커버하도록 표시해
+        (재시작 후에도 유지) 그 구간 조회는 SQLite로 처리한다.
+        """
+        if self.raw_log is None or not groups:
+            return
+
+        prefix = len(MEASUREMENT_PARTITION_PREFIX)
+        try:
+            await asyncio.to_thread(
+                self.raw_log.append,
+                {name[prefix:]: rows for name, rows in groups.items()},
+                {name[prefix:] for name in partial},
+            )
+        except Exception as e:
+            self.logger.error(f"Raw sample log write failed, marking gap: {e}")
+            gaps: dict[int, int] = {}
+            for rows in groups.values():
+                for row in rows:
+                    timestamp, sensor_id = row[0], row[7]
+                    gaps[sensor_id] = max(gaps.get(sensor_id, timestamp), timestamp)
+            try:
+                await asyncio.to_thread(self.raw_log.mark_gap, gaps)
+            except Exception as e:
+                self.logger.error(f"Raw sample log disabled after write failure: {e}")
+                self.raw_log = None
+
     async def save_measurement(
         self,
         voltage: float,
@@ -155,30 +1028,108 @@ class PowerDatabase:
         sequence_number: int = None,
         sensor_status: str = "ok",
         simulation_mode: str = "NORMAL",
+        sensor_id: int = DEFAULT_SENSOR_ID,
     ) -> bool:
         """전력 측정 데이터 저장"""
+        row = (
+            datetime.now(),
+            voltage,
+            current,
+            power,
+            sequence_number,
+            sensor_status,
+            simulation_mode,
+            sensor_id,
+        )
+
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
+            async with self.pool.writer() as db:
+                # 새 시간 파티션 DDL은 배치 트랜잭션 밖에서 먼저 커밋
+                await self._ensure_partitions(db, {measurement_partition(row[0])})
+                groups, partial = await self._insert_measurements(db, [row])
+                await self._update_rollups(db, [row])
+                await db.commit()
+                await self._append_raw_log(groups, partial)
+                return True
+        except Exception as e:
+            self.logger.error(f"Failed to save measurement: {e}")
+            return False
+
+    async def save_measurements_batch(self, rows: list[tuple]) -> bool:
+        """전력 측정 데이터 일괄 저장 (단일 트랜잭션, 롤업 tier 동시 갱신)
+
+        rows: (timestamp, voltage, current, power, sequence_number,
+               sensor_status, simulation_mode[, sensor_id]) 튜플 목록
+        """
+        if not rows:
+            return True
+
+        try:
+            async with self.pool.writer() as db:
+                # 새 시간 파티션 DDL은 배치 트랜잭션 밖에서 먼저 커밋
+                await self._ensure_partitions(
+                    db, {measurement_partition(row[0]) for row in rows}
+                )
+                groups, partial = await self._insert_measurements(db, rows)
+                await self._update_rollups(db, rows)
+                await db.commit()
+                await self._append_raw_log(groups, partial)
+                return True
+        except Exception as e:
+            self.logger.error(
+                f"Failed to save measurement batch ({len(rows)} rows): {e}"
+            )
+            return False
+
+    async def _update_rollups(self, db: aiosqlite.Connection, rows: list[tuple]):
+        """롤업 tier 증분 갱신 (호출자 트랜잭션 안에서 실행)
+
+        배치를 버킷별로 집계한 뒤 UPSERT로 기존 버킷과 병합한다.
+        avg는 sample_count 가중 평균으로 합친다.
+        """
+        for tier in ROLLUP_TIERS.values():
+            merge = ", ".join(
+                f"{m}_min = MIN({m}_min, excluded.{m}_min), "
+                f"{m}_max = MAX({m}_max, excluded.{m}_max), "
+                f"{m}_avg = ({m}_avg * sample_count"
+                f" + excluded.{m}_avg * excluded.sample_count)"
+                f" / (sample_count + excluded.sample_count)"
+                for m in ROLLUP_METRICS
+            )
+            await db.executemany(
+                f"""
+                INSERT INTO {tier["table"]}
+                (sensor_id, {tier["column"]}, voltage_min, voltage_max, voltage_avg,
+                 current_min, current_max, current_avg,
+                 power_min, power_max, power_avg, sample_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(sensor_id, {tier["column"]}) DO UPDATE SET
+                {merge}, sample_count = sample_count + excluded.sample_count
+            """,
+                aggregate_rollup(rows, tier["seconds"]),
+            )
+
+    async def save_analysis_batch(self, rows: list[tuple]) -> bool:
+        """분석 결과 일괄 저장 (append-only, 단일 트랜잭션)"""
+        if not rows:
+            return True
+
+        try:
+            async with self.pool.writer() as db:
+                await db.executemany(
                     """
-                    INSERT INTO power_measurements
-                    (timestamp, voltage, current, power, sequence_number, sensor_status, simulation_mode)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO analysis_results
+                    (timestamp, metric, value, moving_avg_1m, moving_avg_5m,
+                     moving_avg_15m, is_outlier, outlier_score, outlier_method,
+                     severity, confidence, sensor_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                    (
-                        datetime.now(),
-                        voltage,
-                        current,
-                        power,
-                        sequence_number,
-                        sensor_status,
-                        simulation_mode,
-                    ),
+                    rows,
                 )
                 await db.commit()
                 return True
         except Exception as e:
-            self.logger.error(f"Failed to save measurement: {e}")
+            self.logger.error(f"Failed to save analysis batch ({len(rows)} rows): {e}")
             return False
 
     async def save_minute_statistics(
@@ -188,19 +1139,21 @@ class PowerDatabase:
         current_stats: dict,
         power_stats: dict,
         sample_count: int,
+        sensor_id: int = DEFAULT_SENSOR_ID,
     ) -> bool:
         """1분 통계 데이터 저장"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 await db.execute(
                     """
                     INSERT OR REPLACE INTO minute_statistics
-                    (minute_timestamp, voltage_min, voltage_max, voltage_avg,
+                    (sensor_id, minute_timestamp, voltage_min, voltage_max, voltage_avg,
                      current_min, current_max, current_avg,
                      power_min, power_max, power_avg, sample_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
+                        sensor_id,
                         minute_timestamp,
                         voltage_stats["min"],
                         voltage_stats["max"],
@@ -228,16 +1181,17 @@ class PowerDatabase:
         threshold_value: float,
         severity: str,
         message: str = None,
+        sensor_id: int = DEFAULT_SENSOR_ID,
     ) -> bool:
         """알림 이벤트 저장"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 await db.execute(
                     """
                     INSERT INTO alert_events
                     (timestamp, alert_type, metric_name, metric_value,
-                     threshold_value, severity, message)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                     threshold_value, severity, message, sensor_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         datetime.now(),
@@ -247,6 +1201,7 @@ class PowerDatabase:
                         threshold_value,
                         severity,
                         message,
+                        sensor_id,
                     ),
                 )
                 await db.commit()
@@ -255,12 +1210,127 @@ class PowerDatabase:
             self.logger.error(f"Failed to save alert event: {e}")
             return False
 
+    async def open_alert_event(
+        self,
+        timestamp: datetime,
+        alert_type: str,
+        metric_name: str,
+        metric_value: float,
+        threshold_value: float,
+        severity: str,
+        message: str = None,
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> Optional[int]:
+        """알림 이벤트 열기 (상태 전이 시 1행 기록, 생성된 id 반환)"""
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute(
+                    """
+                    INSERT INTO alert_events
+                    (timestamp, alert_type, metric_name, metric_value,
+                     threshold_value, severity, message, peak_value, sample_count,
+                     sensor_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+                """,
+                    (
+                        timestamp,
+                        alert_type,
+                        metric_name,
+                        metric_value,
+                        threshold_value,
+                        severity,
+                        message,
+                        metric_value,
+                        sensor_id,
+                    ),
+                )
+                await db.commit()
+                return cursor.lastrowid
+        except Exception as e:
+            self.logger.error(f"Failed to open alert event: {e}")
+            return None
+
+    async def update_alert_event(
+        self,
+        event_id: int,
+        alert_type: str,
+        threshold_value: float,
+        severity: str,
+        message: str,
+        peak_value: float,
+        sample_count: int,
+        resolved_at: Optional[datetime] = None,
+    ) -> bool:
+        """알림 이벤트 갱신 (심각도 상승 또는 해제 전이)"""
+        try:
+            async with self.pool.writer() as db:
+                await db.execute(
+                    """
+                    UPDATE alert_events
+                    SET alert_type = ?, threshold_value = ?, severity = ?,
+                        message = ?, peak_value = ?, sample_count = ?,
+                        resolved_at = COALESCE(?, resolved_at)
+                    WHERE id = ?
+                """,
+                    (
+                        alert_type,
+                        threshold_value,
+                        severity,
+                        message,
+                        peak_value,
+                        sample_count,
+                        resolved_at,
+                        event_id,
+                    ),
+                )
+                await db.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"Failed to update alert event: {e}")
+            return False
+
+    async def update_alert_counters(
+        self, updates: list[tuple[float, int, int]]
+    ) -> bool:
+        """열린 알림의 피크값/샘플 수 일괄 갱신 [(peak_value, sample_count, id)]"""
+        try:
+            async with self.pool.writer() as db:
+                await db.executemany(
+                    """
+                    UPDATE alert_events SET peak_value = ?, sample_count = ?
+                    WHERE id = ?
+                """,
+                    updates,
+                )
+                await db.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"Failed to update alert counters: {e}")
+            return False
+
+    async def resolve_open_alerts(self, resolved_at: datetime = None) -> int:
+        """미해결 알림 일괄 해제 (이전 실행에서 남은 알림 정리, 해제 건수 반환)
+
+        알림 상태는 메모리에만 있으므로 재시작 후에는 열린 행을 닫을 주체가 없다.
+        """
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute(
+                    "UPDATE alert_events SET resolved_at = ? WHERE resolved_at IS NULL",
+                    (resolved_at or datetime.now(),),
+                )
+                await db.commit()
+                return cursor.rowcount
+        except Exception as e:
+            self.logger.error(f"Failed to resolve open alerts: {e}")
+            return 0
+
     async def save_system_log(
         self, level: str, component: str, message: str, details: dict = None
     ) -> bool:
         """시스템 로그 저장"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 await db.execute(
                     """
                     INSERT INTO system_logs
@@ -281,49 +1351,257 @@ class PowerDatabase:
             self.logger.error(f"Failed to save system log: {e}")
             return False
 
+    def _raw_log_covers(
+        self, start_ms: int, sensor_id: int = DEFAULT_SENSOR_ID
+    ) -> bool:
+        """원본 샘플 로그가 장치의 start_ms 이후 측정 데이터를 모두 담고 있는지"""
+        if self.raw_log is None:
+            return False
+        covered_from = self.raw_log.covered_from(sensor_id)
+        if covered_from is None:
+            return False
+        return covered_from <= start_ms or (
+            self.oldest_ms is not None and covered_from <= self.oldest_ms
+        )
+
+    def _read_raw_log(
+        self,
+        start_ms: int,
+        end_ms: int,
+        limit: int = -1,
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> dict[str, Any]:
+        return self.raw_log.columns(
+            self.raw_log.read(start_ms, end_ms, limit, sensor_id)
+        )
+
+    async def get_raw_columns(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> Optional[dict[str, Any]]:
+        """장치의 원본 샘플 로그 구간 조회 (컬럼별 NumPy 배열, 시간 오름차순)
+
+        로그가 없거나 구간을 모두 담고 있지 않으면 None (SQLite로 조회해야 함).
+        """
+        start_ms = to_epoch_ms(start)
+        if not self._raw_log_covers(start_ms, sensor_id):
+            return None
+        end_ms = to_epoch_ms(end) if end is not None else 2**62
+        return await asyncio.to_thread(
+            self._read_raw_log, start_ms, end_ms, -1, sensor_id
+        )
+
     async def get_recent_measurements(
-        self, hours: int = 24, limit: int = 1000
+        self, hours: int = 24, limit: int = 1000, sensor_id: int = DEFAULT_SENSOR_ID
     ) -> list[dict]:
-        """최근 측정 데이터 조회"""
+        """최근 측정 데이터 조회 (최신 파티션부터 limit을 채울 때까지만 조회)
+
+        limit이 음수면 제한 없음 (SQLite LIMIT -1)
+        """
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
+            cutoff_ms = to_epoch_ms(cutoff_time)
 
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            if self._raw_log_covers(cutoff_ms, sensor_id):
+                columns = await asyncio.to_thread(
+                    self._read_raw_log, cutoff_ms, 2**62, limit, sensor_id
+                )
+                return measurement_rows(
+                    {name: values[::-1] for name, values in columns.items()}
+                )
+
+            measurements = []
+            async with self.pool.reader() as db:
+                for name in reversed(self._partitions_since(cutoff_time)):
+                    remaining = limit - len(measurements) if limit >= 0 else -1
+                    if remaining == 0:
+                        break
+
+                    async with db.execute(
+                        f"""
+                        SELECT {MEASUREMENT_COLUMNS}
+                        FROM {name}
+                        WHERE sensor_id = ? AND timestamp >= ?
+                        ORDER BY timestamp DESC
+                        LIMIT ?
+                    """,
+                        (sensor_id, cutoff_ms, remaining),
+                    ) as cursor:
+                        rows = await cursor.fetchall()
+                        measurements.extend(_measurement_dict(row) for row in rows)
+
+            return measurements
+        except Exception as e:
+            self.logger.error(f"Failed to get recent measurements: {e}")
+            return []
+
+    async def get_measurements(
+        self,
+        hours: float = 24,
+        limit: int = 1000,
+        tier: str = "auto",
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> dict[str, Any]:
+        """장치의 최근 측정 데이터를 조회 범위에 맞는 해상도로 조회 (최신 순)
+
+        tier: "auto" | "raw" | "1s" | "1m" | "1h"
+        auto는 범위의 원본 행이 limit 이내면 raw, 아니면 limit 예산에 맞는 롤업 tier.
+        raw 행은 get_recent_measurements와 같다. 롤업 행은 voltage/current/power에
+        버킷 평균을 담고 *_min/max/avg, sample_count를 함께 반환한다.
+        limit이 음수면 제한 없음 (auto는 항상 raw).
+        """
+        if tier != "auto" and tier != "raw" and tier not in ROLLUP_TIERS:
+            raise ValueError(f"Unknown rollup tier: {tier}")
+
+        try:
+            if tier == "auto":
+                tier = (
+                    await self.select_series_tier(hours, limit, sensor_id)
+                    if limit >= 0
+                    else "raw"
+                )
+        except Exception as e:
+            self.logger.error(f"Failed to select measurement tier: {e}")
+            return {"tier": tier, "resolution_seconds": None, "data": []}
+
+        if tier == "raw":
+            return {
+                "tier": tier,
+                "resolution_seconds": None,
+                "data": await self.get_recent_measurements(hours, limit, sensor_id),
+            }
+
+        series = await self.get_measurement_series(
+            hours=hours, tier=tier, sensor_id=sensor_id
+        )
+        rows = series["data"][::-1]
+        return {
+            **series,
+            "data": [
+                {
+                    "timestamp": row["timestamp"],
+                    **{metric: row[f"{metric}_avg"] for metric in ROLLUP_METRICS},
+                    **row,
+                }
+                for row in (rows[:limit] if limit >= 0 else rows)
+            ],
+        }
+
+    async def iter_measurement_pages(
+        self,
+        start: datetime,
+        end: datetime,
+        after: Optional[tuple[int, int]] = None,
+        page_size: int = 5000,
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> AsyncIterator[list[tuple]]:
+        """장치의 start <= t < end 측정 행을 키셋 순서로 페이지 반환
+
+        키셋 순서는 (timestamp, sequence_number).
+        행은 MEASUREMENT_COLUMNS 순서의 튜플 (timestamp는 epoch 밀리초).
+        after는 이미 받은 마지막 행의 (timestamp, sequence_number)이며 그 다음 행부터
+        반환한다.
+        페이지마다 reader를 새로 잡으므로 긴 내보내기가 커넥션을 점유하지 않는다.
+        """
+        start_ms, end_ms = to_epoch_ms(start), to_epoch_ms(end)
+        key = max(after, (start_ms, -1)) if after is not None else (start_ms, -1)
+        last_partition = measurement_partition(end)
+
+        key_time = datetime.fromtimestamp(key[0] / 1000)
+        for name in self._partitions_since(key_time):
+            if name > last_partition:
+                break
+
+            while True:
+                async with self.pool.reader() as db:
+                    async with db.execute(
+                        f"""
+                        SELECT {MEASUREMENT_COLUMNS}
+                        FROM {name}
+                        WHERE sensor_id = ?
+                          AND (timestamp, sequence_number) > (?, ?) AND timestamp < ?
+                        ORDER BY timestamp, sequence_number
+                        LIMIT ?
+                    """,
+                        (sensor_id, *key, end_ms, page_size),
+                    ) as cursor:
+                        rows = await cursor.fetchall()
+
+                if rows:
+                    key = (rows[-1][0], rows[-1][4])
+                    yield [tuple(row) for row in rows]
+                if len(rows) < page_size:
+                    break
+
+    async def iter_analysis_pages(
+        self,
+        start: datetime,
+        end: datetime,
+        page_size: int = 5000,
+        sensor_id: Optional[int] = None,
+    ) -> AsyncIterator[list[tuple]]:
+        """start <= t < end 분석 결과를 키셋 순서로 페이지 반환
+
+        키셋 순서는 (timestamp, id).
+        행은 ANALYSIS_COLUMNS 순서의 튜플.
+        timestamp 인덱스(idx_analysis_timestamp / 장치 지정 시 idx_analysis_sensor)는
+        rowid(id)를 포함하므로 페이지마다 마지막 키 다음 위치로 바로 찾아간다.
+        sensor_id가 None이면 모든 장치.
+        """
+        sensor_filter = "" if sensor_id is None else "sensor_id = ? AND "
+        sensor_params = () if sensor_id is None else (sensor_id,)
+        # 저장 형식(DataAnalyzer/AnalysisBatchWriter의 isoformat())과 같은
+        # 'T' 구분 ISO 문자열로 비교
+        key, end_text = (start.isoformat(), -1), end.isoformat()
+        while True:
+            async with self.pool.reader() as db:
                 async with db.execute(
-                    """
-                    SELECT timestamp, voltage, current, power,
-                           sequence_number, sensor_status, simulation_mode
-                    FROM power_measurements
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp DESC
+                    f"""
+                    SELECT {ANALYSIS_COLUMNS}
+                    FROM analysis_results
+                    WHERE {sensor_filter}(timestamp, id) > (?, ?) AND timestamp < ?
+                    ORDER BY timestamp, id
                     LIMIT ?
                 """,
-                    (cutoff_time, limit),
+                    (*sensor_params, *key, end_text, page_size),
                 ) as cursor:
                     rows = await cursor.fetchall()
-                    return [dict(row) for row in rows]
-        except Exception as e:
-            self.logger.error(f"Failed to get recent measurements: {e}")
-            return []
 
-    async def get_minute_statistics(self, hours: int = 24) -> list[dict]:
-        """1분 통계 데이터 조회"""
+            if rows:
+                key = (rows[-1][1], rows[-1][0])
+                yield [tuple(row) for row in rows]
+            if len(rows) < page_size:
+                return
+
+    async def get_archived_measurements(
+        self, start: datetime, end: datetime, sensor_id: Optional[int] = None
+    ) -> dict[str, Any]:
+        """콜드 아카이브 구간 조회 (컬럼별 NumPy 배열, timestamp는 epoch 밀리초)
+
+        sensor_id가 None이면 모든 장치.
+        """
+        return await asyncio.to_thread(self.archive.read, start, end, sensor_id)
+
+    async def get_minute_statistics(
+        self, hours: int = 24, sensor_id: int = DEFAULT_SENSOR_ID
+    ) -> list[dict]:
+        """장치의 1분 통계 데이터 조회"""
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
 
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 async with db.execute(
                     """
                     SELECT minute_timestamp, voltage_min, voltage_max, voltage_avg,
                            current_min, current_max, current_avg,
                            power_min, power_max, power_avg, sample_count
                     FROM minute_statistics
-                    WHERE minute_timestamp >= ?
+                    WHERE sensor_id = ? AND minute_timestamp >= ?
                     ORDER BY minute_timestamp DESC
                 """,
-                    (cutoff_time,),
+                    (sensor_id, cutoff_time),
                 ) as cursor:
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
@@ -331,16 +1609,159 @@ class PowerDatabase:
             self.logger.error(f"Failed to get minute statistics: {e}")
             return []
 
+    def select_rollup_tier(self, hours: float, max_points: int) -> str:
+        """조회 범위와 포인트 예산을 만족하는 tier 선택
+
+        예산 안에 들어오는 가장 세밀한 롤업 tier를 고르고,
+        어떤 tier도 예산을 만족하지 못하면 가장 거친 tier를 사용한다.
+        보관 기간이 조회 범위보다 짧은 tier는 제외한다.
+        """
+        range_seconds = hours * 3600
+        coarsest = None
+
+        for name, tier in ROLLUP_TIERS.items():
+            retention = tier["retention_hours"] or self.data_retention_hours
+            if retention < hours:
+                continue
+
+            coarsest = name
+            if range_seconds / tier["seconds"] <= max_points:
+                return name
+
+        return coarsest or list(ROLLUP_TIERS)[-1]
+
+    async def select_series_tier(
+        self, hours: float, max_points: int, sensor_id: int = DEFAULT_SENSOR_ID
+    ) -> str:
+        """조회 범위의 auto tier 선택 (원본 행 수가 예산 이내면 raw)
+
+        원본 행은 예산 + 1개까지만 센다.
+        예산을 넘으면 select_rollup_tier 결과를 사용한다.
+        """
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff_ms = to_epoch_ms(cutoff_time)
+        if self._raw_log_covers(cutoff_ms, sensor_id):
+            # 원본 로그: 세그먼트 이진 탐색만으로 행 수 확인
+            raw_count = self.raw_log.count(cutoff_ms, 2**62, sensor_id)
+        else:
+            # 원본 행 수 확인 (예산 + 1개까지만 스캔)
+            raw_query, raw_params = self._measurement_union(
+                cutoff_time, sensor_id=sensor_id
+            )
+            async with self.pool.reader() as db:
+                async with db.execute(
+                    f"SELECT COUNT(*) FROM ({raw_query} LIMIT ?)",
+                    (*raw_params, max_points + 1),
+                ) as cursor:
+                    raw_count = (await cursor.fetchone())[0]
+
+        if raw_count <= max_points:
+            return "raw"
+        return self.select_rollup_tier(hours, max_points)
+
+    async def get_measurement_series(
+        self,
+        hours: float = 24,
+        max_points: int = 1000,
+        tier: str = "auto",
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> dict[str, Any]:
+        """장치의 다중 해상도 측정 시계열 조회 (시간 오름차순)
+
+        tier: "auto" | "raw" | "1s" | "1m" | "1h"
+        auto는 원본 행 수가 예산 이내면 raw, 아니면 select_rollup_tier 결과를 사용.
+        모든 tier가 같은 행 형태(timestamp, *_min/max/avg, sample_count)를 반환한다.
+        """
+        if tier != "auto" and tier != "raw" and tier not in ROLLUP_TIERS:
+            raise ValueError(f"Unknown rollup tier: {tier}")
+
+        try:
+            if tier == "auto":
+                tier = await self.select_series_tier(hours, max_points, sensor_id)
+
+            cutoff_time = datetime.now() - timedelta(hours=hours)
+            cutoff_ms = to_epoch_ms(cutoff_time)
+            raw_query, raw_params = self._measurement_union(
+                cutoff_time, sensor_id=sensor_id
+            )
+            use_raw_log = self._raw_log_covers(cutoff_ms, sensor_id)
+
+            if use_raw_log and tier == "raw":
+                columns = await asyncio.to_thread(
+                    self._read_raw_log, cutoff_ms, 2**62, -1, sensor_id
+                )
+                return {
+                    "tier": tier,
+                    "resolution_seconds": None,
+                    "data": [
+                        {
+                            "timestamp": row["timestamp"],
+                            **{
+                                f"{metric}_{stat}": row[metric]
+                                for metric in ROLLUP_METRICS
+                                for stat in ("min", "max", "avg")
+                            },
+                            "sample_count": 1,
+                        }
+                        for row in measurement_rows(columns)
+                    ],
+                }
+
+            async with self.pool.reader() as db:
+                if tier == "raw":
+                    query = f"""
+                        SELECT timestamp,
+                               voltage AS voltage_min, voltage AS voltage_max,
+                               voltage AS voltage_avg,
+                               current AS current_min, current AS current_max,
+                               current AS current_avg,
+                               power AS power_min, power AS power_max,
+                               power AS power_avg,
+                               1 AS sample_count
+                        FROM ({raw_query})
+                        ORDER BY timestamp ASC
+                    """
+                    params = raw_params
+                    resolution_seconds = None
+                else:
+                    table = ROLLUP_TIERS[tier]["table"]
+                    column = ROLLUP_TIERS[tier]["column"]
+                    query = f"""
+                        SELECT {column} AS timestamp,
+                               voltage_min, voltage_max, voltage_avg,
+                               current_min, current_max, current_avg,
+                               power_min, power_max, power_avg, sample_count
+                        FROM {table}
+                        WHERE sensor_id = ? AND {column} >= ?
+                        ORDER BY {column} ASC
+                    """
+                    params = [sensor_id, cutoff_time]
+                    resolution_seconds = ROLLUP_TIERS[tier]["seconds"]
+
+                async with db.execute(query, params) as cursor:
+                    rows = await cursor.fetchall()
+
+            to_dict = _measurement_dict if tier == "raw" else dict
+            return {
+                "tier": tier,
+                "resolution_seconds": resolution_seconds,
+                "data": [to_dict(row) for row in rows],
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to get measurement series: {e}")
+            return {"tier": tier, "resolution_seconds": None, "data": []}
+
     async def get_alert_events(
-        self, hours: int = 24, severity: str = None
+        self, hours: int = 24, severity: str = None, sensor_id: Optional[int] = None
     ) -> list[dict]:
-        """알림 이벤트 조회"""
+        """알림 이벤트 조회 (sensor_id가 None이면 모든 장치)"""
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
 
             query = """
                 SELECT timestamp, alert_type, metric_name, metric_value,
-                       threshold_value, severity, message, resolved_at
+                       threshold_value, severity, message, resolved_at,
+                       peak_value, sample_count, sensor_id
                 FROM alert_events
                 WHERE timestamp >= ?
             """
@@ -350,10 +1771,13 @@ class PowerDatabase:
                 query += " AND severity = ?"
                 params.append(severity)
 
+            if sensor_id is not None:
+                query += " AND sensor_id = ?"
+                params.append(sensor_id)
+
             query += " ORDER BY timestamp DESC"
 
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 async with db.execute(query, params) as cursor:
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
@@ -361,6 +1785,76 @@ class PowerDatabase:
             self.logger.error(f"Failed to get alert events: {e}")
             return []
 
+    async def get_active_alerts(self, sensor_id: Optional[int] = None) -> list[dict]:
+        """활성(미해결) 알림 조회 - idx_alert_active 부분 인덱스 사용
+
+        sensor_id가 None이면 모든 장치.
+        """
+        query = """
+            SELECT id, timestamp, alert_type, metric_name, metric_value,
+                   threshold_value, severity, message, peak_value,
+                   sample_count, sensor_id
+            FROM alert_events
+            WHERE resolved_at IS NULL
+        """
+        params = []
+        if sensor_id is not None:
+            query += " AND sensor_id = ?"
+            params.append(sensor_id)
+        query += " ORDER BY sensor_id, metric_name, timestamp"
+
+        try:
+            async with self.pool.reader() as db:
+                async with db.execute(query, params) as cursor:
+                    rows = await cursor.fetchall()
+                    return [dict(row) for row in rows]
+        except Exception as e:
+            self.logger.error(f"Failed to get active alerts: {e}")
+            return []
+
+    async def get_alert_history(
+        self,
+        hours: int = 24,
+        severity: str = None,
+        limit: int = 1000,
+        sensor_id: Optional[int] = None,
+    ) -> list[dict]:
+        """해결된 알림 이력 조회 (해제 시각 역순) - idx_alert_resolved 부분 인덱스 사용
+
+        sensor_id가 None이면 모든 장치.
+        """
+        try:
+            cutoff_time = datetime.now() - timedelta(hours=hours)
+
+            query = """
+                SELECT id, timestamp, alert_type, metric_name, metric_value,
+                       threshold_value, severity, message, resolved_at,
+                       peak_value, sample_count, sensor_id
+                FROM alert_events
+                WHERE resolved_at IS NOT NULL AND resolved_at >= ?
+            """
+            params = [cutoff_time]
+
+            if severity:
+                # 단항 +: 저카디널리티 severity 인덱스 대신 idx_alert_resolved 사용
+                query += " AND +severity = ?"
+                params.append(severity)
+
+            if sensor_id is not None:
+                query += " AND +sensor_id = ?"
+                params.append(sensor_id)
+
+            query += " ORDER BY resolved_at DESC LIMIT ?"
+            params.append(limit)
+
+            async with self.pool.reader() as db:
+                async with db.execute(query, params) as cursor:
+                    rows = await cursor.fetchall()
+                    return [dict(row) for row in rows]
+        except Exception as e:
+            self.logger.error(f"Failed to get alert history: {e}")
+            return []
+
     async def get_system_logs(
         self, hours: int = 24, level: str = None, component: str = None
     ) -> list[dict]:
@@ -385,8 +1879,7 @@ class PowerDatabase:
 
             query += " ORDER BY timestamp DESC"
 
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 async with db.execute(query, params) as cursor:
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
@@ -394,35 +1887,89 @@ class PowerDatabase:
             self.logger.error(f"Failed to get system logs: {e}")
             return []
 
+    async def get_devices(self, enabled_only: bool = False) -> list[dict]:
+        """장치 레지스트리 조회 (sensor_id 순)"""
+        query = """
+            SELECT sensor_id, name, port, description, enabled, created_at
+            FROM devices
+        """
+        if enabled_only:
+            query += " WHERE enabled = 1"
+        query += " ORDER BY sensor_id"
+
+        try:
+            async with self.pool.reader() as db:
+                async with db.execute(query) as cursor:
+                    rows = await cursor.fetchall()
+                    return [
+                        {**dict(row), "enabled": bool(row["enabled"])} for row in rows
+                    ]
+        except Exception as e:
+            self.logger.error(f"Failed to get devices: {e}")
+            return []
+
+    async def register_device(
+        self, name: str, port: str = "MOCK", description: str = None
+    ) -> Optional[int]:
+        """장치 등록 (새 sensor_id 반환, 이름이 이미 있으면 None)"""
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute(
+                    """
+                    INSERT OR IGNORE INTO devices (name, port, description)
+                    VALUES (?, ?, ?)
+                """,
+                    (name, port, description),
+                )
+                await db.commit()
+                return cursor.lastrowid if cursor.rowcount else None
+        except Exception as e:
+            self.logger.error(f"Failed to register device {name}: {e}")
+            return None
+
+    async def set_device_enabled(self, sensor_id: int, enabled: bool) -> bool:
+        """장치 활성/비활성 전환 (장치가 없으면 False)"""
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute(
+                    "UPDATE devices SET enabled = ? WHERE sensor_id = ?",
+                    (int(enabled), sensor_id),
+                )
+                await db.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            self.logger.error(f"Failed to update device {sensor_id}: {e}")
+            return False
+
     async def get_database_stats(self) -> dict:
         """데이터베이스 통계 정보"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.reader() as db:
                 stats = {}
 
-                # 각 테이블의 레코드 수
-                tables = [
-                    "power_measurements",
-                    "minute_statistics",
-                    "alert_events",
-                    "system_logs",
-                ]
-
-                for table in tables:
-                    async with db.execute(f"SELECT COUNT(*) FROM {table}") as cursor:
-                        count = await cursor.fetchone()
-                        stats[f"{table}_count"] = count[0]
-
-                # 데이터 범위
+                # 각 테이블의 레코드 수 (유지 카운터, COUNT 스캔 없음)
                 async with db.execute(
-                    """
-                    SELECT MIN(timestamp) as oldest, MAX(timestamp) as newest
-                    FROM power_measurements
-                """
+                    "SELECT name, row_count FROM table_counters"
                 ) as cursor:
-                    result = await cursor.fetchone()
-                    if result and result[0]:
-                        stats["data_range"] = {"oldest": result[0], "newest": result[1]}
+                    counters = dict(await cursor.fetchall())
+
+                partitions = list(self.partitions)
+                stats["power_measurements_count"] = sum(
+                    counters.get(name, 0) for name in partitions
+                )
+                for table in COUNTED_TABLES:
+                    stats[f"{table}_count"] = counters.get(table, 0)
+
+                # 데이터 범위 (저장/정리 시 갱신된 값)
+                stats["measurement_partitions"] = len(partitions)
+                if self.oldest_ms is not None:
+                    stats["data_range"] = {
+                        "oldest": from_epoch_ms(self.oldest_ms),
+                        "newest": from_epoch_ms(self.newest_ms),
+                    }
+
+                # 페이지 / 빈 페이지 (incremental_vacuum 회수 대상)
+                stats.update(await self._page_stats(db))
 
                 # 파일 크기
                 if os.path.exists(self.db_path):
@@ -430,60 +1977,148 @@ class PowerDatabase:
                         1024 * 1024
                     )
 
+                # 원본 샘플 로그 (사용 시)
+                if self.raw_log is not None:
+                    stats["raw_log"] = self.raw_log.get_stats()
+
                 return stats
         except Exception as e:
             self.logger.error(f"Failed to get database stats: {e}")
             return {}
 
-    async def cleanup_old_data(self) -> dict:
-        """48시간 이전 데이터 정리"""
-        try:
-            cutoff_time = datetime.now() - timedelta(hours=self.data_retention_hours)
+    async def _archive_partition(self, name: str) -> Optional[int]:
+        """파티션 전체를 아카이브 블록으로 기록 (기록한 행 수, 실패하면 None)
 
-            async with aiosqlite.connect(self.db_path) as db:
-                cleanup_stats = {}
-
-                # 오래된 측정 데이터 삭제
+        읽기 커넥션에서 읽고 워커 스레드에서 압축하므로 쓰기 락을 잡지 않는다.
+        """
+        try:
+            async with self.pool.reader() as db:
                 async with db.execute(
-                    """
-                    SELECT COUNT(*) FROM power_measurements WHERE timestamp < ?
-                """,
-                    (cutoff_time,),
+                    f"""
+                    SELECT {MEASUREMENT_COLUMNS}, sensor_id FROM {name}
+                    ORDER BY sensor_id, timestamp, sequence_number
+                """
                 ) as cursor:
-                    old_measurements = await cursor.fetchone()
-                    cleanup_stats["measurements_to_delete"] = old_measurements[0]
+                    rows = await cursor.fetchall()
 
-                await db.execute(
-                    """
-                    DELETE FROM power_measurements WHERE timestamp < ?
-                """,
-                    (cutoff_time,),
+            key = name[len(MEASUREMENT_PARTITION_PREFIX) :]
+            await asyncio.to_thread(
+                self.archive.append_partition, key[:8], int(key[8:]), rows
+            )
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"Failed to archive partition {name}: {e}")
+            return None
+
+    async def cleanup_old_data(self) -> dict:
+        """48시간 이전 데이터 정리"""
+        try:
+            cutoff_time = datetime.now() - timedelta(hours=self.data_retention_hours)
+            cleanup_stats = {}
+
+            # 오래된 측정 데이터: 보관 기간이 지난 시간 파티션을 통째로 삭제
+            # (뷰가 비지 않도록 현재 시간 파티션은 항상 유지)
+            current = measurement_partition(datetime.now())
+            async with self.pool.writer() as db:
+                await self._ensure_partitions(db, {current})
+            first_kept = measurement_partition(cutoff_time)
+            expired = [name for name in self.partitions if name < first_kept]
+
+            # DROP 전에 콜드 아카이브로 보존: 읽기/압축은 쓰기 락 밖에서 실행
+            # (실패한 파티션은 다음 정리 때 재시도)
+            archived = {}
+            for name in expired:
+                row_count = await self._archive_partition(name)
+                if row_count is not None:
+                    archived[name] = row_count
+            cleanup_stats["partitions_archived"] = len(archived)
+
+            async with self.pool.writer() as db:
+                # 아카이브 도중 늦게 들어온 행이 있으면 DROP하지 않고
+                # 다음 정리 때 재시도
+                expired = []
+                for name, row_count in archived.items():
+                    async with db.execute(
+                        "SELECT row_count FROM table_counters WHERE name = ?", (name,)
+                    ) as cursor:
+                        counter = await cursor.fetchone()
+                    if (counter[0] if counter else 0) == row_count:
+                        expired.append(name)
+
+                if expired:
+                    self.partitions = [
+                        name for name in self.partitions if name not in expired
+                    ]
+                    for sql in _measurement_view_ddl(self.partitions):
+                        await db.execute(sql)
+                    for name in expired:
+                        await db.execute(f"DROP TABLE IF EXISTS {name}")
+                        await db.execute(
+                            "DELETE FROM table_counters WHERE name = ?", (name,)
+                        )
+
+                    # 삭제된 파티션의 장치별 요약 캐시 제거
+                    for key in list(self._partition_summaries):
+                        if key[0] in expired:
+                            del self._partition_summaries[key]
+
+                    # 가장 오래된 데이터 시각 재계산 (남은 파티션 앞쪽부터)
+                    self.oldest_ms = None
+                    for name in self.partitions:
+                        async with db.execute(
+                            f"SELECT MIN(timestamp) FROM {name}"
+                        ) as cursor:
+                            self.oldest_ms = (await cursor.fetchone())[0]
+                        if self.oldest_ms is not None:
+                            break
+                    if self.oldest_ms is None:
+                        self.newest_ms = None
+                cleanup_stats["partitions_dropped"] = len(expired)
+
+                # 원본 샘플 로그: 남은 가장 오래된 파티션 이전 세그먼트 삭제
+                if self.raw_log is not None and self.partitions:
+                    first_key = self.partitions[0][len(MEASUREMENT_PARTITION_PREFIX) :]
+                    cleanup_stats["raw_segments_dropped"] = await asyncio.to_thread(
+                        self.raw_log.drop_before, first_key
+                    )
+                cleanup_stats["archive_days_deleted"] = await asyncio.to_thread(
+                    self.archive.cleanup
                 )
 
-                # 오래된 1분 통계 삭제
-                async with db.execute(
+                # 오래된 1분 통계 삭제 (삭제 행 수는 별도 COUNT 없이 rowcount로)
+                cursor = await db.execute(
                     """
-                    SELECT COUNT(*) FROM minute_statistics WHERE minute_timestamp < ?
+                    DELETE FROM minute_statistics WHERE minute_timestamp < ?
                 """,
                     (cutoff_time,),
-                ) as cursor:
-                    old_stats = await cursor.fetchone()
-                    cleanup_stats["statistics_to_delete"] = old_stats[0]
+                )
+                cleanup_stats["statistics_to_delete"] = cursor.rowcount
+
+                # 1초 / 1시간 롤업 정리 (tier별 보관 기간)
+                for name in ("1s", "1h"):
+                    tier = ROLLUP_TIERS[name]
+                    retention = tier["retention_hours"] or self.data_retention_hours
+                    await db.execute(
+                        f"DELETE FROM {tier['table']} WHERE {tier['column']} < ?",
+                        (datetime.now() - timedelta(hours=retention),),
+                    )
 
-                await db.execute(
+                # 오래된 알림 삭제 (해제 시각 기준, 활성 알림은 유지)
+                cursor = await db.execute(
                     """
-                    DELETE FROM minute_statistics WHERE minute_timestamp < ?
+                    DELETE FROM alert_events
+                    WHERE resolved_at IS NOT NULL AND resolved_at < ?
                 """,
                     (cutoff_time,),
                 )
+                cleanup_stats["alerts_deleted"] = cursor.rowcount
 
-                # 오래된 알림 삭제 (해결된 것만)
+                # 오래된 분석 결과 삭제 (ISO 문자열 타임스탬프)
                 await db.execute(
                     """
-                    DELETE FROM alert_events
-                    WHERE timestamp < ? AND resolved_at IS NOT NULL
+                    DELETE FROM analysis_results WHERE timestamp < ?
                 """,
-                    (cutoff_time,),
+                    (cutoff_time.isoformat(),),
                 )
 
                 # 오래된 시스템 로그 삭제
@@ -504,10 +2139,69 @@ class PowerDatabase:
             self.logger.error(f"Failed to cleanup old data: {e}")
             return {"error": str(e)}
 
+    async def _page_stats(self, db: aiosqlite.Connection) -> dict:
+        """페이지 수, 빈 페이지(freelist) 수와 크기"""
+        # PRAGMA 테이블 함수로 한 번에 조회 (커넥션 스레드 왕복 1회)
+        async with db.execute(
+            """
+            SELECT page_size, page_count, freelist_count, auto_vacuum
+            FROM pragma_page_size(), pragma_page_count(),
+                 pragma_freelist_count(), pragma_auto_vacuum()
+        """
+        ) as cursor:
+            page_size, page_count, freelist_count, auto_vacuum = await cursor.fetchone()
+
+        return {
+            "page_count": page_count,
+            "freelist_pages": freelist_count,
+            "freelist_mb": freelist_count * page_size / (1024 * 1024),
+            "incremental_vacuum": auto_vacuum == AUTO_VACUUM_INCREMENTAL,
+        }
+
+    async def incremental_vacuum(self, max_pages: int = 256) -> int:
+        """빈 페이지를 최대 max_pages개 회수 (writer 잠금은 이 단계 동안만 유지)
+
+        Returns:
+            회수한 페이지 수
+        """
+        try:
+            async with self.pool.writer() as db:
+                async with db.execute("PRAGMA freelist_count") as cursor:
+                    before = (await cursor.fetchone())[0]
+                if before == 0:
+                    return 0
+
+                # 단계마다 행이 반환되므로 끝까지 읽어야 회수가 완료됨
+                async with db.execute(
+                    f"PRAGMA incremental_vacuum({int(max_pages)})"
+                ) as cursor:
+                    await cursor.fetchall()
+                await db.commit()
+
+                async with db.execute("PRAGMA freelist_count") as cursor:
+                    after = (await cursor.fetchone())[0]
+
+                self.vacuum_stats["pages_reclaimed"] += before - after
+                self.vacuum_stats["runs"] += 1
+                return before - after
+        except Exception as e:
+            self.logger.error(f"Failed to run incremental vacuum: {e}")
+            return 0
+
+    async def reclaim_free_pages(self, max_pages: int = 256) -> int:
+        """빈 페이지를 모두 회수 (max_pages 단위로 나눠 단계 사이에 쓰기를 허용)"""
+        total = 0
+        while True:
+            reclaimed = await self.incremental_vacuum(max_pages)
+            total += reclaimed
+            if reclaimed < max_pages:
+                return total
+            await asyncio.sleep(0)
+
     async def vacuum_database(self) -> bool:
-        """데이터베이스 최적화 (VACUUM)"""
+        """데이터베이스 전체 재작성 (VACUUM, 실행 중 모든 쓰기 차단)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 await db.execute("VACUUM")
                 await db.commit()
                 self.logger.info("Database vacuum completed")
@@ -521,46 +2215,485 @@ class PowerDatabase:
         try:
             import shutil
 
-            shutil.copy2(self.db_path, backup_path)
+            # WAL 내용을 본 파일에 반영한 뒤, 쓰기 잠금을 잡은 상태로 복사
+            async with self.pool.writer() as db:
+                await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                shutil.copy2(self.db_path, backup_path)
             self.logger.info(f"Database backed up to {backup_path}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to backup database: {e}")
             return False
 
-    async def calculate_power_efficiency(self, hours: int = 24) -> dict:
-        """전력 효율성 계산"""
+    async def _measurement_summary(
+        self,
+        db: aiosqlite.Connection,
+        name: str,
+        start_ms: int = 0,
+        max_gap_ms: float = ENERGY_MAX_GAP_SECONDS * 1000,
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> Optional[dict]:
+        """장치의 파티션(또는 start_ms 이후 구간) 합계와 사다리꼴 에너지 (SQL 집계)
+
+        에너지는 인접 샘플 (P_i + P_i-1) / 2 * Δt 합 (단위 W·ms).
+        """
+        async with db.execute(
+            f"""
+            SELECT COUNT(*), SUM(voltage), SUM(current), SUM(power),
+                   SUM(power * power),
+                   SUM(CASE WHEN dt <= ? THEN (power + prev_power) * dt END) / 2,
+                   SUM(CASE WHEN dt <= ? THEN dt END)
+            FROM (
+                SELECT voltage, current, power,
+                       timestamp - LAG(timestamp) OVER w AS dt,
+                       LAG(power) OVER w AS prev_power
+                FROM {name}
+                WHERE sensor_id = ? AND timestamp >= ?
+                WINDOW w AS (ORDER BY timestamp)
+            )
+        """,
+            (max_gap_ms, max_gap_ms, sensor_id, start_ms),
+        ) as cursor:
+            (
+                count,
+                sum_v,
+                sum_a,
+                sum_w,
+                sum_w2,
+                energy,
+                covered,
+            ) = await cursor.fetchone()
+        if not count:
+            return None
+
+        # 경계 적분용 첫/마지막 샘플 (클러스터드 키 양 끝)
+        edges = []
+        for order in ("ASC", "DESC"):
+            async with db.execute(
+                f"""
+                SELECT timestamp, power FROM {name}
+                WHERE sensor_id = ? AND timestamp >= ?
+                ORDER BY timestamp {order} LIMIT 1
+            """,
+                (sensor_id, start_ms),
+            ) as cursor:
+                edges.append(await cursor.fetchone())
+
+        return {
+            "count": count,
+            "sum_v": sum_v,
+            "sum_a": sum_a,
+            "sum_w": sum_w,
+            "sum_w2": sum_w2,
+            "energy_wms": energy or 0.0,
+            "covered_ms": covered or 0,
+            "first_ts": edges[0][0],
+            "first_w": edges[0][1],
+            "last_ts": edges[1][0],
+            "last_w": edges[1][1],
+        }
+
+    async def calculate_power_efficiency(
+        self, hours: int = 24, sensor_id: int = DEFAULT_SENSOR_ID
+    ) -> dict:
+        """장치의 전력 효율성 계산 (행을 Python으로 가져오지 않음)
+
+        - 평균/변동성: 파티션별 SQL 합계(Σx, Σw²)를 합산
+        - 에너지: 실제 타임스탬프 기준 사다리꼴 적분 (ENERGY_MAX_GAP_SECONDS보다 긴
+          간격은 수집 중단으로 보고 제외)
+        - 지난 파티션 요약은 캐시하므로 조회 비용은 구간 양 끝 부분 시간대 스캔 +
+          파티션 수에 비례
+        """
         try:
-            measurements = await self.get_recent_measurements(hours=hours)
-
-            if not measurements:
+            now = datetime.now()
+            cutoff_time = now - timedelta(hours=hours)
+            settled = measurement_partition(
+                now - timedelta(seconds=SUMMARY_SETTLE_SECONDS)
+            )
+            partitions = self._partitions_since(cutoff_time)
+
+            summaries = []
+            async with self.pool.reader() as db:
+                for index, name in enumerate(partitions):
+                    if index == 0:
+                        # 구간 시작 파티션은 cutoff 이후만 집계 (캐시 안 함)
+                        summary = await self._measurement_summary(
+                            db, name, to_epoch_ms(cutoff_time), sensor_id=sensor_id
+                        )
+                    elif (name, sensor_id) in self._partition_summaries:
+                        summary = self._partition_summaries[(name, sensor_id)]
+                    else:
+                        summary = await self._measurement_summary(
+                            db, name, sensor_id=sensor_id
+                        )
+                        if name < settled:
+                            self._partition_summaries[(name, sensor_id)] = summary
+                    if summary is not None:
+                        summaries.append(summary)
+
+            total = _combine_summaries(summaries, ENERGY_MAX_GAP_SECONDS * 1000)
+            count = total["count"]
+            if not count:
                 return {}
 
             # 효율성 메트릭 계산
-            total_energy = sum(m["power"] for m in measurements) / 3600  # Wh
-            avg_voltage = sum(m["voltage"] for m in measurements) / len(measurements)
-            avg_current = sum(m["current"] for m in measurements) / len(measurements)
-            avg_power = sum(m["power"] for m in measurements) / len(measurements)
-
-            # 전력 변동성 (CV - Coefficient of Variation)
-            powers = [m["power"] for m in measurements]
-            power_std = (sum((p - avg_power) ** 2 for p in powers) / len(powers)) ** 0.5
+            avg_power = total["sum_w"] / count
+
+            # 전력 변동성 (CV - Coefficient of Variation, 모표준편차)
+            power_variance = max(total["sum_w2"] / count - avg_power**2, 0.0)
+            power_std = power_variance**0.5
             power_cv = (power_std / avg_power) * 100 if avg_power > 0 else 0
 
             return {
-                "total_energy_wh": round(total_energy, 3),
-                "avg_voltage": round(avg_voltage, 3),
-                "avg_current": round(avg_current, 3),
+                "total_energy_wh": round(total["energy_wms"] / 1000 / 3600, 3),
+                "avg_voltage": round(total["sum_v"] / count, 3),
+                "avg_current": round(total["sum_a"] / count, 3),
                 "avg_power": round(avg_power, 3),
                 "power_variability_percent": round(power_cv, 2),
-                "sample_count": len(measurements),
+                "sample_count": count,
                 "time_span_hours": hours,
+                "integrated_hours": round(total["covered_ms"] / 1000 / 3600, 4),
             }
         except Exception as e:
             self.logger.error(f"Failed to calculate power efficiency: {e}")
             return {}
 
 
+class BatchWriter:
+    """Write-behind 배치 기록기
+
+    행을 메모리 버퍼에 모아 두었다가 batch_size에 도달하거나
+    flush_interval이 지나면 flush_func 한 번으로 일괄 저장한다.
+    버퍼가 max_pending에 도달하면 add()는 자리가 생길 때까지 대기한다 (backpressure).
+    """
+
+    def __init__(
+        self,
+        flush_func: Callable[[list[tuple]], Awaitable[bool]],
+        name: str = "batch",
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+    ):
+        self.flush_func = flush_func
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.logger = logging.getLogger(__name__)
+
+        self._buffer: list[tuple] = []
+        self._task: Optional[asyncio.Task] = None
+        # 이벤트는 실행 중인 이벤트 루프에서 생성해야 하므로 start()에서 초기화
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._flush_done: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._running = False
+
+        # flush / backpressure 메트릭
+        self.metrics = {
+            "rows_enqueued": 0,
+            "rows_written": 0,
+            "rows_dropped": 0,
+            "flush_count": 0,
+            "failed_flushes": 0,
+            "backpressure_waits": 0,
+            "last_flush_rows": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "last_flush_time": None,
+        }
+
+    @property
+    def pending(self) -> int:
+        """flush 대기 중인 행 수"""
+        return len(self._buffer)
+
+    async def start(self):
+        """주기적 flush 태스크 시작"""
+        if self._running:
+            return
+
+        self._flush_requested = asyncio.Event()
+        self._flush_done = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._running = True
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """flush 태스크 중지 및 남은 행 모두 저장"""
+        self._running = False
+
+        if self._task:
+            self._flush_requested.set()
+            try:
+                await self._task
+            except Exception as e:
+                self.logger.error(f"[{self.name}] Flush task error on stop: {e}")
+            self._task = None
+
+        # 남은 행 drain
+        while self._buffer:
+            if not await self.flush():
+                self.logger.error(
+                    f"[{self.name}] Dropping {len(self._buffer)} rows on shutdown"
+                )
+                self.metrics["rows_dropped"] += len(self._buffer)
+                self._buffer = []
+                break
+
+    async def _wait_for_capacity(self, count: int):
+        """버퍼에 count행이 들어갈 자리가 생길 때까지 flush 요청 후 대기
+
+        깨어난 뒤 다시 검사하므로 동시에 기다리던 생산자나 flush 실패로
+        행이 되돌아온 경우에도 max_pending을 넘지 않는다.
+        max_pending보다 큰 묶음은 버퍼가 비었을 때 통째로 넣는다.
+        """
+        needed = min(count, self.max_pending)
+        while self._running and len(self._buffer) + needed > self.max_pending:
+            self.metrics["backpressure_waits"] += 1
+            self._flush_done.clear()
+            self._flush_requested.set()
+            await self._flush_done.wait()
+
+    async def add(self, row: tuple):
+        """행 추가 (필요 시 flush 요청 또는 backpressure 대기)"""
+        await self._wait_for_capacity(1)
+
+        self._buffer.append(row)
+        self.metrics["rows_enqueued"] += 1
+
+        if not self._running:
+            # 태스크 없이 사용되는 경우 즉시 flush (write-through)
+            await self.flush()
+        elif len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def add_many(self, rows: list[tuple]):
+        """여러 행을 한 단위로 추가 (버스트 프레임: 같은 flush 트랜잭션에 함께 저장)"""
+        if not rows:
+            return
+
+        await self._wait_for_capacity(len(rows))
+
+        self._buffer.extend(rows)
+        self.metrics["rows_enqueued"] += len(rows)
+
+        if not self._running:
+            await self.flush()
+        elif len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> bool:
+        """버퍼의 행을 한 번에 저장"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            if not self._buffer:
+                return True
+
+            rows = self._buffer
+            self._buffer = []
+
+            start = time.perf_counter()
+            success = await self.flush_func(rows)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            if success:
+                self.metrics["rows_written"] += len(rows)
+                self.metrics["flush_count"] += 1
+                self.metrics["last_flush_rows"] = len(rows)
+                self.metrics["last_flush_ms"] = round(elapsed_ms, 3)
+                self.metrics["max_flush_ms"] = round(
+                    max(self.metrics["max_flush_ms"], elapsed_ms), 3
+                )
+                self.metrics["last_flush_time"] = datetime.now().isoformat()
+            else:
+                # 실패한 행은 버퍼 앞쪽에 되돌리고, 한도를 넘는 오래된 행은 버림
+                self.metrics["failed_flushes"] += 1
+                self._buffer = rows + self._buffer
+                overflow = len(self._buffer) - self.max_pending
+                if overflow > 0:
+                    del self._buffer[:overflow]
+                    self.metrics["rows_dropped"] += overflow
+
+            return success
+
+    async def _flush_loop(self):
+        """크기 또는 시간 조건으로 flush 수행"""
+        while self._running:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_requested.clear()
+            try:
+                if not await self.flush():
+                    # 저장 실패 시 잠시 대기 후 재시도
+                    await asyncio.sleep(self.flush_interval)
+            except Exception as e:
+                self.logger.error(f"[{self.name}] Flush error: {e}")
+            finally:
+                self._flush_done.set()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """flush / backpressure 메트릭 반환"""
+        return {
+            "name": self.name,
+            "pending": self.pending,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "max_pending": self.max_pending,
+            **self.metrics,
+        }
+
+
+class MeasurementBatchWriter(BatchWriter):
+    """전력 측정 데이터 write-behind 기록기"""
+
+    def __init__(self, db: "PowerDatabase", **kwargs):
+        kwargs.setdefault("name", "measurements")
+        super().__init__(db.save_measurements_batch, **kwargs)
+
+    async def add_measurement(
+        self,
+        voltage: float,
+        current: float,
+        power: float,
+        sequence_number: int = None,
+        sensor_status: str = "ok",
+        simulation_mode: str = "NORMAL",
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ):
+        """측정 데이터 추가 (수신 시각 기준 타임스탬프)"""
+        await self.add(
+            (
+                datetime.now(),
+                voltage,
+                current,
+                power,
+                sequence_number,
+                sensor_status,
+                simulation_mode,
+                sensor_id,
+            )
+        )
+
+
+class AnalysisBatchWriter(BatchWriter):
+    """데이터 분석 결과 write-behind 기록기
+
+    저장 정책: 이상치가 있는 샘플은 항상 저장하고, 나머지는 sample_every번째
+    샘플만 저장한다 (sample_every=1이면 전부 저장, 0이면 이상치만 저장).
+    샘플 순번은 장치별로 센다.
+    """
+
+    def __init__(self, db: "PowerDatabase", sample_every: int = 10, **kwargs):
+        kwargs.setdefault("name", "analysis")
+        super().__init__(db.save_analysis_batch, **kwargs)
+        self.sample_every = sample_every
+        self._sample_index: dict[int, int] = {}
+        self.metrics["samples_skipped"] = 0
+
+    def should_persist(
+        self, analysis_result: dict[str, Any], sensor_id: int = DEFAULT_SENSOR_ID
+    ) -> bool:
+        """저장 정책 판단"""
+        index = self._sample_index[sensor_id] = self._sample_index.get(sensor_id, 0) + 1
+        if analysis_result.get("has_any_outlier"):
+            return True
+        return self.sample_every > 0 and index % self.sample_every == 0
+
+    async def add_analysis(
+        self, analysis_result: dict[str, Any], sensor_id: int = DEFAULT_SENSOR_ID
+    ) -> bool:
+        """분석 결과 추가 (정책에 따라 저장하지 않으면 False)"""
+        if not self.should_persist(analysis_result, sensor_id):
+            self.metrics["samples_skipped"] += 1
+            return False
+
+        for metric, data in analysis_result["metrics"].items():
+            await self.add(
+                (
+                    analysis_result["timestamp"],
+                    metric,
+                    data["value"],
+                    data["moving_avg"].get("1m", 0),
+                    data["moving_avg"].get("5m", 0),
+                    data["moving_avg"].get("15m", 0),
+                    data["outlier"]["is_outlier"],
+                    data["outlier"]["score"],
+                    data["outlier"]["method"],
+                    data["outlier"]["severity"],
+                    data["outlier"]["confidence"],
+                    sensor_id,
+                )
+            )
+        return True
+
+    async def add_analysis_batch(
+        self,
+        batch_result: dict[str, Any],
+        timestamps: list[datetime],
+        sensor_id: int = DEFAULT_SENSOR_ID,
+    ) -> int:
+        """analyze_batch 결과 추가 (저장 정책을 샘플별로 적용, 저장된 샘플 수 반환)"""
+        count = batch_result["count"]
+        first = self._sample_index.get(sensor_id, 0)
+        indices = range(first + 1, first + count + 1)
+        self._sample_index[sensor_id] = first + count
+
+        outliers = batch_result["has_any_outlier"].tolist()
+        selected = [
+            i
+            for i, sample_index in enumerate(indices)
+            if outliers[i]
+            or (self.sample_every > 0 and sample_index % self.sample_every == 0)
+        ]
+        self.metrics["samples_skipped"] += count - len(selected)
+        if not selected:
+            return 0
+
+        rows = []
+        for metric, data in batch_result["metrics"].items():
+            columns = [
+                data[key].tolist()
+                for key in ("value", "is_outlier", "score", "method", "severity")
+            ]
+            moving_avg = [
+                data["moving_avg"][window].tolist() for window in ("1m", "5m", "15m")
+            ]
+            confidence = data["confidence"].tolist()
+
+            for i in selected:
+                value, is_outlier, score, method, severity = (c[i] for c in columns)
+                rows.append(
+                    (
+                        timestamps[i].isoformat(),
+                        metric,
+                        value,
+                        *(avg[i] for avg in moving_avg),
+                        is_outlier,
+                        score,
+                        method,
+                        severity,
+                        confidence[i],
+                        sensor_id,
+                    )
+                )
+
+        await self.add_many(rows)
+        return len(selected)
+
+    def get_metrics(self) -> dict[str, Any]:
+        """flush / backpressure 메트릭 + 저장 정책"""
+        return {**super().get_metrics(), "sample_every": self.sample_every}
+
+
 class DatabaseManager:
     """데이터베이스 관리자 싱글톤"""
 
@@ -573,9 +2706,11 @@ class DatabaseManager:
 
     @classmethod
     def get_instance(cls) -> PowerDatabase:
-        """데이터베이스 인스턴스 가져오기"""
+        """데이터베이스 인스턴스 가져오기 (POWER_DB_PATH로 경로 지정 가능)"""
         if cls._instance is None:
-            cls._instance = PowerDatabase()
+            cls._instance = PowerDatabase(
+                os.environ.get("POWER_DB_PATH", "power_monitoring.db")
+            )
         return cls._instance
 
 
@@ -600,20 +2735,45 @@ async def auto_cleanup_task():
                 details=cleanup_stats,
             )
 
-            # 데이터베이스 최적화 (6시간마다)
-            current_hour = datetime.now().hour
-            if current_hour % 6 == 0:
-                await db.vacuum_database()
-                await db.save_system_log(
-                    level="INFO",
-                    component="database",
-                    message="Database vacuum completed",
-                )
-
         except Exception as e:
             logging.error(f"Auto cleanup task error: {e}")
 
 
+async def maintenance_task(
+    interval: float = 30.0,
+    max_pages: int = 256,
+    idle_seconds: float = 0.2,
+    max_deferrals: int = 10,
+):
+    """유휴 시 빈 페이지 점진 회수 태스크 (tick당 최대 max_pages 페이지)
+
+    writer가 사용 중이거나 idle_seconds 안에 쓰기가 있었으면 이번 tick은 건너뛴다.
+    고속 수집으로 유휴 구간이 없으면 max_deferrals번 연기 후 한 단계를 실행한다
+    (한 단계의 잠금 시간은 max_pages로 제한됨).
+    """
+    db = DatabaseManager.get_instance()
+    deferrals = 0
+
+    while True:
+        try:
+            await asyncio.sleep(interval)
+
+            pool = db.pool
+            busy = (
+                pool.is_writing
+                or time.monotonic() - pool.last_write_time < idle_seconds
+            )
+            if busy and deferrals < max_deferrals:
+                deferrals += 1
+                continue
+
+            deferrals = 0
+            await db.incremental_vacuum(max_pages)
+
+        except Exception as e:
+            logging.error(f"Maintenance task error: {e}")
+
+
 if __name__ == "__main__":
     # 테스트 코드
     async def test_database():
@@ -630,4 +2790,6 @@ if __name__ == "__main__":
         stats = await db.get_database_stats()
         print(f"Database stats: {stats}")
 
+        await db.close()
+
     asyncio.run(test_database())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - Device Pipeline
+장치(sensor_id)별 수집 파이프라인
+
+기능:
+- 장치 1개 = 시뮬레이터/시리얼 연결 + 리더 스레드 + 데이터 분석기 + 알림 엔진
+- 모든 장치의 리더 스레드가 같은 프레임 큐를 사용하고 프레임의 sensor_id로 구분
+- 이동평균/이상치 윈도와 알림 상태 머신은 장치별로 독립 (다른 장치 샘플이 섞이지 않음)
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from alert_engine import AlertEngine
+from data_analyzer import DataAnalyzer
+from frame_reader import FrameReader
+
+
+class DevicePipeline:
+    """장치 1개의 연결, 리더 스레드, 분석/알림 상태"""
+
+    def __init__(
+        self,
+        sensor_id: int,
+        name: str,
+        port: str = "MOCK",
+        db_path: str = "power_monitoring.db",
+        alert_flush_interval: float = 10.0,
+    ):
+        self.sensor_id = sensor_id
+        self.name = name
+        self.port = port
+        self.logger = logging.getLogger(__name__)
+
+        self.simulator = None
+        self.frame_reader: Optional[FrameReader] = None
+
+        # 장치별 분석 윈도 / 알림 상태
+        self.data_analyzer = DataAnalyzer(db_path)
+        self.alert_engine = AlertEngine(flush_interval=alert_flush_interval)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.simulator is not None and self.simulator.is_connected()
+
+    def connect(self, simulator) -> bool:
+        """시뮬레이터(SimulatorManager) 연결"""
+        self.simulator = simulator
+        if simulator.connect():
+            self.logger.info(
+                f"Device {self.sensor_id} ({self.name}) connected: "
+                f"{simulator.get_simulator_type()}"
+            )
+            return True
+        self.logger.error(f"Device {self.sensor_id} ({self.name}) connection failed")
+        return False
+
+    def start_reader(self, frame_queue: asyncio.Queue, loop: asyncio.AbstractEventLoop):
+        """현재 시뮬레이터에 대한 리더 스레드 시작 (프레임에 sensor_id 부여)"""
+        if self.simulator is None:
+            return
+
+        self.frame_reader = FrameReader(
+            self.simulator, frame_queue, loop, sensor_id=self.sensor_id
+        )
+        self.frame_reader.start()
+
+    async def stop_reader(self):
+        """리더 스레드 중지"""
+        if self.frame_reader:
+            await self.frame_reader.stop()
+            self.frame_reader = None
+
+    async def disconnect(self):
+        """리더 스레드 중지 후 연결 해제"""
+        await self.stop_reader()
+        if self.simulator:
+            self.simulator.disconnect()
+            self.simulator = None
+
+    def get_status(self) -> dict[str, Any]:
+        """장치 연결/리더/알림 상태"""
+        return {
+            "sensor_id": self.sensor_id,
+            "name": self.name,
+            "port": self.port,
+            "simulator": "connected" if self.is_connected else "disconnected",
+            "reader": self.frame_reader.get_metrics() if self.frame_reader else None,
+            "alerts": self.alert_engine.get_metrics(),
+        }
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - Downsampling
+차트용 시계열 다운샘플링 (NumPy 벡터화)
+
+기능:
+- LTTB (Largest-Triangle-Three-Buckets): 시각적 형태를 보존하는 N개 포인트 선택
+- min/max 버킷: 버킷별 최소/최대값 포인트 보존 (스파이크 손실 없음)
+- 다중 메트릭(V/A/W) 공통 인덱스 선택 → 행 단위 결과 반환
+- 컬럼 배열 입력 (콜드 아카이브 조회) 인덱스 선택
+- 페이지 스트리밍 사전 축소 (버킷별 첫/마지막/최소/최대 행, 메모리 상한)
+"""
+
+from typing import Any
+
+import numpy as np
+
+DOWNSAMPLE_ALGORITHMS = ("lttb", "minmax")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB로 선택된 인덱스 반환 (첫/마지막 포인트 항상 포함)
+
+    x: (n,) 단조 증가 x축 값
+    y: (n,) 또는 (n, k) 값 - 다중 메트릭은 범위로 정규화한 삼각형 면적 합으로 선택
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        # 버킷을 만들 수 없으면 양 끝점만 사용
+        return np.array([0, n - 1])[:n_out]
+
+    y = y.reshape(n, -1)
+
+    # 메트릭별 범위 정규화 (전압과 전류의 스케일 차이 보정)
+    span = np.ptp(y, axis=0)
+    span[span == 0] = 1.0
+    y = y / span
+
+    # 첫/마지막을 제외한 n-2개 포인트를 n_out-2개 버킷으로 분할
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+    starts, ends = edges[:-1], edges[1:]
+
+    # 다음 버킷의 평균점 (마지막 버킷은 마지막 포인트)
+    counts = np.append(ends - starts, 1)
+    x_sum = np.append(np.add.reduceat(x[:-1], starts), x[-1])
+    y_sum = np.vstack([np.add.reduceat(y[:-1], starts, axis=0), y[-1]])
+    x_mean = x_sum / counts
+    y_mean = y_sum / counts[:, None]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start, end = starts[i], ends[i]
+        cx, cy = x_mean[i + 1], y_mean[i + 1]
+        ax, ay = x[a], y[a]
+
+        # 삼각형 (a, 후보, 다음 버킷 평균) 면적 x2, 메트릭 합산
+        area = np.abs(
+            (ax - cx) * (y[start:end] - ay) - (ax - x[start:end, None]) * (cy - ay)
+        ).sum(axis=1)
+
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """min/max 버킷으로 선택된 인덱스 반환 (시간 순 정렬)
+
+    y: (n,) 또는 (n, k) 값 - 버킷마다 메트릭별 최소/최대 포인트를 보존하므로
+    버킷 수는 n_out // (2k)로 정해 결과가 n_out개를 넘지 않는다.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+
+    y = y.reshape(n, -1)
+    k = y.shape[1]
+
+    # 동일 크기 버킷 (마지막 버킷은 NaN 패딩)
+    bucket_count = max(1, n_out // (2 * k))
+    size = -(-n // bucket_count)
+    bucket_count = -(-n // size)
+
+    padded = np.full((bucket_count * size, k), np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(bucket_count, size, k)
+
+    offsets = (np.arange(bucket_count) * size)[:, None]
+    min_idx = np.nanargmin(blocks, axis=1) + offsets
+    max_idx = np.nanargmax(blocks, axis=1) + offsets
+
+    return np.unique(np.concatenate([min_idx.ravel(), max_idx.ravel()]))
+
+
+def select_indices(
+    x: np.ndarray, y: np.ndarray, points: int, algo: str = "lttb"
+) -> np.ndarray:
+    """시간 오름차순 배열(x: 초, y: (n, m) 값)에서 남길 인덱스 선택"""
+    if algo == "lttb":
+        return lttb_indices(x, y, points)
+    return minmax_indices(y, points)
+
+
+def downsample_rows(
+    rows: list[dict[str, Any]],
+    points: int,
+    algo: str = "lttb",
+    time_key: str = "timestamp",
+    value_keys: tuple[str, ...] = ("voltage", "current", "power"),
+) -> list[dict[str, Any]]:
+    """측정 행 목록을 최대 points개로 다운샘플링 (시간 오름차순 반환)
+
+    rows는 시간 순서와 무관하게 받을 수 있으며, 원본 행(dict)을 그대로 반환한다.
+    """
+    if algo not in DOWNSAMPLE_ALGORITHMS:
+        raise ValueError(f"Unknown downsampling algorithm: {algo}")
+
+    if not rows:
+        return []
+
+    timestamps = np.array([row[time_key] for row in rows], dtype="datetime64[us]")
+    order = np.argsort(timestamps, kind="stable")
+
+    if points >= len(rows):
+        return [rows[i] for i in order]
+
+    x = timestamps[order].astype(np.int64) / 1e6
+    y = np.array(
+        [[rows[i][key] for key in value_keys] for i in order], dtype=np.float64
+    )
+
+    selected = select_indices(x, y, points, algo)
+    return [rows[order[i]] for i in selected]
+
+
+def row_columns(rows: list[tuple], fields: tuple[str, ...]) -> dict[str, np.ndarray]:
+    """행 튜플 목록 → 필드 이름별 NumPy 배열"""
+    return {name: np.array(values) for name, values in zip(fields, zip(*rows))}
+
+
+class BucketReducer:
+    """시간 오름차순 페이지를 고정 시간 버킷 단위로 줄여 가는 스트리밍 사전 축소
+
+    버킷마다 첫/마지막 행과 메트릭별 최소/최대 행만 남긴다 (M4 방식, 선 그래프
+    형태 보존). 다시 줄여도 같은 행이 남으므로 페이지마다 누적 결과와 합쳐 줄이고,
+    메모리는 페이지 크기 + 버킷 수 × (2k + 2)행으로 제한된다.
+    """
+
+    def __init__(
+        self,
+        start: float,
+        end: float,
+        buckets: int,
+        time_key: str = "timestamp",
+        value_keys: tuple[str, ...] = ("voltage", "current", "power"),
+    ):
+        self.start = start
+        self.width = max(end - start, 1) / buckets
+        self.buckets = buckets
+        self.time_key = time_key
+        self.value_keys = value_keys
+        self.count = 0
+        self._kept: dict[str, np.ndarray] = {}
+
+    def add(self, columns: dict[str, np.ndarray]):
+        """다음 페이지 추가 (이전 페이지보다 뒤 시각의 컬럼 배열)"""
+        if not columns or len(columns[self.time_key]) == 0:
+            return
+        self.count += len(columns[self.time_key])
+        if self._kept:
+            columns = {
+                key: np.concatenate([self._kept[key], array])
+                for key, array in columns.items()
+            }
+
+        buckets = (columns[self.time_key] - self.start) // self.width
+        buckets = np.clip(buckets.astype(np.int64), 0, self.buckets - 1)
+
+        # 버킷 번호는 시간 순이라 단조 증가: 경계 위치가 곧 버킷별 첫/마지막 행
+        boundaries = np.flatnonzero(np.diff(buckets)) + 1
+        firsts = np.concatenate([[0], boundaries])
+        lasts = np.append(boundaries - 1, len(buckets) - 1)
+
+        selected = [firsts, lasts]
+        for key in self.value_keys:
+            values = columns[key]
+            for sign in (1, -1):
+                # (버킷, 값) 정렬 후 각 버킷의 첫 위치 = 버킷 최소(최대)값 행
+                selected.append(np.lexsort((sign * values, buckets))[firsts])
+
+        kept = np.unique(np.concatenate(selected))
+        self._kept = {key: array[kept] for key, array in columns.items()}
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """남은 행의 컬럼 배열 (시간 오름차순, 추가된 행이 없으면 빈 dict)"""
+        return self._kept
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - Measurement Export
+측정 데이터 스트리밍 내보내기 (NDJSON / CSV, 키셋 커서 페이징)
+
+기능:
+- 키셋 페이지 조회 → 페이지별 청크 인코딩 → StreamingResponse
+  (범위와 무관한 고정 메모리)
+- 불투명 커서: 마지막 행의 (timestamp ms, sequence_number)를 base64url로 인코딩
+- limit 도달 시 마지막 줄에 다음 커서 기록
+  (NDJSON: {"next_cursor": "..."}, CSV: # next_cursor=...)
+- 컬럼형 내보내기 (pyarrow 설치 시): Arrow IPC 스트림 / Parquet(zstd)
+  측정 데이터와 분석 결과를 큰 배치 단위로 컬럼 배열로 변환 (행 dict 없음)
+"""
+
+import asyncio
+import base64
+import binascii
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Optional
+
+import codec
+from database import (
+    ANALYSIS_COLUMNS,
+    DEFAULT_SENSOR_ID,
+    MEASUREMENT_COLUMNS,
+    PowerDatabase,
+    from_epoch_ms,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXPORT_FIELDS = tuple(column.strip() for column in MEASUREMENT_COLUMNS.split(","))
+SEQUENCE_INDEX = EXPORT_FIELDS.index("sequence_number")
+
+# 형식 이름 → (media type, 파일 확장자)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+def encode_cursor(key: tuple[int, int]) -> str:
+    """(timestamp ms, sequence_number) → 불투명 커서 문자열"""
+    return base64.urlsafe_b64encode(f"{key[0]}:{key[1]}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """커서 문자열 → (timestamp ms, sequence_number) (형식이 틀리면 ValueError)"""
+    try:
+        timestamp, sequence = base64.urlsafe_b64decode(cursor.encode()).split(b":")
+        return int(timestamp), int(sequence)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _encode_ndjson(rows: list[tuple]) -> bytes:
+    lines = []
+    for row in rows:
+        record = dict(zip(EXPORT_FIELDS, row))
+        record["timestamp"] = from_epoch_ms(row[0])
+        lines.append(codec.dumps_bytes(record))
+    lines.append(b"")
+    return b"\n".join(lines)
+
+
+def _encode_csv(rows: list[tuple]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows((from_epoch_ms(row[0]), *row[1:]) for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_measurements(
+    db: PowerDatabase,
+    start: datetime,
+    end: datetime,
+    export_format: str = "ndjson",
+    after: Optional[tuple[int, int]] = None,
+    limit: Optional[int] = None,
+    page_size: int = 5000,
+    sensor_id: int = DEFAULT_SENSOR_ID,
+) -> AsyncIterator[bytes]:
+    """장치의 측정 데이터를 형식별 바이트 청크로 스트리밍 (페이지 1개 = 청크 1개)"""
+    encode = _encode_ndjson if export_format == "ndjson" else _encode_csv
+    if export_format == "csv":
+        yield (",".join(EXPORT_FIELDS) + "\n").encode()
+
+    sent = 0
+    last_key = None
+    async for rows in db.iter_measurement_pages(
+        start, end, after, page_size, sensor_id
+    ):
+        if limit is not None:
+            rows = rows[: limit - sent]
+        yield encode(rows)
+        sent += len(rows)
+        last_key = (rows[-1][0], rows[-1][SEQUENCE_INDEX])
+        if limit is not None and sent >= limit:
+            break
+
+    if limit is not None and sent >= limit and last_key is not None:
+        cursor = encode_cursor(last_key)
+        if export_format == "ndjson":
+            yield codec.dumps_bytes({"next_cursor": cursor}) + b"\n"
+        else:
+            yield f"# next_cursor={cursor}\n".encode()
+
+
+# 컬럼형 형식 이름 → (media type, 파일 확장자)
+ARROW_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+ARROW_TABLES = ("measurements", "analysis")
+
+
+def _columns(names: str) -> list[str]:
+    return [column.strip() for column in names.split(",")]
+
+
+def _arrow_schema(table: str) -> "pa.Schema":
+    """내보내기 스키마 (타임스탬프는 UTC 기준 시각, 반복 문자열은 dictionary 인코딩)"""
+    text = pa.dictionary(pa.int32(), pa.string())
+    if table == "measurements":
+        types = [
+            pa.timestamp("ms", tz="UTC"),
+            pa.float64(),
+            pa.float64(),
+            pa.float64(),
+            pa.int64(),
+            text,
+            text,
+        ]
+        return pa.schema(list(zip(_columns(MEASUREMENT_COLUMNS), types)))
+
+    types = [
+        pa.int64(),
+        pa.timestamp("us", tz="UTC"),
+        text,
+        pa.float64(),
+        pa.float64(),
+        pa.float64(),
+        pa.float64(),
+        pa.bool_(),
+        pa.float64(),
+        text,
+        text,
+        pa.float64(),
+        pa.int64(),
+    ]
+    return pa.schema(list(zip(_columns(ANALYSIS_COLUMNS), types)))
+
+
+def _local_utc_offset_us() -> int:
+    """현재 로컬 UTC 오프셋 (µs, 분석 결과 로컬 시각 → UTC 변환용)"""
+    offset = datetime.now().astimezone().utcoffset()
+    return int(offset.total_seconds() * 1_000_000)
+
+
+def _arrow_array(values: tuple, field: "pa.Field") -> "pa.Array":
+    """한 컬럼의 값 튜플 → Arrow 배열"""
+    if pa.types.is_dictionary(field.type):
+        return pa.array(values, pa.string()).dictionary_encode()
+    if pa.types.is_timestamp(field.type):
+        if field.type.unit == "ms":
+            # 측정 데이터: epoch 밀리초 정수
+            return pa.array(values, pa.int64()).cast(field.type)
+        # 분석 결과: 로컬 ISO 문자열 → 로컬 µs에서 오프셋을 빼서 UTC로
+        local = pa.array(values, pa.string()).cast(pa.timestamp("us"))
+        utc = pc.subtract(local.cast(pa.int64()), _local_utc_offset_us())
+        return utc.cast(field.type)
+    if pa.types.is_boolean(field.type):
+        return pa.array(values, pa.int8()).cast(pa.bool_())
+    return pa.array(values, field.type)
+
+
+def _arrow_batch(rows: list[tuple], schema: "pa.Schema") -> "pa.RecordBatch":
+    """행 튜플 페이지 → RecordBatch (컬럼 단위 변환)"""
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [_arrow_array(values, field) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+class _DrainSink(io.RawIOBase):
+    """쓰인 바이트를 모아 두었다가 drain()으로 꺼내는 출력 스트림
+
+    tell()은 누적 위치를 반환하므로 Parquet 푸터 오프셋이 올바르게 기록된다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_arrow(
+    db: PowerDatabase,
+    table: str,
+    start: datetime,
+    end: datetime,
+    export_format: str = "arrow",
+    batch_rows: int = 65536,
+    sensor_id: int = DEFAULT_SENSOR_ID,
+) -> AsyncIterator[bytes]:
+    """장치의 측정 데이터 / 분석 결과를 Arrow IPC 스트림 또는 Parquet 바이트로 스트리밍
+
+    DB 페이지 1개 = RecordBatch(Parquet row group) 1개.
+    변환/인코딩은 워커 스레드에서 실행.
+    """
+    schema = _arrow_schema(table)
+    sink = _DrainSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    if table == "measurements":
+        pages = db.iter_measurement_pages(
+            start, end, page_size=batch_rows, sensor_id=sensor_id
+        )
+    else:
+        pages = db.iter_analysis_pages(
+            start, end, page_size=batch_rows, sensor_id=sensor_id
+        )
+
+    def write(rows: list[tuple]) -> bytes:
+        writer.write_batch(_arrow_batch(rows, schema))
+        return sink.drain()
+
+    try:
+        async for rows in pages:
+            yield await asyncio.to_thread(write, rows)
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def write_arrow_file(
+    db: PowerDatabase,
+    path: str,
+    table: str,
+    start: datetime,
+    end: datetime,
+    export_format: str = "parquet",
+    sensor_id: int = DEFAULT_SENSOR_ID,
+) -> int:
+    """stream_arrow 결과를 파일로 저장 (쓴 바이트 수 반환)"""
+    written = 0
+    with open(path, "wb") as f:
+        async for chunk in stream_arrow(
+            db, table, start, end, export_format, sensor_id=sensor_id
+        ):
+            f.write(chunk)
+            written += len(chunk)
+    return written
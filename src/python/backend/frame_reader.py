@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - Frame Reader
+시뮬레이터/시리얼 읽기를 이벤트 루프 밖에서 수행하는 리더 스레드
+
+기능:
+- BaseSimulator.read_frame() 블로킹 호출을 전용 스레드에서 실행
+- 수신 라인을 스레드에서 파싱
+  (측정 라인은 codec 타입 검증 디코딩, 그 외 JSON 메시지는 dict,
+  바이너리 프레임은 디코딩된 dict 그대로)
+- call_soon_threadsafe로 asyncio.Queue에 프레임 전달
+- 큐가 가득 차면 가장 오래된 프레임 폐기 (drop-oldest)
+- 장치 여러 개가 같은 큐를 공유할 수 있도록 프레임에 sensor_id 부여
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+import codec
+
+
+class FrameReader:
+    """시뮬레이터 읽기 스레드 → asyncio.Queue 브리지"""
+
+    def __init__(
+        self,
+        simulator,
+        frame_queue: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        read_timeout: float = 0.1,
+        sensor_id: Optional[int] = None,
+    ):
+        self.simulator = simulator
+        self.frame_queue = frame_queue
+        self.loop = loop
+        self.read_timeout = read_timeout
+        self.sensor_id = sensor_id
+        self.logger = logging.getLogger(__name__)
+
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.metrics = {
+            "frames_read": 0,
+            "binary_frames": 0,
+            "frames_dropped": 0,
+            "parse_errors": 0,
+            "read_errors": 0,
+            "last_frame_time": None,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """리더 스레드 시작"""
+        if self._running:
+            return
+
+        self._running = True
+        name = (
+            "FrameReader" if self.sensor_id is None else f"FrameReader-{self.sensor_id}"
+        )
+        self._thread = threading.Thread(target=self._read_loop, name=name, daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        """리더 스레드 중지 (현재 read 호출이 끝날 때까지 대기)"""
+        self._running = False
+        if self._thread and self._thread.is_alive():
+            await asyncio.to_thread(self._thread.join, self.read_timeout * 10)
+        self._thread = None
+
+    def _read_loop(self):
+        """블로킹 읽기 루프 (전용 스레드)"""
+        while self._running:
+            if not self.simulator or not self.simulator.is_connected():
+                time.sleep(self.read_timeout)
+                continue
+
+            try:
+                item = self.simulator.read_frame(timeout=self.read_timeout)
+            except Exception as e:
+                self.metrics["read_errors"] += 1
+                self.logger.error(f"Frame read error: {e}")
+                time.sleep(self.read_timeout)
+                continue
+
+            if not item:
+                continue
+
+            if isinstance(item, dict):
+                # 바이너리 프레임 (시뮬레이터에서 이미 디코딩됨)
+                frame = item
+                self.metrics["binary_frames"] += 1
+            else:
+                frame = self._parse(item)
+                if frame is None:
+                    continue
+
+            if self.sensor_id is not None:
+                frame["sensor_id"] = self.sensor_id
+
+            self.metrics["frames_read"] += 1
+            try:
+                self.loop.call_soon_threadsafe(self._enqueue, frame)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘
+                break
+
+    def _parse(self, line: str) -> Optional[dict[str, Any]]:
+        """수신 라인 파싱 (JSON이 아닌 데이터, 필드 타입이 틀린 측정은 무시)"""
+        # 측정 라인: 파싱과 타입 검증을 한 번에 (msgspec 설치 시 Struct 디코딩)
+        frame = codec.decode_measurement_line(line)
+        if frame is not None:
+            return frame
+
+        # 측정이 아닌 메시지 (상태 / 명령 응답)
+        try:
+            frame = codec.loads(line)
+        except codec.DECODE_ERRORS:
+            self.metrics["parse_errors"] += 1
+            return None
+
+        if not isinstance(frame, dict) or all(
+            key in frame for key in codec.MEASUREMENT_KEYS
+        ):
+            self.metrics["parse_errors"] += 1
+            return None
+
+        return frame
+
+    def _enqueue(self, frame: dict[str, Any]):
+        """이벤트 루프에서 실행: 큐가 가득 차면 가장 오래된 프레임 폐기"""
+        if self.frame_queue.full():
+            try:
+                self.frame_queue.get_nowait()
+                self.metrics["frames_dropped"] += 1
+            except asyncio.QueueEmpty:
+                pass
+
+        self.frame_queue.put_nowait(frame)
+        self.metrics["last_frame_time"] = time.time()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """리더 메트릭 반환"""
+        return {
+            "sensor_id": self.sensor_id,
+            "running": self.is_running,
+            "queue_size": self.frame_queue.qsize(),
+            "queue_maxsize": self.frame_queue.maxsize,
+            **self.metrics,
+        }
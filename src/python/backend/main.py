@@ -9,9 +9,13 @@ Phase 4.1: Advanced Data Analysis & Outlier Detection
 - 시뮬레이터 연동
 - 실시간 데이터 브로드캐스팅
 - 1분 통계 패널
-- 임계값 알림 시스템
+- 임계값 알림 시스템 (히스테리시스/디바운스 상태 머신, 전이 시에만 기록)
 - SQLite 데이터베이스 48시간 저장
 - 히스토리 데이터 조회 API
+- 다중 해상도 롤업 조회 (1초/1분/1시간 tier 자동 선택)
+- 차트용 서버 측 다운샘플링 (LTTB, min/max)
+- 고속 버스트 프레임 수집 (버스트 단위 DB 배치/분석/브로드캐스트)
+- 다중 센서: 장치 레지스트리 + 장치별 리더/분석/알림 파이프라인 (sensor_id)
 - 자동 데이터 정리 시스템
 - 이동평균 계산 (1분, 5분, 15분)
 - 이상치 탐지 (Z-score, IQR 방법)
@@ -49,73 +53,195 @@ if sys.platform.startswith("win"):
     )
 
 import asyncio
-import json
 import os
 import sqlite3
 import sys
+import time
+from collections import deque
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
+# JSON 코덱 모듈 임포트 (orjson/msgspec 선택적 사용)
+import codec
+
+# 측정 데이터 내보내기 모듈 임포트 (NDJSON/CSV, pyarrow 선택적 사용)
+import export
+import numpy as np
 import uvicorn
 
-# 데이터 분석 모듈 임포트
-from data_analyzer import DataAnalyzer
+# 알림 상태 머신 모듈 임포트
+from alert_engine import AlertTransition
 
 # 데이터베이스 모듈 임포트
-from database import DatabaseManager, auto_cleanup_task
+from database import (
+    DEFAULT_SENSOR_ID,
+    DEFAULT_SENSOR_NAME,
+    MEASUREMENT_FIELDS,
+    ROLLUP_TIERS,
+    AnalysisBatchWriter,
+    DatabaseManager,
+    MeasurementBatchWriter,
+    auto_cleanup_task,
+    maintenance_task,
+    measurement_rows,
+    to_epoch_ms,
+)
+
+# 장치별 수집 파이프라인 모듈 임포트 (리더 스레드 + 분석기 + 알림 엔진)
+from device_pipeline import DevicePipeline
+from downsampling import (
+    DOWNSAMPLE_ALGORITHMS,
+    BucketReducer,
+    row_columns,
+    select_indices,
+)
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 
 # 시뮬레이터 패키지 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 try:
     from simulator import create_simulator
+    from simulator.binary_protocol import BURST_MAX_SAMPLES, BURST_RATE_RANGE
 except ImportError:
     print("❌ Simulator package not found. Please check the path.")
     sys.exit(1)
 
+# 측정 데이터 전송 포맷 (binary: 24바이트 프레임, json: 기존 JSON 라인)
+SIMULATOR_FRAME_FORMAT = os.environ.get("SIMULATOR_FRAME_FORMAT", "binary")
+
+
+class ClientChannel:
+    """클라이언트별 bounded 전송 큐 + writer 태스크
+
+    느린 클라이언트는 자기 큐만 밀리고 다른 클라이언트와 수집 루프는 대기하지 않는다.
+    - drop_oldest: 큐가 가득 차면 가장 오래된 메시지 폐기
+    - coalesce_latest: 대기 메시지를 최신 메시지 1개로 교체
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        manager: "ConnectionManager",
+        max_queue: int = 100,
+        policy: str = "drop_oldest",
+    ):
+        if policy not in ("drop_oldest", "coalesce_latest"):
+            raise ValueError(f"Unknown broadcast policy: {policy}")
+
+        self.websocket = websocket
+        self.manager = manager
+        self.policy = policy
+        maxlen = 1 if policy == "coalesce_latest" else max_queue
+        # (enqueue 시각, 메시지) - deque(maxlen)이 오래된 항목을 자동 폐기
+        self.queue: deque[tuple[float, str]] = deque(maxlen=maxlen)
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.connected_at = time.time()
+
+        self.metrics = {
+            "sent": 0,
+            "dropped": 0,
+            "last_lag_ms": 0.0,
+            "max_lag_ms": 0.0,
+        }
+
+    def start(self):
+        """writer 태스크 시작"""
+        self.task = asyncio.create_task(self._writer_loop())
+
+    def stop(self):
+        """writer 태스크 취소"""
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    def enqueue(self, message: str):
+        """메시지 추가 (대기 없음)"""
+        if len(self.queue) == self.queue.maxlen:
+            self.metrics["dropped"] += 1
+        self.queue.append((time.perf_counter(), message))
+        self.ready.set()
+
+    async def _writer_loop(self):
+        """큐의 메시지를 순서대로 전송"""
+        try:
+            while True:
+                await self.ready.wait()
+                self.ready.clear()
+
+                while self.queue:
+                    enqueued_at, message = self.queue.popleft()
+                    await self.websocket.send_text(message)
+
+                    lag_ms = (time.perf_counter() - enqueued_at) * 1000
+                    self.metrics["sent"] += 1
+                    self.metrics["last_lag_ms"] = round(lag_ms, 3)
+                    self.metrics["max_lag_ms"] = round(
+                        max(self.metrics["max_lag_ms"], lag_ms), 3
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 정상적인 연결 종료는 에러로 표시하지 않음
+            if "already completed" not in str(e) and "websocket.close" not in str(e):
+                print(f"❌ Failed to send message to client: {e}")
+            self.manager.disconnect(self.websocket)
+
+    def get_metrics(self) -> dict[str, Any]:
+        """클라이언트 전송 메트릭 (현재 lag = 가장 오래된 대기 메시지의 대기 시간)"""
+        pending_lag_ms = (
+            (time.perf_counter() - self.queue[0][0]) * 1000 if self.queue else 0.0
+        )
+        client = self.websocket.client
+        return {
+            "client": f"{client.host}:{client.port}" if client else None,
+            "policy": self.policy,
+            "queued": len(self.queue),
+            "pending_lag_ms": round(pending_lag_ms, 3),
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+            **self.metrics,
+        }
+
 
 class ConnectionManager:
-    """WebSocket 연결 관리자"""
+    """WebSocket 연결 관리자 (클라이언트별 큐 fan-out 브로드캐스트)"""
 
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
+    def __init__(self, max_queue: int = 100, policy: str = "drop_oldest"):
+        self.max_queue = max_queue
+        self.policy = policy
+        self.channels: dict[WebSocket, ClientChannel] = {}
+
+    @property
+    def active_connections(self) -> list[WebSocket]:
+        return list(self.channels.keys())
 
     async def connect(self, websocket: WebSocket):
         """클라이언트 연결"""
         await websocket.accept()
-        self.active_connections.append(websocket)
-        print(f"✅ Client connected. Total connections: {len(self.active_connections)}")
+        channel = ClientChannel(websocket, self, self.max_queue, self.policy)
+        self.channels[websocket] = channel
+        channel.start()
+        print(f"✅ Client connected. Total connections: {len(self.channels)}")
 
     def disconnect(self, websocket: WebSocket):
         """클라이언트 연결 해제"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        print(
-            f"🔌 Client disconnected. Total connections: {len(self.active_connections)}"
-        )
-
-    async def broadcast(self, message: str):
-        """모든 연결된 클라이언트에게 메시지 브로드캐스트"""
-        if not self.active_connections:
+        channel = self.channels.pop(websocket, None)
+        if channel is None:
             return
 
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                # 정상적인 연결 종료는 에러로 표시하지 않음
-                if "already completed" not in str(e) and "websocket.close" not in str(
-                    e
-                ):
-                    print(f"❌ Failed to send message to client: {e}")
-                disconnected.append(connection)
+        channel.stop()
+        print(f"🔌 Client disconnected. Total connections: {len(self.channels)}")
 
-        # 연결이 끊어진 클라이언트 제거
-        for connection in disconnected:
-            self.disconnect(connection)
+    async def broadcast(self, message: str):
+        """모든 클라이언트 큐에 메시지 추가 (직렬화된 문자열 1개를 공유)"""
+        for channel in list(self.channels.values()):
+            channel.enqueue(message)
+
+    def get_metrics(self) -> list[dict[str, Any]]:
+        """클라이언트별 lag 메트릭"""
+        return [channel.get_metrics() for channel in self.channels.values()]
 
 
 class PowerMonitoringServer:
@@ -125,23 +251,42 @@ class PowerMonitoringServer:
         # FastAPI 앱은 나중에 설정됨
         self.app = None
         self.manager = ConnectionManager()
-        self.simulator = None
         self.is_running = False
+        self.collector_task = None
         self.db = DatabaseManager.get_instance()
 
-        # 데이터 분석기 초기화
-        self.data_analyzer = DataAnalyzer(self.db.db_path)
+        # 장치별 리더 스레드 → 수집 루프 공용 프레임 큐 (이벤트 루프에서 생성)
+        self.frame_queue = None
 
-        # 1분 통계 버퍼
-        self.minute_buffer = {
-            "voltage": [],
-            "current": [],
-            "power": [],
-            "start_time": None,
+        # 장치 파이프라인 (sensor_id → 연결/리더/분석기/알림 엔진)
+        # 기본 장치는 항상 존재하고, 나머지는 수집 시작 시 레지스트리에서 불러옴
+        self.devices: dict[int, DevicePipeline] = {
+            DEFAULT_SENSOR_ID: DevicePipeline(
+                DEFAULT_SENSOR_ID, DEFAULT_SENSOR_NAME, "MOCK", self.db.db_path
+            )
         }
 
+        # 측정 데이터 write-behind 기록기 (크기/시간 기반 배치 저장)
+        self.measurement_writer = MeasurementBatchWriter(
+            self.db, batch_size=100, flush_interval=1.0, max_pending=10000
+        )
+
+        # 분석 결과 write-behind 기록기 (이상치 + 장치별 10번째 샘플마다 저장)
+        self.analysis_writer = AnalysisBatchWriter(
+            self.db, sample_every=10, batch_size=300, flush_interval=2.0
+        )
+
         # 라우트 설정은 앱이 설정된 후에 호출됨
 
+    def get_device(self, sensor_id: int) -> DevicePipeline:
+        """등록된 장치 파이프라인 (없으면 404)"""
+        device = self.devices.get(sensor_id)
+        if device is None:
+            raise HTTPException(
+                status_code=404, detail=f"Unknown sensor_id: {sensor_id}"
+            )
+        return device
+
     def setup_routes(self):
         """API 라우트 설정"""
 
@@ -1561,8 +1706,8 @@ class PowerMonitoringServer:
                 log(`📊 Loading history data: ${hours}h (${historyMode} mode)`, 'info');
 
                 const endpoint = historyMode === 'measurements'
-                    ? `/api/measurements?hours=${hours}&limit=2000`
-                    : `/api/statistics?hours=${hours}`;
+                    ? `/api/measurements?hours=${hours}&points=1000&algo=lttb`
+                    : `/api/rollups?hours=${hours}&max_points=2000`;
 
                 const response = await fetch(endpoint);
                 const result = await response.json();
@@ -1824,7 +1969,7 @@ class PowerMonitoringServer:
         // 히스토리 데이터 다운로드
         async function downloadHistoryData() {
             try {
-                const endpoint = `/api/measurements?hours=${currentHistoryHours}&limit=10000`;
+                const endpoint = `/api/measurements?hours=${currentHistoryHours}&limit=10000&tier=raw`;
                 const response = await fetch(endpoint);
                 const result = await response.json();
 
@@ -1935,15 +2080,26 @@ class PowerMonitoringServer:
         async def status():
             """시스템 상태"""
             db_stats = await self.db.get_database_stats()
+            default_device = self.devices[DEFAULT_SENSOR_ID]
             return {
                 "server": "running",
                 "simulator": (
-                    "connected"
-                    if self.simulator and self.simulator.is_connected()
-                    else "disconnected"
+                    "connected" if default_device.is_connected else "disconnected"
                 ),
+                "devices": [device.get_status() for device in self.devices.values()],
                 "websocket_connections": len(self.manager.active_connections),
+                "websocket_clients": self.manager.get_metrics(),
                 "database": db_stats,
+                "database_pool": self.db.pool.get_metrics(),
+                "ingest": self.measurement_writer.get_metrics(),
+                "analysis_ingest": self.analysis_writer.get_metrics(),
+                "reader": (
+                    default_device.frame_reader.get_metrics()
+                    if default_device.frame_reader
+                    else None
+                ),
+                "alerts": default_device.alert_engine.get_metrics(),
+                "json_backend": codec.JSON_BACKEND,
                 "timestamp": datetime.now().isoformat(),
             }
 
@@ -1967,20 +2123,25 @@ class PowerMonitoringServer:
                             print(f"❌ WebSocket receive error: {e}")
                         break
             except WebSocketDisconnect:
+                pass
+            finally:
                 self.manager.disconnect(websocket)
 
         @self.app.post("/simulator/start")
-        async def start_simulator():
-            """시뮬레이터 시작"""
-            if self.simulator and self.simulator.is_connected():
+        async def start_simulator(sensor_id: int = DEFAULT_SENSOR_ID):
+            """장치 시뮬레이터 시작 (기본: 기본 장치)"""
+            device = self.get_device(sensor_id)
+            if device.is_connected:
                 return {"status": "already_running"}
 
             try:
-                self.simulator = create_simulator("MOCK")
-                if self.simulator.connect():
+                await device.stop_reader()
+                if self.connect_device(device):
+                    self.start_device_reader(device)
                     return {
                         "status": "started",
-                        "type": self.simulator.get_simulator_type(),
+                        "sensor_id": sensor_id,
+                        "type": device.simulator.get_simulator_type(),
                     }
                 else:
                     return {"status": "failed", "error": "Connection failed"}
@@ -1988,26 +2149,52 @@ class PowerMonitoringServer:
                 return {"status": "error", "error": str(e)}
 
         @self.app.post("/simulator/stop")
-        async def stop_simulator():
-            """시뮬레이터 중지"""
-            if self.simulator:
-                self.simulator.disconnect()
-                self.simulator = None
-                return {"status": "stopped"}
+        async def stop_simulator(sensor_id: int = DEFAULT_SENSOR_ID):
+            """장치 시뮬레이터 중지 (기본: 기본 장치)"""
+            device = self.get_device(sensor_id)
+            if device.simulator:
+                await device.disconnect()
+                return {"status": "stopped", "sensor_id": sensor_id}
             return {"status": "not_running"}
 
-        # 새로운 데이터베이스 API 엔드포인트들
-        @self.app.get("/api/measurements")
-        async def get_measurements(hours: int = 24, limit: int = 1000):
-            """측정 데이터 조회"""
-            try:
-                measurements = await self.db.get_recent_measurements(
-                    hours=hours, limit=limit
+        @self.app.post("/simulator/burst")
+        async def set_simulator_burst(
+            rate_hz: int = 1000, samples: int = 100, sensor_id: int = DEFAULT_SENSOR_ID
+        ):
+            """고속 버스트 수집 모드 설정 (rate_hz=0이면 해제)"""
+            rate_ok = rate_hz == 0 or (
+                BURST_RATE_RANGE[0] <= rate_hz <= BURST_RATE_RANGE[1]
+            )
+            if not rate_ok or not 1 <= samples <= BURST_MAX_SAMPLES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=(
+                        f"rate_hz must be 0 or {BURST_RATE_RANGE[0]}-"
+                        f"{BURST_RATE_RANGE[1]}, samples 1-{BURST_MAX_SAMPLES}"
+                    ),
                 )
+
+            device = self.get_device(sensor_id)
+            if not device.is_connected:
+                return {"status": "not_running"}
+
+            if device.simulator.set_burst_mode(rate_hz, samples):
+                return {"status": "requested", "rate_hz": rate_hz, "samples": samples}
+            return {"status": "failed", "error": "Command not sent"}
+
+        # === 장치 레지스트리 API ===
+
+        @self.app.get("/api/devices")
+        async def get_devices():
+            """등록된 장치 목록 (레지스트리 + 실행 중 파이프라인 상태)"""
+            try:
+                devices = await self.db.get_devices()
+                for device in devices:
+                    pipeline = self.devices.get(device["sensor_id"])
+                    device["status"] = pipeline.get_status() if pipeline else None
                 return {
-                    "data": measurements,
-                    "count": len(measurements),
-                    "hours": hours,
+                    "data": devices,
+                    "count": len(devices),
                     "timestamp": datetime.now().isoformat(),
                 }
             except Exception as e:
@@ -2016,15 +2203,348 @@ class PowerMonitoringServer:
                     status_code=500, detail="Internal server error"
                 ) from e
 
+        @self.app.post("/api/devices")
+        async def register_device(
+            name: str, port: str = "MOCK", description: Optional[str] = None
+        ):
+            """장치 등록 (수집 중이면 바로 연결하고 리더 시작)"""
+            if not name.strip():
+                raise HTTPException(status_code=400, detail="name must not be empty")
+
+            sensor_id = await self.db.register_device(name, port, description)
+            if sensor_id is None:
+                raise HTTPException(
+                    status_code=400, detail=f"Device already registered: {name}"
+                )
+
+            device = self.add_device(sensor_id, name, port)
+            if self.is_running and self.connect_device(device):
+                self.start_device_reader(device)
+            return {
+                "status": "registered",
+                "sensor_id": sensor_id,
+                "device": device.get_status(),
+                "timestamp": datetime.now().isoformat(),
+            }
+
+        @self.app.post("/api/devices/{sensor_id}/enable")
+        async def enable_device(sensor_id: int):
+            """장치 활성화 (수집 중이면 연결하고 리더 시작)"""
+            devices = {
+                device["sensor_id"]: device for device in await self.db.get_devices()
+            }
+            if sensor_id not in devices:
+                raise HTTPException(
+                    status_code=404, detail=f"Unknown sensor_id: {sensor_id}"
+                )
+
+            await self.db.set_device_enabled(sensor_id, True)
+            device = self.devices.get(sensor_id) or self.add_device(
+                sensor_id, devices[sensor_id]["name"], devices[sensor_id]["port"]
+            )
+            if self.is_running and not device.is_connected:
+                if self.connect_device(device):
+                    self.start_device_reader(device)
+            return {"status": "enabled", "device": device.get_status()}
+
+        @self.app.post("/api/devices/{sensor_id}/disable")
+        async def disable_device(sensor_id: int):
+            """장치 비활성화 (리더 중지, 열린 알림 해제, 파이프라인 제거)"""
+            if sensor_id == DEFAULT_SENSOR_ID:
+                raise HTTPException(
+                    status_code=400, detail="Default device cannot be disabled"
+                )
+            if not await self.db.set_device_enabled(sensor_id, False):
+                raise HTTPException(
+                    status_code=404, detail=f"Unknown sensor_id: {sensor_id}"
+                )
+
+            device = self.devices.pop(sensor_id, None)
+            if device:
+                await self.close_device(device)
+            return {"status": "disabled", "sensor_id": sensor_id}
+
+        # 새로운 데이터베이스 API 엔드포인트들
+        @self.app.get("/api/measurements")
+        async def get_measurements(
+            hours: int = 24,
+            limit: int = 1000,
+            points: Optional[int] = None,
+            algo: str = "lttb",
+            tier: str = "auto",
+            sensor_id: int = DEFAULT_SENSOR_ID,
+        ):
+            """장치의 측정 데이터 조회
+
+            points 미지정: 최신 순 최대 limit행. tier(auto | raw | 1s | 1m | 1h)가
+            auto면 범위의 원본 행이 limit을 넘을 때 limit 예산에 맞는 롤업 tier로 조회
+            (롤업 행의 voltage/current/power는 버킷 평균, *_min/max/avg 포함)
+            points 지정 시 limit 없이 전체 범위를 읽어 서버에서 다운샘플링
+            (algo: lttb | minmax, 시간 오름차순 반환, 메모리는 points에 비례)
+            """
+            if points is not None and (points < 3 or algo not in DOWNSAMPLE_ALGORITHMS):
+                raise HTTPException(
+                    status_code=400,
+                    detail=(
+                        f"points must be >= 3 and algo one of {DOWNSAMPLE_ALGORITHMS}"
+                    ),
+                )
+            if tier != "auto" and tier != "raw" and tier not in ROLLUP_TIERS:
+                raise HTTPException(
+                    status_code=400, detail=f"Unknown rollup tier: {tier}"
+                )
+
+            try:
+                if points is None:
+                    result = await self.db.get_measurements(
+                        hours=hours, limit=limit, tier=tier, sensor_id=sensor_id
+                    )
+                    return codec.FastJSONResponse(
+                        {
+                            **result,
+                            "count": len(result["data"]),
+                            "hours": hours,
+                            "sensor_id": sensor_id,
+                            "timestamp": datetime.now().isoformat(),
+                        }
+                    )
+
+                # 원본 샘플 로그 사용 시: 로그의 컬럼 배열을 그대로 사용
+                end = datetime.now()
+                start = end - timedelta(hours=hours)
+                columns = await self.db.get_raw_columns(start, sensor_id=sensor_id)
+                if columns is not None:
+                    source_count = len(columns["timestamp"])
+                else:
+                    # SQLite: 키셋 페이지를 points개 시간 버킷의 첫/마지막/최소/최대
+                    # 행으로 줄여 가며 읽음 (메모리는 조회 범위가 아니라 points에 비례)
+                    reducer = BucketReducer(
+                        to_epoch_ms(start), to_epoch_ms(end), points
+                    )
+                    async for page in self.db.iter_measurement_pages(
+                        start, end, sensor_id=sensor_id
+                    ):
+                        await asyncio.to_thread(
+                            reducer.add, row_columns(page, MEASUREMENT_FIELDS)
+                        )
+                    source_count = reducer.count
+                    columns = reducer.columns()
+
+                # 컬럼 배열에서 선택 후 선택된 행만 변환
+                if source_count > points and len(columns["timestamp"]) > points:
+                    selected = await asyncio.to_thread(
+                        select_indices,
+                        columns["timestamp"] / 1000,
+                        np.column_stack(
+                            [columns[key] for key in ("voltage", "current", "power")]
+                        ),
+                        points,
+                        algo,
+                    )
+                    columns = {key: array[selected] for key, array in columns.items()}
+                sampled = measurement_rows(columns) if source_count else []
+                return codec.FastJSONResponse(
+                    {
+                        "data": sampled,
+                        "count": len(sampled),
+                        "hours": hours,
+                        "sensor_id": sensor_id,
+                        "downsampling": {
+                            "algo": algo,
+                            "points": points,
+                            "source_count": source_count,
+                        },
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                )
+            except Exception as e:
+                # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
+
+        @self.app.get("/api/export/measurements")
+        async def export_measurements(
+            format: str = "ndjson",
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+            cursor: Optional[str] = None,
+            limit: Optional[int] = None,
+            sensor_id: int = DEFAULT_SENSOR_ID,
+        ):
+            """장치의 측정 데이터 스트리밍 내보내기 (NDJSON / CSV)
+
+            start/end: ISO 시각 (기본: 보관 기간 전체), cursor: 이전 응답의 next_cursor,
+            limit: 응답당 최대 행 수 (도달 시 마지막 줄에 next_cursor 기록)
+            """
+            if format not in export.EXPORT_FORMATS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"format must be one of {list(export.EXPORT_FORMATS)}",
+                )
+            if limit is not None and limit < 1:
+                raise HTTPException(status_code=400, detail="limit must be >= 1")
+
+            try:
+                end_time = datetime.fromisoformat(end) if end else datetime.now()
+                start_time = (
+                    datetime.fromisoformat(start)
+                    if start
+                    else end_time - timedelta(hours=self.db.data_retention_hours)
+                )
+                after = export.decode_cursor(cursor) if cursor else None
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+
+            media_type, extension = export.EXPORT_FORMATS[format]
+            return StreamingResponse(
+                export.stream_measurements(
+                    self.db,
+                    start_time,
+                    end_time,
+                    format,
+                    after,
+                    limit,
+                    sensor_id=sensor_id,
+                ),
+                media_type=media_type,
+                headers={
+                    "Content-Disposition": (
+                        f'attachment; filename="measurements.{extension}"'
+                    )
+                },
+            )
+
+        @self.app.get("/api/export/arrow")
+        async def export_arrow(
+            table: str = "measurements",
+            format: str = "arrow",
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+            sensor_id: int = DEFAULT_SENSOR_ID,
+        ):
+            """장치의 컬럼형 내보내기 (Arrow IPC 스트림 / Parquet zstd, pyarrow 필요)
+
+            table: measurements | analysis, start/end: ISO 시각 (기본: 보관 기간 전체)
+            """
+            if export.pa is None:
+                raise HTTPException(status_code=501, detail="pyarrow is not installed")
+            if table not in export.ARROW_TABLES or format not in export.ARROW_FORMATS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=(
+                        f"table must be one of {list(export.ARROW_TABLES)} and "
+                        f"format one of {list(export.ARROW_FORMATS)}"
+                    ),
+                )
+
+            try:
+                end_time = datetime.fromisoformat(end) if end else datetime.now()
+                start_time = (
+                    datetime.fromisoformat(start)
+                    if start
+                    else end_time - timedelta(hours=self.db.data_retention_hours)
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+
+            media_type, extension = export.ARROW_FORMATS[format]
+            return StreamingResponse(
+                export.stream_arrow(
+                    self.db, table, start_time, end_time, format, sensor_id=sensor_id
+                ),
+                media_type=media_type,
+                headers={
+                    "Content-Disposition": (
+                        f'attachment; filename="{table}.{extension}"'
+                    )
+                },
+            )
+
+        @self.app.get("/api/archive")
+        async def get_archive_stats():
+            """콜드 아카이브 현황 (날짜 파일/블록/행 수, 샘플당 바이트)"""
+            try:
+                stats = await asyncio.to_thread(self.db.archive.get_stats)
+                return {"data": stats, "timestamp": datetime.now().isoformat()}
+            except Exception as e:
+                # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
+
+        @self.app.get("/api/archive/measurements")
+        async def get_archived_measurements(
+            start: str,
+            end: str,
+            points: int = 2000,
+            algo: str = "lttb",
+            sensor_id: int = DEFAULT_SENSOR_ID,
+        ):
+            """장치의 콜드 아카이브 원본 측정 데이터 조회 (보관 기간 이전 구간)
+
+            start/end: ISO 시각, 결과가 points보다 많으면 다운샘플링.
+            컬럼 배열 형식으로 반환 (timestamp: epoch 밀리초)
+            """
+            if points < 3 or algo not in DOWNSAMPLE_ALGORITHMS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=(
+                        f"points must be >= 3 and algo one of {DOWNSAMPLE_ALGORITHMS}"
+                    ),
+                )
+            try:
+                start_time = datetime.fromisoformat(start)
+                end_time = datetime.fromisoformat(end)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+
+            try:
+                columns = await self.db.get_archived_measurements(
+                    start_time, end_time, sensor_id
+                )
+                source_count = len(columns["timestamp"])
+                if source_count > points:
+                    values = np.column_stack(
+                        [columns[key] for key in ("voltage", "current", "power")]
+                    )
+                    selected = await asyncio.to_thread(
+                        select_indices,
+                        columns["timestamp"] / 1000,
+                        values,
+                        points,
+                        algo,
+                    )
+                    columns = {key: array[selected] for key, array in columns.items()}
+
+                return codec.FastJSONResponse(
+                    {
+                        "data": {key: array.tolist() for key, array in columns.items()},
+                        "count": len(columns["timestamp"]),
+                        "source_count": source_count,
+                        "start": start_time.isoformat(),
+                        "end": end_time.isoformat(),
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                )
+            except Exception as e:
+                # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
+
         @self.app.get("/api/statistics")
-        async def get_statistics(hours: int = 24):
-            """1분 통계 데이터 조회"""
+        async def get_statistics(hours: int = 24, sensor_id: int = DEFAULT_SENSOR_ID):
+            """장치의 1분 통계 데이터 조회"""
             try:
-                statistics = await self.db.get_minute_statistics(hours=hours)
+                statistics = await self.db.get_minute_statistics(
+                    hours=hours, sensor_id=sensor_id
+                )
                 return {
                     "data": statistics,
                     "count": len(statistics),
                     "hours": hours,
+                    "sensor_id": sensor_id,
                     "timestamp": datetime.now().isoformat(),
                 }
             except Exception as e:
@@ -2033,16 +2553,96 @@ class PowerMonitoringServer:
                     status_code=500, detail="Internal server error"
                 ) from e
 
+        @self.app.get("/api/rollups")
+        async def get_rollups(
+            hours: float = 24,
+            max_points: int = 1000,
+            tier: str = "auto",
+            sensor_id: int = DEFAULT_SENSOR_ID,
+        ):
+            """장치의 다중 해상도 측정 시계열 조회 (tier 자동 선택: raw/1s/1m/1h)"""
+            if tier != "auto" and tier != "raw" and tier not in ROLLUP_TIERS:
+                raise HTTPException(
+                    status_code=400, detail=f"Unknown rollup tier: {tier}"
+                )
+
+            try:
+                series = await self.db.get_measurement_series(
+                    hours=hours, max_points=max_points, tier=tier, sensor_id=sensor_id
+                )
+                return codec.FastJSONResponse(
+                    {
+                        **series,
+                        "count": len(series["data"]),
+                        "hours": hours,
+                        "sensor_id": sensor_id,
+                        "max_points": max_points,
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                )
+            except Exception as e:
+                # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
+
         @self.app.get("/api/alerts")
-        async def get_alerts(hours: int = 24, severity: str = None):
-            """알림 이벤트 조회"""
+        async def get_alerts(
+            hours: int = 24, severity: str = None, sensor_id: Optional[int] = None
+        ):
+            """알림 이벤트 조회 (sensor_id 미지정 시 모든 장치)"""
+            try:
+                alerts = await self.db.get_alert_events(
+                    hours=hours, severity=severity, sensor_id=sensor_id
+                )
+                return {
+                    "data": alerts,
+                    "count": len(alerts),
+                    "hours": hours,
+                    "severity_filter": severity,
+                    "sensor_filter": sensor_id,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            except Exception as e:
+                # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
+
+        @self.app.get("/api/alerts/active")
+        async def get_active_alerts(sensor_id: Optional[int] = None):
+            """활성(미해결) 알림 조회 (sensor_id 미지정 시 모든 장치)"""
+            try:
+                alerts = await self.db.get_active_alerts(sensor_id=sensor_id)
+                return {
+                    "data": alerts,
+                    "count": len(alerts),
+                    "timestamp": datetime.now().isoformat(),
+                }
+            except Exception as e:
+                # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
+
+        @self.app.get("/api/alerts/history")
+        async def get_alert_history(
+            hours: int = 24,
+            severity: str = None,
+            limit: int = 1000,
+            sensor_id: Optional[int] = None,
+        ):
+            """해결된 알림 이력 조회 (해제 시각 역순, sensor_id 미지정 시 모든 장치)"""
             try:
-                alerts = await self.db.get_alert_events(hours=hours, severity=severity)
+                alerts = await self.db.get_alert_history(
+                    hours=hours, severity=severity, limit=limit, sensor_id=sensor_id
+                )
                 return {
                     "data": alerts,
                     "count": len(alerts),
                     "hours": hours,
                     "severity_filter": severity,
+                    "sensor_filter": sensor_id,
                     "timestamp": datetime.now().isoformat(),
                 }
             except Exception as e:
@@ -2073,13 +2673,18 @@ class PowerMonitoringServer:
                 ) from e
 
         @self.app.get("/api/power-efficiency")
-        async def get_power_efficiency(hours: int = 24):
-            """전력 효율성 분석"""
+        async def get_power_efficiency(
+            hours: int = 24, sensor_id: int = DEFAULT_SENSOR_ID
+        ):
+            """장치의 전력 효율성 분석"""
             try:
-                efficiency = await self.db.calculate_power_efficiency(hours=hours)
+                efficiency = await self.db.calculate_power_efficiency(
+                    hours=hours, sensor_id=sensor_id
+                )
                 return {
                     "data": efficiency,
                     "hours": hours,
+                    "sensor_id": sensor_id,
                     "timestamp": datetime.now().isoformat(),
                 }
             except Exception as e:
@@ -2105,16 +2710,32 @@ class PowerMonitoringServer:
                 ) from e
 
         @self.app.post("/api/database/vacuum")
-        async def vacuum_database():
-            """데이터베이스 최적화"""
+        async def vacuum_database(full: bool = False):
+            """데이터베이스 최적화
+
+            기본: 빈 페이지 점진 회수, full=true: 전체 VACUUM
+            """
             try:
-                success = await self.db.vacuum_database()
+                if full:
+                    success = await self.db.vacuum_database()
+                    return {
+                        "status": "completed" if success else "failed",
+                        "mode": "full",
+                        "timestamp": datetime.now().isoformat(),
+                    }
+
+                pages = await self.db.reclaim_free_pages()
                 return {
-                    "status": "completed" if success else "failed",
+                    "status": "completed",
+                    "mode": "incremental",
+                    "pages_reclaimed": pages,
                     "timestamp": datetime.now().isoformat(),
                 }
             except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+                # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
 
         @self.app.get("/api/database/stats")
         async def get_database_stats():
@@ -2131,10 +2752,11 @@ class PowerMonitoringServer:
         # === 데이터 분석 API ===
 
         @self.app.get("/api/analysis/outliers/summary")
-        async def get_outlier_summary():
-            """이상치 요약 통계"""
+        async def get_outlier_summary(sensor_id: int = DEFAULT_SENSOR_ID):
+            """장치의 이상치 요약 통계"""
+            device = self.get_device(sensor_id)
             try:
-                summary = self.data_analyzer.get_outlier_summary()
+                summary = device.data_analyzer.get_outlier_summary()
                 return {"data": summary, "timestamp": datetime.now().isoformat()}
             except Exception as e:
                 # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
@@ -2143,10 +2765,13 @@ class PowerMonitoringServer:
                 ) from e
 
         @self.app.get("/api/analysis/outliers/recent")
-        async def get_recent_outliers(limit: int = 10):
-            """최근 이상치 목록"""
+        async def get_recent_outliers(
+            limit: int = 10, sensor_id: int = DEFAULT_SENSOR_ID
+        ):
+            """장치의 최근 이상치 목록"""
+            device = self.get_device(sensor_id)
             try:
-                outliers = self.data_analyzer.get_recent_outliers(limit)
+                outliers = device.data_analyzer.get_recent_outliers(limit)
                 return {
                     "data": outliers,
                     "count": len(outliers),
@@ -2159,10 +2784,12 @@ class PowerMonitoringServer:
                 ) from e
 
         @self.app.get("/api/analysis/moving-averages")
-        async def get_moving_averages():
-            """현재 이동평균 값"""
+        async def get_moving_averages(sensor_id: int = DEFAULT_SENSOR_ID):
+            """장치의 현재 이동평균 값"""
+            device = self.get_device(sensor_id)
             try:
-                averages = self.data_analyzer.moving_avg_calc.get_all_moving_averages()
+                analyzer = device.data_analyzer
+                averages = analyzer.moving_avg_calc.get_all_moving_averages()
                 return {"data": averages, "timestamp": datetime.now().isoformat()}
             except Exception as e:
                 # 보안을 위해 내부 에러 정보 숨김, 원본 에러 체인 유지
@@ -2172,9 +2799,12 @@ class PowerMonitoringServer:
 
         @self.app.get("/api/analysis/history")
         async def get_analysis_history(
-            hours: int = 1, metric: str = None, outliers_only: bool = False
+            hours: int = 1,
+            metric: str = None,
+            outliers_only: bool = False,
+            sensor_id: Optional[int] = None,
         ):
-            """분석 결과 히스토리"""
+            """분석 결과 히스토리 (sensor_id 미지정 시 모든 장치)"""
             try:
                 conn = sqlite3.connect(self.db.db_path)
                 cursor = conn.cursor()
@@ -2190,11 +2820,16 @@ class PowerMonitoringServer:
                 if outliers_only:
                     where_conditions.append("is_outlier = 1")
 
+                if sensor_id is not None:
+                    where_conditions.append("sensor_id = ?")
+                    params.append(sensor_id)
+
                 where_clause = " AND ".join(where_conditions)
 
                 query = f"""
                     SELECT timestamp, metric, value, moving_avg_1m, moving_avg_5m, moving_avg_15m,
-                           is_outlier, outlier_score, outlier_method, severity, confidence
+                           is_outlier, outlier_score, outlier_method, severity,
+                           confidence, sensor_id
                     FROM analysis_results
                     WHERE {where_clause}
                     ORDER BY timestamp DESC
@@ -2223,6 +2858,7 @@ class PowerMonitoringServer:
                             "outlier_method": row[8],
                             "severity": row[9],
                             "confidence": row[10],
+                            "sensor_id": row[11],
                         }
                     )
 
@@ -2233,6 +2869,7 @@ class PowerMonitoringServer:
                         "hours": hours,
                         "metric": metric,
                         "outliers_only": outliers_only,
+                        "sensor_id": sensor_id,
                     },
                     "timestamp": datetime.now().isoformat(),
                 }
@@ -2244,302 +2881,385 @@ class PowerMonitoringServer:
                 ) from e
 
     async def data_collector(self):
-        """시뮬레이터에서 데이터 수집 및 브로드캐스트"""
+        """리더 스레드가 전달한 프레임 수집 및 브로드캐스트"""
         print("🔄 Data collector started")
 
-        while self.is_running:
-            if self.simulator and self.simulator.is_connected():
-                try:
-                    # 시뮬레이터에서 데이터 읽기
-                    data = self.simulator.read_data(timeout=0.1)
-
-                    if data:
-                        try:
-                            # JSON 파싱
-                            json_data = json.loads(data)
-
-                            # 측정 데이터인지 확인
-                            if (
-                                "v" in json_data
-                                and "a" in json_data
-                                and "w" in json_data
-                            ):
-                                voltage = json_data["v"]
-                                current = json_data["a"]
-                                power = json_data["w"]
-
-                                # 데이터베이스에 저장
-                                await self.db.save_measurement(
-                                    voltage=voltage,
-                                    current=current,
-                                    power=power,
-                                    sequence_number=json_data.get("seq"),
-                                    sensor_status=json_data.get("status", "ok"),
-                                    simulation_mode=json_data.get("mode", "NORMAL"),
-                                )
-
-                                # 1분 통계 버퍼 업데이트
-                                await self.update_minute_statistics(
-                                    voltage, current, power
-                                )
-
-                                # 임계값 알림 체크
-                                await self.check_and_save_alerts(
-                                    voltage, current, power
-                                )
-
-                                # 데이터 분석 수행
-                                analysis_result = self.data_analyzer.analyze_data_point(
-                                    voltage, current, power
-                                )
-
-                                # 분석 결과를 데이터베이스에 저장
-                                self.data_analyzer.save_analysis_to_db(analysis_result)
-
-                                # WebSocket으로 브로드캐스트 (분석 결과 포함)
-                                websocket_message = {
-                                    "type": "measurement",
-                                    "data": json_data,
-                                    "analysis": {
-                                        "has_outlier": analysis_result[
-                                            "has_any_outlier"
-                                        ],
-                                        "outlier_count": analysis_result[
-                                            "outlier_count"
-                                        ],
-                                        "confidence": analysis_result["confidence"],
-                                        "moving_averages": {
-                                            metric: data["moving_avg"]
-                                            for metric, data in analysis_result[
-                                                "metrics"
-                                            ].items()
-                                        },
-                                        "outliers": {
-                                            metric: {
-                                                "is_outlier": data["outlier"][
-                                                    "is_outlier"
-                                                ],
-                                                "score": data["outlier"]["score"],
-                                                "severity": data["outlier"]["severity"],
-                                                "method": data["outlier"]["method"],
-                                            }
-                                            for metric, data in analysis_result[
-                                                "metrics"
-                                            ].items()
-                                            if data["outlier"]["is_outlier"]
-                                        },
-                                    },
-                                    "timestamp": datetime.now().isoformat(),
-                                }
+        while True:
+            # 프레임이 도착하는 즉시 처리 (고정 대기 없음)
+            frame = await self.frame_queue.get()
+            if frame is None:
+                # 종료 신호
+                break
 
-                                await self.manager.broadcast(
-                                    json.dumps(websocket_message)
-                                )
+            try:
+                await self.process_frame(frame)
+            except Exception as e:
+                print(f"❌ Data collection error: {e}")
 
-                            elif json_data.get("type") == "status":
-                                # 상태 메시지 브로드캐스트
-                                websocket_message = {
-                                    "type": "status",
-                                    "message": json_data.get("message", ""),
-                                    "timestamp": datetime.now().isoformat(),
-                                }
+        print("🛑 Data collector stopped")
 
-                                await self.manager.broadcast(
-                                    json.dumps(websocket_message)
-                                )
+    async def process_frame(self, json_data: dict):
+        """파싱된 프레임 1개 처리 (프레임의 sensor_id로 장치 파이프라인 선택)"""
+        sensor_id = json_data.get("sensor_id", DEFAULT_SENSOR_ID)
+        device = self.devices.get(sensor_id)
+        if device is None:
+            # 비활성화된 장치의 큐에 남은 프레임
+            return
 
-                        except json.JSONDecodeError:
-                            # JSON이 아닌 데이터는 무시
-                            pass
+        if json_data.get("type") == "burst":
+            # 고속 수집 버스트 (K개 샘플을 한 단위로 처리)
+            await self.process_burst(device, json_data)
+
+        # 측정 데이터인지 확인
+        elif "v" in json_data and "a" in json_data and "w" in json_data:
+            voltage = json_data["v"]
+            current = json_data["a"]
+            power = json_data["w"]
+
+            # 데이터베이스 저장 (write-behind 배치)
+            await self.measurement_writer.add_measurement(
+                voltage=voltage,
+                current=current,
+                power=power,
+                sequence_number=json_data.get("seq"),
+                sensor_status=json_data.get("status", "ok"),
+                simulation_mode=json_data.get("mode", "NORMAL"),
+                sensor_id=sensor_id,
+            )
+
+            # 1초/1분/1시간 롤업은 measurement_writer flush 시 DB에서 증분 갱신됨
+
+            # 임계값 알림 체크
+            await self.check_and_save_alerts(device, voltage, current, power)
+
+            # 데이터 분석 수행
+            analysis_result = device.data_analyzer.analyze_data_point(
+                voltage, current, power
+            )
+
+            # 분석 결과 저장 (비동기 배치, 저장 정책 적용)
+            await self.analysis_writer.add_analysis(analysis_result, sensor_id)
+
+            # WebSocket으로 브로드캐스트 (분석 결과 포함)
+            websocket_message = {
+                "type": "measurement",
+                "sensor_id": sensor_id,
+                "data": json_data,
+                "analysis": {
+                    "has_outlier": analysis_result["has_any_outlier"],
+                    "outlier_count": analysis_result["outlier_count"],
+                    "confidence": analysis_result["confidence"],
+                    "moving_averages": {
+                        metric: data["moving_avg"]
+                        for metric, data in analysis_result["metrics"].items()
+                    },
+                    "outliers": {
+                        metric: {
+                            "is_outlier": data["outlier"]["is_outlier"],
+                            "score": data["outlier"]["score"],
+                            "severity": data["outlier"]["severity"],
+                            "method": data["outlier"]["method"],
+                        }
+                        for metric, data in analysis_result["metrics"].items()
+                        if data["outlier"]["is_outlier"]
+                    },
+                },
+                "timestamp": datetime.now().isoformat(),
+            }
 
-                except Exception as e:
-                    print(f"❌ Data collection error: {e}")
+            await self.manager.broadcast(codec.dumps(websocket_message))
 
-            # 100ms 대기 (10Hz 업데이트)
-            await asyncio.sleep(0.1)
+        elif json_data.get("type") == "status":
+            # 상태 메시지 브로드캐스트
+            websocket_message = {
+                "type": "status",
+                "sensor_id": sensor_id,
+                "message": json_data.get("message", ""),
+                "timestamp": datetime.now().isoformat(),
+            }
 
-        print("🛑 Data collector stopped")
+            await self.manager.broadcast(codec.dumps(websocket_message))
 
-    async def update_minute_statistics(
-        self, voltage: float, current: float, power: float
-    ):
-        """1분 통계 버퍼 업데이트"""
-        try:
-            now = datetime.now()
-
-            # 1분 버퍼 시작 시간 설정
-            if not self.minute_buffer["start_time"]:
-                self.minute_buffer["start_time"] = now
-
-            # 1분이 지났으면 통계 저장하고 버퍼 리셋
-            if (now - self.minute_buffer["start_time"]).total_seconds() >= 60:
-                if self.minute_buffer["voltage"]:
-                    # 통계 계산
-                    voltage_stats = {
-                        "min": min(self.minute_buffer["voltage"]),
-                        "max": max(self.minute_buffer["voltage"]),
-                        "avg": sum(self.minute_buffer["voltage"])
-                        / len(self.minute_buffer["voltage"]),
-                    }
-                    current_stats = {
-                        "min": min(self.minute_buffer["current"]),
-                        "max": max(self.minute_buffer["current"]),
-                        "avg": sum(self.minute_buffer["current"])
-                        / len(self.minute_buffer["current"]),
-                    }
-                    power_stats = {
-                        "min": min(self.minute_buffer["power"]),
-                        "max": max(self.minute_buffer["power"]),
-                        "avg": sum(self.minute_buffer["power"])
-                        / len(self.minute_buffer["power"]),
-                    }
+    async def process_burst(self, device: DevicePipeline, burst: dict):
+        """버스트 프레임 처리: DB 배치 1회, 분석 배치 1회, 브로드캐스트 1회"""
+        voltage = np.asarray(burst["v"], dtype=np.float64)
+        current = np.asarray(burst["a"], dtype=np.float64)
+        power = np.asarray(burst["w"], dtype=np.float64)
+        count = len(voltage)
+        if count == 0:
+            return
 
-                    # 데이터베이스에 저장
-                    minute_timestamp = self.minute_buffer["start_time"].replace(
-                        second=0, microsecond=0
-                    )
-                    await self.db.save_minute_statistics(
-                        minute_timestamp=minute_timestamp,
-                        voltage_stats=voltage_stats,
-                        current_stats=current_stats,
-                        power_stats=power_stats,
-                        sample_count=len(self.minute_buffer["voltage"]),
-                    )
+        # 디바이스 상대 시각 → 호스트 시각 (마지막 샘플 = 수신 시각)
+        offsets_us = np.cumsum(burst["dt_us"])
+        ages_us = (offsets_us[-1] - offsets_us).tolist()
+        received_at = datetime.now()
+        timestamps = [received_at - timedelta(microseconds=age) for age in ages_us]
+
+        status = burst.get("status", "ok")
+        mode = burst.get("mode", "NORMAL")
+        first_seq = burst.get("seq", 0)
+
+        # 데이터베이스 저장 (같은 flush 트랜잭션에 함께 기록)
+        sensor_id = device.sensor_id
+        await self.measurement_writer.add_many(
+            [
+                (timestamps[i], v, a, w, first_seq + i, status, mode, sensor_id)
+                for i, (v, a, w) in enumerate(
+                    zip(voltage.tolist(), current.tolist(), power.tolist())
+                )
+            ]
+        )
 
-                # 버퍼 리셋
-                self.minute_buffer = {
-                    "voltage": [],
-                    "current": [],
-                    "power": [],
-                    "start_time": now,
-                }
+        # 임계값 알림 체크 (샘플별 평가 - 디바운스/샘플 수가 샘플 단위로 유지됨)
+        await self.check_and_save_burst_alerts(
+            device, voltage.tolist(), current.tolist(), power.tolist(), ages_us
+        )
 
-            # 현재 데이터를 버퍼에 추가
-            self.minute_buffer["voltage"].append(voltage)
-            self.minute_buffer["current"].append(current)
-            self.minute_buffer["power"].append(power)
+        # 데이터 분석 (벡터화, 장치 스트리밍 상태에 반영)
+        result = device.data_analyzer.analyze_batch(
+            voltage, current, power, update_state=True
+        )
+        await self.analysis_writer.add_analysis_batch(result, timestamps, sensor_id)
+
+        # 메트릭별 가장 심한 이상치
+        outliers = {}
+        for metric, data in result["metrics"].items():
+            mask = data["is_outlier"]
+            if not mask.any():
+                continue
+            worst = int(np.flatnonzero(mask)[np.argmax(data["score"][mask])])
+            outliers[metric] = {
+                "is_outlier": True,
+                "score": float(data["score"][worst]),
+                "severity": str(data["severity"][worst]),
+                "method": str(data["method"][worst]),
+                "count": int(mask.sum()),
+            }
 
-        except Exception as e:
-            print(f"❌ Failed to update minute statistics: {e}")
+        # WebSocket 브로드캐스트 1회 (마지막 샘플 + 버스트 요약)
+        last = count - 1
+        sample_rate = (
+            1_000_000 / float(np.mean(burst["dt_us"][1:])) if count > 1 else None
+        )
+        websocket_message = {
+            "type": "measurement",
+            "sensor_id": sensor_id,
+            "data": {
+                "sensor_id": sensor_id,
+                "v": float(voltage[last]),
+                "a": float(current[last]),
+                "w": float(power[last]),
+                "ts": (burst.get("ts_us", 0) + int(offsets_us[-1])) // 1000,
+                "seq": first_seq + last,
+                "status": status,
+                "mode": mode,
+                "burst": {
+                    "count": count,
+                    "rate_hz": round(sample_rate, 1) if sample_rate else None,
+                    **{
+                        key: {
+                            "min": float(values.min()),
+                            "max": float(values.max()),
+                            "avg": float(values.mean()),
+                        }
+                        for key, values in (
+                            ("v", voltage),
+                            ("a", current),
+                            ("w", power),
+                        )
+                    },
+                },
+            },
+            "analysis": {
+                "has_outlier": bool(result["has_any_outlier"].any()),
+                "outlier_count": int(result["outlier_count"].sum()),
+                "confidence": float(result["confidence"][last]),
+                "moving_averages": {
+                    metric: {
+                        window: float(values[last])
+                        for window, values in data["moving_avg"].items()
+                    }
+                    for metric, data in result["metrics"].items()
+                },
+                "outliers": outliers,
+            },
+            "timestamp": received_at.isoformat(),
+        }
+
+        await self.manager.broadcast(codec.dumps(websocket_message))
 
-    async def check_and_save_alerts(self, voltage: float, current: float, power: float):
-        """임계값 알림 체크 및 저장"""
+    async def check_and_save_alerts(
+        self, device: DevicePipeline, voltage: float, current: float, power: float
+    ):
+        """장치의 임계값 알림 상태 평가 (상태 전이 시에만 DB 기록)"""
         try:
-            # 임계값 설정
-            thresholds = {
-                "voltage": {"min": 4.5, "max": 5.5, "warning_range": 0.2},
-                "current": {"max": 0.5, "warning_range": 0.1},
-                "power": {"max": 2.0, "warning_range": 0.3},
-            }
+            now = time.monotonic()
+            engine = device.alert_engine
+            for transition in engine.evaluate(voltage, current, power, now):
+                await self.save_alert_transition(device, transition)
 
-            # 전압 체크
-            if (
-                voltage < thresholds["voltage"]["min"]
-                or voltage > thresholds["voltage"]["max"]
-            ):
-                await self.db.save_alert_event(
-                    alert_type="threshold_violation",
-                    metric_name="voltage",
-                    metric_value=voltage,
-                    threshold_value=(
-                        thresholds["voltage"]["min"]
-                        if voltage < thresholds["voltage"]["min"]
-                        else thresholds["voltage"]["max"]
-                    ),
-                    severity="danger",
-                    message=f"Voltage out of range: {voltage:.3f}V (safe: 4.5V-5.5V)",
-                )
-            elif (
-                voltage
-                < thresholds["voltage"]["min"] + thresholds["voltage"]["warning_range"]
-                or voltage
-                > thresholds["voltage"]["max"] - thresholds["voltage"]["warning_range"]
-            ):
-                await self.db.save_alert_event(
-                    alert_type="threshold_warning",
-                    metric_name="voltage",
-                    metric_value=voltage,
-                    threshold_value=thresholds["voltage"]["min"]
-                    + thresholds["voltage"]["warning_range"],
-                    severity="warning",
-                    message=f"Voltage near limit: {voltage:.3f}V (safe: 4.5V-5.5V)",
-                )
+            updates = engine.pop_counter_updates(now)
+            if updates:
+                await self.db.update_alert_counters(updates)
 
-            # 전류 체크
-            if current > thresholds["current"]["max"]:
-                await self.db.save_alert_event(
-                    alert_type="threshold_violation",
-                    metric_name="current",
-                    metric_value=current,
-                    threshold_value=thresholds["current"]["max"],
-                    severity="danger",
-                    message=f"Current overload: {current:.3f}A (max: 0.5A)",
-                )
-            elif (
-                current
-                > thresholds["current"]["max"] - thresholds["current"]["warning_range"]
-            ):
-                await self.db.save_alert_event(
-                    alert_type="threshold_warning",
-                    metric_name="current",
-                    metric_value=current,
-                    threshold_value=thresholds["current"]["max"]
-                    - thresholds["current"]["warning_range"],
-                    severity="warning",
-                    message=f"Current near limit: {current:.3f}A (max: 0.5A)",
-                )
+        except Exception as e:
+            print(f"❌ Failed to check alerts: {e}")
 
-            # 전력 체크
-            if power > thresholds["power"]["max"]:
-                await self.db.save_alert_event(
-                    alert_type="threshold_violation",
-                    metric_name="power",
-                    metric_value=power,
-                    threshold_value=thresholds["power"]["max"],
-                    severity="danger",
-                    message=f"Power overload: {power:.3f}W (max: 2.0W)",
-                )
-            elif (
-                power
-                > thresholds["power"]["max"] - thresholds["power"]["warning_range"]
+    async def check_and_save_burst_alerts(
+        self,
+        device: DevicePipeline,
+        voltages: list[float],
+        currents: list[float],
+        powers: list[float],
+        ages_us: list[float],
+    ):
+        """버스트 샘플을 순서대로 알림 엔진에 평가 (샘플 시각 = 수신 시각 - age)
+
+        전이는 발생 즉시 기록하므로 한 버스트 안의 open → close도 같은 행을 갱신한다.
+        """
+        try:
+            now = time.monotonic()
+            engine = device.alert_engine
+            for voltage, current, power, age_us in zip(
+                voltages, currents, powers, ages_us
             ):
-                await self.db.save_alert_event(
-                    alert_type="threshold_warning",
-                    metric_name="power",
-                    metric_value=power,
-                    threshold_value=thresholds["power"]["max"]
-                    - thresholds["power"]["warning_range"],
-                    severity="warning",
-                    message=f"Power near limit: {power:.3f}W (max: 2.0W)",
-                )
+                sample_time = now - age_us / 1_000_000
+                for transition in engine.evaluate(voltage, current, power, sample_time):
+                    await self.save_alert_transition(device, transition)
+
+            updates = engine.pop_counter_updates(now)
+            if updates:
+                await self.db.update_alert_counters(updates)
 
         except Exception as e:
             print(f"❌ Failed to check alerts: {e}")
 
+    async def save_alert_transition(
+        self, device: DevicePipeline, transition: AlertTransition
+    ):
+        """알림 전이 기록: open은 INSERT, escalate/close는 같은 행 UPDATE"""
+        if transition.kind == "open":
+            event_id = await self.db.open_alert_event(
+                timestamp=transition.timestamp,
+                alert_type=transition.alert_type,
+                metric_name=transition.metric,
+                metric_value=transition.value,
+                threshold_value=transition.threshold,
+                severity=transition.severity,
+                message=transition.message,
+                sensor_id=device.sensor_id,
+            )
+            device.alert_engine.set_event_id(transition.metric, event_id)
+            return
+
+        if transition.event_id is None:
+            # open 기록이 실패한 알림은 갱신할 행이 없음
+            return
+
+        await self.db.update_alert_event(
+            event_id=transition.event_id,
+            alert_type=transition.alert_type,
+            threshold_value=transition.threshold,
+            severity=transition.severity,
+            message=transition.message,
+            peak_value=transition.peak_value,
+            sample_count=transition.sample_count,
+            resolved_at=transition.timestamp if transition.kind == "close" else None,
+        )
+
+    def add_device(self, sensor_id: int, name: str, port: str) -> DevicePipeline:
+        """장치 파이프라인 생성 (이미 있으면 기존 파이프라인)"""
+        device = self.devices.get(sensor_id)
+        if device is None:
+            device = self.devices[sensor_id] = DevicePipeline(
+                sensor_id, name, port, self.db.db_path
+            )
+        return device
+
+    def connect_device(self, device: DevicePipeline) -> bool:
+        """장치 포트로 시뮬레이터(시리얼) 연결"""
+        simulator = create_simulator(device.port, frame_format=SIMULATOR_FRAME_FORMAT)
+        return device.connect(simulator)
+
+    def start_device_reader(self, device: DevicePipeline):
+        """장치 리더 스레드 시작 (공용 프레임 큐로 전달)"""
+        if self.frame_queue is None:
+            return
+        device.start_reader(self.frame_queue, asyncio.get_running_loop())
+
+    async def close_device(self, device: DevicePipeline):
+        """장치 연결 해제 및 열린 알림 해제 기록"""
+        await device.disconnect()
+        for transition in device.alert_engine.close_all():
+            await self.save_alert_transition(device, transition)
+
     async def start_data_collection(self):
         """데이터 수집 시작"""
         if not self.is_running:
             self.is_running = True
-
-            # 시뮬레이터 자동 시작
-            if not self.simulator:
-                self.simulator = create_simulator("MOCK")
-                if self.simulator.connect():
+            self.frame_queue = asyncio.Queue(maxsize=10000)
+
+            # 이전 실행에서 해제되지 못한 알림 정리 (알림 상태는 메모리에만 존재)
+            resolved = await self.db.resolve_open_alerts()
+            if resolved:
+                print(f"🔕 Resolved {resolved} stale alert(s) from previous run")
+
+            # 활성 장치 레지스트리 불러오기 (기본 장치는 항상 포함)
+            for row in await self.db.get_devices(enabled_only=True):
+                self.add_device(row["sensor_id"], row["name"], row["port"])
+
+            # 장치별 시뮬레이터 자동 시작
+            for device in self.devices.values():
+                if device.simulator:
+                    continue
+                if self.connect_device(device):
                     print(
-                        f"✅ Simulator connected: {self.simulator.get_simulator_type()}"
+                        f"✅ Device {device.sensor_id} ({device.name}) connected: "
+                        f"{device.simulator.get_simulator_type()}"
                     )
                 else:
-                    print("❌ Failed to connect simulator")
+                    print(f"❌ Failed to connect device {device.sensor_id}")
+
+            # 장치별 읽기를 이벤트 루프 밖 전용 스레드에서 수행
+            for device in self.devices.values():
+                self.start_device_reader(device)
+
+            # 배치 기록기 시작
+            await self.measurement_writer.start()
+            await self.analysis_writer.start()
 
             # 데이터 수집 태스크 시작
-            asyncio.create_task(self.data_collector())
+            self.collector_task = asyncio.create_task(self.data_collector())
 
     async def stop_data_collection(self):
         """데이터 수집 중지"""
         self.is_running = False
-        if self.simulator:
-            self.simulator.disconnect()
-            self.simulator = None
+
+        # 리더 스레드 중지 후 종료 신호 전달 (이미 큐에 있는 프레임은 모두 처리)
+        for device in self.devices.values():
+            await device.stop_reader()
+        if self.frame_queue is not None:
+            await self.frame_queue.put(None)
+
+        # 수집 루프가 남은 프레임 처리를 마칠 때까지 대기
+        if self.collector_task:
+            try:
+                await asyncio.wait_for(self.collector_task, timeout=5.0)
+            except Exception as e:
+                print(f"⚠️ Data collector did not stop cleanly: {e}")
+            self.collector_task = None
+
+        # 장치 연결 해제 및 열린 알림 해제 (최종 카운터/피크값 포함)
+        for device in self.devices.values():
+            await self.close_device(device)
+
+        # 대기 중인 측정/분석 데이터 모두 저장
+        await self.measurement_writer.stop()
+        await self.analysis_writer.stop()
+        print(
+            f"💾 Ingest writer drained "
+            f"({self.measurement_writer.metrics['rows_written']} rows written)"
+        )
 
 
 # 전역 서버 인스턴스 (먼저 생성)
@@ -2571,6 +3291,10 @@ async def lifespan(app: FastAPI):
     asyncio.create_task(auto_cleanup_task())
     print("🔄 Auto cleanup task started")
 
+    # 빈 페이지 점진 회수 태스크 시작
+    asyncio.create_task(maintenance_task())
+    print("🧹 Incremental vacuum task started")
+
     yield  # 서버 실행 중
 
     # 종료 이벤트
@@ -2584,8 +3308,12 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ Error saving shutdown log: {e}")
 
+    # 데이터 수집 중지 (write-behind 버퍼에 남은 측정 데이터 drain 포함)
     await server.stop_data_collection()
 
+    # 커넥션 풀 닫기
+    await server.db.close()
+
 
 # FastAPI 앱 생성 (lifespan 포함)
 # 환경에 따른 보안 설정
@@ -2596,6 +3324,8 @@ app = FastAPI(
     description="Real-time power monitoring with WebSocket & Database & Advanced Analysis",
     version="4.1.0",
     lifespan=lifespan,
+    # 응답 직렬화는 codec 백엔드 사용 (orjson/msgspec 설치 시 고속 경로)
+    default_response_class=codec.FastJSONResponse,
     # 운영 환경에서는 API 문서 비활성화 (보안 강화)
     docs_url=None if is_production else "/docs",
     redoc_url=None if is_production else "/redoc",
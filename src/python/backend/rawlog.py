@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+INA219 Power Monitoring System - Raw Sample Log
+고정 길이 레코드 원본 측정 로그 (numpy.memmap 제로 카피 조회, 선택적 사용)
+
+기능:
+- 측정 1개 = 42바이트 레코드 (timestamp ms, seq, V, A, W, status/mode 코드)
+- 장치별 1시간 세그먼트 파일(YYYYMMDDHH_<sensor_id>.raw, 측정 파티션과 같은 시간 단위)에
+  덧붙이기 전용 기록
+- 세그먼트별 시간 인덱스 (첫/마지막 timestamp, 정렬 여부)를 메모리에 유지
+- 구간 조회: 세그먼트 선택 → 이진 탐색 → memmap 슬라이스 (복사 없음)
+- 보관 기간 정리: 세그먼트 파일 삭제
+- 장치별 커버 시작 시각 (coverage.json): 기록 실패 / 누락 구간 이후부터만 조회에 사용
+
+SQLite 측정 파티션이 원본 저장소이고, 이 로그는 원본 구간 조회 가속용 사본이다.
+쓰기 도중 중단된 마지막 레코드는 시작 시 잘라낸다.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+RAW_LOG_SUFFIX = ".raw"
+RAW_LOG_LABELS = "labels.json"
+RAW_LOG_COVERAGE = "coverage.json"
+
+# sensor_id가 없는 이전 세그먼트 파일(YYYYMMDDHH.raw)의 장치
+RAW_LOG_DEFAULT_SENSOR = 1
+
+# MEASUREMENT_COLUMNS와 같은 이름의 고정 길이 레코드 (패딩 없음)
+RAW_RECORD = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("sequence_number", "<i8"),
+        ("voltage", "<f8"),
+        ("current", "<f8"),
+        ("power", "<f8"),
+        ("sensor_status", "u1"),
+        ("simulation_mode", "u1"),
+    ]
+)
+
+# 코드로 저장하는 문자열 컬럼 (코드 → 문자열 표는 labels.json)
+LABEL_FIELDS = ("sensor_status", "simulation_mode")
+
+
+@dataclass
+class RawSegment:
+    """세그먼트 시간 인덱스 항목"""
+
+    first_ms: int
+    last_ms: int
+    count: int
+    ordered: bool  # timestamp 오름차순 여부 (아니면 구간 조회 시 마스크 + 정렬)
+    sensor_id: int = RAW_LOG_DEFAULT_SENSOR
+
+
+def _segment_key(hour: str, sensor_id: int) -> str:
+    """세그먼트 키 (YYYYMMDDHH_<sensor_id>, 시간 순 정렬은 앞 10자리 기준)"""
+    return f"{hour}_{sensor_id}"
+
+
+def _bisect(timestamps: np.ndarray, value: int) -> int:
+    """오름차순 timestamp 뷰에서 value 이상인 첫 위치 (strided 뷰를 복사하지 않음)"""
+    low, high = 0, len(timestamps)
+    while low < high:
+        middle = (low + high) // 2
+        if timestamps[middle] < value:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class RawSampleLog:
+    """장치별 1시간 세그먼트 고정 길이 레코드 로그"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.logger = logging.getLogger(__name__)
+
+        self.segments: dict[str, RawSegment] = {}
+        self.labels: dict[str, list[Optional[str]]] = {
+            field: [] for field in LABEL_FIELDS
+        }
+        self._maps: dict[str, np.memmap] = {}
+
+        # 장치별 커버 시작 시각 (epoch ms): 그 이후 저장된 측정은 모두 로그에 있음
+        # 항목이 없는 장치(첫 레코드 전)는 커버하지 않는 것으로 본다
+        self.coverage: dict[int, int] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + RAW_LOG_SUFFIX)
+
+    def _load(self):
+        """레이블 표와 세그먼트 인덱스 복원 (잘린 마지막 레코드 제거)"""
+        try:
+            with open(os.path.join(self.directory, RAW_LOG_LABELS)) as f:
+                self.labels.update(json.load(f))
+        except FileNotFoundError:
+            pass
+
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(RAW_LOG_SUFFIX):
+                continue
+            key = name[: -len(RAW_LOG_SUFFIX)]
+            if "_" not in key:
+                # 장치 구분 이전 세그먼트는 기본 장치 세그먼트로 이름 변경
+                hour, key = key, _segment_key(key, RAW_LOG_DEFAULT_SENSOR)
+                os.replace(self._path(hour), self._path(key))
+            path = self._path(key)
+            size = os.path.getsize(path)
+            if size % RAW_RECORD.itemsize:
+                with open(path, "r+b") as f:
+                    f.truncate(size - size % RAW_RECORD.itemsize)
+            records = self._map(key)
+            if records is None:
+                continue
+            timestamps = records["timestamp"]
+            self.segments[key] = RawSegment(
+                first_ms=int(timestamps.min()),
+                last_ms=int(timestamps.max()),
+                count=len(records),
+                ordered=bool(np.all(timestamps[1:] >= timestamps[:-1])),
+                sensor_id=int(key.split("_")[1]),
+            )
+
+        try:
+            with open(os.path.join(self.directory, RAW_LOG_COVERAGE)) as f:
+                self.coverage = {int(k): v for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+
+        # coverage.json 이전 로그: 장치별 첫 레코드부터 커버
+        missing = {}
+        for segment in self.segments.values():
+            if segment.sensor_id not in self.coverage:
+                first = missing.get(segment.sensor_id, segment.first_ms)
+                missing[segment.sensor_id] = min(first, segment.first_ms)
+        if missing:
+            self.coverage.update(missing)
+            self._save_coverage()
+
+    def _save_json(self, name: str, data: Any):
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+
+    def _save_labels(self):
+        self._save_json(RAW_LOG_LABELS, self.labels)
+
+    def _save_coverage(self):
+        self._save_json(RAW_LOG_COVERAGE, self.coverage)
+
+    def _codes(self, field: str, values: list[Optional[str]]) -> np.ndarray:
+        table = self.labels[field]
+        index = {label: code for code, label in enumerate(table)}
+        codes = np.empty(len(values), dtype=np.uint8)
+        for i, value in enumerate(values):
+            code = index.get(value)
+            if code is None:
+                if len(table) >= 256:
+                    raise ValueError(f"Too many distinct {field} values")
+                code = index[value] = len(table)
+                table.append(value)
+                self._save_labels()
+            codes[i] = code
+        return codes
+
+    def _map(self, key: str) -> Optional[np.memmap]:
+        """세그먼트 memmap (현재 파일 크기 기준, 다음 append 전까지 캐시)"""
+        records = self._maps.get(key)
+        if records is None:
+            count = os.path.getsize(self._path(key)) // RAW_RECORD.itemsize
+            if not count:
+                return None
+            records = np.memmap(
+                self._path(key), dtype=RAW_RECORD, mode="r", shape=(count,)
+            )
+            self._maps[key] = records
+        return records
+
+    def _new_rows(self, key: str, rows: list[tuple]) -> list[tuple]:
+        """세그먼트에 이미 있는 (timestamp, sequence_number) 키의 행 제외"""
+        seen = set()
+        records = self._map(key) if key in self.segments else None
+        if records is not None:
+            first = min(row[0] for row in rows)
+            recent = records[records["timestamp"] >= first]
+            seen.update(
+                zip(recent["timestamp"].tolist(), recent["sequence_number"].tolist())
+            )
+
+        kept = []
+        for row in rows:
+            if (row[0], row[4]) not in seen:
+                seen.add((row[0], row[4]))
+                kept.append(row)
+        return kept
+
+    def append(self, groups: dict[str, list[tuple]], dedupe: frozenset = frozenset()):
+        """시간(YYYYMMDDHH)별 행 튜플을 장치 세그먼트로 나눠 덧붙임
+
+        행: (epoch ms, voltage, current, power, sequence_number, status, mode
+             [, sensor_id]) - sensor_id가 없으면 기본 장치
+        dedupe: 저장소에서 중복이 무시된 시간 (이미 있는 키의 행은 기록하지 않음)
+        """
+        for hour, hour_rows in groups.items():
+            by_sensor: dict[int, list[tuple]] = {}
+            for row in hour_rows:
+                sensor_id = row[7] if len(row) > 7 else RAW_LOG_DEFAULT_SENSOR
+                by_sensor.setdefault(sensor_id, []).append(row)
+            for sensor_id, rows in by_sensor.items():
+                self._append_segment(hour, sensor_id, rows, hour in dedupe)
+
+    def _append_segment(
+        self, hour: str, sensor_id: int, rows: list[tuple], dedupe: bool
+    ):
+        """장치 세그먼트 1개에 행 덧붙이기 (dedupe면 이미 있는 키 제외)"""
+        key = _segment_key(hour, sensor_id)
+        if dedupe:
+            rows = self._new_rows(key, rows)
+        if not rows:
+            return
+
+        columns = list(zip(*rows))
+        records = np.empty(len(rows), dtype=RAW_RECORD)
+        records["timestamp"] = columns[0]
+        records["voltage"] = columns[1]
+        records["current"] = columns[2]
+        records["power"] = columns[3]
+        records["sequence_number"] = columns[4]
+        records["sensor_status"] = self._codes("sensor_status", columns[5])
+        records["simulation_mode"] = self._codes("simulation_mode", columns[6])
+
+        with open(self._path(key), "ab") as f:
+            f.write(records.tobytes())
+        self._maps.pop(key, None)
+
+        timestamps = records["timestamp"]
+        first, last = int(timestamps.min()), int(timestamps.max())
+        if sensor_id not in self.coverage:
+            # 장치의 첫 레코드: 이 시각부터 커버
+            self.coverage[sensor_id] = first
+            self._save_coverage()
+        ordered = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        segment = self.segments.get(key)
+        if segment is None:
+            self.segments[key] = RawSegment(
+                first, last, len(records), ordered, sensor_id
+            )
+        else:
+            segment.ordered = (
+                segment.ordered and ordered and timestamps[0] >= segment.last_ms
+            )
+            segment.first_ms = min(segment.first_ms, first)
+            segment.last_ms = max(segment.last_ms, last)
+            segment.count += len(records)
+
+    def covered_from(self, sensor_id: int) -> Optional[int]:
+        """장치의 커버 시작 시각 (이후 저장된 측정은 모두 로그에 있음, 없으면 None)"""
+        return self.coverage.get(sensor_id)
+
+    def last_ms(self, sensor_id: int) -> Optional[int]:
+        """장치의 가장 최근 레코드 timestamp (레코드가 없으면 None)"""
+        last = [
+            segment.last_ms
+            for segment in self.segments.values()
+            if segment.sensor_id == sensor_id
+        ]
+        return max(last) if last else None
+
+    def mark_gap(self, gaps: dict[int, int]):
+        """장치별 through_ms까지 로그에 빠졌을 수 있는 구간 기록 (커버 시작을 그 뒤로)
+
+        coverage.json에 바로 저장하므로 재시작 후에도 그 구간은 커버하지 않는다.
+        """
+        for sensor_id, through_ms in gaps.items():
+            self.coverage[sensor_id] = max(
+                self.coverage.get(sensor_id, through_ms + 1), through_ms + 1
+            )
+        self._save_coverage()
+
+    def _slices(self, start_ms: int, end_ms: int, sensor_id: int) -> list[np.ndarray]:
+        """장치의 start <= t < end 레코드 조각 목록 (시간 순, 정렬된 세그먼트는 뷰)"""
+        parts = []
+        for key in sorted(self.segments):
+            segment = self.segments[key]
+            if segment.sensor_id != sensor_id:
+                continue
+            if segment.last_ms < start_ms or segment.first_ms >= end_ms:
+                continue
+            records = self._map(key)
+            if records is None:
+                continue
+
+            timestamps = records["timestamp"]
+            if segment.ordered:
+                parts.append(
+                    records[_bisect(timestamps, start_ms) : _bisect(timestamps, end_ms)]
+                )
+            else:
+                selected = records[(timestamps >= start_ms) & (timestamps < end_ms)]
+                parts.append(np.sort(selected, order=["timestamp", "sequence_number"]))
+        return parts
+
+    def count(
+        self, start_ms: int, end_ms: int, sensor_id: int = RAW_LOG_DEFAULT_SENSOR
+    ) -> int:
+        """장치의 구간 레코드 수 (이진 탐색만, 데이터 스캔 없음)"""
+        return sum(len(part) for part in self._slices(start_ms, end_ms, sensor_id))
+
+    def read(
+        self,
+        start_ms: int,
+        end_ms: int,
+        limit: int = -1,
+        sensor_id: int = RAW_LOG_DEFAULT_SENSOR,
+    ) -> np.ndarray:
+        """장치의 start <= t < end 레코드 (시간 오름차순, limit >= 0이면 최신 limit개)
+
+        세그먼트 1개 구간이면 memmap 뷰 그대로, 여러 개면 이어 붙인 배열.
+        """
+        parts = self._slices(start_ms, end_ms, sensor_id)
+        if limit >= 0:
+            kept = []
+            remaining = limit
+            for part in reversed(parts):
+                if remaining <= 0:
+                    break
+                kept.append(part[-remaining:] if len(part) > remaining else part)
+                remaining -= len(kept[-1])
+            parts = kept[::-1]
+
+        if not parts:
+            return np.empty(0, dtype=RAW_RECORD)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def columns(self, records: np.ndarray) -> dict[str, np.ndarray]:
+        """레코드 배열 → 컬럼 이름별 배열 (문자열 컬럼은 레이블로 변환)"""
+        result = {}
+        for name in RAW_RECORD.names:
+            if name in LABEL_FIELDS:
+                table = np.array(self.labels[name], dtype=object)
+                result[name] = table[records[name]]
+            else:
+                result[name] = records[name]
+        return result
+
+    def drop_before(self, first_kept: str) -> int:
+        """first_kept(YYYYMMDDHH)보다 오래된 세그먼트 파일 삭제 (삭제 수 반환)"""
+        expired = [key for key in self.segments if key[:10] < first_kept]
+        for key in expired:
+            self._maps.pop(key, None)
+            del self.segments[key]
+            os.remove(self._path(key))
+        return len(expired)
+
+    def get_stats(self) -> dict[str, Any]:
+        """세그먼트 수, 장치 수, 레코드 수, 파일 크기"""
+        records = sum(segment.count for segment in self.segments.values())
+        return {
+            "directory": self.directory,
+            "segments": len(self.segments),
+            "sensors": len({segment.sensor_id for segment in self.segments.values()}),
+            "records": records,
+            "size_bytes": records * RAW_RECORD.itemsize,
+            "record_bytes": RAW_RECORD.itemsize,
+        }
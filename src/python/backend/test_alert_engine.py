@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+알림 엔진 테스트
+AlertEngine의 히스테리시스 / 디바운스 / 전이 기록 검증 (DB 불필요)
+
+테스트 항목:
+1. 디바운스: open_seconds 미만의 짧은 이탈은 무시
+2. 지속 이탈 시 open 1회, 유지 중에는 전이 없음
+3. 경고 → 위험 escalate, 위험 → 경고 하강은 기록 없음
+4. 히스테리시스: 해제 임계값 안쪽으로 들어와야 해제 대기
+5. close_seconds 후 close (샘플 수 / 피크값 포함)
+6. 카운터 flush 주기와 close_all
+"""
+
+import sys
+
+from alert_engine import AlertEngine, AlertRule
+
+
+class AlertEngineTester:
+    """AlertEngine 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    @staticmethod
+    def feed(engine: AlertEngine, voltages: list[float], start: float, step=0.1):
+        """전압 샘플을 step초 간격으로 평가 → (샘플 시각, 전이) 목록"""
+        events = []
+        for i, voltage in enumerate(voltages):
+            now = start + i * step
+            for transition in engine.evaluate(voltage, 0.2, 1.0, now):
+                events.append((round(now, 3), transition))
+        return events
+
+    def test_debounce(self):
+        """디바운스 / open 테스트"""
+        engine = AlertEngine()
+
+        # 0.5초 위험 → 정상 복귀: open_seconds(1초) 미만이라 무시
+        events = self.feed(engine, [5.8] * 5 + [5.0] * 10, start=0.0)
+        self.log_result(
+            "짧은 이탈 무시",
+            events == [] and engine.get_active() == [],
+            "5.8V 0.5초 → 전이 없음",
+        )
+
+        # 2초 위험 지속 → 1초 경과 시점에 open 1회
+        events = self.feed(engine, [5.8] * 20, start=10.0)
+        opened = events[0][1] if events else None
+        self.log_result(
+            "지속 이탈 open",
+            len(events) == 1
+            and events[0][0] == 11.0
+            and opened.kind == "open"
+            and opened.severity == "danger"
+            and opened.alert_type == "threshold_violation"
+            and opened.threshold == 5.5,
+            f"전이 {[(t, e.kind) for t, e in events]}, "
+            f"임계값 {opened.threshold if opened else None}",
+        )
+        self.log_result(
+            "메시지",
+            opened is not None
+            and opened.message == "Voltage out of range: 5.800V (safe: 4.5V-5.5V)",
+            f"{opened.message if opened else None}",
+        )
+
+    def test_escalate(self):
+        """경고 → 위험 escalate 테스트"""
+        engine = AlertEngine()
+        # 경고 대역 (5.3 < v <= 5.5) 1.5초 → 위험 1.5초 → 경고 6초 (하강은 5초 디바운스)
+        voltages = [5.4] * 15 + [5.7] * 15 + [5.4] * 60
+        events = self.feed(engine, voltages, start=0.0)
+        kinds = [(t, e.kind, e.severity) for t, e in events]
+        self.log_result(
+            "escalate",
+            kinds == [(1.0, "open", "warning"), (2.5, "escalate", "danger")],
+            f"전이 {kinds}",
+        )
+        active = engine.get_active()
+        self.log_result(
+            "하강 시 최고 심각도 유지",
+            len(active) == 1
+            and active[0]["severity"] == "danger"
+            and active[0]["level"] == "warning"
+            and active[0]["peak_value"] == 5.7,
+            f"이벤트 {active[0]['severity']} / 현재 {active[0]['level']}, "
+            f"피크 {active[0]['peak_value']}V",
+        )
+
+    def test_hysteresis_close(self):
+        """히스테리시스 / close 테스트"""
+        rule = AlertRule(
+            "voltage",
+            "V",
+            danger_high=5.5,
+            hysteresis=0.05,
+            open_seconds=0.0,
+            close_seconds=1.0,
+        )
+        engine = AlertEngine(rules=(rule,))
+        events = self.feed(engine, [5.6], start=0.0)
+
+        # 5.47V: 진입 임계값(5.5) 안쪽이지만 해제 임계값(5.45) 밖 → 해제 대기 안 함
+        events += self.feed(engine, [5.47] * 30, start=1.0)
+        held = len(events) == 1 and engine.get_active() != []
+        self.log_result(
+            "히스테리시스 유지",
+            held,
+            "5.47V 3초 (해제 임계값 5.45V 밖) → 알림 유지",
+        )
+
+        # 5.4V 1초 지속 → close (샘플 수 = open 1 + 유지 30 + 해제 대기 11)
+        events += self.feed(engine, [5.4] * 11, start=5.0)
+        closed = events[-1][1]
+        self.log_result(
+            "close",
+            [e.kind for _, e in events] == ["open", "close"]
+            and events[-1][0] == 6.0
+            and closed.peak_value == 5.6
+            and closed.sample_count == 42
+            and engine.get_active() == [],
+            f"close 시각 {events[-1][0]}초, 샘플 {closed.sample_count}개, "
+            f"피크 {closed.peak_value}V",
+        )
+
+        # 해제 대기 중 다시 이탈하면 대기 시간 초기화
+        engine = AlertEngine(rules=(rule,))
+        events = self.feed(engine, [5.6] + [5.0] * 8 + [5.6] + [5.0] * 8, start=0.0)
+        self.log_result(
+            "해제 대기 초기화",
+            [e.kind for _, e in events] == ["open"],
+            "0.8초 정상 → 재이탈 → 0.8초 정상: close 없음",
+        )
+
+    def test_counters(self):
+        """카운터 flush / close_all 테스트"""
+        engine = AlertEngine(flush_interval=10.0)
+        self.feed(engine, [5.8] * 20, start=0.0)
+        engine.set_event_id("voltage", 42)
+
+        early = engine.pop_counter_updates(5.0)
+        due = engine.pop_counter_updates(12.0)
+        again = engine.pop_counter_updates(30.0)
+        self.log_result(
+            "카운터 flush 주기",
+            early == [] and due == [(5.8, 10, 42)] and again == [],
+            f"5초: {early}, 12초: {due}, 변경 없음: {again}",
+        )
+
+        closed = engine.close_all()
+        self.log_result(
+            "close_all",
+            len(closed) == 1
+            and closed[0].kind == "close"
+            and closed[0].event_id == 42
+            and engine.get_active() == []
+            and engine.metrics["opened"] == engine.metrics["closed"] == 1,
+            f"해제 {len(closed)}개, 메트릭 {engine.metrics}",
+        )
+
+    def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🚨 알림 엔진 테스트 시작")
+        print("=" * 60)
+        self.test_debounce()
+        self.test_escalate()
+        self.test_hysteresis_close()
+        self.test_counters()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+def main():
+    """메인 실행 함수"""
+    tester = AlertEngineTester()
+    sys.exit(0 if tester.run_full_test() else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+알림 수명주기 테스트
+알림 엔진 전이 → alert_events 1행 (open → escalate → close) 기록 검증
+
+테스트 항목:
+1. open 시 1행 INSERT (resolved_at NULL, 활성 알림 조회)
+2. 열린 동안 피크값 / 샘플 수 주기적 갱신
+3. escalate / close는 같은 행 UPDATE, close 시 resolved_at 기록
+4. 재시작 시 남은 열린 알림 일괄 해제
+5. 정리 작업: 해제된 오래된 알림만 삭제 (활성 알림 유지)
+6. 활성 / 이력 조회의 부분 인덱스 사용
+7. 수명주기 이전 DB 마이그레이션: 해제되지 않은 기존 행은 발생 시각에 해제
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+from alert_engine import AlertEngine, AlertTransition
+from database import PowerDatabase
+
+
+class AlertLifecycleTester:
+    """알림 수명주기 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_alert_lifecycle.db"
+        self.db = None
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def rows(self) -> list[tuple]:
+        """alert_events 전체 (id, severity, sample_count, peak, resolved 여부)"""
+        with sqlite3.connect(self.test_db_path) as conn:
+            return conn.execute(
+                "SELECT id, severity, sample_count, peak_value, "
+                "resolved_at IS NOT NULL FROM alert_events ORDER BY id"
+            ).fetchall()
+
+    async def apply(self, engine: AlertEngine, transition: AlertTransition):
+        """서버와 같은 방식으로 전이 기록 (open은 INSERT, 나머지는 같은 행 UPDATE)"""
+        if transition.kind == "open":
+            event_id = await self.db.open_alert_event(
+                timestamp=transition.timestamp,
+                alert_type=transition.alert_type,
+                metric_name=transition.metric,
+                metric_value=transition.value,
+                threshold_value=transition.threshold,
+                severity=transition.severity,
+                message=transition.message,
+            )
+            engine.set_event_id(transition.metric, event_id)
+            return
+        await self.db.update_alert_event(
+            event_id=transition.event_id,
+            alert_type=transition.alert_type,
+            threshold_value=transition.threshold,
+            severity=transition.severity,
+            message=transition.message,
+            peak_value=transition.peak_value,
+            sample_count=transition.sample_count,
+            resolved_at=transition.timestamp if transition.kind == "close" else None,
+        )
+
+    async def feed(self, engine: AlertEngine, voltages: list[float], start: float):
+        """10Hz 전압 샘플 평가 + 전이 기록 + 카운터 flush"""
+        for i, voltage in enumerate(voltages):
+            now = start + i * 0.1
+            for transition in engine.evaluate(voltage, 0.2, 1.0, now):
+                await self.apply(engine, transition)
+            updates = engine.pop_counter_updates(now)
+            if updates:
+                await self.db.update_alert_counters(updates)
+
+    async def test_lifecycle(self):
+        """open → escalate → close 테스트"""
+        engine = AlertEngine(flush_interval=1.0)
+
+        # 경고 대역 1.5초 → open (샘플 1개로 시작)
+        await self.feed(engine, [5.4] * 15, start=0.0)
+        opened = self.rows()
+        active = await self.db.get_active_alerts()
+        self.log_result(
+            "open 1행",
+            len(opened) == 1
+            and opened[0][1] == "warning"
+            and opened[0][4] == 0
+            and len(active) == 1
+            and active[0]["metric_name"] == "voltage",
+            f"행 {opened}",
+        )
+
+        # 위험 1.5초 → escalate (같은 행), 열린 동안 카운터 갱신
+        await self.feed(engine, [5.4] * 5 + [5.7] * 15, start=1.5)
+        escalated = self.rows()
+        self.log_result(
+            "escalate / 카운터 갱신",
+            len(escalated) == 1
+            and escalated[0][0] == opened[0][0]
+            and escalated[0][1] == "danger"
+            and escalated[0][2] > opened[0][2]
+            and escalated[0][3] == 5.7,
+            f"행 {escalated}",
+        )
+
+        # 정상 6초 → close (resolved_at 기록, 이력으로 이동)
+        await self.feed(engine, [5.0] * 60, start=3.5)
+        closed = self.rows()
+        active = await self.db.get_active_alerts()
+        history = await self.db.get_alert_history(hours=1)
+        self.log_result(
+            "close",
+            len(closed) == 1
+            and closed[0][4] == 1
+            and closed[0][2] > escalated[0][2]
+            and active == []
+            and len(history) == 1
+            and history[0]["severity"] == "danger",
+            f"행 {closed}, 활성 {len(active)}개, 이력 {len(history)}개",
+        )
+
+        # 다음 이탈은 새 행
+        await self.feed(engine, [4.2] * 15, start=20.0)
+        self.log_result(
+            "새 이벤트 새 행",
+            [row[4] for row in self.rows()] == [1, 0],
+            f"행 {len(self.rows())}개 (해제 1, 활성 1)",
+        )
+
+        # 재시작: 메모리 상태가 없으므로 남은 열린 행 일괄 해제
+        resolved = await self.db.resolve_open_alerts()
+        self.log_result(
+            "재시작 시 일괄 해제",
+            resolved == 1 and await self.db.get_active_alerts() == [],
+            f"해제 {resolved}건",
+        )
+
+    async def test_retention(self):
+        """정리 작업의 알림 보관 정책 테스트"""
+        old = datetime.now() - timedelta(hours=self.db.data_retention_hours + 5)
+        stale_id = await self.db.open_alert_event(
+            old, "threshold_violation", "current", 0.8, 0.5, "danger"
+        )
+        await self.db.update_alert_event(
+            stale_id, "threshold_violation", 0.5, "danger", "old", 0.8, 10, old
+        )
+        # 오래전에 열렸지만 아직 활성인 알림은 유지
+        active_id = await self.db.open_alert_event(
+            old, "threshold_violation", "power", 2.5, 2.0, "danger"
+        )
+        before = len(self.rows())
+
+        stats = await self.db.cleanup_old_data()
+        remaining = {row[0] for row in self.rows()}
+        self.log_result(
+            "해제된 오래된 알림 삭제",
+            stats.get("alerts_deleted") == 1
+            and stale_id not in remaining
+            and active_id in remaining
+            and len(remaining) == before - 1,
+            f"삭제 {stats.get('alerts_deleted')}건, 활성 알림 id {active_id} 유지",
+        )
+
+        with sqlite3.connect(self.test_db_path) as conn:
+            plans = [
+                " ".join(
+                    row[3]
+                    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+                )
+                for sql in (
+                    "SELECT id FROM alert_events WHERE resolved_at IS NULL "
+                    "ORDER BY sensor_id, metric_name, timestamp",
+                    "SELECT id FROM alert_events WHERE resolved_at IS NOT NULL "
+                    "AND resolved_at >= '2024-01-01' ORDER BY resolved_at DESC",
+                )
+            ]
+        self.log_result(
+            "부분 인덱스 사용",
+            "idx_alert_active" in plans[0] and "idx_alert_resolved" in plans[1],
+            f"활성: {plans[0]} / 이력: {plans[1]}",
+        )
+
+    async def test_legacy_migration(self):
+        """수명주기 이전 alert_events 마이그레이션 테스트"""
+        legacy_path = "test_alert_lifecycle_legacy.db"
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+        occurred = datetime.now() - timedelta(minutes=30)
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE alert_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME NOT NULL,
+                    alert_type TEXT NOT NULL,
+                    metric_name TEXT NOT NULL,
+                    metric_value REAL NOT NULL,
+                    threshold_value REAL NOT NULL,
+                    severity TEXT NOT NULL,
+                    message TEXT,
+                    resolved_at DATETIME,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+            conn.executemany(
+                "INSERT INTO alert_events (timestamp, alert_type, metric_name, "
+                "metric_value, threshold_value, severity) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (occurred, "threshold_violation", "voltage", 5.6, 5.5, "danger"),
+                    (occurred, "threshold_violation", "current", 0.6, 0.5, "warning"),
+                ],
+            )
+
+        # 서버 시작(resolve_open_alerts) 없이 DB만 열어도 활성 알림 없음
+        db = PowerDatabase(legacy_path)
+        try:
+            active = await db.get_active_alerts()
+            history = await db.get_alert_history(hours=1)
+        finally:
+            await db.close()
+            os.remove(legacy_path)
+            shutil.rmtree(db.archive.directory, ignore_errors=True)
+        self.log_result(
+            "기존 알림 마이그레이션",
+            active == []
+            and len(history) == 2
+            and all(row["resolved_at"] == row["timestamp"] for row in history)
+            and {row["peak_value"] for row in history} == {5.6, 0.6},
+            f"활성 {len(active)}개, 이력 {len(history)}개 (발생 시각에 해제)",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🔔 알림 수명주기 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        try:
+            await self.test_lifecycle()
+            await self.test_retention()
+            await self.test_legacy_migration()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = AlertLifecycleTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+분석 결과 배치 기록기 테스트
+AnalysisBatchWriter의 저장 정책과 배치 저장 검증
+
+테스트 항목:
+1. 정상 샘플은 sample_every번째만 저장
+2. 이상치 샘플은 항상 저장
+3. analyze_batch 결과도 같은 정책 (샘플 순번 연속)
+4. 장치별 샘플 순번 분리
+5. 배치 flush로 저장 (샘플마다 트랜잭션 없음)
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+from data_analyzer import DataAnalyzer
+from database import AnalysisBatchWriter, PowerDatabase
+
+
+class AnalysisWriterTester:
+    """AnalysisBatchWriter 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_analysis_writer.db"
+        self.db = None
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def stored(self, sensor_id: int = 1, outliers_only: bool = False) -> int:
+        """저장된 분석 결과 샘플 수 (메트릭 3행 = 샘플 1개)"""
+        condition = " AND is_outlier = 1" if outliers_only else ""
+        with sqlite3.connect(self.test_db_path) as conn:
+            rows = conn.execute(
+                "SELECT COUNT(DISTINCT timestamp) FROM analysis_results "
+                "WHERE sensor_id = ?" + condition,
+                (sensor_id,),
+            ).fetchone()[0]
+        return rows
+
+    async def test_sampling_policy(self):
+        """정상 / 이상치 저장 정책 테스트"""
+        writer = AnalysisBatchWriter(
+            self.db, sample_every=10, batch_size=300, flush_interval=60.0
+        )
+        await writer.start()
+        analyzer = DataAnalyzer(":memory:")
+        rng = np.random.default_rng(7)
+
+        persisted = expected = 0
+        for i in range(200):
+            if i == 150:
+                voltage, current = 9.0, 0.25  # 명확한 전압 이상치
+            else:
+                voltage = 5.0 + rng.normal(0, 0.01)
+                current = 0.25 + rng.normal(0, 0.005)
+            result = analyzer.analyze_data_point(voltage, current, voltage * current)
+            # 같은 마이크로초 타임스탬프 방지
+            result["timestamp"] = (
+                datetime.now() + timedelta(milliseconds=i)
+            ).isoformat()
+            if result["has_any_outlier"] or (i + 1) % 10 == 0:
+                expected += 1
+            persisted += await writer.add_analysis(result)
+
+        flushes_before_stop = writer.metrics["flush_count"]
+        await writer.stop()
+
+        skipped = writer.metrics["samples_skipped"]
+        self.log_result(
+            "정상 샘플 간격 저장",
+            persisted == expected and skipped == 200 - persisted,
+            f"200개 중 {persisted}개 저장 (기대 {expected}), 건너뜀 {skipped}개",
+        )
+        with sqlite3.connect(self.test_db_path) as conn:
+            spike = conn.execute(
+                "SELECT is_outlier FROM analysis_results "
+                "WHERE metric = 'voltage' AND value = 9.0"
+            ).fetchall()
+        self.log_result(
+            "이상치 항상 저장",
+            spike == [(1,)],
+            f"151번째 전압 이상치 저장 {len(spike)}행, "
+            f"이상치 샘플 {self.stored(outliers_only=True)}개",
+        )
+        self.log_result(
+            "배치 저장",
+            flushes_before_stop == 0
+            and writer.metrics["rows_written"] == persisted * 3,
+            f"{writer.metrics['rows_written']}행을 {writer.metrics['flush_count']}회 "
+            "flush로 저장",
+        )
+
+    async def test_batch_policy(self):
+        """analyze_batch 결과 저장 정책 / 장치별 순번 테스트"""
+        writer = AnalysisBatchWriter(self.db, sample_every=10)
+        analyzer = DataAnalyzer(":memory:")
+        base = datetime.now() + timedelta(hours=1)
+
+        voltage = np.full(95, 5.0)
+        current = np.full(95, 0.25)
+        power = voltage * current
+        timestamps = [base + timedelta(milliseconds=i) for i in range(95)]
+
+        # 40개 + 55개 두 배치로 나눠도 순번이 이어져 10번째마다 저장
+        saved = 0
+        for part in (slice(0, 40), slice(40, 95)):
+            result = analyzer.analyze_batch(voltage[part], current[part], power[part])
+            saved += await writer.add_analysis_batch(
+                result, timestamps[part], sensor_id=2
+            )
+        await writer.flush()
+
+        self.log_result(
+            "배치 분석 저장 정책",
+            saved == 9 and self.stored(sensor_id=2) == 9,
+            f"95개 중 {saved}개 저장 (10, 20, ..., 90번째)",
+        )
+
+        # 다른 장치는 순번이 따로 시작
+        single = analyzer.analyze_batch(voltage[:5], current[:5], power[:5])
+        saved = await writer.add_analysis_batch(single, timestamps[:5], sensor_id=3)
+        self.log_result(
+            "장치별 순번 분리",
+            saved == 0 and writer._sample_index == {2: 95, 3: 5},
+            f"순번 {writer._sample_index}",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🧮 분석 결과 배치 기록기 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        try:
+            await self.test_sampling_policy()
+            await self.test_batch_policy()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = AnalysisWriterTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
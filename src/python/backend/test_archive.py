@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+콜드 아카이브 테스트
+보관 기간이 지난 측정 파티션의 압축 블록 보존과 구간 조회 검증
+
+테스트 항목:
+1. 블록 인코딩 왕복 (delta-of-delta 시각, 정수화 / XOR 실수, 사전 문자열)
+2. 정리 작업: 만료 파티션 아카이브 후 DROP, 구간 조회가 원본과 일치
+3. 장치별 블록 / 장치 필터 조회
+4. 아카이브 도중 늦게 들어온 행: DROP 보류 후 다음 정리 때 보존
+5. 잘린 마지막 블록은 읽을 때 무시, 다음 쓰기 전에 잘라냄
+"""
+
+import asyncio
+import os
+import random
+import shutil
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+from archive import ARCHIVE_COLUMNS, decode_block, encode_block
+from database import PowerDatabase, measurement_partition, to_epoch_ms
+
+
+class ArchiveTester:
+    """콜드 아카이브 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_archive.db"
+        self.db = None
+        # 보관 기간(48시간)보다 3시간 오래된 정시부터 2시간 분량 (파티션 2개)
+        now = datetime.now()
+        self.start = now.replace(minute=0, second=0, microsecond=0) - timedelta(
+            hours=51
+        )
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def rows(self, sensor_id: int, count: int, step: float = 1.0) -> list[tuple]:
+        """장치별 측정 행 (장치 1: 소수 3자리 값, 장치 2: 임의 실수)"""
+        generator = random.Random(sensor_id)
+        result = []
+        for i in range(count):
+            if sensor_id == 1:
+                voltage, current = 5.0 + (i % 7) * 0.001, 0.2 + (i % 11) * 0.001
+            else:
+                voltage, current = generator.uniform(4, 6), generator.uniform(0, 1)
+            timestamp = self.start + timedelta(seconds=i * step)
+            mode = "NORMAL" if i % 100 else "SPIKE"
+            result.append(
+                (timestamp, voltage, current, voltage * current, i, "ok", mode)
+                + (sensor_id,)
+            )
+        return result
+
+    @staticmethod
+    def same(columns: dict, rows: list[tuple]) -> bool:
+        """복원한 컬럼 배열이 원본 행과 (시각 ms 기준) 일치하는지"""
+        expected = [
+            (row[0] if isinstance(row[0], int) else to_epoch_ms(row[0]), *row[1:])
+            for row in rows
+        ]
+        return len(columns["timestamp"]) == len(expected) and all(
+            columns[name].tolist() == [row[index] for row in expected]
+            for index, (name, _kind) in enumerate(ARCHIVE_COLUMNS)
+        )
+
+    def test_codec(self):
+        """블록 인코딩 왕복 테스트"""
+        for sensor_id, encoding in ((1, "정수화 delta"), (2, "XOR")):
+            rows = [
+                (to_epoch_ms(row[0]), *row[1:7]) for row in self.rows(sensor_id, 600)
+            ]
+            # 불규칙 간격 (수집 중단 1분) 포함
+            rows = rows[:300] + [(row[0] + 60_000, *row[1:]) for row in rows[300:]]
+            payload, first_ms, last_ms = encode_block(rows)
+            columns = decode_block(payload, first_ms, len(rows))
+            self.log_result(
+                f"블록 왕복 ({encoding})",
+                self.same(columns, rows)
+                and (first_ms, last_ms) == (rows[0][0], rows[-1][0]),
+                f"{len(rows)}행 → {len(payload)} bytes (압축 전, 무손실)",
+            )
+
+    async def test_cleanup_archive(self):
+        """정리 작업 아카이브 / 조회 테스트"""
+        sensor_1 = self.rows(1, 7200)
+        sensor_2 = self.rows(2, 3600, step=2.0)
+        await self.db.save_measurements_batch(sensor_1 + sensor_2)
+        expired = [
+            measurement_partition(self.start),
+            measurement_partition(self.start + timedelta(hours=1)),
+        ]
+
+        stats = await self.db.cleanup_old_data()
+        end = self.start + timedelta(hours=2)
+        all_sensors = await self.db.get_archived_measurements(self.start, end)
+        only_1 = await self.db.get_archived_measurements(self.start, end, 1)
+        only_2 = await self.db.get_archived_measurements(self.start, end, 2)
+        archive_stats = self.db.archive.get_stats()
+        self.log_result(
+            "아카이브 후 DROP",
+            stats.get("partitions_archived") == 2
+            and stats.get("partitions_dropped") == 2
+            and not set(expired) & set(self.db.partitions)
+            and archive_stats["rows"] == 10800
+            and archive_stats["blocks"] == 4,
+            f"파티션 {stats.get('partitions_dropped')}개 DROP, 블록 "
+            f"{archive_stats['blocks']}개, 샘플당 {archive_stats['bytes_per_sample']}B",
+        )
+        self.log_result(
+            "장치별 조회 원본 일치",
+            self.same(only_1, sensor_1) and self.same(only_2, sensor_2),
+            f"장치 1: {len(only_1['timestamp'])}행, "
+            f"장치 2: {len(only_2['timestamp'])}행",
+        )
+        timestamps = all_sensors["timestamp"]
+        self.log_result(
+            "전체 장치 시간 순",
+            len(timestamps) == 10800
+            and bool(np.all(np.diff(timestamps) >= 0))
+            and set(all_sensors["sensor_id"].tolist()) == {1, 2},
+            f"{len(timestamps)}행, 장치 {np.unique(all_sensors['sensor_id']).tolist()}",
+        )
+
+        # 부분 구간: 블록 안쪽만 잘라서 반환
+        middle = await self.db.get_archived_measurements(
+            self.start + timedelta(minutes=30), self.start + timedelta(minutes=31), 1
+        )
+        self.log_result(
+            "부분 구간 조회",
+            middle["sequence_number"].tolist() == list(range(1800, 1860)),
+            f"30~31분: {len(middle['timestamp'])}행",
+        )
+
+    async def test_late_rows(self):
+        """아카이브 도중 늦게 들어온 행 테스트"""
+        start = self.start + timedelta(hours=2)
+        name = measurement_partition(start)
+        rows = [
+            (start + timedelta(seconds=i), 5.0, 0.2, 1.0, i, "ok", "NORMAL")
+            for i in range(100)
+        ]
+        await self.db.save_measurements_batch(rows)
+
+        # 파티션을 읽은 뒤 DROP 전에 같은 파티션에 행 1개 도착
+        archive_partition = self.db._archive_partition
+        late = (start + timedelta(minutes=30), 5.0, 0.2, 1.0, 999, "ok", "NORMAL")
+
+        async def archive_then_insert(partition: str):
+            row_count = await archive_partition(partition)
+            await self.db.save_measurements_batch([late])
+            return row_count
+
+        self.db._archive_partition = archive_then_insert
+        first = await self.db.cleanup_old_data()
+        self.db._archive_partition = archive_partition
+        kept = name in self.db.partitions
+
+        second = await self.db.cleanup_old_data()
+        archived = await self.db.get_archived_measurements(
+            start, start + timedelta(hours=1), 1
+        )
+        self.log_result(
+            "늦게 들어온 행 보존",
+            first.get("partitions_dropped") == 0
+            and kept
+            and second.get("partitions_dropped") == 1
+            and archived["sequence_number"].tolist() == list(range(100)) + [999],
+            f"1차 DROP 보류, 2차 DROP 후 아카이브 {len(archived['timestamp'])}/101행",
+        )
+
+    def test_truncated_block(self):
+        """잘린 마지막 블록 테스트"""
+        archive = self.db.archive
+        day = archive.days()[-1]
+        path = archive._day_path(day)
+        size = os.path.getsize(path)
+        before = archive.get_stats()["rows"]
+
+        # 쓰기 도중 중단: 블록 일부만 남김
+        extra = [
+            (to_epoch_ms(self.start) + i, 5.0, 0.2, 1.0, i, "ok", "NORMAL", 3)
+            for i in range(500)
+        ]
+        archive.append_partition(day, 23, extra)
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 10)
+        ignored = archive.get_stats()["rows"] == before
+
+        archive.append_partition(day, 23, extra)
+        restored = archive.read(
+            self.start - timedelta(hours=1), self.start + timedelta(hours=1), 3
+        )
+        self.log_result(
+            "잘린 블록 복구",
+            ignored
+            and archive.get_stats()["rows"] == before + 500
+            and len(restored["timestamp"]) == 500
+            and os.path.getsize(path) > size,
+            "잘린 블록 무시 → 재시도 시 잘라내고 다시 기록",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🗄️ 콜드 아카이브 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+        try:
+            self.test_codec()
+            await self.test_cleanup_archive()
+            await self.test_late_rows()
+            self.test_truncated_block()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = ArchiveTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
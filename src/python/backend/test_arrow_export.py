@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Arrow IPC / Parquet 내보내기 테스트
+측정 데이터와 분석 결과를 Arrow 스트림 / Parquet 파일로 내보내고 다시 읽어 검증
+
+테스트 항목:
+1. 분석 결과 키셋 페이지: (timestamp, id) 순서, 범위 경계, 장치 필터
+2. 분석 결과 페이지 조회는 end를 넘으면 멈추고, 페이지마다 인덱스로 탐색
+3. 측정 데이터 Arrow IPC 행 수 / 순서
+4. 분석 결과 Arrow IPC 행 수 (시간 범위 경계 포함)
+5. 분석 결과 Parquet 파일 행 수 / 타임스탬프 UTC 변환
+6. 다른 장치 데이터 제외
+
+실행: python test_arrow_export.py (3~6번은 pyarrow 필요, 없으면 건너뜀)
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from database import PowerDatabase
+from export import stream_arrow, write_arrow_file
+
+
+class ArrowExportTester:
+    """Arrow 내보내기 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_arrow_export.db"
+        self.parquet_path = "test_arrow_export.parquet"
+        self.db = None
+        self.base_time = datetime.now().replace(microsecond=0) - timedelta(minutes=30)
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    async def setup(self):
+        """테스트 DB 생성 및 데이터 저장"""
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+
+        measurements = [
+            (
+                self.base_time + timedelta(milliseconds=100 * i),
+                5.0,
+                0.2,
+                1.0,
+                i,
+                "ok",
+                "NORMAL",
+            )
+            for i in range(1000)
+        ]
+        await self.db.save_measurements_batch(measurements)
+
+        # 분석 결과는 AnalysisBatchWriter와 같은 isoformat() 문자열로 저장
+        analysis = []
+        for i in range(300):
+            timestamp = self.base_time + timedelta(seconds=i, microseconds=250)
+            sensor_id = 1 if i < 200 else 2
+            analysis.append(
+                (
+                    timestamp.isoformat(),
+                    "power",
+                    1.0,
+                    1.0,
+                    1.0,
+                    1.0,
+                    i % 50 == 0,
+                    0.0,
+                    "zscore",
+                    "normal",
+                    0.0,
+                    sensor_id,
+                )
+            )
+        await self.db.save_analysis_batch(analysis)
+
+    async def analysis_rows(
+        self, start: datetime, end: datetime, page_size: int, **kwargs
+    ) -> list[list[tuple]]:
+        """iter_analysis_pages 페이지 목록"""
+        return [
+            page
+            async for page in self.db.iter_analysis_pages(
+                start, end, page_size=page_size, **kwargs
+            )
+        ]
+
+    async def test_analysis_pages(self):
+        """분석 결과 키셋 페이지 테스트"""
+        end = self.base_time + timedelta(minutes=10)
+        pages = await self.analysis_rows(self.base_time, end, 64)
+        rows = [row for page in pages for row in page]
+        keys = [(row[1], row[0]) for row in rows]
+        self.log_result(
+            "분석 페이지 순서",
+            len(rows) == 300
+            and keys == sorted(set(keys))
+            and max(len(page) for page in pages) == 64,
+            f"{len(rows)}행, 페이지 {[len(page) for page in pages]}",
+        )
+
+        # 경계: start는 포함, end는 제외 (각 행은 +250µs 위치)
+        boundary = await self.analysis_rows(
+            self.base_time + timedelta(seconds=10, microseconds=250),
+            self.base_time + timedelta(seconds=20, microseconds=250),
+            4,
+        )
+        sensor_2 = await self.analysis_rows(self.base_time, end, 64, sensor_id=2)
+        self.log_result(
+            "분석 페이지 경계 / 장치 필터",
+            sum(len(page) for page in boundary) == 10
+            and {row[12] for page in sensor_2 for row in page} == {2}
+            and sum(len(page) for page in sensor_2) == 100,
+            f"경계 {sum(len(page) for page in boundary)}/10행, "
+            f"장치 2 {sum(len(page) for page in sensor_2)}/100행",
+        )
+
+        # end 이후 행이 280개 남아 있어도 20행 (8 + 8 + 4) 읽고 멈춤
+        reader = self.db.pool.reader
+        queries = []
+
+        def counting_reader():
+            queries.append(1)
+            return reader()
+
+        self.db.pool.reader = counting_reader
+        try:
+            pages = await self.analysis_rows(
+                self.base_time, self.base_time + timedelta(seconds=20), 8
+            )
+        finally:
+            self.db.pool.reader = reader
+        self.log_result(
+            "end에서 멈춤",
+            [len(page) for page in pages] == [8, 8, 4] and len(queries) == 3,
+            f"페이지 {[len(page) for page in pages]}, 쿼리 {len(queries)}번",
+        )
+
+        with sqlite3.connect(self.test_db_path) as conn:
+            plans = [
+                " ".join(
+                    row[3]
+                    for row in conn.execute(
+                        f"EXPLAIN QUERY PLAN SELECT * FROM analysis_results "
+                        f"WHERE {sensor_filter}(timestamp, id) > (?, ?) "
+                        "AND timestamp < ? ORDER BY timestamp, id LIMIT 8",
+                        params,
+                    ).fetchall()
+                )
+                for sensor_filter, params in (
+                    ("", ("", -1, "")),
+                    ("sensor_id = ? AND ", (2, "", -1, "")),
+                )
+            ]
+        self.log_result(
+            "페이지 인덱스 탐색",
+            plans[0].startswith("SEARCH")
+            and "idx_analysis_timestamp" in plans[0]
+            and plans[1].startswith("SEARCH")
+            and "idx_analysis_sensor" in plans[1]
+            and "TEMP B-TREE" not in " ".join(plans),
+            f"전체: {plans[0]} / 장치: {plans[1]}",
+        )
+
+    async def read_ipc(self, table: str, start: datetime, end: datetime, **kwargs):
+        """stream_arrow 결과를 pyarrow Table로 읽기"""
+        chunks = [
+            chunk
+            async for chunk in stream_arrow(
+                self.db, table, start, end, "arrow", **kwargs
+            )
+        ]
+        return pa.ipc.open_stream(pa.BufferReader(b"".join(chunks))).read_all()
+
+    async def test_measurement_ipc(self):
+        """측정 데이터 Arrow IPC 테스트"""
+        table = await self.read_ipc(
+            "measurements", self.base_time, self.base_time + timedelta(minutes=5)
+        )
+        self.log_result(
+            "측정 IPC 행 수", table.num_rows == 1000, f"{table.num_rows}/1000행"
+        )
+        sequences = table.column("sequence_number").to_pylist()
+        self.log_result(
+            "측정 IPC 순서",
+            sequences == list(range(1000)),
+            "sequence_number 오름차순",
+        )
+
+    async def test_analysis_ipc(self):
+        """분석 결과 Arrow IPC 행 수 테스트"""
+        table = await self.read_ipc(
+            "analysis", self.base_time, self.base_time + timedelta(minutes=10)
+        )
+        self.log_result(
+            "분석 IPC 행 수", table.num_rows == 200, f"{table.num_rows}/200행"
+        )
+
+        # 경계: start는 포함, end는 제외 (각 행은 +250µs 위치)
+        table = await self.read_ipc(
+            "analysis",
+            self.base_time + timedelta(seconds=10, microseconds=250),
+            self.base_time + timedelta(seconds=20, microseconds=250),
+        )
+        self.log_result(
+            "분석 IPC 범위 경계", table.num_rows == 10, f"{table.num_rows}/10행"
+        )
+
+        table = await self.read_ipc(
+            "analysis",
+            self.base_time,
+            self.base_time + timedelta(minutes=10),
+            sensor_id=2,
+        )
+        self.log_result(
+            "분석 IPC 장치 필터", table.num_rows == 100, f"{table.num_rows}/100행"
+        )
+
+    async def test_analysis_parquet(self):
+        """분석 결과 Parquet 파일 테스트"""
+        written = await write_arrow_file(
+            self.db,
+            self.parquet_path,
+            "analysis",
+            self.base_time,
+            self.base_time + timedelta(minutes=10),
+        )
+        table = pq.read_table(self.parquet_path)
+        self.log_result(
+            "분석 Parquet 행 수",
+            table.num_rows == 200,
+            f"{table.num_rows}/200행, {written} bytes",
+        )
+
+        first = table.column("timestamp")[0].as_py() if table.num_rows else None
+        expected = (
+            (self.base_time + timedelta(microseconds=250))
+            .astimezone()
+            .astimezone(timezone.utc)
+        )
+        self.log_result(
+            "분석 Parquet 타임스탬프", first == expected, f"{first} == {expected}"
+        )
+
+    async def cleanup(self):
+        """테스트 파일 정리"""
+        await self.db.close()
+        for path in (self.test_db_path, self.parquet_path):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📦 Arrow IPC / Parquet 내보내기 테스트 시작")
+        print("=" * 60)
+        await self.setup()
+        try:
+            await self.test_analysis_pages()
+            if pa is None:
+                print("⚠️ pyarrow 미설치: Arrow IPC / Parquet 항목 건너뜀")
+                print("pip install pyarrow")
+            else:
+                await self.test_measurement_ipc()
+                await self.test_analysis_ipc()
+                await self.test_analysis_parquet()
+        finally:
+            await self.cleanup()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = ArrowExportTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
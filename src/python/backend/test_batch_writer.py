@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Write-behind 배치 기록기 테스트
+BatchWriter의 flush 조건, backpressure, 실패 재시도, 종료 시 drain 검증
+
+테스트 항목:
+1. batch_size 도달 시 flush
+2. flush_interval 경과 시 flush
+3. max_pending 도달 시 backpressure 대기 (동시 생산자 / flush 실패 중에도 한도 유지)
+4. flush 실패 행 재시도
+5. stop() 시 남은 행 drain
+6. MeasurementBatchWriter → SQLite 저장
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+
+from database import BatchWriter, MeasurementBatchWriter, PowerDatabase
+
+
+class RecordingSink:
+    """flush_func 대상: 받은 배치를 기록 (지연/실패 주입 가능)"""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches: list[list[tuple]] = []
+        self.delay = delay
+        self.fail_next = 0
+
+    async def __call__(self, rows: list[tuple]) -> bool:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_next:
+            self.fail_next -= 1
+            return False
+        self.batches.append(list(rows))
+        return True
+
+    @property
+    def rows(self) -> list[tuple]:
+        return [row for batch in self.batches for row in batch]
+
+
+class BatchWriterTester:
+    """BatchWriter 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_batch_writer.db"
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    async def test_size_flush(self):
+        """batch_size 도달 시 flush 테스트"""
+        sink = RecordingSink()
+        writer = BatchWriter(sink, batch_size=10, flush_interval=60.0)
+        await writer.start()
+        for i in range(9):
+            await writer.add((i,))
+        await asyncio.sleep(0.05)
+        before = len(sink.rows)
+        await writer.add((9,))
+        await asyncio.sleep(0.05)
+
+        self.log_result(
+            "크기 기반 flush",
+            before == 0 and len(sink.rows) == 10 and writer.pending == 0,
+            f"9행: 저장 {before}행 → 10행: 저장 {len(sink.rows)}행",
+        )
+        for i in range(10, 25):
+            await writer.add((i,))
+        await writer.stop()
+        self.log_result(
+            "종료 시 drain",
+            [row[0] for row in sink.rows] == list(range(25)),
+            f"저장 {len(sink.rows)}/25행 (순서 유지)",
+        )
+
+    async def test_interval_flush(self):
+        """flush_interval 경과 시 flush 테스트"""
+        sink = RecordingSink()
+        writer = BatchWriter(sink, batch_size=1000, flush_interval=0.1)
+        await writer.start()
+        for i in range(3):
+            await writer.add((i,))
+        await asyncio.sleep(0.3)
+
+        self.log_result(
+            "시간 기반 flush",
+            len(sink.rows) == 3 and writer.metrics["flush_count"] >= 1,
+            f"저장 {len(sink.rows)}/3행, flush {writer.metrics['flush_count']}회",
+        )
+        await writer.stop()
+
+    async def test_backpressure(self):
+        """max_pending 도달 시 backpressure 테스트"""
+        sink = RecordingSink(delay=0.05)
+        writer = BatchWriter(sink, batch_size=1000, flush_interval=60.0, max_pending=50)
+        await writer.start()
+        max_seen = 0
+        for i in range(200):
+            await writer.add((i,))
+            max_seen = max(max_seen, writer.pending)
+        await writer.stop()
+
+        self.log_result(
+            "backpressure 대기",
+            writer.metrics["backpressure_waits"] > 0 and max_seen <= 50,
+            f"대기 {writer.metrics['backpressure_waits']}회, 최대 버퍼 {max_seen}행",
+        )
+        self.log_result(
+            "backpressure 손실 없음",
+            len(sink.rows) == 200 and writer.metrics["rows_dropped"] == 0,
+            f"저장 {len(sink.rows)}/200행",
+        )
+
+        # add_many는 묶음 단위로 한도를 검사
+        sink = RecordingSink(delay=0.02)
+        writer = BatchWriter(sink, batch_size=1000, flush_interval=60.0, max_pending=30)
+        await writer.start()
+        for i in range(10):
+            await writer.add_many([(i, j) for j in range(20)])
+            max_seen = max(max_seen, writer.pending)
+        await writer.stop()
+        self.log_result(
+            "add_many backpressure",
+            len(sink.rows) == 200
+            and all(len(batch) % 20 == 0 for batch in sink.batches),
+            f"저장 {len(sink.rows)}/200행, 배치 {len(sink.batches)}개 (묶음 분할 없음)",
+        )
+
+        # 동시 생산자: 깨어난 뒤 다시 검사하므로 한도를 넘지 않음
+        sink = RecordingSink(delay=0.02)
+        writer = BatchWriter(sink, batch_size=1000, flush_interval=60.0, max_pending=20)
+        await writer.start()
+        seen = []
+
+        async def produce(producer: int):
+            for i in range(40):
+                await writer.add((producer, i))
+                seen.append(writer.pending)
+
+        await asyncio.gather(*(produce(p) for p in range(5)))
+        await writer.stop()
+        self.log_result(
+            "동시 생산자 한도",
+            max(seen) <= 20 and len(sink.rows) == 200,
+            f"생산자 5개 × 40행, 최대 버퍼 {max(seen)}행, 저장 {len(sink.rows)}/200행",
+        )
+
+        # flush 실패로 행이 되돌아와도 한도 유지 (재시도 성공까지 대기)
+        sink = RecordingSink()
+        sink.fail_next = 2
+        writer = BatchWriter(sink, batch_size=1000, flush_interval=0.05, max_pending=10)
+        await writer.start()
+        seen = []
+        for i in range(30):
+            await writer.add((i,))
+            seen.append(writer.pending)
+        await writer.stop()
+        self.log_result(
+            "flush 실패 중 한도",
+            max(seen) <= 10
+            and writer.metrics["failed_flushes"] == 2
+            and [row[0] for row in sink.rows] == list(range(30)),
+            f"실패 {writer.metrics['failed_flushes']}회, 최대 버퍼 {max(seen)}행, "
+            f"저장 {len(sink.rows)}/30행 (순서 유지)",
+        )
+
+    async def test_failed_flush(self):
+        """flush 실패 재시도 테스트"""
+        sink = RecordingSink()
+        sink.fail_next = 1
+        writer = BatchWriter(sink, batch_size=5, flush_interval=60.0, max_pending=100)
+        await writer.start()
+        for i in range(5):
+            await writer.add((i,))
+        await asyncio.sleep(0.05)
+        retained = writer.pending
+        await writer.stop()
+
+        self.log_result(
+            "실패 행 보존",
+            retained == 5 and writer.metrics["failed_flushes"] == 1,
+            f"실패 후 대기 {retained}행",
+        )
+        self.log_result(
+            "실패 행 재시도",
+            [row[0] for row in sink.rows] == list(range(5)),
+            f"재시도 저장 {len(sink.rows)}/5행",
+        )
+
+        # max_pending을 넘는 오래된 실패 행은 버림
+        sink = RecordingSink()
+        sink.fail_next = 10
+        writer = BatchWriter(sink, batch_size=1000, max_pending=3)
+        for i in range(5):
+            await writer.add((i,))
+        self.log_result(
+            "실패 행 한도",
+            writer.pending == 3 and writer.metrics["rows_dropped"] == 2,
+            f"대기 {writer.pending}행, 버림 {writer.metrics['rows_dropped']}행",
+        )
+
+    async def test_measurement_writer(self):
+        """MeasurementBatchWriter → SQLite 저장 테스트"""
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        db = PowerDatabase(self.test_db_path)
+        writer = MeasurementBatchWriter(db, batch_size=100, flush_interval=0.1)
+        await writer.start()
+
+        for i in range(250):
+            await writer.add_measurement(5.0, 0.2, 1.0, i)
+        await writer.stop()
+
+        rows = await db.get_recent_measurements(hours=1, limit=-1)
+        self.log_result(
+            "측정 기록기 저장",
+            len(rows) == 250 and writer.metrics["rows_written"] == 250,
+            f"DB {len(rows)}/250행, flush {writer.metrics['flush_count']}회",
+        )
+
+        await db.close()
+        os.remove(self.test_db_path)
+        shutil.rmtree(db.archive.directory, ignore_errors=True)
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📝 Write-behind 배치 기록기 테스트 시작")
+        print("=" * 60)
+        await self.test_size_flush()
+        await self.test_interval_flush()
+        await self.test_backpressure()
+        await self.test_failed_flush()
+        await self.test_measurement_writer()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = BatchWriterTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
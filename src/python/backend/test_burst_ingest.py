@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+버스트 프레임 수집 테스트
+고속 수집 버스트 프레임 인코딩/디코딩과 서버 process_burst 처리 검증
+
+테스트 항목:
+1. 버스트 프레임 왕복 (샘플 dt / 값 / 헤더) 및 크기 13 + 12K + 2
+2. 샘플 수 범위 검사, CRC 손상 거부
+3. 측정 프레임 / JSON 라인과 섞인 스트림 분리
+4. process_burst: 샘플별 시각 / 순번으로 배치 저장
+5. process_burst: 샘플 단위 알림 디바운스 (버스트 안에서 open)
+
+주의: main 모듈 import 시 현재 디렉토리에 power_monitoring.db가 생성됨
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+# 경로 설정 (simulator 패키지)
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from database import MEASUREMENT_FIELDS
+from simulator.binary_protocol import (
+    BURST_MAX_SAMPLES,
+    FrameDecoder,
+    burst_frame_size,
+    decode_burst,
+    encode_burst,
+    encode_measurement,
+)
+
+import main
+
+
+class BurstIngestTester:
+    """버스트 프레임 수집 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    @staticmethod
+    def samples(count: int, dt_us: int, danger: int = 0) -> list[tuple]:
+        """(dt_us, V, A, W) 샘플 목록 (앞쪽 danger개는 전류 0.8A)"""
+        result = []
+        for i in range(count):
+            current = 0.8 if i < danger else 0.2 + (i % 5) * 0.001
+            result.append((0 if i == 0 else dt_us, 5.0, current, 5.0 * current))
+        return result
+
+    def test_protocol(self):
+        """버스트 프레임 인코딩 / 디코딩 테스트"""
+        samples = self.samples(BURST_MAX_SAMPLES, dt_us=100)
+        frame = encode_burst(samples, seq=1000, ts_us=5_000_000, mode="NOISE")
+        burst = decode_burst(frame)
+        self.log_result(
+            "버스트 왕복",
+            len(frame) == burst_frame_size(200) == 13 + 12 * 200 + 2
+            and burst["count"] == 200
+            and burst["seq"] == 1000
+            and burst["ts_us"] == 5_000_000
+            and burst["mode"] == "NOISE"
+            and burst["dt_us"] == [sample[0] for sample in samples]
+            and burst["a"] == [round(sample[2], 6) for sample in samples],
+            f"{burst['count']}샘플, {len(frame)} bytes (측정 프레임 200개는 4800)",
+        )
+
+        rejected = []
+        for count in (0, BURST_MAX_SAMPLES + 1):
+            try:
+                encode_burst(self.samples(count, 100) if count else [], 0, 0)
+                rejected.append(False)
+            except ValueError:
+                rejected.append(True)
+        corrupted = bytearray(frame)
+        corrupted[100] ^= 0x10
+        self.log_result(
+            "범위 / CRC 검사",
+            all(rejected)
+            and decode_burst(corrupted) is None
+            and decode_burst(frame[:-1]) is None,
+            "샘플 0 / 201개 ValueError, 손상 / 잘린 프레임 None",
+        )
+
+        stream = (
+            encode_measurement(5.0, 0.2, 1.0, 1, 10)
+            + b'{"type": "status"}\n'
+            + encode_burst(self.samples(50, 1000), 2, 0)
+            + encode_measurement(5.0, 0.2, 1.0, 52, 60)
+        )
+        decoder = FrameDecoder()
+        items = []
+        for i in range(0, len(stream), 7):
+            decoder.feed(stream[i : i + 7])
+            while (item := decoder.next_item()) is not None:
+                items.append(item)
+        kinds = [
+            item if isinstance(item, str) else item.get("type", "measurement")
+            for item in items
+        ]
+        self.log_result(
+            "혼합 스트림",
+            kinds == ["measurement", '{"type": "status"}', "burst", "measurement"]
+            and items[2]["count"] == 50,
+            f"7바이트씩 수신 → {kinds}",
+        )
+
+    async def test_process_burst(self):
+        """서버 process_burst 저장 / 알림 테스트"""
+        server = main.server
+        device = server.devices[main.DEFAULT_SENSOR_ID]
+        started = datetime.now()
+
+        # 100Hz 200샘플 (2초) 중 앞 150샘플(1.5초) 전류 위험 → open 디바운스 1초 통과
+        frame = decode_burst(
+            encode_burst(self.samples(200, dt_us=10_000, danger=150), 500, 0)
+        )
+        await server.process_frame(frame)
+        await server.measurement_writer.flush()
+        await server.analysis_writer.flush()
+
+        rows = []
+        async for page in server.db.iter_measurement_pages(
+            started - timedelta(seconds=5), datetime.now() + timedelta(seconds=1)
+        ):
+            rows.extend(dict(zip(MEASUREMENT_FIELDS, row)) for row in page)
+        gaps = {b["timestamp"] - a["timestamp"] for a, b in zip(rows, rows[1:])}
+        self.log_result(
+            "버스트 배치 저장",
+            len(rows) == 200
+            and [row["sequence_number"] for row in rows] == list(range(500, 700))
+            and gaps <= {9, 10, 11},
+            f"{len(rows)}/200행, 순번 500~699, 샘플 간격 {sorted(gaps)}ms",
+        )
+
+        active = {alert["metric"]: alert for alert in device.alert_engine.get_active()}
+        stored = await server.db.get_active_alerts(sensor_id=main.DEFAULT_SENSOR_ID)
+        self.log_result(
+            "샘플 단위 알림",
+            "current" in active
+            and active["current"]["severity"] == "danger"
+            and active["current"]["peak_value"] == 0.8
+            and any(alert["metric_name"] == "current" for alert in stored),
+            f"버스트 1개로 열린 알림 {sorted(active)}, DB 활성 알림 {len(stored)}개 "
+            f"(샘플 수 {active.get('current', {}).get('sample_count')})",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("⚡ 버스트 프레임 수집 테스트 시작")
+        print("=" * 60)
+        try:
+            self.test_protocol()
+            await self.test_process_burst()
+        finally:
+            await main.server.db.close()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main_async():
+    """메인 실행 함수"""
+    tester = BurstIngestTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+JSON 코덱 테스트
+codec 백엔드 선택 / 폴백, 측정 라인 디코딩, FastJSONResponse 왕복 검증
+
+테스트 항목:
+1. 백엔드 선택: JSON_BACKEND 강제, 알 수 없는 값은 자동 선택 (orjson → msgspec → json)
+2. 폴백: orjson / msgspec이 없으면 표준 json (강제 지정해도 json)
+3. 모든 백엔드가 numpy / datetime을 같은 JSON으로 직렬화
+4. 측정 라인 디코딩: 기본값 채움, 필드 타입이 틀린 측정 / 측정이 아닌 메시지는 None
+   (설치된 빠른 백엔드 경로와 표준 json 폴백 경로 모두)
+5. FastJSONResponse: 렌더링 결과 왕복, FastAPI 기본 응답 클래스로 사용
+"""
+
+import importlib
+import json
+import os
+import sys
+from datetime import datetime
+
+import codec
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class CodecTester:
+    """JSON 코덱 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.content = {
+            "timestamp": datetime(2026, 1, 2, 3, 4, 5, 678000),
+            "count": np.int64(3),
+            "value": np.float32(0.5),
+            "values": np.array([1.0, 2.5]),
+            "text": "전력",
+            "nested": [{"ok": True, "none": None}],
+        }
+        self.expected = {
+            "timestamp": "2026-01-02T03:04:05.678000",
+            "count": 3,
+            "value": 0.5,
+            "values": [1.0, 2.5],
+            "text": "전력",
+            "nested": [{"ok": True, "none": None}],
+        }
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    @staticmethod
+    def reload(backend: str = None, without_fast: bool = False):
+        """JSON_BACKEND / 빠른 백엔드 설치 여부를 바꿔 codec 모듈 다시 로드"""
+        saved_env = os.environ.pop("JSON_BACKEND", None)
+        saved_modules = {name: sys.modules.get(name) for name in ("orjson", "msgspec")}
+        if backend is not None:
+            os.environ["JSON_BACKEND"] = backend
+        if without_fast:
+            # sys.modules 값이 None이면 import 시 ImportError
+            sys.modules.update(dict.fromkeys(saved_modules))
+        try:
+            return importlib.reload(codec)
+        finally:
+            os.environ.pop("JSON_BACKEND", None)
+            if saved_env is not None:
+                os.environ["JSON_BACKEND"] = saved_env
+            for name, module in saved_modules.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+
+    def test_selection(self):
+        """백엔드 선택 / 폴백 테스트"""
+        available = list(codec.BACKENDS)
+        forced = {name: self.reload(name).JSON_BACKEND for name in available}
+        auto = next(name for name in ("orjson", "msgspec", "json") if name in available)
+        unknown = self.reload("simdjson").JSON_BACKEND
+        self.log_result(
+            "백엔드 선택",
+            forced == {name: name for name in available} and unknown == auto,
+            f"설치 {available}, 강제 {forced}, 알 수 없는 값 → {unknown}",
+        )
+
+        fallback = self.reload("orjson", without_fast=True)
+        self.log_result(
+            "표준 json 폴백",
+            list(fallback.BACKENDS) == ["json"]
+            and fallback.JSON_BACKEND == "json"
+            and fallback.msgspec is None,
+            f"빠른 백엔드 없음 + JSON_BACKEND=orjson → {fallback.JSON_BACKEND}",
+        )
+        self.check_decoding(fallback, "json 폴백")
+        self.reload()
+
+    def test_encoding(self):
+        """백엔드별 직렬화 결과 테스트"""
+        encoded = {
+            name: dumps_bytes(self.content)
+            for name, (dumps_bytes, _loads) in codec.BACKENDS.items()
+        }
+        decoded = {
+            name: loads(encoded[name])
+            for name, (_dumps, loads) in codec.BACKENDS.items()
+        }
+        self.log_result(
+            "numpy / datetime 직렬화",
+            all(value == self.expected for value in decoded.values())
+            and codec.dumps(self.content) == encoded[codec.JSON_BACKEND].decode(),
+            f"{list(encoded)} 모두 같은 값 ({len(encoded['json'])} bytes)",
+        )
+
+    def check_decoding(self, module, path: str):
+        """측정 라인 디코딩 확인 (module: codec 또는 폴백으로 다시 로드한 codec)"""
+        decode = module.decode_measurement_line
+        full = decode(
+            b'{"v": 5.01, "a": 0.2, "w": 1.002, "ts": 123, "seq": 7, '
+            b'"status": "ok", "mode": "SPIKE"}'
+        )
+        minimal = decode('{"v": 5, "a": 0.2, "w": 1.0, "extra": 1}')
+        rejected = [
+            decode(line)
+            for line in (
+                '{"v": "5.0", "a": 0.2, "w": 1.0}',
+                '{"v": 5.0, "a": 0.2}',
+                '{"type": "status", "message": "ready"}',
+                '{"result": "ok"}',
+                "[1, 2, 3]",
+                "not json",
+            )
+        ]
+        self.log_result(
+            f"측정 라인 디코딩 ({path})",
+            full
+            == {
+                "v": 5.01,
+                "a": 0.2,
+                "w": 1.002,
+                "ts": 123,
+                "seq": 7,
+                "status": "ok",
+                "mode": "SPIKE",
+            }
+            and minimal == {"v": 5.0, "a": 0.2, "w": 1.0, **codec.MEASUREMENT_DEFAULTS}
+            and isinstance(minimal["v"], float)
+            and rejected == [None] * len(rejected),
+            f"기본값 채움 {minimal}, 잘못된 라인 {len(rejected)}개 → None",
+        )
+
+    def test_response(self):
+        """FastJSONResponse 왕복 테스트"""
+        response = codec.FastJSONResponse(self.content)
+        self.log_result(
+            "FastJSONResponse 렌더링",
+            json.loads(response.body) == self.expected
+            and response.media_type == "application/json"
+            and response.headers["content-length"] == str(len(response.body)),
+            f"{len(response.body)} bytes ({codec.JSON_BACKEND})",
+        )
+
+        app = FastAPI(default_response_class=codec.FastJSONResponse)
+
+        @app.get("/direct")
+        async def direct():
+            return codec.FastJSONResponse(self.content)
+
+        @app.get("/default")
+        async def default():
+            return {key: self.expected[key] for key in ("count", "text", "nested")}
+
+        client = TestClient(app)
+        direct_response = client.get("/direct")
+        default_response = client.get("/default")
+        self.log_result(
+            "FastAPI 응답 왕복",
+            direct_response.json() == self.expected
+            and default_response.json()
+            == {key: self.expected[key] for key in ("count", "text", "nested")}
+            and default_response.headers["content-type"] == "application/json",
+            f"직접 반환 / 기본 응답 클래스 {direct_response.status_code}, "
+            f"{default_response.status_code}",
+        )
+
+    def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📦 JSON 코덱 테스트 시작")
+        print("=" * 60)
+        self.test_selection()
+        self.test_encoding()
+        self.check_decoding(
+            codec, "msgspec Struct" if codec.msgspec is not None else codec.JSON_BACKEND
+        )
+        self.test_response()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+def main():
+    """메인 실행 함수"""
+    tester = CodecTester()
+    success = tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
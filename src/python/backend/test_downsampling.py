@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+차트 다운샘플링 테스트
+LTTB / min-max 인덱스 선택과 페이지 스트리밍 사전 축소(BucketReducer) 검증
+
+테스트 항목:
+1. LTTB: points개 선택, 첫/마지막 포함, 스파이크 보존
+2. min/max: points 이하, 메트릭별 최소/최대 보존
+3. downsample_rows: 시간 정렬 / 알 수 없는 알고리즘 거부
+4. BucketReducer: 메모리 상한, 스파이크 보존, 페이지 분할과 무관한 결과
+5. SQLite 키셋 페이지 → BucketReducer → select_indices 경로
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+from database import MEASUREMENT_FIELDS, PowerDatabase, to_epoch_ms
+from downsampling import (
+    BucketReducer,
+    downsample_rows,
+    lttb_indices,
+    minmax_indices,
+    row_columns,
+    select_indices,
+)
+
+VALUE_KEYS = ("voltage", "current", "power")
+
+
+class DownsamplingTester:
+    """다운샘플링 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_downsampling.db"
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    @staticmethod
+    def signal(n: int, spike_at: int) -> dict[str, np.ndarray]:
+        """10Hz 측정 컬럼 (잡음 + spike_at 위치에 전류 스파이크)"""
+        rng = np.random.default_rng(3)
+        voltage = 5.0 + rng.normal(0, 0.01, n)
+        current = 0.25 + rng.normal(0, 0.005, n)
+        current[spike_at] = 2.0
+        return {
+            "timestamp": np.arange(n, dtype=np.int64) * 100,
+            "voltage": voltage,
+            "current": current,
+            "power": voltage * current,
+            "sequence_number": np.arange(n),
+        }
+
+    def test_index_selection(self):
+        """LTTB / min-max 인덱스 선택 테스트"""
+        columns = self.signal(100_000, spike_at=61_234)
+        x = columns["timestamp"] / 1000
+        y = np.column_stack([columns[key] for key in VALUE_KEYS])
+
+        lttb = lttb_indices(x, y, 500)
+        self.log_result(
+            "LTTB 선택",
+            len(lttb) == 500
+            and lttb[0] == 0
+            and lttb[-1] == len(x) - 1
+            and np.all(np.diff(lttb) > 0),
+            f"100,000 → {len(lttb)}개 (첫/마지막 포함, 시간 순)",
+        )
+        self.log_result(
+            "LTTB 스파이크 보존",
+            61_234 in lttb,
+            "전류 스파이크 인덱스 61234 선택",
+        )
+
+        minmax = minmax_indices(y, 600)
+        extremes = {int(np.argmin(y[:, k])) for k in range(3)}
+        extremes |= {int(np.argmax(y[:, k])) for k in range(3)}
+        self.log_result(
+            "min/max 선택",
+            len(minmax) <= 600 and extremes <= set(minmax.tolist()),
+            f"100,000 → {len(minmax)}개, 전체 최소/최대 {len(extremes)}개 포함",
+        )
+
+        small = select_indices(x[:10], y[:10], 50, "minmax")
+        self.log_result(
+            "points 이상이면 전체 유지",
+            small.tolist() == list(range(10)),
+            f"10개 → {len(small)}개",
+        )
+
+    def test_downsample_rows(self):
+        """행(dict) 다운샘플링 테스트"""
+        base = datetime(2024, 1, 1)
+        rows = [
+            {
+                "timestamp": base + timedelta(seconds=i),
+                "voltage": 5.0 + (i % 7) * 0.01,
+                "current": 0.25,
+                "power": 1.25,
+            }
+            for i in range(1000)
+        ]
+        shuffled = rows[::-1]
+        sampled = downsample_rows(shuffled, 100)
+        everything = downsample_rows(shuffled, 5000, algo="minmax")
+        self.log_result(
+            "downsample_rows 정렬",
+            len(sampled) == 100
+            and sampled[0] is rows[0]
+            and sampled[-1] is rows[-1]
+            and everything == rows,
+            f"역순 1000행 → {len(sampled)}행 (시간 오름차순, 원본 dict 반환)",
+        )
+
+        try:
+            downsample_rows(rows, 100, algo="average")
+            rejected = False
+        except ValueError:
+            rejected = True
+        self.log_result("알 수 없는 알고리즘 거부", rejected, "ValueError")
+
+    def test_bucket_reducer(self):
+        """페이지 스트리밍 사전 축소 테스트"""
+        n, buckets = 200_000, 500
+        columns = self.signal(n, spike_at=123_457)
+        end = int(columns["timestamp"][-1]) + 1
+
+        def reduce(page_size: int) -> tuple[BucketReducer, int]:
+            reducer = BucketReducer(0, end, buckets)
+            peak = 0
+            for start in range(0, n, page_size):
+                reducer.add(
+                    {
+                        key: array[start : start + page_size]
+                        for key, array in columns.items()
+                    }
+                )
+                peak = max(peak, len(reducer.columns()["timestamp"]))
+            return reducer, peak
+
+        reducer, peak = reduce(5000)
+        kept = reducer.columns()
+        limit = buckets * (2 * len(VALUE_KEYS) + 2)
+        self.log_result(
+            "메모리 상한",
+            reducer.count == n and peak <= limit,
+            f"{n:,}행 → 최대 보관 {peak}행 (상한 {limit}행)",
+        )
+        self.log_result(
+            "사전 축소 스파이크 보존",
+            123_457 in kept["sequence_number"]
+            and kept["sequence_number"][0] == 0
+            and kept["sequence_number"][-1] == n - 1
+            and np.all(np.diff(kept["timestamp"]) > 0),
+            f"남은 {len(kept['timestamp'])}행에 스파이크 / 첫 / 마지막 행 포함",
+        )
+
+        other, _ = reduce(7919)
+        self.log_result(
+            "페이지 크기 무관",
+            np.array_equal(other.columns()["sequence_number"], kept["sequence_number"]),
+            "페이지 5000행 / 7919행 결과 동일",
+        )
+
+        empty = BucketReducer(0, end, buckets)
+        empty.add({})
+        self.log_result(
+            "빈 입력",
+            empty.count == 0 and empty.columns() == {},
+            "추가된 행 없으면 빈 dict",
+        )
+
+    async def test_database_pages(self):
+        """SQLite 키셋 페이지 → 사전 축소 → 인덱스 선택 테스트"""
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        db = PowerDatabase(self.test_db_path)
+        end = datetime.now()
+        start = end - timedelta(hours=1)
+        try:
+            rows = [
+                (
+                    start + timedelta(milliseconds=100 * i),
+                    9.0 if i == 17_777 else 5.0 + (i % 11) * 0.001,
+                    0.25,
+                    1.25,
+                    i,
+                    "ok",
+                    "NORMAL",
+                )
+                for i in range(30_000)
+            ]
+            await db.save_measurements_batch(rows)
+
+            points = 200
+            reducer = BucketReducer(to_epoch_ms(start), to_epoch_ms(end), points)
+            pages = 0
+            async for page in db.iter_measurement_pages(start, end):
+                reducer.add(row_columns(page, MEASUREMENT_FIELDS))
+                pages += 1
+            columns = reducer.columns()
+            selected = select_indices(
+                columns["timestamp"] / 1000,
+                np.column_stack([columns[key] for key in VALUE_KEYS]),
+                points,
+                "lttb",
+            )
+            sequence = columns["sequence_number"][selected]
+            self.log_result(
+                "DB 페이지 다운샘플링",
+                reducer.count == 30_000
+                and len(selected) == points
+                and 17_777 in sequence
+                and sequence[0] == 0
+                and sequence[-1] == 29_999,
+                f"{pages}페이지 {reducer.count:,}행 → 사전 축소 "
+                f"{len(columns['timestamp'])}행 → {len(selected)}개 (스파이크 포함)",
+            )
+        finally:
+            await db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(db.archive.directory, ignore_errors=True)
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📉 차트 다운샘플링 테스트 시작")
+        print("=" * 60)
+        self.test_index_selection()
+        self.test_downsample_rows()
+        self.test_bucket_reducer()
+        await self.test_database_pages()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = DownsamplingTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+측정 데이터 스트리밍 내보내기 테스트
+NDJSON / CSV 청크 스트리밍과 키셋 커서 페이징 검증
+
+테스트 항목:
+1. 커서 인코딩 왕복, 잘못된 커서 ValueError
+2. NDJSON: 페이지 1개 = 청크 1개, 행 수 / 순서 / 시각 문자열
+3. CSV: 헤더 + 행, limit 도달 시 # next_cursor 줄
+4. 커서 이어 받기: 파티션 경계를 넘어도 누락 / 중복 없음
+5. 마지막 페이지 이후 커서는 빈 결과, 다른 장치 데이터 제외
+"""
+
+import asyncio
+import base64
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timedelta
+
+from database import PowerDatabase, from_epoch_ms, to_epoch_ms
+from export import EXPORT_FIELDS, decode_cursor, encode_cursor, stream_measurements
+
+
+class ExportCursorTester:
+    """스트리밍 내보내기 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_export_cursor.db"
+        self.db = None
+        # 1시간 전 정시의 10분 전부터 1초 간격 1200행 (파티션 2개)
+        now = datetime.now()
+        self.start = now.replace(minute=0, second=0, microsecond=0) - timedelta(
+            hours=1, minutes=10
+        )
+        self.end = self.start + timedelta(hours=1)
+        self.total = 1200
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def rows(self, count: int, first_seq: int = 0, sensor_id: int = 1) -> list:
+        """start부터 1초 간격 측정 행"""
+        return [
+            (self.start + timedelta(seconds=i), 5.0, 0.2, 1.0, first_seq + i)
+            + ("ok", "NORMAL", sensor_id)
+            for i in range(count)
+        ]
+
+    async def collect(self, export_format: str, **kwargs) -> list[bytes]:
+        """stream_measurements 청크 목록"""
+        return [
+            chunk
+            async for chunk in stream_measurements(
+                self.db, self.start, self.end, export_format, **kwargs
+            )
+        ]
+
+    @staticmethod
+    def parse_ndjson(chunks: list[bytes]) -> tuple[list[dict], str]:
+        """NDJSON 청크 → (행 목록, 다음 커서)"""
+        records = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        if records and "next_cursor" in records[-1]:
+            return records[:-1], records[-1]["next_cursor"]
+        return records, None
+
+    async def test_cursor_codec(self):
+        """커서 인코딩 테스트"""
+        key = (to_epoch_ms(self.start), 123)
+        cursor = encode_cursor(key)
+        rejected = []
+        invalid = ["not base64!", base64.urlsafe_b64encode(b"1:2:3").decode(), ""]
+        for value in invalid:
+            try:
+                decode_cursor(value)
+                rejected.append(False)
+            except ValueError:
+                rejected.append(True)
+        self.log_result(
+            "커서 왕복",
+            decode_cursor(cursor) == key and all(rejected),
+            f"{key} → {cursor}, 잘못된 커서 {sum(rejected)}/{len(invalid)}개 거부",
+        )
+
+    async def test_ndjson(self):
+        """NDJSON 전체 스트리밍 테스트"""
+        chunks = await self.collect("ndjson", page_size=500)
+        records, cursor = self.parse_ndjson(chunks)
+        sequences = [record["sequence_number"] for record in records]
+        self.log_result(
+            "NDJSON 전체",
+            len(records) == self.total
+            and sequences == list(range(self.total))
+            and cursor is None
+            and list(records[0]) == list(EXPORT_FIELDS)
+            and records[0]["timestamp"] == from_epoch_ms(to_epoch_ms(self.start)),
+            f"{len(records)}행, 첫 시각 {records[0]['timestamp']}, 커서 {cursor}",
+        )
+        # 파티션마다 남는 페이지가 있어 청크 수 = 파티션별 페이지 수 합
+        sizes = [chunk.count(b"\n") for chunk in chunks]
+        self.log_result(
+            "페이지 단위 청크",
+            max(sizes) <= 500 and sum(sizes) == self.total,
+            f"청크 {len(chunks)}개, 청크당 행 {sizes}",
+        )
+
+    async def test_csv(self):
+        """CSV + limit 커서 테스트"""
+        chunks = await self.collect("csv", limit=250, page_size=100)
+        lines = b"".join(chunks).decode().splitlines()
+        rows = list(csv.reader(io.StringIO("\n".join(lines[1:-1]))))
+        cursor = lines[-1].removeprefix("# next_cursor=")
+        self.log_result(
+            "CSV limit",
+            lines[0] == ",".join(EXPORT_FIELDS)
+            and len(rows) == 250
+            and rows[-1][EXPORT_FIELDS.index("sequence_number")] == "249"
+            and lines[-1].startswith("# next_cursor=")
+            and decode_cursor(cursor)[1] == 249,
+            f"헤더 + {len(rows)}행 + {lines[-1]}",
+        )
+
+    async def test_resume(self):
+        """커서 이어 받기 테스트"""
+        received = []
+        cursor = None
+        requests = 0
+        while True:
+            chunks = await self.collect(
+                "ndjson",
+                after=decode_cursor(cursor) if cursor else None,
+                limit=333,
+                page_size=128,
+            )
+            records, cursor = self.parse_ndjson(chunks)
+            received.extend(record["sequence_number"] for record in records)
+            requests += 1
+            if cursor is None:
+                break
+        self.log_result(
+            "커서 이어 받기",
+            received == list(range(self.total)) and requests == 4,
+            f"요청 {requests}번, {len(received)}행 (파티션 경계 포함 누락/중복 없음)",
+        )
+
+        # limit이 남은 행 수와 정확히 같으면 커서 후 빈 결과
+        last = encode_cursor((to_epoch_ms(self.start) + 1099 * 1000, 1099))
+        chunks = await self.collect("ndjson", after=decode_cursor(last), limit=100)
+        records, cursor = self.parse_ndjson(chunks)
+        tail, tail_cursor = self.parse_ndjson(
+            await self.collect("ndjson", after=decode_cursor(cursor), limit=100)
+        )
+        self.log_result(
+            "마지막 페이지 이후",
+            len(records) == 100
+            and cursor is not None
+            and tail == []
+            and tail_cursor is None,
+            f"마지막 100행 → 커서 → 빈 결과 {tail}",
+        )
+
+        other = self.parse_ndjson(
+            [
+                chunk
+                async for chunk in stream_measurements(
+                    self.db, self.start, self.end, sensor_id=2
+                )
+            ]
+        )[0]
+        self.log_result(
+            "장치별 분리",
+            [r["sequence_number"] for r in other] == list(range(9000, 9010)),
+            f"장치 2: {len(other)}행",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📤 스트리밍 내보내기 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        try:
+            await self.db.save_measurements_batch(
+                self.rows(self.total) + self.rows(10, first_seq=9000, sensor_id=2)
+            )
+            await self.test_cursor_codec()
+            await self.test_ndjson()
+            await self.test_csv()
+            await self.test_resume()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = ExportCursorTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
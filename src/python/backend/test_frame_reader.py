@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+프레임 리더 스레드 테스트
+FrameReader의 스레드 읽기, 파싱, 큐 전달, drop-oldest, 종료 검증
+
+테스트 항목:
+1. JSON 라인 파싱 / 잘못된 라인·타입이 틀린 측정 무시 / 바이너리 프레임 전달
+2. sensor_id 부여
+3. 블로킹 읽기 중에도 이벤트 루프 응답
+4. 큐가 가득 차면 가장 오래된 프레임 폐기
+5. stop() 시 스레드 종료
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+
+from frame_reader import FrameReader
+
+
+class ScriptedSource:
+    """정해진 항목을 차례로 반환하는 시뮬레이터 대역 (read_frame 블로킹 지연 포함)"""
+
+    def __init__(self, items: list, read_delay: float = 0.0):
+        self.items = list(items)
+        self.read_delay = read_delay
+        self.read_threads: set[str] = set()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def read_frame(self, timeout: float = 0.1):
+        self.read_threads.add(threading.current_thread().name)
+        if self.read_delay:
+            time.sleep(self.read_delay)
+        if not self.items:
+            time.sleep(timeout)
+            return None
+        return self.items.pop(0)
+
+
+class FrameReaderTester:
+    """FrameReader 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    async def drain(self, queue: asyncio.Queue, count: int, timeout: float = 2.0):
+        """큐에서 count개 프레임 수신 (시간 초과 시 받은 만큼)"""
+        frames = []
+        deadline = time.monotonic() + timeout
+        while len(frames) < count and time.monotonic() < deadline:
+            try:
+                frames.append(await asyncio.wait_for(queue.get(), 0.1))
+            except asyncio.TimeoutError:
+                pass
+        return frames
+
+    async def test_parsing(self):
+        """파싱 / sensor_id 부여 테스트"""
+        lines = [json.dumps({"v": 5.0, "a": 0.2, "w": 1.0, "seq": i}) for i in range(5)]
+        # 필드 타입이 틀린 측정 라인은 무시, 측정이 아닌 메시지(상태)는 전달
+        invalid = json.dumps({"v": "5.0", "a": 0.2, "w": 1.0})
+        status = json.dumps({"type": "status", "message": "ready"})
+        items = lines[:2] + ["not json", "[1, 2]", invalid, status] + lines[2:]
+        items.append({"v": 5.1, "a": 0.3, "w": 1.5, "seq": 99, "binary": True})
+
+        queue = asyncio.Queue(maxsize=100)
+        source = ScriptedSource(items)
+        reader = FrameReader(
+            source, queue, asyncio.get_running_loop(), read_timeout=0.01, sensor_id=7
+        )
+        reader.start()
+        frames = await self.drain(queue, 7)
+        await reader.stop()
+
+        measurements = [frame for frame in frames if "v" in frame]
+        self.log_result(
+            "JSON 파싱",
+            [frame["seq"] for frame in measurements] == [0, 1, 2, 3, 4, 99]
+            and all(isinstance(frame["v"], float) for frame in measurements)
+            and frames[2].get("type") == "status",
+            f"{len(frames)}/7 프레임 (순서 유지, 상태 메시지 포함)",
+        )
+        self.log_result(
+            "잘못된 라인 무시",
+            reader.metrics["parse_errors"] == 3,
+            f"parse_errors={reader.metrics['parse_errors']} (JSON 아님, 배열, 타입)",
+        )
+        self.log_result(
+            "바이너리 프레임 전달",
+            reader.metrics["binary_frames"] == 1,
+            f"binary_frames={reader.metrics['binary_frames']}",
+        )
+        self.log_result(
+            "sensor_id 부여",
+            all(frame.get("sensor_id") == 7 for frame in frames),
+            "모든 프레임 sensor_id=7",
+        )
+        self.log_result(
+            "전용 스레드 읽기",
+            source.read_threads == {"FrameReader-7"},
+            f"read_frame 스레드: {sorted(source.read_threads)}",
+        )
+
+    async def test_loop_responsive(self):
+        """블로킹 읽기 중 이벤트 루프 응답 테스트"""
+        queue = asyncio.Queue(maxsize=100)
+        source = ScriptedSource(["{}"] * 5, read_delay=0.2)
+        reader = FrameReader(source, queue, asyncio.get_running_loop())
+        reader.start()
+
+        # read_frame이 200ms씩 블로킹하는 동안 10ms 타이머 지연 측정
+        worst_ms = 0.0
+        for _ in range(30):
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst_ms = max(worst_ms, (time.perf_counter() - started) * 1000 - 10)
+        await reader.stop()
+
+        self.log_result(
+            "이벤트 루프 비차단",
+            worst_ms < 100,
+            f"블로킹 read 200ms 중 최대 타이머 지연 {worst_ms:.1f}ms",
+        )
+
+    async def test_drop_oldest(self):
+        """큐 포화 시 drop-oldest 테스트"""
+        queue = asyncio.Queue(maxsize=5)
+        lines = [json.dumps({"seq": i}) for i in range(20)]
+        reader = FrameReader(
+            ScriptedSource(lines), queue, asyncio.get_running_loop(), read_timeout=0.01
+        )
+        reader.start()
+        deadline = time.monotonic() + 2.0
+        while reader.metrics["frames_read"] < 20 and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await reader.stop()
+
+        frames = [queue.get_nowait() for _ in range(queue.qsize())]
+        self.log_result(
+            "drop-oldest",
+            [frame["seq"] for frame in frames] == list(range(15, 20))
+            and reader.metrics["frames_dropped"] == 15,
+            f"남은 프레임 {[frame['seq'] for frame in frames]}, "
+            f"폐기 {reader.metrics['frames_dropped']}개",
+        )
+        self.log_result(
+            "리더 종료",
+            not reader.is_running,
+            f"is_running={reader.is_running}",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🧵 프레임 리더 스레드 테스트 시작")
+        print("=" * 60)
+        await self.test_parsing()
+        await self.test_loop_responsive()
+        await self.test_drop_oldest()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = FrameReaderTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
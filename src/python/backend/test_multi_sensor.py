@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+다중 센서 테스트
+장치 레지스트리와 장치별 파이프라인(저장 / 롤업 / 알림 / 분석)의 분리 검증
+
+테스트 항목:
+1. 장치 레지스트리: 기본 장치, 등록 / 이름 중복, 활성 / 비활성 전환
+2. 두 장치 프레임을 번갈아 처리해도 측정 데이터가 sensor_id별로 저장
+3. 1초 롤업이 장치별 버킷으로 집계
+4. 알림은 위험 구간이 있는 장치에만 열림 (엔진 / DB 모두)
+5. 이동평균 윈도가 장치별로 독립, 등록되지 않은 장치 프레임은 무시
+
+서버 DB는 임시 디렉토리에 생성 (POWER_DB_PATH, 저장소의 power_monitoring.db 미사용)
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# 경로 설정 (simulator 패키지)
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from database import DEFAULT_SENSOR_ID, DEFAULT_SENSOR_NAME, MEASUREMENT_FIELDS
+from simulator.binary_protocol import decode_burst, encode_burst
+
+
+class MultiSensorTester:
+    """다중 센서 테스트 클래스"""
+
+    def __init__(self, server):
+        self.test_results = []
+        self.server = server
+        self.sensor_id = None
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    @staticmethod
+    def burst(sensor_id: int, seq: int, danger: int = 0) -> dict:
+        """100Hz 200샘플 버스트 프레임 (앞쪽 danger개는 전류 0.8A)"""
+        samples = []
+        for i in range(200):
+            current = 0.8 if i < danger else 0.2
+            samples.append((0 if i == 0 else 10_000, 5.0, current, 5.0 * current))
+        frame = decode_burst(encode_burst(samples, seq, 0))
+        frame["sensor_id"] = sensor_id
+        return frame
+
+    async def rows(self, sensor_id: int, since: datetime) -> list[dict]:
+        """장치의 since 이후 측정 행"""
+        rows = []
+        async for page in self.server.db.iter_measurement_pages(
+            since, datetime.now() + timedelta(seconds=1), sensor_id=sensor_id
+        ):
+            rows.extend(dict(zip(MEASUREMENT_FIELDS, row)) for row in page)
+        return rows
+
+    async def test_registry(self):
+        """장치 레지스트리 테스트"""
+        db = self.server.db
+        self.sensor_id = await db.register_device("bench-2", "MOCK", "test device")
+        duplicate = await db.register_device("bench-2", "COM9")
+        devices = await db.get_devices()
+        self.log_result(
+            "장치 등록",
+            devices[0]["sensor_id"] == DEFAULT_SENSOR_ID
+            and devices[0]["name"] == DEFAULT_SENSOR_NAME
+            and self.sensor_id not in (None, DEFAULT_SENSOR_ID)
+            and duplicate is None
+            and [device["name"] for device in devices][-1] == "bench-2",
+            f"장치 {[(d['sensor_id'], d['name']) for d in devices]}, 중복 이름 → None",
+        )
+
+        disabled = await db.set_device_enabled(self.sensor_id, False)
+        enabled_only = await db.get_devices(enabled_only=True)
+        await db.set_device_enabled(self.sensor_id, True)
+        self.log_result(
+            "활성 / 비활성",
+            disabled
+            and self.sensor_id not in [d["sensor_id"] for d in enabled_only]
+            and not await db.set_device_enabled(999, False)
+            and all(device["enabled"] for device in await db.get_devices()),
+            "비활성 장치는 enabled_only 조회에서 제외, 없는 장치는 False",
+        )
+
+    async def test_pipelines(self):
+        """장치별 파이프라인 분리 테스트"""
+        server = self.server
+        other = server.add_device(self.sensor_id, "bench-2", "MOCK")
+        default = server.devices[DEFAULT_SENSOR_ID]
+        started = datetime.now() - timedelta(seconds=5)
+
+        # 두 장치 버스트를 번갈아 처리 (장치 2만 앞 1.5초 전류 / 전력 위험)
+        await server.process_frame(self.burst(DEFAULT_SENSOR_ID, 0))
+        await server.process_frame(self.burst(self.sensor_id, 0, danger=150))
+        await server.process_frame(
+            {"v": 5.0, "a": 0.2, "w": 1.0, "seq": 200, "sensor_id": self.sensor_id}
+        )
+        # 등록되지 않은 장치 프레임은 무시
+        await server.process_frame({"v": 5.0, "a": 0.2, "w": 1.0, "sensor_id": 99})
+        await server.measurement_writer.flush()
+        await server.analysis_writer.flush()
+
+        first = await self.rows(DEFAULT_SENSOR_ID, started)
+        second = await self.rows(self.sensor_id, started)
+        stray = await self.rows(99, started)
+        self.log_result(
+            "장치별 측정 저장",
+            [row["sequence_number"] for row in first] == list(range(200))
+            and [row["sequence_number"] for row in second] == list(range(201))
+            and max(row["current"] for row in first) == 0.2
+            and max(row["current"] for row in second) == 0.8
+            and stray == [],
+            f"장치 1: {len(first)}행, 장치 {self.sensor_id}: {len(second)}행, "
+            f"미등록 장치: {len(stray)}행",
+        )
+
+        series = {
+            sensor_id: (
+                await server.db.get_measurement_series(
+                    hours=0.1, tier="1s", sensor_id=sensor_id
+                )
+            )["data"]
+            for sensor_id in (DEFAULT_SENSOR_ID, self.sensor_id)
+        }
+        counts = {
+            sensor_id: sum(row["sample_count"] for row in data)
+            for sensor_id, data in series.items()
+        }
+        peaks = {
+            sensor_id: max(row["current_max"] for row in data)
+            for sensor_id, data in series.items()
+        }
+        self.log_result(
+            "장치별 롤업",
+            counts == {DEFAULT_SENSOR_ID: 200, self.sensor_id: 201}
+            and peaks == {DEFAULT_SENSOR_ID: 0.2, self.sensor_id: 0.8},
+            f"1초 버킷 샘플 수 {counts}, 최대 전류 {peaks}",
+        )
+
+        stored = await server.db.get_active_alerts()
+        self.log_result(
+            "장치별 알림",
+            default.alert_engine.get_active() == []
+            and sorted(alert["metric"] for alert in other.alert_engine.get_active())
+            == ["current", "power"]
+            and {alert["sensor_id"] for alert in stored} == {self.sensor_id}
+            and len(stored) == 2,
+            f"DB 활성 알림 {[(a['sensor_id'], a['metric_name']) for a in stored]}",
+        )
+
+        averages = {
+            device.sensor_id: device.data_analyzer.moving_avg_calc.get_moving_averages(
+                "current"
+            )
+            for device in (default, other)
+        }
+        default_avg = min(averages[DEFAULT_SENSOR_ID].values())
+        other_avg = max(averages[self.sensor_id].values())
+        self.log_result(
+            "장치별 분석 윈도",
+            abs(default_avg - 0.2) < 1e-9 and other_avg > 0.2,
+            f"장치 1 전류 이동평균 {default_avg:.3f}A, "
+            f"장치 {self.sensor_id} 최대 {other_avg:.3f}A",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🔌 다중 센서 테스트 시작")
+        print("=" * 60)
+        try:
+            await self.test_registry()
+            await self.test_pipelines()
+        finally:
+            await self.server.db.close()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main_async():
+    """메인 실행 함수"""
+    # main 모듈 import 시 서버 DB가 열리므로 import 전에 임시 경로 지정
+    test_dir = tempfile.mkdtemp(prefix="test_multi_sensor_")
+    os.environ["POWER_DB_PATH"] = os.path.join(test_dir, "power_monitoring.db")
+    from main import server
+
+    tester = MultiSensorTester(server)
+    try:
+        success = await tester.run_full_test()
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+측정 파티션 테스트
+1시간 파티션 테이블 생성 / power_measurements 뷰 / 정리 작업의 파티션 DROP 검증
+
+테스트 항목:
+1. 시간 경계를 넘는 배치: 파티션 2개로 나눠 저장, 뷰로 전체 조회
+2. 뷰 정의: 모든 파티션을 UNION ALL로 묶음
+3. 배치 원자성: 배치 도중 실패하면 모든 파티션의 행이 롤백
+   (새 파티션 DDL은 배치 전에 따로 커밋되어 빈 테이블로 남음)
+4. 정리 작업: 보관 기간이 지난 파티션만 통째로 DROP, 뷰에서 제외
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+from database import PowerDatabase, measurement_partition
+
+
+class PartitionTester:
+    """측정 파티션 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_partitions.db"
+        self.db = None
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """별도 커넥션으로 조회 (커밋된 상태만 보임)"""
+        with sqlite3.connect(self.test_db_path) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def tables(self) -> list[str]:
+        """DB에 있는 측정 파티션 테이블 이름"""
+        return [
+            name
+            for (name,) in self.query(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name LIKE 'power_measurements_%' ORDER BY name"
+            )
+        ]
+
+    @staticmethod
+    def rows(start: datetime, count: int, first_seq: int = 0) -> list[tuple]:
+        """0.1초 간격 측정 행"""
+        return [
+            (
+                start + timedelta(milliseconds=100 * i),
+                5.0,
+                0.2,
+                1.0,
+                first_seq + i,
+                "ok",
+                "NORMAL",
+            )
+            for i in range(count)
+        ]
+
+    async def test_hour_boundary(self):
+        """시간 경계 배치 / 뷰 정의 테스트"""
+        boundary = datetime.now().replace(minute=0, second=0, microsecond=0)
+        start = boundary - timedelta(seconds=3)
+        saved = await self.db.save_measurements_batch(self.rows(start, 60))
+
+        before, after = measurement_partition(start), measurement_partition(boundary)
+        counts = {
+            name: self.query(f"SELECT COUNT(*) FROM {name}")[0][0]
+            for name in (before, after)
+        }
+        total = self.query("SELECT COUNT(*) FROM power_measurements")[0][0]
+        self.log_result(
+            "시간 경계 배치",
+            saved and counts == {before: 30, after: 30} and total == 60,
+            f"{counts}, 뷰 {total}행",
+        )
+
+        view_sql = self.query(
+            "SELECT sql FROM sqlite_master WHERE type = 'view' "
+            "AND name = 'power_measurements'"
+        )[0][0]
+        self.log_result(
+            "UNION ALL 뷰",
+            self.tables() == self.db.partitions
+            and all(f"FROM {name}" in view_sql for name in self.db.partitions)
+            and view_sql.count("UNION ALL") == len(self.db.partitions) - 1,
+            f"파티션 {self.db.partitions}",
+        )
+
+    async def test_atomicity(self):
+        """배치 도중 실패 시 롤백 테스트"""
+        start = datetime.now().replace(minute=0, second=0, microsecond=0)
+        start += timedelta(hours=2) - timedelta(seconds=2)
+        new_partitions = {
+            measurement_partition(start),
+            measurement_partition(start + timedelta(hours=1)),
+        }.difference(self.db.partitions)
+        before = self.query("SELECT COUNT(*) FROM power_measurements")[0][0]
+
+        # 파티션 INSERT 이후 롤업 갱신에서 실패
+        update_rollups = self.db._update_rollups
+
+        async def failing_rollups(db, rows):
+            raise sqlite3.OperationalError("injected failure")
+
+        self.db._update_rollups = failing_rollups
+        try:
+            saved = await self.db.save_measurements_batch(self.rows(start, 40, 1000))
+        finally:
+            self.db._update_rollups = update_rollups
+
+        after = self.query("SELECT COUNT(*) FROM power_measurements")[0][0]
+        self.log_result(
+            "배치 원자성",
+            not saved
+            and after == before
+            and new_partitions
+            and new_partitions.issubset(self.tables())
+            and new_partitions.issubset(self.db.partitions),
+            f"실패 배치 후 뷰 {after}행 (이전 {before}행), "
+            f"빈 파티션 {sorted(new_partitions)}",
+        )
+
+        saved = await self.db.save_measurements_batch(self.rows(start, 40, 1000))
+        after_retry = self.query("SELECT COUNT(*) FROM power_measurements")[0][0]
+        self.log_result(
+            "재시도 저장",
+            saved and after_retry == before + 40,
+            f"뷰 {after_retry}행",
+        )
+
+    async def test_cleanup(self):
+        """보관 기간이 지난 파티션 DROP 테스트"""
+        old = datetime.now() - timedelta(hours=self.db.data_retention_hours + 3)
+        await self.db.save_measurements_batch(self.rows(old, 20, 5000))
+        expired = measurement_partition(old)
+        kept = [name for name in self.db.partitions if name != expired]
+
+        stats = await self.db.cleanup_old_data()
+        view_sql = self.query(
+            "SELECT sql FROM sqlite_master WHERE type = 'view' "
+            "AND name = 'power_measurements'"
+        )[0][0]
+        oldest = self.query("SELECT MIN(timestamp) FROM power_measurements")[0][0]
+        self.log_result(
+            "만료 파티션 DROP",
+            stats.get("partitions_dropped") == 1
+            and expired not in self.tables()
+            and expired not in view_sql
+            and self.db.partitions == kept
+            and self.tables() == kept
+            and oldest == self.db.oldest_ms,
+            f"{expired} 삭제, 남은 파티션 {len(kept)}개",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🗂️ 측정 파티션 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        try:
+            await self.test_hour_boundary()
+            await self.test_atomicity()
+            await self.test_cleanup()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = PartitionTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
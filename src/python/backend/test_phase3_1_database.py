@@ -15,6 +15,7 @@ SQLite 데이터베이스 저장, 조회, 통계 기능 검증
 
 import asyncio
 import os
+import shutil
 import sqlite3
 import sys
 from datetime import datetime, timedelta
@@ -70,8 +71,10 @@ class Phase31DatabaseTester:
             with sqlite3.connect(self.test_db_path) as conn:
                 cursor = conn.cursor()
 
-                # 테이블 목록 조회
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+                # 테이블 목록 조회 (power_measurements는 시간 파티션 뷰)
+                cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+                )
                 tables = [row[0] for row in cursor.fetchall()]
 
                 required_tables = [
@@ -362,18 +365,10 @@ class Phase31DatabaseTester:
             # 오래된 데이터 생성 (50시간 전)
             old_time = datetime.now() - timedelta(hours=50)
 
-            # 직접 DB에 오래된 데이터 삽입
-            with sqlite3.connect(self.test_db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO power_measurements
-                    (timestamp, voltage, current, power, sequence_number, sensor_status, simulation_mode)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (old_time, 5.0, 0.3, 1.5, 999, "ok", "TEST"),
-                )
-                conn.commit()
+            # 오래된 데이터 삽입 (해당 시간 파티션이 생성됨)
+            await self.db.save_measurements_batch(
+                [(old_time, 5.0, 0.3, 1.5, 999, "ok", "TEST")]
+            )
 
             # 정리 전 데이터 수 확인
             measurements_before = await self.db.get_recent_measurements(hours=72)  # 3일
@@ -420,6 +415,19 @@ class Phase31DatabaseTester:
                     "오래된 데이터 정리", "WARNING", "오래된 데이터 정리 효과 미확인"
                 )
 
+            # 삭제된 파티션은 콜드 아카이브에 보존
+            archived = await self.db.get_archived_measurements(
+                old_time - timedelta(seconds=1), old_time + timedelta(seconds=1)
+            )
+            if 999 in archived["sequence_number"].tolist():
+                self.log_result(
+                    "콜드 아카이브 보존",
+                    "PASS",
+                    f"아카이브 행 {len(archived['sequence_number'])}개 복원",
+                )
+            else:
+                self.log_result("콜드 아카이브 보존", "FAIL", "아카이브에 행 없음")
+
         except Exception as e:
             self.log_result("데이터베이스 정리 테스트", "FAIL", f"테스트 실패: {e}")
 
@@ -609,9 +617,11 @@ class Phase31DatabaseTester:
     async def cleanup_test_db(self):
         """테스트 데이터베이스 정리"""
         try:
+            await self.db.close()
             if os.path.exists(self.test_db_path):
                 os.remove(self.test_db_path)
                 print(f"🗑️ 테스트 데이터베이스 정리 완료: {self.test_db_path}")
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
         except Exception as e:
             print(f"❌ 테스트 DB 정리 실패: {e}")
 
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+전력 효율성 계산 테스트
+calculate_power_efficiency의 사다리꼴 에너지 적분과 파티션 요약 캐시 검증
+
+테스트 항목:
+1. 일정 전력: 파티션 경계를 넘는 구간도 W × 적분 시간
+2. ENERGY_MAX_GAP_SECONDS보다 긴 간격(수집 중단)은 적분 제외
+3. 불규칙 간격: 실제 타임스탬프 기준 사다리꼴 적분
+4. 지난 파티션 요약 캐시, 늦게 도착한 행 저장 시 무효화
+5. 장치별 분리 (다른 장치 데이터 / 데이터 없는 장치)
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+from datetime import datetime, timedelta
+
+from database import ENERGY_MAX_GAP_SECONDS, PowerDatabase, measurement_partition
+
+
+class PowerEfficiencyTester:
+    """전력 효율성 계산 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_power_efficiency.db"
+        self.db = None
+        # 3~4시간 전 사이의 정시: 두 번째 파티션도 현재 시각 정시 직후
+        # (SUMMARY_SETTLE_SECONDS 이내)에 실행해도 요약 캐시 대상인 지난 파티션
+        now = datetime.now()
+        self.base = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    @staticmethod
+    def rows(samples: list[tuple], sensor_id: int) -> list[tuple]:
+        """(시각, 전력 W) 목록 → 측정 행 (전압 5V 고정)"""
+        return [
+            (timestamp, 5.0, power / 5.0, power, seq, "ok", "NORMAL", sensor_id)
+            for seq, (timestamp, power) in enumerate(samples)
+        ]
+
+    async def test_energy(self):
+        """사다리꼴 에너지 적분 테스트"""
+        # 장치 1: 2W 1초 간격 1800개, 정시 15분 전부터 (파티션 2개에 걸침)
+        start = self.base + timedelta(minutes=45)
+        await self.db.save_measurements_batch(
+            self.rows([(start + timedelta(seconds=i), 2.0) for i in range(1800)], 1)
+        )
+        result = await self.db.calculate_power_efficiency(hours=4, sensor_id=1)
+        self.log_result(
+            "일정 전력",
+            result.get("total_energy_wh") == round(2.0 * 1799 / 3600, 3)
+            and result.get("integrated_hours") == round(1799 / 3600, 4)
+            and result.get("sample_count") == 1800
+            and result.get("power_variability_percent") == 0,
+            f"2W × 1799초 = {result.get('total_energy_wh')}Wh (파티션 경계 간격 포함)",
+        )
+
+        # 장치 2: 1W 100개 → 60초 수집 중단 → 100개
+        first = [(start + timedelta(seconds=i), 1.0) for i in range(100)]
+        resumed = first[-1][0] + timedelta(seconds=60)
+        second = [(resumed + timedelta(seconds=i), 1.0) for i in range(100)]
+        await self.db.save_measurements_batch(self.rows(first + second, 2))
+        result = await self.db.calculate_power_efficiency(hours=4, sensor_id=2)
+        self.log_result(
+            "수집 중단 구간 제외",
+            result.get("total_energy_wh") == round(198 / 3600, 3)
+            and result.get("integrated_hours") == round(198 / 3600, 4),
+            f"{result.get('total_energy_wh')}Wh, 적분 "
+            f"{result.get('integrated_hours')}시간 (60초 간격 > "
+            f"{ENERGY_MAX_GAP_SECONDS:.0f}초 제외)",
+        )
+
+        # 장치 3: 불규칙 간격 0, 0.5, 2.5, 3, 13초 (마지막 10초 간격은 적분)
+        offsets = [(0.0, 1000.0), (0.5, 3000.0), (2.5, 5000.0), (3.0, 1000.0)]
+        offsets.append((3.0 + ENERGY_MAX_GAP_SECONDS, 1000.0))
+        await self.db.save_measurements_batch(
+            self.rows(
+                [(start + timedelta(seconds=t), power) for t, power in offsets], 3
+            )
+        )
+        result = await self.db.calculate_power_efficiency(hours=4, sensor_id=3)
+        # (1000+3000)/2×0.5 + (3000+5000)/2×2 + (5000+1000)/2×0.5 + 1000×10
+        expected = (1000 + 8000 + 1500 + 10000) / 3600
+        self.log_result(
+            "불규칙 간격 사다리꼴",
+            result.get("total_energy_wh") == round(expected, 3)
+            and result.get("avg_power") == 2200.0,
+            f"{result.get('total_energy_wh')}Wh (평균 × 구간이면 "
+            f"{2200 * 13 / 3600:.3f}Wh)",
+        )
+
+    async def test_cache(self):
+        """지난 파티션 요약 캐시 / 무효화 테스트"""
+        second_partition = measurement_partition(self.base + timedelta(hours=1))
+        cached = self.db._partition_summaries.get((second_partition, 1))
+        again = await self.db.calculate_power_efficiency(hours=4, sensor_id=1)
+        self.log_result(
+            "지난 파티션 캐시",
+            cached is not None
+            and self.db._partition_summaries.get((second_partition, 1)) is cached
+            and again.get("total_energy_wh") == round(2.0 * 1799 / 3600, 3),
+            f"{second_partition} 요약 {cached and cached['count']}행 재사용",
+        )
+
+        # 마지막 샘플 5초 뒤에 늦게 도착한 행 → 해당 파티션 요약만 무효화
+        late = self.base + timedelta(minutes=45, seconds=1799 + 5)
+        await self.db.save_measurements_batch(self.rows([(late, 2.0)], 1))
+        invalidated = (second_partition, 1) not in self.db._partition_summaries
+        result = await self.db.calculate_power_efficiency(hours=4, sensor_id=1)
+        self.log_result(
+            "저장 시 캐시 무효화",
+            invalidated
+            and (second_partition, 2) in self.db._partition_summaries
+            and result.get("sample_count") == 1801
+            and result.get("total_energy_wh") == round(2.0 * 1804 / 3600, 3),
+            f"늦은 행 1개 → {result.get('sample_count')}행, "
+            f"{result.get('total_energy_wh')}Wh (다른 장치 캐시 유지)",
+        )
+
+    async def test_isolation(self):
+        """장치별 분리 테스트"""
+        counts = {
+            sensor_id: (
+                await self.db.calculate_power_efficiency(hours=4, sensor_id=sensor_id)
+            ).get("sample_count")
+            for sensor_id in (1, 2, 3)
+        }
+        empty = await self.db.calculate_power_efficiency(hours=4, sensor_id=9)
+        self.log_result(
+            "장치별 분리",
+            counts == {1: 1801, 2: 200, 3: 5} and empty == {},
+            f"샘플 수 {counts}, 데이터 없는 장치 {empty}",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🔋 전력 효율성 계산 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        try:
+            await self.test_energy()
+            await self.test_cache()
+            await self.test_isolation()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = PowerEfficiencyTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
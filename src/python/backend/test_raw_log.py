@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+원본 샘플 로그 테스트
+고정 길이 레코드 로그(memmap)의 구간 조회와 커버 구간 관리 검증
+
+테스트 항목:
+1. 구간 조회가 SQLite 측정 데이터와 일치, 세그먼트 1개 구간은 memmap 뷰
+2. 최근 조회 limit, 중복 무시 행은 다시 기록하지 않음
+3. 순서가 뒤바뀐 배치도 정렬해서 반환, 장치별 세그먼트 분리
+4. 기록 실패 시 커버 시작을 실패 구간 뒤로 (SQLite로 조회), 재시작 후에도 유지
+5. 로그 없이 수집한 기간은 시작 시 보정으로 커버 제외
+6. 잘린 마지막 레코드 복구, 정리 작업의 세그먼트 삭제
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+from database import MEASUREMENT_FIELDS, PowerDatabase, to_epoch_ms
+from rawlog import RAW_LOG_SUFFIX, RAW_RECORD
+
+
+class RawLogTester:
+    """원본 샘플 로그 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_raw_log.db"
+        self.raw_log_dir = "test_raw_log_samples"
+        self.db = None
+        # 1시간 전 정시의 10분 전부터 1초 간격 (파티션 2개)
+        now = datetime.now()
+        self.start = now.replace(minute=0, second=0, microsecond=0) - timedelta(
+            hours=1, minutes=10
+        )
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def rows(self, sensor_id: int, first: int, count: int) -> list[tuple]:
+        """start + first초부터 1초 간격 측정 행 (순번 = 초)"""
+        return [
+            (self.start + timedelta(seconds=i), 5.0, 0.2 + i % 10 * 0.01, 1.0, i)
+            + ("ok", "SPIKE" if i % 50 == 0 else "NORMAL", sensor_id)
+            for i in range(first, first + count)
+        ]
+
+    def open_db(self, raw_log: bool = True) -> PowerDatabase:
+        return PowerDatabase(
+            self.test_db_path, raw_log_dir=self.raw_log_dir if raw_log else None
+        )
+
+    async def sqlite_rows(self, sensor_id: int) -> list[dict]:
+        """SQLite 파티션의 장치 측정 행 (timestamp는 epoch ms)"""
+        rows = []
+        async for page in self.db.iter_measurement_pages(
+            self.start, datetime.now() + timedelta(hours=1), sensor_id=sensor_id
+        ):
+            rows.extend(dict(zip(MEASUREMENT_FIELDS, row)) for row in page)
+        return rows
+
+    async def test_reads(self):
+        """구간 조회 테스트"""
+        await self.db.save_measurements_batch(self.rows(1, 0, 1200))
+        await self.db.save_measurements_batch(self.rows(2, 0, 100))
+        expected = await self.sqlite_rows(1)
+        columns = await self.db.get_raw_columns(self.start, sensor_id=1)
+        matched = columns is not None and all(
+            columns[name].tolist() == [row[name] for row in expected]
+            for name in MEASUREMENT_FIELDS
+        )
+        self.log_result(
+            "SQLite와 일치",
+            matched and len(expected) == 1200,
+            f"로그 {len(columns['timestamp']) if columns else None}행 / SQLite "
+            f"{len(expected)}행, 세그먼트 {len(self.db.raw_log.segments)}개",
+        )
+
+        # 세그먼트 1개 구간: 복사 없는 memmap 뷰
+        start_ms = to_epoch_ms(self.start)
+        view = self.db.raw_log.read(start_ms, start_ms + 60_000, sensor_id=1)
+        self.log_result(
+            "memmap 뷰",
+            isinstance(view, np.memmap)
+            and len(view) == 60
+            and self.db.raw_log.count(start_ms, start_ms + 60_000, 1) == 60,
+            f"1분 구간 {len(view)}행 ({type(view).__name__}, "
+            f"{RAW_RECORD.itemsize}바이트 레코드)",
+        )
+
+        recent = await self.db.get_recent_measurements(hours=3, limit=50, sensor_id=1)
+        self.log_result(
+            "최근 조회 limit",
+            [row["sequence_number"] for row in recent] == list(range(1199, 1149, -1))
+            and recent[0]["simulation_mode"] == "NORMAL",
+            f"최신 {len(recent)}행 (순번 {recent[0]['sequence_number']}부터 역순)",
+        )
+
+        # 마지막 100행 재전송 + 새 10행: 로그에는 새 10행만 추가
+        before = self.db.raw_log.get_stats()["records"]
+        await self.db.save_measurements_batch(self.rows(1, 1100, 110))
+        after = self.db.raw_log.get_stats()["records"]
+        self.log_result(
+            "중복 행 제외",
+            after - before == 10 and len(await self.sqlite_rows(1)) == 1210,
+            f"110행 저장 → 로그 +{after - before}레코드",
+        )
+
+        # 장치 3: 뒤쪽 구간을 먼저 받은 뒤 앞쪽 구간 도착
+        await self.db.save_measurements_batch(self.rows(3, 20, 10))
+        await self.db.save_measurements_batch(self.rows(3, 0, 10))
+        # (커버 시작은 장치의 첫 기록 시각이므로 로그를 직접 조회)
+        records = self.db.raw_log.read(to_epoch_ms(self.start), 2**62, sensor_id=3)
+        columns = self.db.raw_log.columns(records)
+        segment = self.db.raw_log.segments[f"{self.start.strftime('%Y%m%d%H')}_3"]
+        sensor_2 = await self.db.get_raw_columns(self.start, sensor_id=2)
+        self.log_result(
+            "순서 뒤바뀐 배치 / 장치 분리",
+            not segment.ordered
+            and columns["sequence_number"].tolist()
+            == list(range(10)) + list(range(20, 30))
+            and len(sensor_2["timestamp"]) == 100,
+            f"장치 3 순번 {columns['sequence_number'].tolist()[8:12]}..., "
+            f"장치 2 {len(sensor_2['timestamp'])}행",
+        )
+
+    async def test_write_failure(self):
+        """기록 실패 시 커버 구간 테스트"""
+        raw_log = self.db.raw_log
+        append = raw_log.append
+
+        def failing_append(*args, **kwargs):
+            raise OSError("disk full")
+
+        raw_log.append = failing_append
+        await self.db.save_measurements_batch(self.rows(1, 1300, 20))
+        raw_log.append = append
+
+        gap_end = to_epoch_ms(self.start + timedelta(seconds=1319))
+        covered = raw_log.covered_from(1)
+        columns = await self.db.get_raw_columns(self.start, sensor_id=1)
+        recent = await self.db.get_recent_measurements(hours=3, limit=-1, sensor_id=1)
+        self.log_result(
+            "기록 실패 구간 제외",
+            covered == gap_end + 1
+            and columns is None
+            and len(recent) == 1230
+            and raw_log.covered_from(2) is not None,
+            f"커버 시작 = 실패 구간 끝 + 1ms, 조회는 SQLite {len(recent)}행",
+        )
+
+        # 실패 후 기록은 다시 로그로, 커버 시작 이후 조회는 로그 사용
+        await self.db.save_measurements_batch(self.rows(1, 1400, 30))
+        after_gap = await self.db.get_raw_columns(
+            self.start + timedelta(seconds=1320), sensor_id=1
+        )
+        await self.db.close()
+        self.db = self.open_db()
+        self.log_result(
+            "커버 시작 유지",
+            after_gap is not None
+            and after_gap["sequence_number"].tolist() == list(range(1400, 1430))
+            and self.db.raw_log.covered_from(1) == gap_end + 1,
+            f"실패 뒤 {len(after_gap['timestamp']) if after_gap else 0}행은 로그 조회, "
+            "재시작 후 coverage.json에서 복원",
+        )
+
+    async def test_reconcile(self):
+        """로그 없이 수집한 기간 보정 / 잘린 레코드 테스트"""
+        await self.db.close()
+        self.db = self.open_db(raw_log=False)
+        await self.db.save_measurements_batch(self.rows(2, 200, 50))
+        await self.db.close()
+
+        # 잘린 마지막 레코드 (쓰기 도중 중단)
+        key = f"{self.start.strftime('%Y%m%d%H')}_2"
+        path = os.path.join(self.raw_log_dir, key + RAW_LOG_SUFFIX)
+        with open(path, "ab") as f:
+            f.write(b"\0" * 10)
+
+        self.db = self.open_db()
+        newest = to_epoch_ms(self.start + timedelta(seconds=249))
+        covered = self.db.raw_log.covered_from(2)
+        self.log_result(
+            "시작 시 보정",
+            covered == newest + 1
+            and await self.db.get_raw_columns(self.start, sensor_id=2) is None
+            and self.db.raw_log.covered_from(1) is not None,
+            "로그 없이 저장한 장치 2 구간 → 커버 시작을 SQLite 최신 행 뒤로",
+        )
+        self.log_result(
+            "잘린 레코드 복구",
+            os.path.getsize(path) % RAW_RECORD.itemsize == 0
+            and self.db.raw_log.segments[key].count == 100,
+            f"{os.path.getsize(path)} bytes = {RAW_RECORD.itemsize} × "
+            f"{self.db.raw_log.segments[key].count}",
+        )
+
+    async def test_cleanup(self):
+        """정리 작업 세그먼트 삭제 테스트"""
+        old = datetime.now() - timedelta(hours=self.db.data_retention_hours + 3)
+        old = old.replace(minute=0, second=0, microsecond=0)
+        await self.db.save_measurements_batch(
+            [
+                (old + timedelta(seconds=i), 5.0, 0.2, 1.0, i, "ok", "NORMAL", 4)
+                for i in range(60)
+            ]
+        )
+        old_key = f"{old.strftime('%Y%m%d%H')}_4"
+        present = old_key in self.db.raw_log.segments
+        stats = await self.db.cleanup_old_data()
+        self.log_result(
+            "만료 세그먼트 삭제",
+            present
+            and stats.get("raw_segments_dropped", 0) >= 1
+            and old_key not in self.db.raw_log.segments
+            and not os.path.exists(
+                os.path.join(self.raw_log_dir, old_key + RAW_LOG_SUFFIX)
+            )
+            and self.db.raw_log.get_stats()["records"] > 0,
+            f"세그먼트 {stats.get('raw_segments_dropped')}개 삭제, "
+            f"남은 레코드 {self.db.raw_log.get_stats()['records']}",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📼 원본 샘플 로그 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        shutil.rmtree(self.raw_log_dir, ignore_errors=True)
+        self.db = self.open_db()
+        try:
+            await self.test_reads()
+            await self.test_write_failure()
+            await self.test_reconcile()
+            await self.test_cleanup()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.raw_log_dir, ignore_errors=True)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = RawLogTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+롤업 통계 테스트
+save_measurements_batch의 1초 / 1분 / 1시간 롤업 UPSERT와 tier 선택 검증
+
+테스트 항목:
+1. 배치 저장 시 tier별 버킷 min/max/avg/count 집계
+2. 같은 버킷에 나눠 저장해도 sample_count 가중 평균으로 병합
+3. 장치별 버킷 분리
+4. 조회 범위 / 포인트 예산에 따른 tier 선택
+5. get_measurement_series의 tier 조회
+6. get_measurements: 원본 행이 limit을 넘으면 롤업 tier로 조회 (최신 순)
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+from database import PowerDatabase
+
+
+class RollupTester:
+    """롤업 통계 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_rollups.db"
+        self.db = None
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def rollup(self, table: str, column: str, sensor_id: int = 1) -> list[tuple]:
+        """(버킷, voltage min/max/avg, sample_count) 행 (버킷 오름차순)"""
+        with sqlite3.connect(self.test_db_path) as conn:
+            return conn.execute(
+                f"SELECT {column}, voltage_min, voltage_max, voltage_avg, "
+                f"sample_count FROM {table} WHERE sensor_id = ? ORDER BY {column}",
+                (sensor_id,),
+            ).fetchall()
+
+    @staticmethod
+    def rows(start: datetime, count: int, voltage: float, sensor_id: int = 1):
+        """10Hz 측정 행 (전압은 voltage부터 0.01씩 증가)"""
+        return [
+            (
+                start + timedelta(milliseconds=100 * i),
+                voltage + 0.01 * i,
+                0.2,
+                (voltage + 0.01 * i) * 0.2,
+                i,
+                "ok",
+                "NORMAL",
+                sensor_id,
+            )
+            for i in range(count)
+        ]
+
+    async def test_batch_rollup(self, base: datetime):
+        """tier별 버킷 집계 테스트"""
+        # 분 경계 2초 전부터 4초간 40행 → 1초 버킷 4개, 1분 버킷 2개
+        start = base - timedelta(seconds=2)
+        saved = await self.db.save_measurements_batch(self.rows(start, 40, 5.0))
+
+        seconds = self.rollup("second_statistics", "second_timestamp")
+        first = seconds[0] if seconds else (None, 0, 0, 0, 0)
+        self.log_result(
+            "1초 롤업",
+            saved
+            and len(seconds) == 4
+            and all(row[4] == 10 for row in seconds)
+            and (round(first[1], 6), round(first[2], 6), round(first[3], 6))
+            == (5.0, 5.09, 5.045),
+            f"버킷 {len(seconds)}개, 첫 버킷 min/max/avg "
+            f"{first[1]:.3f}/{first[2]:.3f}/{first[3]:.3f}",
+        )
+
+        minutes = self.rollup("minute_statistics", "minute_timestamp")
+        self.log_result(
+            "1분 롤업",
+            [row[4] for row in minutes] == [20, 20]
+            and minutes[1][0] == base.isoformat(sep=" "),
+            f"버킷 {[(row[0][11:16], row[4]) for row in minutes]}",
+        )
+
+        hours = self.rollup("hour_statistics", "hour_timestamp")
+        self.log_result(
+            "1시간 롤업",
+            sum(row[4] for row in hours) == 40
+            and round(min(row[1] for row in hours), 6) == 5.0
+            and round(max(row[2] for row in hours), 6) == 5.39,
+            f"버킷 {len(hours)}개, 샘플 {sum(row[4] for row in hours)}개",
+        )
+
+    async def test_upsert_merge(self, base: datetime):
+        """같은 버킷 병합 테스트"""
+        # 같은 1분 버킷에 10행(평균 5.045) + 30행(평균 6.145) 두 번 저장
+        start = base + timedelta(minutes=1)
+        await self.db.save_measurements_batch(self.rows(start, 10, 5.0))
+        await self.db.save_measurements_batch(
+            self.rows(start + timedelta(seconds=1), 30, 6.0)
+        )
+
+        bucket = start.isoformat(sep=" ")
+        minute = [
+            row
+            for row in self.rollup("minute_statistics", "minute_timestamp")
+            if row[0] == bucket
+        ]
+        expected_avg = (5.045 * 10 + 6.145 * 30) / 40
+        self.log_result(
+            "UPSERT 병합",
+            len(minute) == 1
+            and minute[0][4] == 40
+            and round(minute[0][1], 6) == 5.0
+            and round(minute[0][2], 6) == 6.29
+            and abs(minute[0][3] - expected_avg) < 1e-9,
+            f"버킷 1개, 샘플 {minute[0][4] if minute else 0}개, "
+            f"가중 평균 {minute[0][3] if minute else 0:.4f} (기대 {expected_avg:.4f})",
+        )
+
+        # 다른 장치는 같은 시각이라도 별도 버킷
+        await self.db.save_measurements_batch(self.rows(start, 10, 12.0, sensor_id=2))
+        other = self.rollup("minute_statistics", "minute_timestamp", sensor_id=2)
+        self.log_result(
+            "장치별 버킷 분리",
+            len(other) == 1
+            and other[0][4] == 10
+            and round(other[0][1], 6) == 12.0
+            and minute[0][4] == 40,
+            f"장치 2 버킷 {len(other)}개 (장치 1 버킷 영향 없음)",
+        )
+
+    async def test_tier_selection(self):
+        """tier 선택 / 시계열 조회 테스트"""
+        cases = [
+            ((0.1, 1000), "1s"),
+            ((1, 1000), "1m"),
+            ((24, 2000), "1m"),
+            ((24, 100), "1h"),
+            ((24 * 7, 1000), "1h"),
+        ]
+        selected = [self.db.select_rollup_tier(*args) for args, _ in cases]
+        self.log_result(
+            "tier 선택",
+            selected == [tier for _, tier in cases],
+            ", ".join(
+                f"{hours}h/{points}pt→{tier}"
+                for ((hours, points), _), tier in zip(cases, selected)
+            ),
+        )
+
+        series = await self.db.get_measurement_series(hours=1, tier="1m")
+        raw = await self.db.get_measurement_series(hours=1, max_points=1000)
+        rollup = await self.db.get_measurement_series(hours=1, max_points=3)
+        self.log_result(
+            "시계열 tier 조회",
+            series["resolution_seconds"] == 60
+            and sum(row["sample_count"] for row in series["data"]) == 80
+            and raw["tier"] == "raw"
+            and len(raw["data"]) == 80
+            and rollup["tier"] == "1h",
+            f"1m 버킷 {len(series['data'])}개, auto: 원본 {len(raw['data'])}행 → "
+            f"{raw['tier']}, 예산 3포인트 → {rollup['tier']}",
+        )
+
+        rejected = []
+        for method in (self.db.get_measurement_series, self.db.get_measurements):
+            try:
+                await method(tier="5m")
+                rejected.append(False)
+            except ValueError:
+                rejected.append(True)
+        self.log_result("알 수 없는 tier 거부", all(rejected), "ValueError")
+
+    async def test_measurements(self):
+        """범위에 따른 get_measurements 해상도 테스트"""
+        raw = await self.db.get_measurements(hours=1, limit=1000)
+        unlimited = await self.db.get_measurements(hours=1, limit=-1)
+        newest = await self.db.get_measurements(hours=1, limit=10, tier="raw")
+        timestamps = [row["timestamp"] for row in raw["data"]]
+        self.log_result(
+            "원본 행 (limit 이내)",
+            raw["tier"] == "raw"
+            and len(raw["data"]) == 80
+            and timestamps == sorted(timestamps, reverse=True)
+            and unlimited["tier"] == "raw"
+            and len(unlimited["data"]) == 80
+            and newest["data"] == raw["data"][:10],
+            f"auto → {raw['tier']} {len(raw['data'])}행 (최신 순), "
+            f"tier=raw limit 10 → {len(newest['data'])}행",
+        )
+
+        # 1시간 범위 원본 80행 > limit 60 → 1분 버킷 (60개 이내)
+        rollup = await self.db.get_measurements(hours=1, limit=60)
+        rows = rollup["data"]
+        self.log_result(
+            "롤업 tier 전환",
+            rollup["tier"] == "1m"
+            and rollup["resolution_seconds"] == 60
+            and sum(row["sample_count"] for row in rows) == 80
+            and [row["timestamp"] for row in rows]
+            == sorted((row["timestamp"] for row in rows), reverse=True)
+            and all(
+                row["voltage"] == row["voltage_avg"]
+                and row["voltage_min"] <= row["voltage"] <= row["voltage_max"]
+                for row in rows
+            ),
+            f"limit 60 → {rollup['tier']} 버킷 {len(rows)}개 "
+            f"(샘플 {sum(row['sample_count'] for row in rows)}개, voltage = 평균)",
+        )
+
+        trimmed = await self.db.get_measurements(hours=1, limit=2, tier="1m")
+        self.log_result(
+            "롤업 limit",
+            [row["timestamp"] for row in trimmed["data"]]
+            == [row["timestamp"] for row in rows[:2]],
+            f"tier=1m limit 2 → 최신 버킷 {len(trimmed['data'])}개",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📊 롤업 통계 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        base = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=10)
+        try:
+            await self.test_batch_rollup(base)
+            await self.test_upsert_merge(base)
+            await self.test_tier_selection()
+            await self.test_measurements()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = RollupTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
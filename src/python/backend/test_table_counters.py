@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+테이블 행 수 카운터 테스트
+table_counters(트리거 / 파티션 저장 시 갱신)와 get_database_stats 검증
+
+테스트 항목:
+1. 트리거 카운터: INSERT / DELETE 시 증감
+2. 측정 파티션 카운터: 실제 저장된 행만 (중복 무시 행 제외)
+3. 통계가 실제 COUNT(*)와 일치
+4. 정리 작업의 파티션 DROP 시 카운터 제거
+5. 시작 시 어긋난 카운터 보정
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+from database import COUNTED_TABLES, PowerDatabase
+
+
+class TableCounterTester:
+    """테이블 카운터 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_table_counters.db"
+        self.db = None
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def actual_counts(self) -> dict[str, int]:
+        """COUNT(*)로 센 실제 행 수 (측정 데이터는 뷰 전체)"""
+        with sqlite3.connect(self.test_db_path) as conn:
+            counts = {
+                f"{table}_count": conn.execute(
+                    f"SELECT COUNT(*) FROM {table}"
+                ).fetchone()[0]
+                for table in COUNTED_TABLES
+            }
+            counts["power_measurements_count"] = conn.execute(
+                "SELECT COUNT(*) FROM power_measurements"
+            ).fetchone()[0]
+        return counts
+
+    async def stats_match(self) -> tuple[bool, dict, dict]:
+        """통계의 카운터 값과 실제 행 수 비교"""
+        stats = await self.db.get_database_stats()
+        actual = self.actual_counts()
+        reported = {key: stats.get(key) for key in actual}
+        return reported == actual, reported, actual
+
+    @staticmethod
+    def rows(start: datetime, count: int, first_seq: int = 0) -> list[tuple]:
+        """1초 간격 측정 행"""
+        return [
+            (start + timedelta(seconds=i), 5.0, 0.2, 1.0, first_seq + i, "ok", "NORMAL")
+            for i in range(count)
+        ]
+
+    async def test_counters(self):
+        """트리거 / 파티션 카운터 테스트"""
+        for i in range(25):
+            await self.db.save_system_log("INFO", "test", f"log {i}")
+        stats = await self.db.get_database_stats()
+        self.log_result(
+            "트리거 INSERT",
+            stats["system_logs_count"] == 25,
+            f"system_logs {stats['system_logs_count']}/25",
+        )
+
+        # 현재 시간 직전 파티션 경계를 넘는 200행 + 중복 50행
+        now = datetime.now().replace(microsecond=0)
+        start = now.replace(minute=0, second=0) - timedelta(seconds=100)
+        await self.db.save_measurements_batch(self.rows(start, 200))
+        await self.db.save_measurements_batch(
+            self.rows(start + timedelta(seconds=150), 100, 150)
+        )
+        matched, reported, actual = await self.stats_match()
+        self.log_result(
+            "파티션 카운터 (중복 제외)",
+            reported["power_measurements_count"] == 250 and matched,
+            f"측정 {reported['power_measurements_count']}행 (중복 50행 무시), "
+            f"파티션 {len(self.db.partitions)}개",
+        )
+        self.log_result(
+            "롤업 / 로그 카운터 일치",
+            matched,
+            f"카운터 {reported}" if not matched else "모든 카운터 = COUNT(*)",
+        )
+
+    async def test_cleanup(self):
+        """파티션 DROP / 행 삭제 시 카운터 테스트"""
+        old = datetime.now() - timedelta(hours=self.db.data_retention_hours + 3)
+        old = old.replace(minute=0, second=0, microsecond=0)
+        await self.db.save_measurements_batch(self.rows(old, 60, 10_000))
+        old_partition = self.db.partitions[0]
+        before = (await self.db.get_database_stats())["power_measurements_count"]
+
+        stats = await self.db.cleanup_old_data()
+        with sqlite3.connect(self.test_db_path) as conn:
+            counter_rows = conn.execute(
+                "SELECT COUNT(*) FROM table_counters WHERE name = ?", (old_partition,)
+            ).fetchone()[0]
+        matched, reported, actual = await self.stats_match()
+        self.log_result(
+            "파티션 DROP",
+            stats.get("partitions_dropped", 0) >= 1
+            and counter_rows == 0
+            and reported["power_measurements_count"] == before - 60
+            and matched,
+            f"{old_partition} 삭제, 측정 {before} → "
+            f"{reported['power_measurements_count']}행, 롤업 DELETE 트리거 일치",
+        )
+
+    async def test_reconcile(self):
+        """시작 시 카운터 보정 테스트"""
+        await self.db.close()
+        with sqlite3.connect(self.test_db_path) as conn:
+            conn.execute("UPDATE table_counters SET row_count = row_count + 1000")
+        self.db = PowerDatabase(self.test_db_path)
+        matched, reported, _ = await self.stats_match()
+        self.log_result(
+            "시작 시 보정",
+            matched and reported["system_logs_count"] >= 25,
+            "카운터 +1000 변조 후 재시작 → 실제 행 수로 복원",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🔢 테이블 행 수 카운터 테스트 시작")
+        print("=" * 60)
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+        self.db = PowerDatabase(self.test_db_path)
+        try:
+            await self.test_counters()
+            await self.test_cleanup()
+            await self.test_reconcile()
+        finally:
+            await self.db.close()
+            os.remove(self.test_db_path)
+            shutil.rmtree(self.db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = TableCounterTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
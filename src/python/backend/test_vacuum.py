@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+증분 vacuum 테스트
+auto_vacuum=INCREMENTAL 설정과 빈 페이지 단계별 회수 검증
+
+테스트 항목:
+1. 새 DB / 기존 DB(auto_vacuum 없음) 모두 INCREMENTAL로 설정
+2. incremental_vacuum: 한 단계에 max_pages개까지만 회수
+3. reclaim_free_pages: 빈 페이지를 모두 회수, 단계 사이에 다른 쓰기 허용
+4. 페이지 통계 (get_database_stats)
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+
+from database import PowerDatabase
+
+
+class VacuumTester:
+    """증분 vacuum 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+        self.test_db_path = "test_vacuum.db"
+        self.legacy_db_path = "test_vacuum_legacy.db"
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    def make_free_pages(self, rows: int = 4000) -> int:
+        """임시 테이블을 채웠다가 삭제해 빈 페이지 생성 (freelist 수 반환)"""
+        with sqlite3.connect(self.test_db_path) as conn:
+            conn.execute("CREATE TABLE scratch (payload BLOB)")
+            conn.executemany(
+                "INSERT INTO scratch VALUES (?)",
+                ((os.urandom(1024),) for _ in range(rows)),
+            )
+            conn.commit()
+            conn.execute("DROP TABLE scratch")
+            conn.commit()
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    @staticmethod
+    def remove(path: str):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    async def test_auto_vacuum_mode(self):
+        """auto_vacuum 모드 설정 테스트"""
+        # 기존 DB: auto_vacuum 없이 만든 테이블이 있는 파일
+        self.remove(self.legacy_db_path)
+        with sqlite3.connect(self.legacy_db_path) as conn:
+            conn.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY, value TEXT)")
+            conn.executemany(
+                "INSERT INTO legacy (value) VALUES (?)", [("x" * 100,)] * 100
+            )
+        with sqlite3.connect(self.legacy_db_path) as conn:
+            before = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+        legacy = PowerDatabase(self.legacy_db_path)
+        stats = await legacy.get_database_stats()
+        await legacy.close()
+        with sqlite3.connect(self.legacy_db_path) as conn:
+            after = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            kept = conn.execute("SELECT COUNT(*) FROM legacy").fetchone()[0]
+        self.remove(self.legacy_db_path)
+        shutil.rmtree(legacy.archive.directory, ignore_errors=True)
+
+        self.log_result(
+            "기존 DB 전환",
+            before == 0 and after == 2 and kept == 100 and stats["incremental_vacuum"],
+            f"auto_vacuum {before} → {after}, 기존 행 {kept}/100 유지",
+        )
+
+    async def test_incremental(self, db: PowerDatabase):
+        """단계별 회수 테스트"""
+        stats = await db.get_database_stats()
+        self.log_result(
+            "새 DB INCREMENTAL",
+            stats["incremental_vacuum"],
+            f"freelist {stats['freelist_pages']}페이지",
+        )
+
+        free = self.make_free_pages()
+        reclaimed = await db.incremental_vacuum(max_pages=100)
+        stats = await db.get_database_stats()
+        self.log_result(
+            "단계당 max_pages",
+            free > 500 and reclaimed == 100 and stats["freelist_pages"] == free - 100,
+            f"빈 페이지 {free} → 1단계 {reclaimed} 회수, "
+            f"남은 {stats['freelist_pages']}",
+        )
+
+        # 회수 중 다른 쓰기: 단계 사이에 writer를 얻어 끝나기 전에 완료
+        runs_before = db.vacuum_stats["runs"]
+        write_done_at = None
+
+        async def writer():
+            nonlocal write_done_at
+            await asyncio.sleep(0)
+            await db.save_system_log("INFO", "test", "write during vacuum")
+            write_done_at = db.vacuum_stats["runs"] - runs_before
+
+        reclaim, _ = await asyncio.gather(db.reclaim_free_pages(max_pages=50), writer())
+        stats = await db.get_database_stats()
+        steps = db.vacuum_stats["runs"] - runs_before
+        self.log_result(
+            "전체 회수",
+            reclaim == free - 100 and stats["freelist_pages"] == 0,
+            f"{steps}단계로 {reclaim}페이지 회수, 남은 빈 페이지 "
+            f"{stats['freelist_pages']}",
+        )
+        self.log_result(
+            "단계 사이 쓰기 허용",
+            write_done_at is not None and write_done_at < steps,
+            f"쓰기 완료 시점: {write_done_at}/{steps}단계",
+        )
+        self.log_result(
+            "빈 페이지 없으면 no-op",
+            await db.incremental_vacuum() == 0,
+            f"누적 {db.vacuum_stats}",
+        )
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("🧹 증분 vacuum 테스트 시작")
+        print("=" * 60)
+        await self.test_auto_vacuum_mode()
+
+        self.remove(self.test_db_path)
+        db = PowerDatabase(self.test_db_path)
+        try:
+            await self.test_incremental(db)
+        finally:
+            await db.close()
+            self.remove(self.test_db_path)
+            shutil.rmtree(db.archive.directory, ignore_errors=True)
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main():
+    """메인 실행 함수"""
+    tester = VacuumTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+WebSocket fan-out 브로드캐스트 테스트
+ConnectionManager / ClientChannel의 클라이언트별 bounded 큐 검증
+
+테스트 항목:
+1. 모든 클라이언트가 같은 직렬화 문자열을 순서대로 수신
+2. 느린 클라이언트가 broadcast와 빠른 클라이언트를 지연시키지 않음
+3. drop_oldest: 큐가 가득 차면 가장 오래된 메시지 폐기
+4. coalesce_latest: 최신 메시지 1개만 유지
+5. 전송 실패 / disconnect 시 채널 정리
+6. 클라이언트별 lag 메트릭
+
+주의: main 모듈 import 시 현재 디렉토리에 power_monitoring.db가 생성됨
+"""
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import main
+from main import ClientChannel, ConnectionManager
+
+
+class FakeWebSocket:
+    """accept / send_text만 구현한 WebSocket 대역 (전송 지연 / 실패 주입 가능)"""
+
+    def __init__(self, port: int, delay: float = 0.0, fail: bool = False):
+        self.client = SimpleNamespace(host="127.0.0.1", port=port)
+        self.delay = delay
+        self.fail = fail
+        self.accepted = False
+        self.received: list[str] = []
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.received.append(message)
+
+
+class WebSocketFanoutTester:
+    """ConnectionManager 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    async def wait_for(self, condition, timeout: float = 2.0):
+        """조건이 참이 될 때까지 대기 (시간 초과 시 그대로 반환)"""
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    async def test_fanout(self):
+        """공유 메시지 / 느린 클라이언트 격리 / drop_oldest 테스트"""
+        manager = ConnectionManager(max_queue=5)
+        fast = FakeWebSocket(1001)
+        slow = FakeWebSocket(1002, delay=0.05)
+        await manager.connect(fast)
+        await manager.connect(slow)
+
+        messages = [f'{{"seq": {i}}}' for i in range(20)]
+        started = time.perf_counter()
+        for message in messages:
+            await manager.broadcast(message)
+            await asyncio.sleep(0)  # 빠른 클라이언트 writer에 실행 기회
+        broadcast_ms = (time.perf_counter() - started) * 1000
+        await self.wait_for(lambda: len(fast.received) == 20)
+        fast_done = len(fast.received)
+
+        self.log_result(
+            "연결 / accept",
+            fast.accepted and slow.accepted and len(manager.active_connections) == 2,
+            f"활성 연결 {len(manager.active_connections)}개",
+        )
+        self.log_result(
+            "broadcast 비차단",
+            broadcast_ms < 50,
+            f"느린 클라이언트(50ms/메시지) 포함 20개 broadcast {broadcast_ms:.1f}ms",
+        )
+        self.log_result(
+            "빠른 클라이언트 전체 수신",
+            fast.received == messages
+            and all(a is b for a, b in zip(fast.received, messages)),
+            f"{fast_done}/20개 (같은 문자열 객체 공유)",
+        )
+
+        await self.wait_for(lambda: not manager.channels[slow].queue)
+        await asyncio.sleep(0.1)
+        metrics = {m["client"]: m for m in manager.get_metrics()}
+        slow_metrics = metrics["127.0.0.1:1002"]
+        self.log_result(
+            "drop_oldest 큐 상한",
+            len(slow.received) < 20
+            and slow.received[-5:] == messages[-5:]
+            and slow_metrics["dropped"] == 20 - len(slow.received),
+            f"느린 클라이언트 수신 {len(slow.received)}개, "
+            f"폐기 {slow_metrics['dropped']}개 (마지막 5개는 보존)",
+        )
+        self.log_result(
+            "lag 메트릭",
+            metrics["127.0.0.1:1001"]["dropped"] == 0
+            and slow_metrics["max_lag_ms"] > metrics["127.0.0.1:1001"]["max_lag_ms"]
+            and slow_metrics["sent"] == len(slow.received),
+            f"max_lag 빠름 {metrics['127.0.0.1:1001']['max_lag_ms']}ms / "
+            f"느림 {slow_metrics['max_lag_ms']}ms",
+        )
+
+        manager.disconnect(fast)
+        manager.disconnect(slow)
+        await asyncio.sleep(0.01)
+        self.log_result(
+            "disconnect 정리",
+            not manager.channels,
+            f"남은 연결 {len(manager.channels)}개",
+        )
+
+    async def test_coalesce(self):
+        """coalesce_latest 정책 테스트"""
+        manager = ConnectionManager(policy="coalesce_latest")
+        websocket = FakeWebSocket(2001, delay=0.05)
+        await manager.connect(websocket)
+
+        await manager.broadcast("first")
+        await asyncio.sleep(0.01)  # 첫 메시지 전송 시작
+        for i in range(10):
+            await manager.broadcast(f"update-{i}")
+        await self.wait_for(lambda: len(websocket.received) == 2)
+        await asyncio.sleep(0.1)
+
+        self.log_result(
+            "coalesce_latest",
+            websocket.received == ["first", "update-9"],
+            f"수신 {websocket.received}",
+        )
+        manager.disconnect(websocket)
+
+        try:
+            ClientChannel(websocket, manager, policy="unknown")
+            rejected = False
+        except ValueError:
+            rejected = True
+        self.log_result("알 수 없는 정책 거부", rejected, "ValueError")
+
+    async def test_send_failure(self):
+        """전송 실패 시 자동 disconnect 테스트"""
+        manager = ConnectionManager()
+        healthy = FakeWebSocket(3001)
+        broken = FakeWebSocket(3002, fail=True)
+        await manager.connect(healthy)
+        await manager.connect(broken)
+
+        await manager.broadcast("hello")
+        await self.wait_for(lambda: broken not in manager.channels)
+        await manager.broadcast("again")
+        await self.wait_for(lambda: len(healthy.received) == 2)
+
+        self.log_result(
+            "전송 실패 연결 제거",
+            list(manager.channels) == [healthy]
+            and healthy.received == ["hello", "again"],
+            f"남은 연결 {len(manager.channels)}개, 정상 클라이언트 수신 "
+            f"{len(healthy.received)}개",
+        )
+        manager.disconnect(healthy)
+
+    async def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📡 WebSocket fan-out 브로드캐스트 테스트 시작")
+        print("=" * 60)
+        try:
+            await self.test_fanout()
+            await self.test_coalesce()
+            await self.test_send_failure()
+        finally:
+            await main.server.db.close()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+async def main_async():
+    """메인 실행 함수"""
+    tester = WebSocketFanoutTester()
+    success = await tester.run_full_test()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
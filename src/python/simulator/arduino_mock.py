@@ -4,6 +4,8 @@ Arduino UNO R4 WiFi + INA219 Mock Simulator
 
 기능:
 - 실제 Arduino 시뮬레이터와 동일한 JSON 프로토콜
+- 바이너리 측정 프레임 전송 (set_format 명령으로 전환)
+- 고속 버스트 수집 모드 (20Hz~10kHz, K개 샘플을 버스트 프레임 1개로 전송)
 - 다양한 시나리오 테스트 지원
 - 시리얼 포트 에뮬레이션
 - 실시간 데이터 생성
@@ -17,7 +19,26 @@ import threading
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
+
+try:
+    from .binary_protocol import (
+        BURST_MAX_SAMPLES,
+        BURST_RATE_RANGE,
+        FRAME_FORMATS,
+        decode_frame,
+        encode_burst,
+        encode_measurement,
+    )
+except ImportError:
+    from binary_protocol import (
+        BURST_MAX_SAMPLES,
+        BURST_RATE_RANGE,
+        FRAME_FORMATS,
+        decode_frame,
+        encode_burst,
+        encode_measurement,
+    )
 
 
 class SimulationMode(Enum):
@@ -48,7 +69,16 @@ class ArduinoMockSimulator:
         # 시뮬레이션 상태
         self.current_mode = SimulationMode.NORMAL
         self.measurement_interval = 1000  # ms
+        self.output_format = "json"  # 측정 데이터 전송 포맷 (json | binary)
         self.sequence_number = 0
+
+        # 버스트 모드 (burst_rate_hz == 0이면 샘플 단위 전송)
+        self.burst_rate_hz = 0
+        self.burst_samples = 100
+        self._burst_buffer: list[tuple[int, float, float, float]] = []
+        self._burst_start_seq = 0
+        self._burst_start_us = 0
+        self._next_sample_time = 0.0
         self.sensor_status = True
         self.start_time = time.time()
 
@@ -128,15 +158,26 @@ class ArduinoMockSimulator:
             return False
 
     def read_data(self, timeout: float = 1.0) -> Optional[str]:
-        """데이터 읽기"""
+        """데이터 읽기 (바이너리 프레임은 JSON 문자열로 변환)"""
+        item = self.read_frame(timeout)
+        if isinstance(item, dict):
+            return json.dumps(item)
+        return item
+
+    def read_frame(self, timeout: float = 1.0) -> Optional[Union[str, dict[str, Any]]]:
+        """프레임 읽기 - 바이너리 측정 프레임은 dict, JSON 라인은 str로 반환"""
         if not self.is_connected:
             return None
 
         try:
-            return self.output_queue.get(timeout=timeout)
+            item = self.output_queue.get(timeout=timeout)
         except queue.Empty:
             return None
 
+        if isinstance(item, bytes):
+            return decode_frame(item)
+        return item
+
     def set_data_callback(self, callback: Callable[[dict[str, Any]], None]):
         """데이터 수신 콜백 설정"""
         self.data_callback = callback
@@ -154,8 +195,11 @@ class ArduinoMockSimulator:
         while self.is_running:
             current_time = time.time()
 
-            # 측정 간격 확인
-            if (current_time - last_measurement) * 1000 >= self.measurement_interval:
+            if self.burst_rate_hz:
+                # 버스트 모드: 경과 시간만큼 샘플 생성
+                self._sample_burst(current_time)
+            elif (current_time - last_measurement) * 1000 >= self.measurement_interval:
+                # 측정 간격 확인
                 self._send_measurement_data()
                 last_measurement = current_time
 
@@ -205,13 +249,90 @@ class ArduinoMockSimulator:
 
         self.sequence_number += 1
 
-        json_str = json.dumps(data)
-        self.output_queue.put(json_str)
+        if self.output_format == "binary":
+            self.output_queue.put(
+                encode_measurement(
+                    data["v"],
+                    data["a"],
+                    data["w"],
+                    seq=data["seq"],
+                    ts=data["ts"],
+                    status=data["status"],
+                    mode=data["mode"],
+                )
+            )
+        else:
+            json_str = json.dumps(data)
+            self.output_queue.put(json_str)
 
         # 콜백 호출
         if self.data_callback:
             self.data_callback(data)
 
+    def _sample_burst(self, current_time: float):
+        """버스트 모드 샘플링 (가상 샘플 시각 기준, 최대 1초 분량까지 따라잡음)"""
+        interval = 1.0 / self.burst_rate_hz
+        dt_us = round(interval * 1_000_000)
+
+        if current_time - self._next_sample_time > 1.0:
+            self._next_sample_time = current_time
+
+        while self._next_sample_time <= current_time:
+            voltage = self._generate_voltage()
+            current = self._generate_current()
+
+            if not self._burst_buffer:
+                self._burst_start_seq = self.sequence_number
+                # micros() 에뮬레이션 (시뮬레이터 시작 기준)
+                self._burst_start_us = int(
+                    (self._next_sample_time - self.start_time) * 1_000_000
+                )
+
+            self._burst_buffer.append(
+                (
+                    dt_us if self._burst_buffer else 0,
+                    voltage,
+                    current,
+                    voltage * current,
+                )
+            )
+            self.sequence_number += 1
+            self._next_sample_time += interval
+
+            if len(self._burst_buffer) >= self.burst_samples:
+                self._send_burst_data()
+
+    def _send_burst_data(self):
+        """버스트 프레임 전송 (항상 바이너리)"""
+        samples = self._burst_buffer
+        self._burst_buffer = []
+
+        status = "ok" if self.sensor_status else "error"
+        self.output_queue.put(
+            encode_burst(
+                samples,
+                seq=self._burst_start_seq,
+                ts_us=self._burst_start_us,
+                status=status,
+                mode=self.current_mode.value,
+            )
+        )
+
+        # 콜백에는 마지막 샘플만 전달
+        if self.data_callback:
+            _, voltage, current, power = samples[-1]
+            self.data_callback(
+                {
+                    "v": round(voltage, 3),
+                    "a": round(current, 3),
+                    "w": round(power, 3),
+                    "ts": int(time.time() * 1000),
+                    "seq": self.sequence_number - 1,
+                    "status": status,
+                    "mode": self.current_mode.value,
+                }
+            )
+
     def _generate_voltage(self) -> float:
         """전압 시뮬레이션"""
         voltage = self.sim_params.base_voltage
@@ -291,10 +412,50 @@ class ArduinoMockSimulator:
                 response["result"] = "error"
                 response["message"] = "Invalid mode"
 
+        elif cmd == "set_format":
+            frame_format = cmd_data.get("value", "")
+            if frame_format in FRAME_FORMATS:
+                # 응답은 항상 JSON으로 보낸 뒤 측정 데이터 포맷 전환
+                response["result"] = "ok"
+                response["message"] = f"Format changed to {frame_format}"
+                self._send_json_response(response)
+                self.output_format = frame_format
+                return
+            response["result"] = "error"
+            response["message"] = "Invalid format (json, binary)"
+
+        elif cmd == "set_burst":
+            rate_hz = cmd_data.get("rate_hz", 0)
+            samples = cmd_data.get("samples", self.burst_samples)
+            if rate_hz == 0:
+                self.burst_rate_hz = 0
+                self._burst_buffer = []
+                response["result"] = "ok"
+                response["message"] = "Burst mode disabled"
+            elif (
+                BURST_RATE_RANGE[0] <= rate_hz <= BURST_RATE_RANGE[1]
+                and 1 <= samples <= BURST_MAX_SAMPLES
+            ):
+                self.burst_samples = samples
+                self._burst_buffer = []
+                self._next_sample_time = time.time()
+                self.burst_rate_hz = rate_hz
+                response["result"] = "ok"
+                response["message"] = f"Burst mode {rate_hz}Hz x {samples} samples"
+            else:
+                response["result"] = "error"
+                response["message"] = (
+                    f"Invalid burst settings (rate_hz {BURST_RATE_RANGE[0]}-"
+                    f"{BURST_RATE_RANGE[1]}, samples 1-{BURST_MAX_SAMPLES})"
+                )
+
         elif cmd == "get_status":
             response["result"] = "ok"
             response["uptime"] = int((time.time() - self.start_time) * 1000)
             response["interval"] = self.measurement_interval
+            response["format"] = self.output_format
+            response["burst_rate_hz"] = self.burst_rate_hz
+            response["burst_samples"] = self.burst_samples
             response["mode"] = self.current_mode.value
             response["sequence"] = self.sequence_number
 
@@ -322,6 +483,10 @@ class ArduinoMockSimulator:
             self._send_status_message('  {"cmd":"set_mode","value":"NORMAL","seq":2}')
             self._send_status_message('  {"cmd":"get_status","seq":3}')
             self._send_status_message('  {"cmd":"reset","seq":4}')
+            self._send_status_message('  {"cmd":"set_format","value":"binary","seq":5}')
+            self._send_status_message(
+                '  {"cmd":"set_burst","rate_hz":1000,"samples":100,"seq":6}'
+            )
             self._send_status_message("Text Commands: HELP, STATUS, MODES")
             self._send_status_message("========================")
 
@@ -385,6 +550,9 @@ class ArduinoMockSimulator:
         self.sequence_number = 0
         self.current_mode = SimulationMode.NORMAL
         self.measurement_interval = 1000
+        self.output_format = "json"
+        self.burst_rate_hz = 0
+        self._burst_buffer = []
         self.sensor_status = True
         self.start_time = time.time()
 
@@ -0,0 +1,345 @@
+"""
+INA219 Binary Frame Protocol
+115200 baud 링크용 고정 길이 바이너리 측정 프레임
+
+프레임 구조 (little-endian, 24 bytes):
+    offset  size  field
+    0       2     sync (0xA5 0x5A)
+    2       1     frame type (0x01 = measurement)
+    3       4     seq (uint32)
+    7       4     device ts (uint32, millis)
+    11      2     voltage (uint16, mV)
+    13      4     current (int32, µA)
+    17      4     power (int32, µW)
+    21      1     flags (bit0 = sensor ok, bit1-3 = simulation mode)
+    22      2     CRC-16/CCITT-FALSE (type ~ flags 구간)
+
+버스트 프레임 (고속 수집 모드, 13 + 12*K + 2 bytes):
+    0       2     sync (0xA5 0x5A)
+    2       1     frame type (0x02 = burst)
+    3       4     첫 샘플 seq (uint32)
+    7       4     첫 샘플 device ts (uint32, micros)
+    11      1     샘플 수 K (1~200)
+    12      1     flags
+    13      12*K  샘플: dt (uint16, 이전 샘플 대비 µs) + mV (uint16)
+                  + µA (int32) + µW (int32)
+    13+12K  2     CRC-16/CCITT-FALSE (type ~ 마지막 샘플 구간)
+
+JSON 라인(상태 메시지, 명령 응답)과 같은 스트림에 섞여 전송되며,
+{"cmd":"set_format","value":"binary"} 명령으로 측정 데이터만 바이너리로 전환한다.
+버스트 프레임은 {"cmd":"set_burst","rate_hz":1000,"samples":100} 명령으로 켠다.
+"""
+
+import binascii
+import struct
+from typing import Any, Optional, Union
+
+SYNC = b"\xa5\x5a"
+FRAME_TYPE_MEASUREMENT = 0x01
+FRAME_TYPE_BURST = 0x02
+
+FRAME_STRUCT = struct.Struct("<2sBIIHiiBH")
+FRAME_SIZE = FRAME_STRUCT.size  # 24 bytes
+
+# CRC 계산 구간 (sync 제외, CRC 필드 제외)
+CRC_START = len(SYNC)
+CRC_END = FRAME_SIZE - 2
+
+BURST_HEADER_STRUCT = struct.Struct("<2sBIIBB")
+BURST_SAMPLE_STRUCT = struct.Struct("<HHii")
+BURST_MAX_SAMPLES = 200
+BURST_RATE_RANGE = (20, 10000)  # Hz (dt가 uint16 µs에 들어가는 범위)
+
+# 플래그 비트의 시뮬레이션 모드 코드 (Arduino 스케치와 동일한 순서)
+MODES = ("NORMAL", "LOAD_SPIKE", "VOLTAGE_DROP", "NOISE", "ERROR_TEST")
+MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+
+FRAME_FORMATS = ("json", "binary")
+
+
+def crc16(data) -> int:
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF)"""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    return max(low, min(high, value))
+
+
+def encode_measurement(
+    voltage: float,
+    current: float,
+    power: float,
+    seq: int,
+    ts: int,
+    status: str = "ok",
+    mode: str = "NORMAL",
+) -> bytes:
+    """측정값을 바이너리 프레임으로 인코딩 (Mock 시뮬레이터용)"""
+    flags = (1 if status == "ok" else 0) | (MODE_CODES.get(mode, 0) << 1)
+
+    frame = bytearray(FRAME_SIZE)
+    FRAME_STRUCT.pack_into(
+        frame,
+        0,
+        SYNC,
+        FRAME_TYPE_MEASUREMENT,
+        seq & 0xFFFFFFFF,
+        ts & 0xFFFFFFFF,
+        _clamp(round(voltage * 1000), 0, 0xFFFF),
+        _clamp(round(current * 1_000_000), -(2**31), 2**31 - 1),
+        _clamp(round(power * 1_000_000), -(2**31), 2**31 - 1),
+        flags,
+        0,
+    )
+    crc = crc16(memoryview(frame)[CRC_START:CRC_END])
+    struct.pack_into("<H", frame, CRC_END, crc)
+    return bytes(frame)
+
+
+def decode_measurement(buffer, offset: int = 0) -> Optional[dict[str, Any]]:
+    """buffer[offset:]의 바이너리 프레임을 JSON 프레임과 같은 dict로 디코딩
+
+    복사 없이 struct.unpack_from으로 읽으며, sync/타입/CRC가 맞지 않으면 None.
+    """
+    view = memoryview(buffer)
+    if len(view) - offset < FRAME_SIZE:
+        return None
+
+    (sync, frame_type, seq, ts, voltage_mv, current_ua, power_uw, flags, crc) = (
+        FRAME_STRUCT.unpack_from(view, offset)
+    )
+
+    if sync != SYNC or frame_type != FRAME_TYPE_MEASUREMENT:
+        return None
+    if crc16(view[offset + CRC_START : offset + CRC_END]) != crc:
+        return None
+
+    mode_code = (flags >> 1) & 0x07
+    return {
+        "v": voltage_mv / 1000,
+        "a": current_ua / 1_000_000,
+        "w": power_uw / 1_000_000,
+        "ts": ts,
+        "seq": seq,
+        "status": "ok" if flags & 0x01 else "error",
+        "mode": MODES[mode_code] if mode_code < len(MODES) else "UNKNOWN",
+    }
+
+
+def burst_frame_size(count: int) -> int:
+    """샘플 K개 버스트 프레임 크기 (bytes)"""
+    return BURST_HEADER_STRUCT.size + BURST_SAMPLE_STRUCT.size * count + 2
+
+
+def encode_burst(
+    samples: list[tuple[int, float, float, float]],
+    seq: int,
+    ts_us: int,
+    status: str = "ok",
+    mode: str = "NORMAL",
+) -> bytes:
+    """버스트 프레임 인코딩 (Mock 시뮬레이터용)
+
+    samples: (dt_us, voltage, current, power) 튜플 목록, 첫 샘플 dt는 0
+    """
+    count = len(samples)
+    if not 1 <= count <= BURST_MAX_SAMPLES:
+        raise ValueError(f"Burst sample count out of range: {count}")
+
+    flags = (1 if status == "ok" else 0) | (MODE_CODES.get(mode, 0) << 1)
+    size = burst_frame_size(count)
+
+    frame = bytearray(size)
+    BURST_HEADER_STRUCT.pack_into(
+        frame,
+        0,
+        SYNC,
+        FRAME_TYPE_BURST,
+        seq & 0xFFFFFFFF,
+        ts_us & 0xFFFFFFFF,
+        count,
+        flags,
+    )
+
+    offset = BURST_HEADER_STRUCT.size
+    for dt_us, voltage, current, power in samples:
+        BURST_SAMPLE_STRUCT.pack_into(
+            frame,
+            offset,
+            _clamp(dt_us, 0, 0xFFFF),
+            _clamp(round(voltage * 1000), 0, 0xFFFF),
+            _clamp(round(current * 1_000_000), -(2**31), 2**31 - 1),
+            _clamp(round(power * 1_000_000), -(2**31), 2**31 - 1),
+        )
+        offset += BURST_SAMPLE_STRUCT.size
+
+    crc = crc16(memoryview(frame)[CRC_START : size - 2])
+    struct.pack_into("<H", frame, size - 2, crc)
+    return bytes(frame)
+
+
+def decode_burst(buffer, offset: int = 0) -> Optional[dict[str, Any]]:
+    """버스트 프레임 디코딩 (컬럼 리스트 형태, CRC 불일치 시 None)
+
+    반환: {"type": "burst", "seq", "ts_us", "count", "dt_us", "v", "a", "w",
+           "status", "mode"}
+    """
+    view = memoryview(buffer)
+    if len(view) - offset < BURST_HEADER_STRUCT.size:
+        return None
+
+    sync, frame_type, seq, ts_us, count, flags = BURST_HEADER_STRUCT.unpack_from(
+        view, offset
+    )
+    if sync != SYNC or frame_type != FRAME_TYPE_BURST:
+        return None
+
+    size = burst_frame_size(count)
+    if count == 0 or len(view) - offset < size:
+        return None
+
+    (crc,) = struct.unpack_from("<H", view, offset + size - 2)
+    if crc16(view[offset + CRC_START : offset + size - 2]) != crc:
+        return None
+
+    samples_start = offset + BURST_HEADER_STRUCT.size
+    dt_us, voltage_mv, current_ua, power_uw = zip(
+        *BURST_SAMPLE_STRUCT.iter_unpack(view[samples_start : offset + size - 2])
+    )
+
+    mode_code = (flags >> 1) & 0x07
+    return {
+        "type": "burst",
+        "seq": seq,
+        "ts_us": ts_us,
+        "count": count,
+        "dt_us": list(dt_us),
+        "v": [value / 1000 for value in voltage_mv],
+        "a": [value / 1_000_000 for value in current_ua],
+        "w": [value / 1_000_000 for value in power_uw],
+        "status": "ok" if flags & 0x01 else "error",
+        "mode": MODES[mode_code] if mode_code < len(MODES) else "UNKNOWN",
+    }
+
+
+def frame_size(buffer) -> Optional[int]:
+    """sync로 시작하는 buffer의 프레임 크기
+
+    헤더가 덜 왔으면 None, 알 수 없는 타입은 0.
+    """
+    if len(buffer) < 3:
+        return None
+
+    frame_type = buffer[2]
+    if frame_type == FRAME_TYPE_MEASUREMENT:
+        return FRAME_SIZE
+    if frame_type == FRAME_TYPE_BURST:
+        if len(buffer) < BURST_HEADER_STRUCT.size:
+            return None
+        count = buffer[BURST_HEADER_STRUCT.size - 2]
+        return burst_frame_size(count) if 0 < count <= BURST_MAX_SAMPLES else 0
+    return 0
+
+
+def decode_frame(buffer, offset: int = 0) -> Optional[dict[str, Any]]:
+    """프레임 타입에 따라 측정/버스트 디코딩"""
+    if len(buffer) - offset < 3:
+        return None
+    if buffer[offset + 2] == FRAME_TYPE_BURST:
+        return decode_burst(buffer, offset)
+    return decode_measurement(buffer, offset)
+
+
+class FrameDecoder:
+    """JSON 라인 + 바이너리 프레임 혼합 스트림 디코더
+
+    feed()로 받은 바이트를 누적하고, next_item()이 완성된 항목을 하나씩 반환한다.
+    - 바이너리 측정/버스트 프레임 → dict
+    - 텍스트 라인 (JSON 상태/응답) → str
+    """
+
+    def __init__(self, max_buffer: int = 16384):
+        self.buffer = bytearray()
+        self.max_buffer = max_buffer
+        # CRC 실패 후에는 다음 sync 또는 JSON 라인 시작까지 버림
+        self._resync = False
+        self.metrics = {
+            "binary_frames": 0,
+            "text_lines": 0,
+            "crc_errors": 0,
+            "discarded_bytes": 0,
+        }
+
+    def feed(self, data: bytes):
+        """수신 바이트 추가"""
+        self.buffer += data
+
+        # 줄바꿈 없는 잡음이 계속 쌓이는 경우 방지
+        if len(self.buffer) > self.max_buffer:
+            overflow = len(self.buffer) - self.max_buffer
+            del self.buffer[:overflow]
+            self.metrics["discarded_bytes"] += overflow
+
+    def next_item(self) -> Optional[Union[str, dict[str, Any]]]:
+        """완성된 항목 1개 반환 (없으면 None)"""
+        buffer = self.buffer
+
+        while buffer:
+            if self._resync:
+                sync = buffer.find(SYNC)
+                line_start = buffer.find(b"\n{")
+                candidates = [sync] if sync != -1 else []
+                if line_start != -1:
+                    candidates.append(line_start + 1)
+
+                if not candidates:
+                    # 마지막 바이트는 다음 sync/라인의 앞부분일 수 있으므로 보존
+                    drop = len(buffer) - 1
+                    del buffer[:drop]
+                    self.metrics["discarded_bytes"] += drop
+                    return None
+
+                start = min(candidates)
+                del buffer[:start]
+                self.metrics["discarded_bytes"] += start
+                self._resync = False
+                continue
+
+            if buffer.startswith(SYNC):
+                size = frame_size(buffer)
+                if size is None or size > len(buffer):
+                    return None
+
+                frame = decode_frame(buffer) if size else None
+                if frame is not None:
+                    del buffer[:size]
+                    self.metrics["binary_frames"] += 1
+                    return frame
+
+                # CRC 불일치: sync 1바이트를 버리고 재동기화
+                del buffer[:1]
+                self.metrics["crc_errors"] += 1
+                self.metrics["discarded_bytes"] += 1
+                self._resync = True
+                continue
+
+            newline = buffer.find(b"\n")
+            sync = buffer.find(SYNC)
+
+            if sync != -1 and (newline == -1 or sync < newline):
+                # 줄바꿈 없이 sync 앞에 남은 바이트는 깨진 라인
+                del buffer[:sync]
+                self.metrics["discarded_bytes"] += sync
+                continue
+
+            if newline == -1:
+                return None
+
+            line = bytes(buffer[:newline]).decode(errors="replace").strip()
+            del buffer[: newline + 1]
+            if line:
+                self.metrics["text_lines"] += 1
+                return line
+
+        return None
@@ -7,22 +7,29 @@ Arduino Simulator Interface
 - Mock Simulator 사용
 - 자동 감지 및 전환
 - 통일된 API 제공
+- 바이너리 측정 프레임 협상 및 디코딩 (set_format)
+- 고속 버스트 수집 모드 설정 (set_burst)
 """
 
 import json
 import threading
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 
 import serial
 import serial.tools.list_ports
 
 try:
     from .arduino_mock import ArduinoMockSimulator
+    from .binary_protocol import FRAME_FORMATS, FrameDecoder
 except ImportError:
     from arduino_mock import ArduinoMockSimulator
+    from binary_protocol import FRAME_FORMATS, FrameDecoder
+
+FORMAT_ACK_TIMEOUT = 2.0  # set_format 응답 대기 시간 (초)
 
 
 @dataclass
@@ -34,6 +41,7 @@ class SimulatorConfig:
     timeout: float = 1.0
     auto_reconnect: bool = True
     mock_fallback: bool = True  # 실제 포트 없을 때 Mock 사용
+    frame_format: str = "json"  # json 또는 binary (연결 후 set_format 협상)
 
 
 class BaseSimulator(ABC):
@@ -59,6 +67,10 @@ class BaseSimulator(ABC):
     def is_connected(self) -> bool:
         pass
 
+    def read_frame(self, timeout: float = 1.0) -> Optional[Union[str, dict[str, Any]]]:
+        """프레임 읽기 - 바이너리 측정 프레임은 dict, 텍스트 라인은 str로 반환"""
+        return self.read_data(timeout)
+
 
 class SerialSimulator(BaseSimulator):
     """실제 Arduino 시리얼 통신"""
@@ -69,6 +81,7 @@ class SerialSimulator(BaseSimulator):
         self.timeout = timeout
         self.serial_conn: Optional[serial.Serial] = None
         self._connected = False
+        self.decoder = FrameDecoder()
 
     def connect(self) -> bool:
         try:
@@ -102,20 +115,43 @@ class SerialSimulator(BaseSimulator):
             return False
 
     def read_data(self, timeout: float = 1.0) -> Optional[str]:
+        item = self.read_frame(timeout)
+        if isinstance(item, dict):
+            # 바이너리 프레임은 기존 호출자를 위해 JSON 라인으로 변환
+            return json.dumps(item)
+        return item
+
+    def read_frame(self, timeout: float = 1.0) -> Optional[Union[str, dict[str, Any]]]:
         if not self._connected or not self.serial_conn:
             return None
 
+        item = self.decoder.next_item()
+        if item is not None:
+            return item
+
         try:
             # 타임아웃 임시 변경
             original_timeout = self.serial_conn.timeout
-            self.serial_conn.timeout = timeout
-
-            line = self.serial_conn.readline().decode().strip()
-
-            # 타임아웃 복원
-            self.serial_conn.timeout = original_timeout
-
-            return line if line else None
+            deadline = time.monotonic() + timeout
+
+            try:
+                while item is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+
+                    self.serial_conn.timeout = remaining
+                    chunk = self.serial_conn.read(max(1, self.serial_conn.in_waiting))
+                    if not chunk:
+                        break
+
+                    self.decoder.feed(chunk)
+                    item = self.decoder.next_item()
+            finally:
+                # 타임아웃 복원
+                self.serial_conn.timeout = original_timeout
+
+            return item
         except Exception as e:
             print(f"Failed to read data: {e}")
             return None
@@ -142,6 +178,9 @@ class MockSimulatorWrapper(BaseSimulator):
     def read_data(self, timeout: float = 1.0) -> Optional[str]:
         return self.mock_sim.read_data(timeout)
 
+    def read_frame(self, timeout: float = 1.0) -> Optional[Union[str, dict[str, Any]]]:
+        return self.mock_sim.read_frame(timeout)
+
     def is_connected(self) -> bool:
         return self.mock_sim.is_connected
 
@@ -160,6 +199,12 @@ class SimulatorManager:
         self.simulator: Optional[BaseSimulator] = None
         self.is_mock = False
 
+        # 협상된 측정 데이터 포맷 / 명령 시퀀스 번호
+        self.frame_format = "json"
+        self._command_seq = 0
+        # 응답 대기 중 먼저 도착한 프레임 (read_frame / read_data가 먼저 반환)
+        self._pending_frames: deque = deque()
+
         # 콜백 함수들
         self.data_callback: Optional[Callable[[dict[str, Any]], None]] = None
         self.status_callback: Optional[Callable[[str], None]] = None
@@ -172,11 +217,16 @@ class SimulatorManager:
     def connect(self) -> bool:
         """시뮬레이터 연결"""
         if self.config.port == "MOCK":
-            return self._connect_mock()
+            connected = self._connect_mock()
         elif self.config.port == "AUTO":
-            return self._connect_auto()
+            connected = self._connect_auto()
         else:
-            return self._connect_serial(self.config.port)
+            connected = self._connect_serial(self.config.port)
+
+        if connected and self.config.frame_format != "json":
+            self.set_frame_format(self.config.frame_format)
+
+        return connected
 
     def disconnect(self):
         """시뮬레이터 연결 해제"""
@@ -199,10 +249,92 @@ class SimulatorManager:
 
     def read_data(self, timeout: float = 1.0) -> Optional[str]:
         """데이터 읽기"""
+        if self._pending_frames:
+            item = self._pending_frames.popleft()
+            return json.dumps(item) if isinstance(item, dict) else item
         if not self.simulator:
             return None
         return self.simulator.read_data(timeout)
 
+    def read_frame(self, timeout: float = 1.0) -> Optional[Union[str, dict[str, Any]]]:
+        """프레임 읽기 (바이너리 측정 프레임은 디코딩된 dict)"""
+        if self._pending_frames:
+            return self._pending_frames.popleft()
+        if not self.simulator:
+            return None
+        return self.simulator.read_frame(timeout)
+
+    def _next_seq(self) -> int:
+        """명령 시퀀스 번호 (응답의 ack와 매칭)"""
+        self._command_seq += 1
+        return self._command_seq
+
+    def _wait_for_ack(self, seq: int, timeout: float) -> Optional[dict[str, Any]]:
+        """seq에 대한 JSON 응답 대기 (타임아웃이면 None)
+
+        기다리는 동안 읽은 다른 프레임은 버리지 않고 read_frame이 먼저 반환한다.
+        """
+        deadline = time.monotonic() + timeout
+        skipped = []
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                item = self.simulator.read_frame(min(remaining, 0.5))
+                if item is None:
+                    continue
+                if isinstance(item, str):
+                    try:
+                        response = json.loads(item)
+                    except json.JSONDecodeError:
+                        response = None
+                    if isinstance(response, dict) and response.get("ack") == seq:
+                        return response
+                skipped.append(item)
+            return None
+        finally:
+            self._pending_frames.extend(skipped)
+
+    def set_frame_format(
+        self, frame_format: str, timeout: float = FORMAT_ACK_TIMEOUT
+    ) -> bool:
+        """측정 데이터 전송 포맷 협상 (json | binary)
+
+        디바이스의 {"result": "ok"} 응답을 timeout초까지 기다린다.
+        에러 응답이나 응답이 없으면 (set_format을 모르는 펌웨어, 예: arduino.ino)
+        JSON으로 폴백한다. 수신 측은 두 포맷을 모두 처리한다.
+        """
+        if frame_format not in FRAME_FORMATS:
+            raise ValueError(f"Unknown frame format: {frame_format}")
+
+        seq = self._next_seq()
+        sent = self.send_command(
+            json.dumps({"cmd": "set_format", "value": frame_format, "seq": seq})
+        )
+        response = self._wait_for_ack(seq, timeout) if sent else None
+        if response is not None and response.get("result") == "ok":
+            self.frame_format = frame_format
+            return True
+
+        reason = "no response" if response is None else response.get("message", "error")
+        print(f"set_format {frame_format} failed ({reason}), falling back to JSON")
+        self.frame_format = "json"
+        return False
+
+    def set_burst_mode(self, rate_hz: int, samples: int = 100) -> bool:
+        """고속 버스트 수집 모드 설정 (rate_hz=0이면 해제)
+
+        디바이스가 rate_hz로 샘플링하고 samples개마다 버스트 프레임 1개를 보낸다.
+        """
+        return self.send_command(
+            json.dumps(
+                {
+                    "cmd": "set_burst",
+                    "rate_hz": rate_hz,
+                    "samples": samples,
+                    "seq": self._next_seq(),
+                }
+            )
+        )
+
     def is_connected(self) -> bool:
         """연결 상태 확인"""
         return self.simulator is not None and self.simulator.is_connected()
@@ -332,6 +464,8 @@ class SimulatorManager:
 
                 # 재연결 시도
                 if self._connect_auto():
+                    if self.config.frame_format != "json":
+                        self.set_frame_format(self.config.frame_format)
                     print("Reconnected successfully")
                 else:
                     print("Reconnection failed")
@@ -344,10 +478,12 @@ class SimulatorManager:
 
 # 편의 함수들
 def create_simulator(
-    port: str = "AUTO", mock_fallback: bool = True
+    port: str = "AUTO", mock_fallback: bool = True, frame_format: str = "json"
 ) -> SimulatorManager:
     """시뮬레이터 생성 편의 함수"""
-    config = SimulatorConfig(port=port, mock_fallback=mock_fallback)
+    config = SimulatorConfig(
+        port=port, mock_fallback=mock_fallback, frame_format=frame_format
+    )
     return SimulatorManager(config)
 
 
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+바이너리 측정 프레임 테스트
+binary_protocol의 24바이트 프레임 인코딩/디코딩과 FrameDecoder 재동기화 검증
+
+사용법:
+python test_binary_protocol.py
+
+테스트 항목:
+1. 인코딩 → 디코딩 왕복 (mV / µA / µW 정밀도, 상태 / 모드 플래그)
+2. 범위 밖 값 클램핑
+3. CRC / sync / 타입 불일치 프레임 거부
+4. JSON 라인과 바이너리 프레임 혼합 스트림 분리
+5. 바이트 단위 분할 수신
+6. 손상 프레임 후 재동기화
+7. set_format 협상: ok 응답이면 binary, 응답 없음 / 에러면 JSON 폴백
+   (대기 중 도착한 프레임 유지)
+"""
+
+import json
+import sys
+import time
+
+try:
+    from binary_protocol import (
+        FRAME_SIZE,
+        FrameDecoder,
+        crc16,
+        decode_measurement,
+        encode_measurement,
+    )
+    from simulator_interface import (
+        BaseSimulator,
+        SimulatorConfig,
+        SimulatorManager,
+    )
+except ImportError:
+    import os
+
+    sys.path.append(os.path.dirname(__file__))
+    from binary_protocol import (
+        FRAME_SIZE,
+        FrameDecoder,
+        crc16,
+        decode_measurement,
+        encode_measurement,
+    )
+    from simulator_interface import (
+        BaseSimulator,
+        SimulatorConfig,
+        SimulatorManager,
+    )
+
+
+class ScriptedDevice(BaseSimulator):
+    """set_format을 모르거나 거부하는 펌웨어 대역 (측정 JSON 라인만 전송)"""
+
+    def __init__(self, reply: str = None):
+        self.reply = reply  # None이면 명령에 응답하지 않음 (예: arduino.ino)
+        self.lines = [
+            json.dumps({"v": 5.0, "a": 0.2, "w": 1.0, "seq": i}) for i in range(3)
+        ]
+
+    def connect(self) -> bool:
+        return True
+
+    def disconnect(self):
+        pass
+
+    def send_command(self, command: str) -> bool:
+        if self.reply is not None:
+            seq = json.loads(command)["seq"]
+            self.lines.insert(1, json.dumps({"ack": seq, "result": self.reply}))
+        return True
+
+    def read_data(self, timeout: float = 1.0):
+        return self.read_frame(timeout)
+
+    def read_frame(self, timeout: float = 1.0):
+        if self.lines:
+            return self.lines.pop(0)
+        time.sleep(timeout)
+        return None
+
+    def is_connected(self) -> bool:
+        return True
+
+
+class BinaryProtocolTester:
+    """바이너리 프레임 프로토콜 테스트 클래스"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def log_result(self, test_name: str, passed: bool, details: str = ""):
+        """테스트 결과 로깅"""
+        self.test_results.append({"test": test_name, "passed": passed})
+        print(f"{'✅' if passed else '❌'} {test_name}: {details}")
+
+    @staticmethod
+    def drain(decoder: FrameDecoder) -> list:
+        """디코더에서 완성된 항목 전부 꺼내기"""
+        items = []
+        while (item := decoder.next_item()) is not None:
+            items.append(item)
+        return items
+
+    def test_round_trip(self):
+        """인코딩 / 디코딩 왕복 테스트"""
+        frame = encode_measurement(
+            5.0123, -0.123456, 0.618, 4_000_000_000, 123456, "ok", "LOAD_SPIKE"
+        )
+        decoded = decode_measurement(frame)
+        self.log_result(
+            "프레임 크기",
+            len(frame) == FRAME_SIZE == 24 and frame[:2] == b"\xa5\x5a",
+            f"{len(frame)} bytes, sync {frame[:2].hex()}",
+        )
+        self.log_result(
+            "왕복 디코딩",
+            decoded
+            == {
+                "v": 5.012,
+                "a": -0.123456,
+                "w": 0.618,
+                "ts": 123456,
+                "seq": 4_000_000_000,
+                "status": "ok",
+                "mode": "LOAD_SPIKE",
+            },
+            f"{decoded}",
+        )
+
+        error = decode_measurement(
+            encode_measurement(4.9, 0.2, 0.98, 1, 2, "error", "ERROR_TEST")
+        )
+        clamped = decode_measurement(encode_measurement(70.0, 5000.0, -5000.0, 1, 2))
+        self.log_result(
+            "플래그 / 클램핑",
+            error["status"] == "error"
+            and error["mode"] == "ERROR_TEST"
+            and clamped["v"] == 65.535
+            and clamped["a"] == (2**31 - 1) / 1_000_000
+            and clamped["w"] == -(2**31) / 1_000_000,
+            f"status={error['status']}, mode={error['mode']}, 70V → {clamped['v']}V",
+        )
+
+        # 버퍼 중간 offset에서 복사 없이 디코딩
+        stream = b"xyz" + frame + frame
+        self.log_result(
+            "offset 디코딩",
+            decode_measurement(stream, 3) == decoded
+            and decode_measurement(stream, 3 + FRAME_SIZE) == decoded
+            and decode_measurement(stream, 4 + FRAME_SIZE) is None,
+            "offset 3 / 27 디코딩, 잘린 프레임 None",
+        )
+
+    def test_rejection(self):
+        """손상 프레임 거부 테스트"""
+        frame = bytearray(encode_measurement(5.0, 0.25, 1.25, 7, 1000))
+        rejected = []
+        for position in (0, 2, 12, 22):
+            corrupted = bytearray(frame)
+            corrupted[position] ^= 0x01
+            rejected.append(decode_measurement(corrupted) is None)
+
+        self.log_result(
+            "손상 프레임 거부",
+            all(rejected) and decode_measurement(frame) is not None,
+            "sync / 타입 / 값 / CRC 바이트 1비트 변조 모두 None",
+        )
+        self.log_result(
+            "CRC-16/CCITT-FALSE",
+            crc16(b"123456789") == 0x29B1,
+            f"check 값 0x{crc16(b'123456789'):04X}",
+        )
+
+    def test_mixed_stream(self):
+        """JSON 라인 + 바이너리 프레임 혼합 스트림 테스트"""
+        status = json.dumps({"type": "status", "message": "ready"})
+        frames = [encode_measurement(5.0, 0.2, 1.0, i, i * 100) for i in range(5)]
+        stream = (
+            status.encode()
+            + b"\n"
+            + frames[0]
+            + frames[1]
+            + b'{"v": 5.0, "seq": 99}\n'
+            + b"".join(frames[2:])
+        )
+
+        decoder = FrameDecoder()
+        decoder.feed(stream)
+        items = self.drain(decoder)
+        self.log_result(
+            "혼합 스트림 분리",
+            [item if isinstance(item, str) else item["seq"] for item in items]
+            == [status, 0, 1, '{"v": 5.0, "seq": 99}', 2, 3, 4],
+            f"텍스트 {decoder.metrics['text_lines']}줄, "
+            f"프레임 {decoder.metrics['binary_frames']}개",
+        )
+
+        # 1바이트씩 도착해도 같은 결과
+        decoder = FrameDecoder()
+        trickled = []
+        for i in range(len(stream)):
+            decoder.feed(stream[i : i + 1])
+            trickled.extend(self.drain(decoder))
+        self.log_result(
+            "분할 수신",
+            trickled == items and decoder.metrics["discarded_bytes"] == 0,
+            f"{len(stream)}바이트를 1바이트씩 수신 → 항목 {len(trickled)}개",
+        )
+
+    def test_resync(self):
+        """손상 프레임 후 재동기화 테스트"""
+        good = [encode_measurement(5.0, 0.2, 1.0, i, i) for i in range(4)]
+        broken = bytearray(good[1])
+        broken[15] ^= 0xFF  # 페이로드 손상 → CRC 불일치
+
+        decoder = FrameDecoder()
+        decoder.feed(
+            good[0]
+            + bytes(broken)
+            + good[2]
+            + b"\x00garbage\n"
+            + b'{"type": "status"}\n'
+            + good[3]
+        )
+        items = self.drain(decoder)
+        # 줄바꿈으로 끝난 잡음은 텍스트 라인으로 전달 (JSON 파싱 단계에서 무시됨)
+        self.log_result(
+            "CRC 오류 재동기화",
+            [item if isinstance(item, str) else item["seq"] for item in items]
+            == [0, 2, "\x00garbage", '{"type": "status"}', 3]
+            and decoder.metrics["crc_errors"] >= 1,
+            f"수신 {len(items)}개, CRC 오류 {decoder.metrics['crc_errors']}회, "
+            f"버린 바이트 {decoder.metrics['discarded_bytes']}",
+        )
+
+        # 줄바꿈 없는 잡음은 max_buffer로 제한
+        decoder = FrameDecoder(max_buffer=256)
+        decoder.feed(b"\x01" * 1000)
+        self.drain(decoder)
+        decoder.feed(good[0])
+        frame = self.drain(decoder)
+        self.log_result(
+            "버퍼 상한",
+            len(decoder.buffer) <= 256
+            and [item["seq"] for item in frame if isinstance(item, dict)] == [0],
+            f"잡음 1000바이트 후 버퍼 {len(decoder.buffer)}바이트, 다음 프레임 수신",
+        )
+
+    def test_negotiation(self):
+        """set_format 응답 대기 / JSON 폴백 테스트"""
+        manager = SimulatorManager(SimulatorConfig(port="MOCK", frame_format="binary"))
+        try:
+            connected = manager.connect()
+            # 응답 대기 중 받은 상태 메시지는 그대로 전달된 뒤 바이너리 프레임
+            frames = []
+            deadline = time.monotonic() + 3.0
+            while time.monotonic() < deadline and not any(
+                isinstance(frame, dict) for frame in frames
+            ):
+                frames.append(manager.read_frame(timeout=0.5))
+        finally:
+            manager.disconnect()
+        self.log_result(
+            "binary 협상",
+            connected
+            and manager.frame_format == "binary"
+            and any(isinstance(frame, dict) for frame in frames)
+            and manager._command_seq == 1,
+            f"Mock 응답 ok → {manager.frame_format}, "
+            f"대기 중 메시지 {sum(isinstance(f, str) for f in frames)}개 유지",
+        )
+
+        for reply, name in ((None, "응답 없음"), ("error", "에러 응답")):
+            manager = SimulatorManager(SimulatorConfig(port="MOCK"))
+            manager.simulator = ScriptedDevice(reply)
+            start = time.monotonic()
+            accepted = manager.set_frame_format("binary", timeout=0.3)
+            elapsed = time.monotonic() - start
+            frames = [manager.read_frame(timeout=0.01) for _ in range(4)]
+            self.log_result(
+                f"JSON 폴백 ({name})",
+                not accepted
+                and manager.frame_format == "json"
+                and [json.loads(f)["seq"] for f in frames[:3]] == [0, 1, 2]
+                and frames[3] is None
+                and (elapsed >= 0.3 if reply is None else elapsed < 0.3),
+                f"{elapsed:.2f}초 후 json, 대기 중 측정 라인 {len(frames) - 1}개 유지",
+            )
+
+    def run_full_test(self) -> bool:
+        """전체 테스트 실행"""
+        print("📦 바이너리 측정 프레임 테스트 시작")
+        print("=" * 60)
+        self.test_round_trip()
+        self.test_rejection()
+        self.test_mixed_stream()
+        self.test_resync()
+        self.test_negotiation()
+
+        failed = len([r for r in self.test_results if not r["passed"]])
+        print("\n" + "=" * 60)
+        print(f"  ✅ 성공: {len(self.test_results) - failed}개")
+        print(f"  ❌ 실패: {failed}개")
+        return failed == 0
+
+
+def main():
+    """메인 실행 함수"""
+    tester = BinaryProtocolTester()
+    sys.exit(0 if tester.run_full_test() else 1)
+
+
+if __name__ == "__main__":
+    main()